@@ -0,0 +1,161 @@
+"""
+Reconnect Backfill - recover chat sent while a connector was disconnected
+
+Each websocket / polling worker owns a GapTracker. It records the id and
+timestamp of the last message delivered to the app. `disconnected()` opens
+a Gap covering everything sent since that message, and `connected()` hands
+it back once the connection is up again. The worker then fetches that
+window from the platform's history source (Trovo's post-AUTH history
+replay, DLive's `chats` query, YouTube's saved `nextPageToken`), passes
+each message through `gap.accepts()` and its own seen-id de-duplication
+against the live stream, and calls `finish()`, which logs how long the gap
+was and how many messages were recovered and keeps the numbers for
+`stats()`.
+
+Nothing is backfilled on the very first connection: the window starts at
+the first successful connect, so chat from before the app started is never
+replayed.
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from core.logger import get_logger
+
+logger = get_logger('Backfill')
+
+# Never replay chat older than this, however long the outage was
+MAX_BACKFILL_SECONDS = 15 * 60
+GAP_HISTORY = 20
+# How long to wait for a history replay pushed right after connecting
+BACKFILL_SETTLE_SECONDS = 5.0
+
+
+def to_epoch_seconds(value) -> Optional[float]:
+    """Normalise a platform timestamp (s / ms / us / ns epoch, or ISO 8601) to epoch seconds."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            try:
+                return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+            except ValueError:
+                return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if value <= 0:
+        return None
+    # Magnitude tells the unit apart: 1e9 s ~ 2001, 1e12 ms, 1e15 us, 1e18 ns
+    for scale in (1e18, 1e15, 1e12):
+        if value >= scale / 10:
+            return value / (scale / 1e9)
+    return value
+
+
+class Gap:
+    """One outage: from the last delivered message to the reconnect"""
+
+    __slots__ = ('since_ts', 'since_id', 'disconnected_at', 'reconnected_at', 'recovered', 'complete')
+
+    def __init__(self, since_ts: float, since_id: Optional[str], disconnected_at: float):
+        self.since_ts = since_ts
+        self.since_id = since_id
+        self.disconnected_at = disconnected_at
+        self.reconnected_at: Optional[float] = None
+        self.recovered = 0
+        self.complete = True
+
+    @property
+    def duration(self) -> float:
+        """Seconds the connection was down"""
+        return max(0.0, (self.reconnected_at or time.time()) - self.disconnected_at)
+
+    @property
+    def window_start(self) -> float:
+        """Oldest send time the backfill will recover"""
+        return max(self.since_ts, (self.reconnected_at or time.time()) - MAX_BACKFILL_SECONDS)
+
+    def accepts(self, timestamp, message_id: Optional[str] = None) -> bool:
+        """True if a history message falls inside this gap"""
+        if message_id is not None and message_id == self.since_id:
+            return False
+        ts = to_epoch_seconds(timestamp)
+        return ts is not None and ts >= self.window_start
+
+    def as_dict(self) -> dict:
+        return {
+            'disconnected_at': self.disconnected_at,
+            'reconnected_at': self.reconnected_at,
+            'duration': round(self.duration, 1),
+            'window_seconds': round((self.reconnected_at or time.time()) - self.window_start, 1),
+            'recovered': self.recovered,
+            'complete': self.complete,
+        }
+
+
+class GapTracker:
+    """Tracks the last delivered message of one connection and the gaps between connections"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.last_id: Optional[str] = None
+        self.last_ts: Optional[float] = None
+        self.total_recovered = 0
+        self.history: deque = deque(maxlen=GAP_HISTORY)
+        self._open: Optional[Gap] = None
+        self._lock = threading.Lock()
+
+    def connected(self, now: Optional[float] = None) -> Optional[Gap]:
+        """Call once a connection is up; returns the gap to backfill, or None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.last_ts is None:
+                # First connection: the backfill window starts here
+                self.last_ts = now
+            gap, self._open = self._open, None
+        if gap is not None:
+            gap.reconnected_at = now
+        return gap
+
+    def delivered(self, message_id=None, timestamp=None):
+        """Record a message handed to the app (live or backfilled)."""
+        ts = to_epoch_seconds(timestamp) or time.time()
+        with self._lock:
+            if self.last_ts is None or ts >= self.last_ts:
+                self.last_ts = ts
+                self.last_id = str(message_id) if message_id is not None else None
+
+    def disconnected(self, now: Optional[float] = None):
+        """Call when the connection drops; repeated calls keep the first drop time."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._open is None and self.last_ts is not None:
+                self._open = Gap(self.last_ts, self.last_id, now)
+
+    def finish(self, gap: Gap, recovered: int, complete: bool = True):
+        """Report a backfilled gap"""
+        gap.recovered = recovered
+        gap.complete = complete
+        with self._lock:
+            self.total_recovered += recovered
+            self.history.append(gap)
+        note = '' if complete else ' (history may be truncated)'
+        logger.info(f"[{self.name}] Reconnected after a {gap.duration:.1f}s gap; recovered {recovered} "
+                    f"message{'s' if recovered != 1 else ''} sent since the last delivery{note}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            gaps = [g.as_dict() for g in self.history]
+        return {
+            'gaps': len(gaps),
+            'total_recovered': self.total_recovered,
+            'total_gap_seconds': round(sum(g['duration'] for g in gaps), 1),
+            'last_gap': gaps[-1] if gaps else None,
+        }
@@ -54,6 +54,15 @@ class BadgeManager:
         except Exception as e:
             logger.exception(f"Error saving badge cache: {e}")
     
+    def _notify_badges_changed(self):
+        """Invalidate rendered-message caches after badge assets change"""
+        try:
+            from core.render_cache import get_render_cache, get_chrome_cache
+            get_render_cache().invalidate('badges')
+            get_chrome_cache().invalidate('badges')
+        except Exception:
+            pass
+    
     def fetch_twitch_badges(self, client_id: str, access_token: str, channel_id: str = None):
         """
         Fetch Twitch badge URLs from API
@@ -90,6 +99,7 @@ class BadgeManager:
                         }
                 
                 self.save_cache()
+                self._notify_badges_changed()
                 logger.info(f"Fetched {len(self.badge_urls)} global Twitch badges")
             else:
                 logger.warning(f"Failed to fetch badges: {response.status_code}")
@@ -120,6 +130,7 @@ class BadgeManager:
                             }
                     
                     self.save_cache()
+                    self._notify_badges_changed()
                     logger.info(f"Fetched channel-specific badges for channel {channel_id}")
                     
             except Exception as e:
@@ -162,6 +173,7 @@ class BadgeManager:
                     with open(filepath, 'wb') as f:
                         f.write(response.content)
                     logger.info(f"Downloaded badge: {badge_key} to {filepath}")
+                    self._notify_badges_changed()
                 else:
                     logger.warning(f"Failed to download badge {badge_key}: HTTP {response.status_code}")
                     return None
@@ -12,6 +12,11 @@ API:
  - start_server(port)
  - is_running()
 
+When the embedded combined server is active (config `http.server_mode` =
+'combined', see core.http_server) the routes are served on the overlay port,
+and `start_server(port)` adds `port` as another listener of that server
+instead of starting a second one.
+
 Handlers receive a Flask `request` object and should return a tuple or
 Flask response. This module runs the Flask app in a background thread.
 """
@@ -32,6 +37,13 @@ _routes: Dict[str, Dict] = {}
 _lock = Lock()
 _thread: Thread | None = None
 _port: int | None = None
+_embedded_port: int | None = None
+# Adds a listening port to the embedded server (EmbeddedHTTPServer.add_port)
+_embedded_listen: Callable[[int], None] | None = None
+_embedded_ports: set = set()
+
+# WSGI app exposed for the embedded combined server
+app = _app
 
 
 def register_route(path: str, handler: Callable, methods: List[str] = None):
@@ -91,6 +103,20 @@ def start_server(port: int = 8889):
     with _lock:
         if _thread and _thread.is_alive() and _port == port:
             return True
+        if _embedded_port is not None:
+            if port == _embedded_port or port in _embedded_ports:
+                return True
+            if _embedded_listen is None:
+                logger.error(f"Callback routes are served on port {_embedded_port}; cannot listen on {port}")
+                return False
+            try:
+                _embedded_listen(port)
+            except OSError as e:
+                logger.error(f"Could not listen for callbacks on port {port}: {e}")
+                return False
+            _embedded_ports.add(port)
+            logger.info(f"Callback routes served by the combined server on port {port}")
+            return True
         _port = port
 
         def _run():
@@ -113,7 +139,29 @@ def start_server(port: int = 8889):
         return True
 
 
+def attach_embedded(port: int, add_listener: Callable[[int], None] | None = None):
+    """Mark the callback app as served by the embedded combined server on `port`.
+
+    `add_listener(port)` makes that server listen on another port as well.
+    """
+    global _embedded_port, _embedded_listen
+    with _lock:
+        _embedded_port = port
+        _embedded_listen = add_listener
+        _embedded_ports.clear()
+
+
+def detach_embedded():
+    global _embedded_port, _embedded_listen
+    with _lock:
+        _embedded_port = None
+        _embedded_listen = None
+        _embedded_ports.clear()
+
+
 def is_running() -> bool:
+    if _embedded_port is not None:
+        return True
     return _thread is not None and _thread.is_alive()
 
 
@@ -0,0 +1,300 @@
+"""
+Chat Archive - Persistent chat history with full-text search
+
+Every normalized chat message is written to a SQLite database with an FTS5
+index over message text and username. Writes are queued and committed in
+batches by a background writer thread so the UI/connector threads never
+touch the disk. Queries open their own short-lived connection (WAL mode
+allows reads concurrently with the writer).
+"""
+
+import datetime
+import json
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.logger import get_logger
+
+logger = get_logger('ChatArchive')
+
+# Maximum number of messages committed in one transaction
+DEFAULT_BATCH_SIZE = 200
+# Seconds the writer waits for more messages before committing a partial batch
+DEFAULT_FLUSH_INTERVAL = 0.5
+# Pending-write queue bound; messages beyond this are dropped and counted
+DEFAULT_MAX_PENDING = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    platform TEXT NOT NULL,
+    username TEXT NOT NULL,
+    message TEXT NOT NULL,
+    message_id TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_ts ON messages(ts);
+CREATE INDEX IF NOT EXISTS idx_messages_platform_ts ON messages(platform, ts);
+CREATE INDEX IF NOT EXISTS idx_messages_user_ts ON messages(username COLLATE NOCASE, ts);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    message, username, content='messages', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, message, username) VALUES (new.id, new.message, new.username);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, message, username) VALUES ('delete', old.id, old.message, old.username);
+END;
+"""
+
+# Metadata keys that are large and only useful for rendering; not archived
+_SKIP_METADATA_KEYS = ('fragments', 'message_fragments', 'raw', 'raw_tags')
+
+
+def _normalize_timestamp(value) -> float:
+    """Convert the various connector timestamp formats to epoch seconds."""
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        # Some platforms send milliseconds
+        return float(value) / 1000.0 if value > 1e12 else float(value)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except Exception:
+            pass
+    return time.time()
+
+
+def _fts_query(text: str) -> str:
+    """Quote each whitespace-separated term so user input can't inject FTS syntax."""
+    terms = [t for t in (text or '').split() if t]
+    return ' '.join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+class ChatArchive:
+    """SQLite-backed chat history with a batched background writer"""
+
+    def __init__(self, db_path: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_pending: int = DEFAULT_MAX_PENDING):
+        if db_path is None:
+            config_dir = Path.home() / ".audiblezenbot"
+            config_dir.mkdir(exist_ok=True)
+            db_path = str(config_dir / "chat_archive.db")
+        self.db_path = str(db_path)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self.dropped = 0
+        self.written = 0
+        self.has_fts = False
+
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"FTS5 unavailable, text search falls back to LIKE: {e}")
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._writer = threading.Thread(target=self._writer_loop, name='ChatArchiveWriter', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        except Exception:
+            pass
+        return conn
+
+    # --- Writes -----------------------------------------------------------
+    def record(self, platform: str, username: str, message: str, metadata: Optional[dict] = None):
+        """Queue a normalized chat message for archiving (never blocks)."""
+        if self._stop.is_set():
+            return
+        metadata = metadata if isinstance(metadata, dict) else {}
+        try:
+            slim = {k: v for k, v in metadata.items() if k not in _SKIP_METADATA_KEYS}
+            row = (
+                _normalize_timestamp(metadata.get('timestamp')),
+                str(platform or ''),
+                str(username or ''),
+                str(message or ''),
+                str(metadata.get('message_id') or metadata.get('id') or '') or None,
+                json.dumps(slim, default=str),
+            )
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+        except Exception as e:
+            logger.debug(f"Failed to queue message for archive: {e}")
+
+    def _writer_loop(self):
+        conn = None
+        try:
+            conn = self._connect()
+            while not self._stop.is_set() or not self._queue.empty():
+                batch = []
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    with conn:
+                        conn.executemany(
+                            'INSERT INTO messages (ts, platform, username, message, message_id, metadata) VALUES (?, ?, ?, ?, ?, ?)',
+                            batch,
+                        )
+                    self.written += len(batch)
+                except Exception as e:
+                    logger.error(f"Chat archive write failed ({len(batch)} messages): {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        except Exception as e:
+            logger.exception(f"Chat archive writer stopped: {e}")
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until all queued messages are committed (or timeout)."""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if time.time() > deadline or not self._writer.is_alive():
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Flush pending writes and stop the writer thread."""
+        self.flush(timeout)
+        self._stop.set()
+        self._writer.join(timeout)
+
+    # --- Queries ----------------------------------------------------------
+    def query(self, text: Optional[str] = None, username: Optional[str] = None, platform: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None, limit: int = 200) -> List[Dict[str, Any]]:
+        """Search archived messages, newest first.
+
+        Args:
+            text: Full-text search terms (all terms must match)
+            username: Exact username (case-insensitive)
+            platform: Platform id (e.g. 'twitch')
+            since / until: Epoch-second bounds on the message timestamp
+            limit: Maximum number of rows returned
+        """
+        clauses = []
+        params: List[Any] = []
+        joins = ''
+        if text:
+            if self.has_fts:
+                fts = _fts_query(text)
+                if fts:
+                    joins = ' JOIN messages_fts ON messages_fts.rowid = m.id'
+                    clauses.append('messages_fts MATCH ?')
+                    params.append(fts)
+            else:
+                for term in text.split():
+                    clauses.append('m.message LIKE ?')
+                    params.append(f'%{term}%')
+        if username:
+            clauses.append('m.username = ? COLLATE NOCASE')
+            params.append(username)
+        if platform:
+            clauses.append('m.platform = ?')
+            params.append(platform.lower())
+        if since is not None:
+            clauses.append('m.ts >= ?')
+            params.append(float(since))
+        if until is not None:
+            clauses.append('m.ts <= ?')
+            params.append(float(until))
+        sql = 'SELECT m.id, m.ts, m.platform, m.username, m.message, m.message_id, m.metadata FROM messages m' + joins
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY m.ts DESC, m.id DESC LIMIT ?'
+        params.append(int(limit))
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Chat archive query failed: {e}")
+            return []
+        finally:
+            conn.close()
+
+        results = []
+        for row in rows:
+            item = dict(row)
+            try:
+                item['metadata'] = json.loads(item.get('metadata') or '{}')
+            except Exception:
+                item['metadata'] = {}
+            results.append(item)
+        return results
+
+    def count(self) -> int:
+        """Return the number of archived messages."""
+        conn = self._connect()
+        try:
+            return int(conn.execute('SELECT COUNT(*) FROM messages').fetchone()[0])
+        finally:
+            conn.close()
+
+    def stats(self) -> dict:
+        """Return writer counters."""
+        return {
+            'written': self.written,
+            'pending': self._queue.qsize(),
+            'dropped': self.dropped,
+            'fts': self.has_fts,
+        }
+
+
+# Global instance
+_chat_archive = None
+
+
+def get_chat_archive() -> ChatArchive:
+    """Get the global chat archive instance"""
+    global _chat_archive
+    if _chat_archive is None:
+        _chat_archive = ChatArchive()
+    return _chat_archive
+
+
+def shutdown_chat_archive():
+    """Flush and close the global archive if it was created."""
+    global _chat_archive
+    if _chat_archive is not None:
+        try:
+            _chat_archive.close()
+        except Exception:
+            pass
+        _chat_archive = None
@@ -7,6 +7,7 @@ import time
 import os
 import threading
 import importlib
+from concurrent.futures import Future
 from typing import Dict, Optional
 from platform_connectors.qt_compat import QObject, pyqtSignal, QThread, QTimer, pyqtSlot
 from core.logger import get_logger
@@ -16,6 +17,7 @@ logger = get_logger('ChatManager')
 
 from core.config import ConfigManager
 from core.env import is_ci
+from core.outbound import completed_future
 from datetime import datetime, timezone
 
 
@@ -196,9 +198,9 @@ class ChatManager(QObject):
         except Exception:
             preview = ''
         try:
-            logger.debug(f"[TRACE] _onConnectorMessageWithMetadata: platform={platform} username={username} preview={preview}")
+            logger.debug("[TRACE] _onConnectorMessageWithMetadata: platform=%s username=%s preview=%s", platform, username, preview)
         except Exception:
-            logger.debug(f"[TRACE] _onConnectorMessageWithMetadata: platform={platform} username={username}")
+            logger.debug("[TRACE] _onConnectorMessageWithMetadata: platform=%s username=%s", platform, username)
 
         # Hand off to metadata handler
         # Validate metadata shape before handing off
@@ -221,9 +223,9 @@ class ChatManager(QObject):
         except Exception:
             preview = ''
         try:
-            logger.debug(f"[TRACE] _onConnectorMessageLegacy: platform={platform} username={username} preview={preview}")
+            logger.debug("[TRACE] _onConnectorMessageLegacy: platform=%s username=%s preview=%s", platform, username, preview)
         except Exception:
-            logger.debug(f"[TRACE] _onConnectorMessageLegacy: platform={platform} username={username}")
+            logger.debug("[TRACE] _onConnectorMessageLegacy: platform=%s username=%s", platform, username)
 
         # Legacy handoff path
         # If this looks like a Twitch IRC tag blob mistakenly sent as `username`,
@@ -344,8 +346,8 @@ class ChatManager(QObject):
 
             # Load cookies for Kick (stored during OAuth)
             if platform_id == 'kick' and hasattr(connector, 'set_cookies'):
-                from core.config import ConfigManager
-                config = ConfigManager()
+                from core.config import get_config_manager
+                config = get_config_manager()
                 platform_config = config.get_platform_config(platform_id)
                 cookies_json = platform_config.get('streamer_cookies', '')
                 if cookies_json:
@@ -476,8 +478,8 @@ class ChatManager(QObject):
             
             # Load cookies for Kick (stored during OAuth)
             if platform_id == 'kick' and hasattr(connector, 'set_cookies'):
-                from core.config import ConfigManager
-                config = ConfigManager()
+                from core.config import get_config_manager
+                config = get_config_manager()
                 platform_config = config.get_platform_config(platform_id)
                 cookies_json = platform_config.get('streamer_cookies', '')
                 if cookies_json:
@@ -826,24 +828,7 @@ class ChatManager(QObject):
 
                     if result:
                         logger.info(f"[OK] Sent message as bot on {platform_id}")
-                        # Echo the message to chat log (except for Twitch - IRC echoes automatically)
-                        if platform_id != 'twitch':
-                            from datetime import datetime
-                            bot_config = self.config.get_platform_config(platform_id) if self.config else {}
-                            bot_username = bot_config.get('bot_username', 'Bot')
-                            metadata = {
-                                'timestamp': datetime.now(),
-                                'color': '#22B2B2',
-                                'badges': [],
-                                'emotes': ''
-                            }
-                            # Use onMessageReceivedWithMetadata so de-duplication runs and prevents
-                            # duplicate display when the connector later emits the same incoming message.
-                            try:
-                                self.onMessageReceivedWithMetadata(platform_id, bot_username, message, metadata)
-                            except Exception:
-                                # Fallback to direct emit if something unexpected fails
-                                self.message_received.emit(platform_id, bot_username, message, metadata)
+                        self._echoSentMessage(platform_id, 'bot', message)
                         return True
                     else:
                         logger.error(f"Bot send failed for {platform_id}")
@@ -898,22 +883,7 @@ class ChatManager(QObject):
                     result = connector.send_message(message)
                     if result:
                         logger.info(f"[OK] Sent message as streamer on {platform_id}")
-                        # Echo the message to chat log (except for Twitch - IRC echoes automatically)
-                        if platform_id != 'twitch':
-                            from datetime import datetime
-                            streamer_config = self.config.get_platform_config(platform_id) if self.config else {}
-                            streamer_username = streamer_config.get('streamer_username') or streamer_config.get('username', 'Streamer')
-                            metadata = {
-                                'timestamp': datetime.now(),
-                                'color': '#22B2B2',
-                                'badges': [],
-                                'emotes': ''
-                            }
-                            # Call onMessageReceivedWithMetadata to run de-duplication before emitting
-                            try:
-                                self.onMessageReceivedWithMetadata(platform_id, streamer_username, message, metadata)
-                            except Exception:
-                                self.message_received.emit(platform_id, streamer_username, message, metadata)
+                        self._echoSentMessage(platform_id, 'streamer', message)
                         return True
                     else:
                         logger.error(f"Streamer send also failed for {platform_id}")
@@ -927,6 +897,80 @@ class ChatManager(QObject):
 
         logger.error(f"Failed to send message on {platform_id} - no available connectors")
         return False
+
+    def _echoSentMessage(self, platform_id: str, account: str, message: str):
+        """Echo a message we sent to the chat log (except for Twitch - IRC echoes automatically)"""
+        if platform_id == 'twitch':
+            return
+        platform_config = self.config.get_platform_config(platform_id) if self.config else {}
+        if account == 'bot':
+            username = platform_config.get('bot_username', 'Bot')
+        else:
+            username = platform_config.get('streamer_username') or platform_config.get('username', 'Streamer')
+        metadata = {
+            'timestamp': datetime.now(),
+            'color': '#22B2B2',
+            'badges': [],
+            'emotes': ''
+        }
+        # Use onMessageReceivedWithMetadata so de-duplication runs and prevents
+        # duplicate display when the connector later emits the same incoming message.
+        try:
+            self.onMessageReceivedWithMetadata(platform_id, username, message, metadata)
+        except Exception:
+            # Fallback to direct emit if something unexpected fails
+            self.message_received.emit(platform_id, username, message, metadata)
+
+    def sendMessageAsBotAsync(self, platform_id: str, message: str, allow_fallback: bool = True) -> Future:
+        """
+        Non-blocking sendMessageAsBot for platforms with an outbound dispatcher
+        (Trovo, YouTube, DLive, Kick). The message is queued on the bot connector,
+        or the streamer connector as fallback, and the returned future resolves to
+        True once the platform accepted it; the chat-log echo happens on delivery.
+        Other platforms send synchronously and return an already-resolved future.
+        """
+        candidates = []
+        bot_connector = self.bot_connectors.get(platform_id)
+        if bot_connector is not None:
+            candidates.append(('bot', bot_connector))
+        if allow_fallback:
+            connector = self.connectors.get(platform_id)
+            if connector is not None and getattr(connector, 'connected', False):
+                candidates.append(('streamer', connector))
+        candidates = [(account, c) for account, c in candidates
+                      if callable(getattr(c, 'outbound', None)) and c.outbound() is not None]
+        if not candidates:
+            return completed_future(self.sendMessageAsBot(platform_id, message, allow_fallback))
+
+        result: Future = Future()
+
+        def _attempt(index: int):
+            account, connector = candidates[index]
+
+            def _done(future):
+                try:
+                    ok = bool(future.result())
+                except Exception as e:
+                    logger.warning(f"Queued send on {platform_id} raised: {e}")
+                    ok = False
+                if ok:
+                    logger.info(f"[OK] Delivered message as {account} on {platform_id}")
+                    try:
+                        self._echoSentMessage(platform_id, account, message)
+                    except Exception as e:
+                        logger.debug(f"Echo of sent message failed for {platform_id}: {e}")
+                    result.set_result(True)
+                elif index + 1 < len(candidates):
+                    logger.info(f"{account.capitalize()} send failed for {platform_id}; trying fallback to streamer...")
+                    _attempt(index + 1)
+                else:
+                    logger.error(f"Failed to deliver message on {platform_id}")
+                    result.set_result(False)
+
+            connector.send_message_async(message).add_done_callback(_done)
+
+        _attempt(0)
+        return result
     
     def disablePlatform(self, platform_id: str, disabled: bool):
         """Disable or enable a platform. When disabled, disconnects the platform (stops all background workers). When enabled, reconnects if credentials exist."""
@@ -954,30 +998,30 @@ class ChatManager(QObject):
             preview = message[:120] if message else ''
         except Exception:
             preview = ''
-        logger.debug(f"[TRACE] onMessageReceived: platform={platform_id} username={username} preview={preview}")
+        logger.debug("[TRACE] onMessageReceived: platform=%s username=%s preview=%s", platform_id, username, preview)
         # Route legacy messages through the metadata handler so de-duplication
         # and canonical checks run uniformly for all incoming messages.
         try:
             if platform_id not in self.disabled_platforms:
                 self.onMessageReceivedWithMetadata(platform_id, username, message, {})
             else:
-                logger.info(f"Platform {platform_id} is disabled, message not emitted")
+                logger.info("Platform %s is disabled, message not emitted", platform_id)
         except Exception as e:
             logger.exception(f"Error handling legacy message for {platform_id}: {e}")
     
     def onMessageReceivedWithMetadata(self, platform_id: str, username: str, message: str, metadata: dict):
         """Handle incoming message from a platform with metadata (color, badges, timestamp)"""
         msg_preview = message[:50] + '...' if len(message) > 50 else message
-        logger.info(f"onMessageReceivedWithMetadata: {platform_id}, {username}, {msg_preview}")
+        logger.debug("onMessageReceivedWithMetadata: %s, %s, %s", platform_id, username, msg_preview)
         # TRACE: show metadata keys and preview
         try:
             keys = list(metadata.keys()) if isinstance(metadata, dict) else []
         except Exception:
             keys = []
-        logger.debug(f"[TRACE] onMessageReceivedWithMetadata: platform={platform_id} username={username} preview={msg_preview} metadata_keys={keys}")
+        logger.debug("[TRACE] onMessageReceivedWithMetadata: platform=%s username=%s preview=%s metadata_keys=%s", platform_id, username, msg_preview, keys)
         # Don't emit if platform is disabled
         if platform_id in self.disabled_platforms:
-            logger.info(f"Platform {platform_id} is disabled, message not emitted")
+            logger.info("Platform %s is disabled, message not emitted", platform_id)
             return
 
         # Heuristic: some connectors may accidentally place IRC tag payload into the
@@ -1038,7 +1082,7 @@ class ChatManager(QObject):
             if msg_id:
                 prev = self._recent_message_ids.get(msg_id)
                 if prev and (now - prev) < 2.0:
-                    logger.debug(f"[TRACE] Suppressing duplicate by message_id: {msg_id}")
+                    logger.debug("[TRACE] Suppressing duplicate by message_id: %s", msg_id)
                     return
                 # record this id
                 try:
@@ -1068,7 +1112,7 @@ class ChatManager(QObject):
             # If we've recently seen the canonical signature, suppress duplicate
             prev_can = self._recent_canonical.get(canonical)
             if prev_can and (now - prev_can) < 2.0:
-                logger.debug(f"[TRACE] Suppressing duplicate by canonical key: {canonical} age={(now-prev_can):.3f}s")
+                logger.debug("[TRACE] Suppressing duplicate by canonical key: %s age=%.3fs", canonical, (now-prev_can))
                 return
             # Record canonical occurrence for short window
             try:
@@ -1088,7 +1132,7 @@ class ChatManager(QObject):
             # check for duplicate
             for (p, u, m, ts) in self._recent_incoming:
                 if p == msg_key[0] and u == msg_key[1] and m == msg_key[2]:
-                    logger.debug(f"[TRACE] Suppressing duplicate message from {username} on {platform_id}: {message[:120]}")
+                    logger.debug("[TRACE] Suppressing duplicate message from %s on %s: %s", username, platform_id, message[:120])
                     return
             # record this message
             self._recent_incoming.append((msg_key[0], msg_key[1], msg_key[2], now))
@@ -1097,7 +1141,7 @@ class ChatManager(QObject):
 
         try:
             self.message_received.emit(platform_id, username, message, metadata)
-            logger.debug(f"[TRACE] Emitted message_received for {platform_id} {username}")
+            logger.debug("[TRACE] Emitted message_received for %s %s", platform_id, username)
             # Persistent diagnostic log to track emitted messages
             try:
                 log_dir = os.path.join(os.getcwd(), 'logs')
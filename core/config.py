@@ -1,12 +1,32 @@
 """
 Configuration Manager - Save and load application settings
+
+Every ConfigManager for the same file shares one in-memory store. Writes
+(`set`, `set_platform_config`, ...) mutate the store and schedule a
+coalesced save a short debounce later (write-behind), so a burst of updates
+costs one disk write. Saves are atomic (temp file + rename). A background
+watcher merges edits made to the file by other processes without discarding
+changes that haven't been written yet. Call `flush()` (or `flush_all()`) to
+persist pending changes immediately; this also runs at interpreter exit.
+
+Reads never take the lock: each change publishes a new immutable snapshot
+(read-only mappings and tuples that share unchanged subtrees with the
+previous one) and readers use whichever snapshot is current. Hot paths can
+use `accessor(key)` for a precompiled reader that only re-resolves the key
+when the snapshot changes, and `subscribe(key, callback)` to be told when a
+value changes.
 """
 
+import atexit
+import functools
 import json
 import os
+import tempfile
 import threading
+import time
 import traceback
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Callable, List, Mapping, Optional, Tuple
 from pathlib import Path
 from core import secret_store
 from copy import deepcopy
@@ -17,52 +37,411 @@ logger = get_logger(__name__)
 # Keys considered sensitive and should be encrypted on disk
 SENSITIVE_KEYS = ['bot_token', 'streamer_token', 'access_token', 'refresh_token', 'client_secret', 'access_token_secret', 'api_key', 'streamer_cookies', 'oauth_token']
 
+# Seconds to coalesce writes before saving
+SAVE_DEBOUNCE_SECONDS = 0.5
+# How often the watcher checks the file for external edits
+WATCH_INTERVAL_SECONDS = 2.0
+
+
+class _ConfigStore:
+    """In-memory configuration shared by every ConfigManager for one file"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.RLock()
+        # Serializes disk writes (and watcher checks) without holding `lock`
+        self.write_lock = threading.Lock()
+        self.config: Optional[Dict[str, Any]] = None
+        # Key path -> value for changes not yet written; () means whole config
+        self.pending: Dict[Tuple[str, ...], Any] = {}
+        self.timer: Optional[threading.Timer] = None
+        # mtime of the file as we last read or wrote it
+        self.disk_mtime_ns: Optional[int] = None
+        self.watcher: Optional[threading.Thread] = None
+        self.saves = 0
+        # Immutable view of `config`, replaced (never mutated) on every change
+        self.snapshot: Mapping[str, Any] = MappingProxyType({})
+        # Snapshot subscribers were last notified about
+        self.notified_snapshot: Mapping[str, Any] = self.snapshot
+        self.subscribers: Dict[Tuple[str, ...], List[Callable[[str, Any], None]]] = {}
+        # platform -> (snapshot node it was decrypted from, decrypted dict)
+        self.secret_cache: Dict[str, Tuple[Mapping[str, Any], Dict[str, Any]]] = {}
+
+
+_stores: Dict[str, _ConfigStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _get_store(path: Path) -> _ConfigStore:
+    key = os.path.normcase(os.path.abspath(str(path)))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _ConfigStore(path)
+            _stores[key] = store
+        return store
+
+
+def _file_mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _apply_path(config: Dict[str, Any], path: Tuple[str, ...], value: Any):
+    """Set `value` at key `path` in `config`, creating parent dicts as needed."""
+    node = config
+    for k in path[:-1]:
+        if not isinstance(node.get(k), dict):
+            node[k] = {}
+        node = node[k]
+    node[path[-1]] = value
+
+
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=1024)
+def _key_path(key: str) -> Tuple[str, ...]:
+    return tuple(key.split('.'))
+
+
+def _freeze(value: Any) -> Any:
+    """Deep read-only copy: dicts become mappingproxies and lists become tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Mutable deep copy of a frozen value (scalars are returned as-is)."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _frozen_with(node: Any, path: Tuple[str, ...], value: Any) -> Mapping[str, Any]:
+    """Copy of frozen `node` with `path` set to frozen `value`; other subtrees are shared."""
+    base = dict(node) if isinstance(node, Mapping) else {}
+    if len(path) == 1:
+        base[path[0]] = value
+    else:
+        base[path[0]] = _frozen_with(base.get(path[0]), path[1:], value)
+    return MappingProxyType(base)
+
+
+def _lookup(node: Any, path: Tuple[str, ...], default: Any = _MISSING) -> Any:
+    for k in path:
+        if isinstance(node, Mapping) and k in node:
+            node = node[k]
+        else:
+            return default
+    return node
+
+
+def _notify_subscribers(store: '_ConfigStore'):
+    """Call subscribers whose key changed since the last notification (no locks held)."""
+    with store.lock:
+        old = store.notified_snapshot
+        new = store.snapshot
+        if old is new or not store.subscribers:
+            store.notified_snapshot = new
+            return
+        store.notified_snapshot = new
+        subscriptions = [(path, list(callbacks)) for path, callbacks in store.subscribers.items()]
+    for path, callbacks in subscriptions:
+        before = _lookup(old, path)
+        after = _lookup(new, path)
+        if before is after or before == after:
+            continue
+        key = '.'.join(path)
+        value = None if after is _MISSING else after
+        for callback in callbacks:
+            try:
+                callback(key, value)
+            except Exception as e:
+                logger.warning(f"Config subscriber for {key} failed: {e}")
+
+
+class ConfigAccessor:
+    """Precompiled reader for one dotted key.
+
+    Calling it returns the current value (containers as read-only views),
+    re-resolving the key only when a new snapshot has been published.
+    """
+
+    __slots__ = ('key', 'path', 'default', '_store', '_cached')
+
+    def __init__(self, store: '_ConfigStore', key: str, default: Any = None):
+        self.key = key
+        self.path = _key_path(key)
+        self.default = default
+        self._store = store
+        self._cached = (None, default)
+
+    def __call__(self) -> Any:
+        snapshot = self._store.snapshot
+        cached = self._cached
+        if cached[0] is snapshot:
+            return cached[1]
+        value = _lookup(snapshot, self.path, self.default)
+        self._cached = (snapshot, value)
+        return value
+
+
+def _read_config_file(path: Path) -> Dict[str, Any]:
+    """Read the config file and decrypt sensitive platform fields (raises on error)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        loaded = json.load(f)
+    # Decrypt any sensitive fields stored as ENC:... in platforms
+    try:
+        platforms = loaded.get('platforms', {}) if isinstance(loaded, dict) else {}
+        for pname, pdata in (platforms or {}).items():
+            if not isinstance(pdata, dict):
+                continue
+            for sk in SENSITIVE_KEYS:
+                if sk in pdata and isinstance(pdata[sk], str) and pdata[sk].startswith('ENC:'):
+                    try:
+                        pdata[sk] = secret_store.unprotect_string(pdata[sk])
+                    except Exception:
+                        pdata[sk] = ''
+    except Exception:
+        pass
+    return loaded
+
+
+def _write_config_file(path: Path, config: Dict[str, Any]):
+    """Encrypt sensitive fields and atomically replace the config file."""
+    write_copy = deepcopy(config)
+    try:
+        platforms = write_copy.get('platforms', {}) if isinstance(write_copy, dict) else {}
+        for pname, pdata in (platforms or {}).items():
+            if not isinstance(pdata, dict):
+                continue
+            for sk in SENSITIVE_KEYS:
+                if sk in pdata and isinstance(pdata[sk], str) and pdata[sk]:
+                    val = pdata[sk]
+                    # If already encrypted (starts with ENC:), leave as-is
+                    if not val.startswith('ENC:'):
+                        try:
+                            pdata[sk] = secret_store.protect_string(val)
+                        except Exception:
+                            pass
+    except Exception:
+        pass
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(write_copy, f, indent=4)
+            f.flush()  # Ensure data is written to disk
+            os.fsync(f.fileno())  # Force OS to write to disk
+        # Windows refuses the rename while another process has the file open; retry briefly
+        for attempt in range(5):
+            try:
+                os.replace(tmp_name, path)
+                break
+            except PermissionError:
+                if attempt == 4:
+                    raise
+                time.sleep(0.05)
+    except Exception:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _flush_store(store: _ConfigStore) -> bool:
+    """Write the store's pending changes to disk. Returns True if a write happened."""
+    with store.write_lock:
+        with store.lock:
+            if store.timer is not None:
+                store.timer.cancel()
+                store.timer = None
+            if not store.pending or store.config is None:
+                return False
+            pending = store.pending
+            store.pending = {}
+            snapshot = deepcopy(store.config)
+        try:
+            _write_config_file(store.path, snapshot)
+        except Exception as e:
+            logger.exception(f"Error saving config: {e}")
+            with store.lock:
+                # Keep the changes pending (newer writes win) so the next save retries them
+                for path, value in pending.items():
+                    store.pending.setdefault(path, value)
+            return False
+        with store.lock:
+            store.disk_mtime_ns = _file_mtime_ns(store.path)
+            store.saves += 1
+        return True
+
+
+def _merge_external_changes(store: _ConfigStore) -> bool:
+    """Reload the file if another process changed it, re-applying unsaved changes."""
+    with store.write_lock:
+        mtime = _file_mtime_ns(store.path)
+        with store.lock:
+            if mtime is None or mtime == store.disk_mtime_ns:
+                return False
+        try:
+            loaded = _read_config_file(store.path)
+        except Exception as e:
+            # Possibly caught mid-write by another process; try again next time
+            logger.debug(f"Could not read externally modified config: {e}")
+            return False
+        with store.lock:
+            if not isinstance(loaded, dict):
+                return False
+            for path, value in store.pending.items():
+                if path:
+                    _apply_path(loaded, path, deepcopy(value))
+                else:
+                    loaded = deepcopy(value)
+            store.config = loaded
+            store.snapshot = _freeze(loaded)
+            store.disk_mtime_ns = mtime
+        logger.info(f"Merged external changes to {store.path.name}")
+    _notify_subscribers(store)
+    return True
+
+
+def _watch_loop(store: _ConfigStore):
+    while True:
+        time.sleep(WATCH_INTERVAL_SECONDS)
+        try:
+            _merge_external_changes(store)
+        except Exception as e:
+            logger.debug(f"Config watcher error: {e}")
+
+
+# Global instance
+_config_manager = None
+_config_manager_lock = threading.Lock()
+
+
+def get_config_manager() -> 'ConfigManager':
+    """Get the process-wide ConfigManager shared by the UI and connectors"""
+    global _config_manager
+    if _config_manager is None:
+        with _config_manager_lock:
+            if _config_manager is None:
+                _config_manager = ConfigManager()
+    return _config_manager
+
+
+def flush_all():
+    """Persist pending changes for every config file (called on shutdown)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        try:
+            _flush_store(store)
+        except Exception as e:
+            logger.exception(f"Error flushing config {store.path}: {e}")
+
+
+atexit.register(flush_all)
+
 
 class ConfigManager:
     """Manages application configuration and settings"""
     
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", write_behind: bool = True, watch: bool = True):
         """
         Initialize config manager
         
         Args:
             config_file: Path to configuration file
+            write_behind: Coalesce writes into a debounced background save
+                (False saves synchronously on every write)
+            watch: Merge edits made to the file by other processes
         """
         # Get user's home directory for config storage
         self.config_dir = Path.home() / ".audiblezenbot"
         self.config_dir.mkdir(exist_ok=True)
         
         self.config_file = self.config_dir / config_file
-        self._lock = threading.RLock()
+        self.write_behind = write_behind
+        self._store = _get_store(self.config_file)
+        self._lock = self._store.lock
         # Verbose config saves can be enabled by env var AZB_VERBOSE_CONFIG=1
         try:
             self.verbose = bool(int(os.environ.get('AZB_VERBOSE_CONFIG', '0')))
         except Exception:
             self.verbose = False
-        self.config: Dict[str, Any] = self.load()
-    
+        with self._lock:
+            if self._store.config is None:
+                self._store.disk_mtime_ns = _file_mtime_ns(self.config_file)
+                self._store.config = self._load_file()
+                self._store.snapshot = self._store.notified_snapshot = _freeze(self._store.config)
+                loaded_fresh = True
+            else:
+                loaded_fresh = False
+        if not loaded_fresh:
+            _merge_external_changes(self._store)
+        if watch:
+            with self._lock:
+                if self._store.watcher is None:
+                    self._store.watcher = threading.Thread(target=_watch_loop, args=(self._store,),
+                                                           name='ConfigWatcher', daemon=True)
+                    self._store.watcher.start()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self._store.config
+
+    @config.setter
+    def config(self, value: Dict[str, Any]):
+        with self._lock:
+            self._store.config = value
+            self._store.snapshot = _freeze(value)
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """Current immutable configuration (read-only mappings and tuples)"""
+        return self._store.snapshot
+
+    def accessor(self, key: str, default: Any = None) -> ConfigAccessor:
+        """Return a cheap callable that reads `key` (dot notation) from the current snapshot."""
+        return ConfigAccessor(self._store, key, default)
+
+    def subscribe(self, key: str, callback: Callable[[str, Any], None]):
+        """Call `callback(key, new_value)` whenever the value at `key` changes.
+
+        Callbacks run on the thread that made the change (possibly the file
+        watcher thread); containers are passed as read-only views.
+        """
+        with self._lock:
+            callbacks = self._store.subscribers.setdefault(_key_path(key), [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+
+    def unsubscribe(self, key: str, callback: Callable[[str, Any], None]):
+        with self._lock:
+            callbacks = self._store.subscribers.get(_key_path(key), [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._store.subscribers.pop(_key_path(key), None)
+
     def load(self) -> Dict[str, Any]:
-        """Load configuration from file"""
+        """Load configuration from file (pending changes are written first)"""
+        _flush_store(self._store)
+        return self._load_file()
+
+    def _load_file(self) -> Dict[str, Any]:
         with self._lock:
             if self.config_file.exists():
                 try:
-                    with open(self.config_file, 'r', encoding='utf-8') as f:
-                        loaded = json.load(f)
-                        # Decrypt any sensitive fields stored as ENC:... in platforms
-                        try:
-                            platforms = loaded.get('platforms', {}) if isinstance(loaded, dict) else {}
-                            for pname, pdata in (platforms or {}).items():
-                                if not isinstance(pdata, dict):
-                                    continue
-                                for sk in SENSITIVE_KEYS:
-                                    if sk in pdata and isinstance(pdata[sk], str) and pdata[sk].startswith('ENC:'):
-                                        try:
-                                            pdata[sk] = secret_store.unprotect_string(pdata[sk])
-                                        except Exception:
-                                            pdata[sk] = ''
-                        except Exception:
-                            pass
-                        return loaded
+                    return _read_config_file(self.config_file)
                 except Exception as e:
                     logger.exception(f"Error loading config: {e}")
                     return self.get_default_config()
@@ -70,43 +449,42 @@ class ConfigManager:
                 return self.get_default_config()
     
     def save(self):
-        """Save configuration to file"""
+        """Save configuration to file now"""
         with self._lock:
-            try:
-                # Debug: Check if trovo streamer_user_id is in config before saving
-                if self.verbose:
-                        if "platforms" in self.config and "trovo" in self.config["platforms"]:
-                            trovo_keys = list(self.config["platforms"]["trovo"].keys())
-                            has_user_id = "streamer_user_id" in trovo_keys
-                            logger.debug(f"[ConfigManager] DEBUG save(): Trovo keys = {trovo_keys}")
-                            logger.debug(f"[ConfigManager] DEBUG save(): Has streamer_user_id = {has_user_id}")
-                            if has_user_id:
-                                logger.debug(f"[ConfigManager] DEBUG save(): streamer_user_id value = {self.config['platforms']['trovo']['streamer_user_id']}")
-                # Make a deep copy and encrypt sensitive fields before writing
-                write_copy = deepcopy(self.config)
-                try:
-                    platforms = write_copy.get('platforms', {}) if isinstance(write_copy, dict) else {}
-                    for pname, pdata in (platforms or {}).items():
-                        if not isinstance(pdata, dict):
-                            continue
-                        for sk in SENSITIVE_KEYS:
-                            if sk in pdata and isinstance(pdata[sk], str) and pdata[sk]:
-                                val = pdata[sk]
-                                # If already encrypted (starts with ENC:), leave as-is
-                                if not val.startswith('ENC:'):
-                                    try:
-                                        pdata[sk] = secret_store.protect_string(val)
-                                    except Exception:
-                                        pass
-                except Exception:
-                    pass
-
-                with open(self.config_file, 'w', encoding='utf-8') as f:
-                    json.dump(write_copy, f, indent=4)
-                    f.flush()  # Ensure data is written to disk
-                    os.fsync(f.fileno())  # Force OS to write to disk
-            except Exception as e:
-                logger.exception(f"Error saving config: {e}")
+            # Debug: Check if trovo streamer_user_id is in config before saving
+            if self.verbose:
+                    if "platforms" in self.config and "trovo" in self.config["platforms"]:
+                        trovo_keys = list(self.config["platforms"]["trovo"].keys())
+                        has_user_id = "streamer_user_id" in trovo_keys
+                        logger.debug(f"[ConfigManager] DEBUG save(): Trovo keys = {trovo_keys}")
+                        logger.debug(f"[ConfigManager] DEBUG save(): Has streamer_user_id = {has_user_id}")
+                        if has_user_id:
+                            logger.debug(f"[ConfigManager] DEBUG save(): streamer_user_id value = {self.config['platforms']['trovo']['streamer_user_id']}")
+            # Anything in memory counts as pending, including direct edits to self.config
+            self._store.pending[()] = self.config
+            self._store.snapshot = _freeze(self.config)
+        _flush_store(self._store)
+        _notify_subscribers(self._store)
+
+    def flush(self):
+        """Write pending changes to disk immediately (no-op if nothing changed)"""
+        _flush_store(self._store)
+
+    def _changed(self, path: Tuple[str, ...], value: Any):
+        """Record a mutation of `path` and schedule the debounced save (lock held)."""
+        store = self._store
+        store.pending[path] = value
+        store.snapshot = _frozen_with(store.snapshot, path, _freeze(value)) if path else _freeze(value)
+        if self.write_behind and store.timer is None:
+            store.timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, _flush_store, args=(store,))
+            store.timer.daemon = True
+            store.timer.start()
+
+    def _commit(self):
+        """Notify subscribers and, when write-behind is off, save now (call without the lock held)."""
+        if not self.write_behind:
+            _flush_store(self._store)
+        _notify_subscribers(self._store)
     
     def get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
@@ -135,7 +513,8 @@ class ConfigManager:
                     "channel_id": "",
                     "connected": False,
                     "disabled": False,
-                    "oauth_token": ""
+                    "oauth_token": "",
+                    "chat_transport": "poll"
                 },
                 "trovo": {
                     "client_id": "",
@@ -153,7 +532,8 @@ class ConfigManager:
                     "access_token": "",
                     "refresh_token": "",
                     "client_id": "",
-                    "client_secret": ""
+                    "client_secret": "",
+                    "read_mode": "auto"
                 },
                 "dlive": {
                     "username": "",
@@ -172,7 +552,19 @@ class ConfigManager:
             "chat": {
                 "max_messages": 500,
                 "auto_scroll": True,
-                "show_timestamps": False
+                "show_timestamps": False,
+                "archive_enabled": True
+            },
+            "http": {
+                "server_mode": "separate",
+                "threads": 32,
+                "gzip": True,
+                "shutdown_timeout": 5,
+                "keepalive_timeout": 20
+            },
+            "connectors": {
+                # Host every websocket worker on one shared asyncio loop
+                "shared_runtime": True
             },
             "ngrok": {
                 "auth_token": "",
@@ -202,7 +594,14 @@ class ConfigManager:
                     "CRITICAL": True
                 },
                 # Per-category overrides structure: {"category": {"DEBUG": True, ...}}
-                "category_levels": {}
+                "category_levels": {},
+                # Rotation/cleanup for logs/ and the session log folder
+                "retention": {
+                    "max_file_mb": 20,
+                    "total_budget_mb": 500,
+                    "max_age_days": 14,
+                    "compress": True
+                }
             }
         }
     
@@ -217,17 +616,11 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
-        with self._lock:
-            keys = key.split('.')
-        value = self.config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
+        value = _lookup(self._store.snapshot, _key_path(key))
+        if value is _MISSING:
+            return default
+        # Callers get a private mutable copy of containers
+        return _thaw(value)
     
     def set(self, key: str, value: Any):
         """
@@ -238,36 +631,33 @@ class ConfigManager:
             value: Value to set
         """
         with self._lock:
-            # CRITICAL: Reload config before modifying to avoid overwriting other platforms' data
-            self.config = self.load()
-            keys = key.split('.')
-            config = self.config
-            # Navigate to the parent dictionary
-            for k in keys[:-1]:
-                if k not in config:
-                    config[k] = {}
-                config = config[k]
-            # Set the value
-            config[keys[-1]] = value
-            # Save to file
-            self.save()
+            path = _key_path(key)
+            _apply_path(self.config, path, value)
+            self._changed(path, value)
+        self._commit()
     
     def get_platform_config(self, platform: str) -> Dict[str, Any]:
-        """Get configuration for a specific platform"""
-        with self._lock:
-            raw = self.config.get("platforms", {}).get(platform, {})
-            # Return a decrypted copy for sensitive fields
-            if not raw:
-                return {}
-            result = dict(raw)
+        """Get configuration for a specific platform (sensitive fields decrypted)
+
+        Decrypted results are cached per platform and reused until the
+        platform's section changes, so repeated token lookups are memory reads.
+        """
+        store = self._store
+        node = _lookup(store.snapshot, ("platforms", platform), None)
+        if not node:
+            return {}
+        cached = store.secret_cache.get(platform)
+        if cached is None or cached[0] is not node:
+            result = _thaw(node)
             # Decrypt known sensitive keys if present
-            sensitive = ['bot_token', 'streamer_token', 'access_token', 'refresh_token', 'client_secret', 'access_token_secret', 'api_key', 'streamer_cookies']
-            for k in sensitive:
+            for k in SENSITIVE_KEYS:
                 if k in result and isinstance(result[k], str) and result[k].startswith('ENC:'):
                     try:
                         result[k] = secret_store.unprotect_string(result[k])
                     except Exception:
                         result[k] = ''
+            # A newer snapshot wins if another thread raced us; either entry is valid for its node
+            store.secret_cache[platform] = cached = (node, result)
             # Diagnostic trace for platform reads (help track unexpected overwrites)
             try:
                 # Format a cleaned stack that omits internal worker frames to
@@ -284,30 +674,24 @@ class ConfigManager:
                     except Exception:
                         return ''.join(traceback.format_stack(limit=limit))
 
-                stack = _clean_stack(limit=6)
+                # Lazy message: the stack is only walked when DEBUG is enabled for this module
                 keys = list(result.keys())
-                logger.debug(f"[ConfigManager][TRACE] get_platform_config: platform={platform} keys={keys} stack:\n{stack}")
+                logger.debug(lambda: f"[ConfigManager][TRACE] get_platform_config (decrypted): platform={platform} keys={keys} stack:\n{_clean_stack(limit=6)}")
             except Exception:
                 pass
-            return result
+        # Callers may mutate the result; hand out a copy of the cached entry
+        return deepcopy(cached[1])
     
     def set_platform_config(self, platform: str, key: str, value: Any):
         """Set configuration for a specific platform"""
         with self._lock:
-            # CRITICAL: Reload config before modifying to avoid overwriting other platforms' data
-            self.config = self.load()
             if "platforms" not in self.config:
                 self.config["platforms"] = {}
             if platform not in self.config["platforms"]:
                 self.config["platforms"][platform] = {}
-            # Encrypt sensitive keys before persisting
-            sensitive = ['bot_token', 'streamer_token', 'access_token', 'refresh_token', 'client_secret', 'access_token_secret', 'api_key', 'streamer_cookies']
+            # Secrets stay plaintext in memory; save() encrypts them on the way to disk
+            sensitive = SENSITIVE_KEYS
             store_value = value
-            try:
-                if key in sensitive and isinstance(value, str) and value:
-                    store_value = secret_store.protect_string(value)
-            except Exception:
-                store_value = value
 
             # Diagnostic trace for platform writes — mask sensitive values
             try:
@@ -327,30 +711,30 @@ class ConfigManager:
                     except Exception:
                         return ''.join(traceback.format_stack(limit=limit))
 
-                stack = _clean_stack(limit=6)
-                logger.debug(f"[ConfigManager][TRACE] set_platform_config: platform={platform} key={key} value={disp} stack:\n{stack}")
+                logger.debug(lambda: f"[ConfigManager][TRACE] set_platform_config: platform={platform} key={key} value={disp} stack:\n{_clean_stack(limit=6)}")
             except Exception:
                 pass
 
             self.config["platforms"][platform][key] = store_value
-            self.save()
+            self._changed(("platforms", platform, key), store_value)
+        self._commit()
     
     def reset(self):
         """Reset configuration to defaults"""
         with self._lock:
             self.config = self.get_default_config()
-            self.save()
+            self._store.pending.clear()
+            self._changed((), self.config)
+        self._commit()
 
     def merge_platform_stream_info(self, platform: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Atomically merge provided stream_info updates into the stored config for a platform.
 
-        This method reloads the latest config under the lock, deep-merges the
-        `updates` dict into `config['platforms'][platform]['stream_info']`,
-        saves once, and returns the resulting stream_info dictionary.
+        This method merges the `updates` dict into
+        `config['platforms'][platform]['stream_info']` under the lock, schedules
+        one save, and returns the resulting stream_info dictionary.
         """
         with self._lock:
-            # Reload latest config to avoid stomping concurrent changes
-            self.config = self.load()
             if 'platforms' not in self.config:
                 self.config['platforms'] = {}
             if platform not in self.config['platforms']:
@@ -362,9 +746,8 @@ class ConfigManager:
             # Shallow-merge updates into existing stream_info (fields are simple strings/lists)
             for k, v in (updates or {}).items():
                 existing[k] = v
+                self._changed(('platforms', platform, 'stream_info', k), v)
+        self._commit()
 
-            # Persist merged config once
-            self.save()
-
-            # Return the merged stream_info
-            return existing
+        # Return the merged stream_info
+        return existing
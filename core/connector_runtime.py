@@ -0,0 +1,326 @@
+"""
+Connector Runtime - one asyncio loop for every websocket worker
+
+TwitchWorker, TwitchEventSubWorker, TrovoWorker, DLiveWorker and the Kick
+Pusher reader used to each spin up their own OS thread and event loop. The
+ConnectorRuntime hosts them all as tasks on a single loop in one background
+thread instead. Connectors start workers through `worker_host(worker)`, which
+returns a HostedTask - a QThread-shaped handle (start / isRunning / wait /
+quit / terminate) - so the surrounding lifecycle code is unchanged. Setting
+`connectors.shared_runtime` to false in config restores one QThread per
+worker.
+
+Qt bridging: workers keep emitting their pyqtSignals from the runtime thread.
+The signals belong to QObjects owned by the GUI thread, so Qt delivers them
+through queued connections exactly as it did from the worker QThreads.
+Plain callables can be sent back to the runtime with `call_soon()`.
+
+Per-task CPU accounting: every hosted coroutine, and every task it spawns,
+is driven through a wrapper that charges the runtime thread's CPU time for
+each step to the owning worker. `stats()` reports it per task so the costly
+platform is visible, and steps that hold the loop longer than
+SLOW_STEP_SECONDS are logged since they stall every connector.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+import weakref
+from typing import List, Optional
+
+from core.logger import get_logger
+
+logger = get_logger('ConnectorRuntime')
+
+# A single step holding the loop this long delays every other connector
+SLOW_STEP_SECONDS = 0.25
+
+_current_stats: contextvars.ContextVar = contextvars.ContextVar('connector_task_stats', default=None)
+
+
+class TaskStats:
+    """CPU and step accounting for one hosted worker"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.cpu_seconds = 0.0
+        self.steps = 0
+        self.slow_steps = 0
+        self.max_step = 0.0
+        self.tasks: 'weakref.WeakSet' = weakref.WeakSet()  # Main task and everything it spawned
+        self._lock = threading.Lock()
+
+    def charge(self, cpu: float, wall: float):
+        with self._lock:
+            self.cpu_seconds += cpu
+            self.steps += 1
+            if wall > self.max_step:
+                self.max_step = wall
+            if wall >= SLOW_STEP_SECONDS:
+                self.slow_steps += 1
+                slow = self.slow_steps
+            else:
+                slow = 0
+        if slow == 1 or (slow and slow % 100 == 0):
+            logger.warning(f"[{self.name}] Held the shared connector loop for {wall * 1000:.0f}ms "
+                           f"({slow} slow step{'s' if slow != 1 else ''})")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            end = self.finished or time.time()
+            elapsed = max(end - self.started, 1e-6)
+            return {
+                'name': self.name,
+                'running': self.finished is None,
+                'cpu_seconds': round(self.cpu_seconds, 4),
+                'cpu_percent': round(100.0 * self.cpu_seconds / elapsed, 2),
+                'steps': self.steps,
+                'slow_steps': self.slow_steps,
+                'max_step_ms': round(self.max_step * 1000, 1),
+                'uptime_seconds': round(elapsed, 1),
+            }
+
+
+class _Accounted:
+    """Awaitable that drives `coro` step by step and charges each step to `stats`"""
+
+    __slots__ = ('_coro', '_stats')
+
+    def __init__(self, coro, stats: TaskStats):
+        self._coro = coro
+        self._stats = stats
+
+    def __await__(self):
+        coro, stats = self._coro, self._stats
+        value, error = None, None
+        while True:
+            cpu_start, wall_start = time.thread_time(), time.perf_counter()
+            try:
+                if error is None:
+                    yielded = coro.send(value)
+                else:
+                    yielded = coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                stats.charge(time.thread_time() - cpu_start, time.perf_counter() - wall_start)
+            value, error = None, None
+            try:
+                value = yield yielded
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                error = e
+
+
+async def _accounted(coro, stats: TaskStats):
+    return await _Accounted(coro, stats)
+
+
+class ConnectorRuntime:
+    """One event loop thread shared by all websocket connectors"""
+
+    def __init__(self, name: str = 'ConnectorRuntime'):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats: List[TaskStats] = []
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            loop.set_task_factory(self._task_factory)
+            ready = threading.Event()
+            self.loop = loop
+            self._thread = threading.Thread(target=self._run, args=(loop, ready), name=self.name, daemon=True)
+            self._thread.start()
+        ready.wait(5)
+
+    def _run(self, loop, ready):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            except Exception as e:
+                logger.debug(f"Error cancelling connector tasks on shutdown: {e}")
+            loop.close()
+
+    @staticmethod
+    def _task_factory(loop, coro, **kwargs):
+        # Tasks spawned by a hosted worker (health checks, ping loops) are charged to it too
+        stats = _current_stats.get()
+        if stats is None:
+            return asyncio.Task(coro, loop=loop, **kwargs)
+        task = asyncio.Task(_accounted(coro, stats), loop=loop, **kwargs)
+        stats.tasks.add(task)
+        return task
+
+    def in_runtime_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro, name: str) -> concurrent.futures.Future:
+        """Run `coro` on the shared loop; returns a thread-safe future for its result."""
+        self.start()
+        stats = TaskStats(name)
+        with self._lock:
+            # Keep finished entries briefly for the stats table, but don't grow forever
+            self._stats = [s for s in self._stats if s.finished is None or time.time() - s.finished < 300]
+            self._stats.append(stats)
+
+        async def _main():
+            _current_stats.set(stats)
+            stats.tasks.add(asyncio.current_task())
+            try:
+                return await _Accounted(coro, stats)
+            finally:
+                stats.finished = time.time()
+
+        # Submit from a clean context so a worker starting another worker isn't charged for it
+        context = contextvars.copy_context()
+        context.run(_current_stats.set, None)
+        future = context.run(asyncio.run_coroutine_threadsafe, _main(), self.loop)
+        future.task_stats = stats
+        return future
+
+    def cancel(self, future: concurrent.futures.Future):
+        """Cancel a submitted worker and every task it spawned."""
+        stats = getattr(future, 'task_stats', None)
+
+        def _cancel():
+            for task in list(stats.tasks if stats is not None else ()):
+                task.cancel()
+
+        future.cancel()
+        if self.loop is not None and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(_cancel)
+            except RuntimeError:
+                pass
+
+    def call_soon(self, callback, *args):
+        """Schedule a plain callable on the runtime loop from any thread."""
+        self.start()
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stats(self) -> List[dict]:
+        """Per-task accounting, most CPU first."""
+        with self._lock:
+            entries = list(self._stats)
+        return sorted((s.snapshot() for s in entries), key=lambda s: s['cpu_seconds'], reverse=True)
+
+    def shutdown(self, timeout: float = 5.0):
+        loop, thread = self.loop, self._thread
+        if loop is None or thread is None:
+            return
+        try:
+            loop.call_soon_threadsafe(loop.stop)
+        except RuntimeError:
+            pass
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+
+class HostedTask:
+    """QThread-shaped handle for a worker running on the ConnectorRuntime
+
+    The worker provides `async run_async()` and `stop()`; connector code keeps
+    calling start() / isRunning() / wait(ms) / quit() / terminate().
+    """
+
+    def __init__(self, worker, runtime: Optional[ConnectorRuntime] = None, name: Optional[str] = None):
+        self.worker = worker
+        self.runtime = runtime or get_connector_runtime()
+        if name is None:
+            # e.g. 'TrovoWorker:somechannel' so streamer and bot workers are told apart
+            channel = getattr(worker, 'channel', None) or getattr(worker, 'displayname', None) \
+                or getattr(worker, 'broadcaster_login', None)
+            name = f"{type(worker).__name__}:{channel}" if isinstance(channel, str) and channel else type(worker).__name__
+        self.name = name
+        self.future: Optional[concurrent.futures.Future] = None
+        # Lets the worker's stop() cancel just its own tasks on the shared loop
+        worker.runtime_host = self
+
+    def start(self):
+        if self.isRunning():
+            return
+        self.future = self.runtime.submit(self.worker.run_async(), self.name)
+
+    def isRunning(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def isFinished(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def wait(self, timeout_ms: Optional[int] = None) -> bool:
+        if self.future is None:
+            return True
+        if self.runtime.in_runtime_thread():
+            # Blocking here would deadlock the loop the task runs on
+            return self.future.done()
+        done, _ = concurrent.futures.wait([self.future], None if timeout_ms is None else timeout_ms / 1000.0)
+        return bool(done)
+
+    def quit(self):
+        # Workers exit on their own once stop() cleared `running`
+        pass
+
+    def terminate(self):
+        if self.future is not None:
+            self.runtime.cancel(self.future)
+
+
+_runtime: Optional[ConnectorRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_connector_runtime() -> ConnectorRuntime:
+    """Get the process-wide ConnectorRuntime"""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = ConnectorRuntime()
+    return _runtime
+
+
+def shared_runtime_enabled(config=None) -> bool:
+    try:
+        if config is None:
+            from core.config import get_config_manager
+            config = get_config_manager()
+        return bool((config.get('connectors', {}) or {}).get('shared_runtime', True))
+    except Exception:
+        return True
+
+
+def worker_host(worker, thread_factory=None, config=None):
+    """Return the handle that runs `worker`.
+
+    With the shared runtime enabled this is a HostedTask. Otherwise it is a
+    QThread running `worker.run`: a fresh one from `thread_factory` (the worker
+    is moved into it), or the worker itself when it is a QThread subclass.
+    """
+    if hasattr(worker, 'run_async') and shared_runtime_enabled(config):
+        return HostedTask(worker)
+    if thread_factory is None:
+        return worker
+    thread = thread_factory()
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    return thread
@@ -0,0 +1,322 @@
+"""
+Health Supervisor - one scheduler for every connector health check
+
+Twitch, Trovo and DLive each used to run a `health_check_loop` task that
+slept 30 seconds between checks, Kick ran `start_health_monitoring` on its
+own thread and NgrokManager polled the ngrok API from `_monitor_tunnels`
+while holding its lock. The HealthSupervisor replaces all of them with a
+single daemon thread driving a hashed timer wheel.
+
+Connectors `register()` a probe - a plain callable returning a ProbeResult
+with the last message age, ping round trip and subscription state - plus
+an optional escalation action that runs once a probe reports DEAD (close
+the websocket so the worker reconnects, resubscribe a webhook, raise a
+tunnel error). Probes and escalations run on a small thread pool, so a
+slow HTTP check never delays the wheel, and every probe gets the same
+timeout: one that doesn't answer within it counts as DEAD.
+
+`websocket_probe()` builds the standard probe for websocket workers: a
+stream that has been quiet for `ping_after` seconds is pinged, so a
+silently stalled socket is detected within a minute or so instead of
+after the full `stall_after` window. `table()` is the live health table
+shown on the settings page.
+"""
+
+import asyncio
+import concurrent.futures
+import math
+import threading
+import time
+from typing import Callable, List, Optional
+
+from core.logger import get_logger
+
+logger = get_logger('HealthSupervisor')
+
+OK = 'ok'
+WARN = 'warn'
+DEAD = 'dead'
+PENDING = 'pending'
+
+TICK_SECONDS = 1.0
+WHEEL_SLOTS = 64
+DEFAULT_INTERVAL = 15.0
+# Every probe must answer within this; consistent across platforms
+DEFAULT_PROBE_TIMEOUT = 10.0
+# A quiet websocket is pinged after this long without traffic
+IDLE_PING_AFTER = 60.0
+PING_TIMEOUT = 8.0
+MAX_PROBE_WORKERS = 4
+
+
+class ProbeResult:
+    """Outcome of one health probe"""
+
+    __slots__ = ('status', 'detail', 'last_message_age', 'rtt_ms', 'subscription', 'data')
+
+    def __init__(self, status: str, detail: str = '', last_message_age: Optional[float] = None,
+                 rtt_ms: Optional[float] = None, subscription: Optional[str] = None, data=None):
+        self.status = status
+        self.detail = detail
+        self.last_message_age = last_message_age
+        self.rtt_ms = rtt_ms
+        self.subscription = subscription
+        self.data = data
+
+    @property
+    def healthy(self) -> bool:
+        return self.status != DEAD
+
+
+class ProbeHandle:
+    """One registered probe; also its row in the health table"""
+
+    def __init__(self, supervisor: 'HealthSupervisor', name: str, platform: str, probe: Callable[[], ProbeResult],
+                 interval: float, timeout: float, escalate: Optional[Callable[[ProbeResult], None]],
+                 escalate_after: int):
+        self.supervisor = supervisor
+        self.name = name
+        self.platform = platform
+        self.probe = probe
+        self.interval = interval
+        self.timeout = timeout
+        self.escalate = escalate
+        self.escalate_after = max(1, escalate_after)
+        self.active = True
+        self.registered_at = time.time()
+        # Timer wheel position
+        self.slot = 0
+        self.rounds = 0
+        # In-flight probe
+        self.future: Optional[concurrent.futures.Future] = None
+        self.started = 0.0
+        # Latest outcome
+        self.result = ProbeResult(PENDING, 'Waiting for first check')
+        self.checked_at: Optional[float] = None
+        self.failures = 0
+        self.escalations = 0
+
+    def unregister(self):
+        self.supervisor.unregister(self)
+
+    def row(self) -> dict:
+        result = self.result
+        return {
+            'name': self.name,
+            'platform': self.platform,
+            'status': result.status,
+            'detail': result.detail,
+            'last_message_age': None if result.last_message_age is None else round(result.last_message_age, 1),
+            'rtt_ms': None if result.rtt_ms is None else round(result.rtt_ms, 1),
+            'subscription': result.subscription,
+            'checked_at': self.checked_at,
+            'failures': self.failures,
+            'escalations': self.escalations,
+            'interval': self.interval,
+        }
+
+
+class HealthSupervisor:
+    """Timer wheel that runs connector health probes from one thread"""
+
+    def __init__(self, tick_seconds: float = TICK_SECONDS, slots: int = WHEEL_SLOTS,
+                 max_workers: int = MAX_PROBE_WORKERS):
+        self.tick_seconds = tick_seconds
+        self._slots: List[List[ProbeHandle]] = [[] for _ in range(slots)]
+        self._cursor = 0
+        self._inflight: List[ProbeHandle] = []
+        self._handles: List[ProbeHandle] = []
+        self._lock = threading.RLock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                               thread_name_prefix='HealthProbe')
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, probe: Callable[[], ProbeResult], interval: float = DEFAULT_INTERVAL,
+                 timeout: float = DEFAULT_PROBE_TIMEOUT, escalate: Optional[Callable[[ProbeResult], None]] = None,
+                 escalate_after: int = 1, platform: str = '', first_check: Optional[float] = None) -> ProbeHandle:
+        """Run `probe` every `interval` seconds; `escalate` runs after `escalate_after` DEAD results in a row."""
+        handle = ProbeHandle(self, name, platform, probe, interval, timeout, escalate, escalate_after)
+        with self._lock:
+            self._handles.append(handle)
+            self._schedule(handle, interval if first_check is None else first_check)
+        self._ensure_thread()
+        return handle
+
+    def unregister(self, handle: Optional[ProbeHandle]):
+        if handle is None:
+            return
+        with self._lock:
+            handle.active = False
+            if handle in self._handles:
+                self._handles.remove(handle)
+            for bucket in self._slots:
+                if handle in bucket:
+                    bucket.remove(handle)
+            if handle in self._inflight:
+                self._inflight.remove(handle)
+
+    def table(self) -> List[dict]:
+        """Current state of every registered probe"""
+        with self._lock:
+            handles = list(self._handles)
+        return [h.row() for h in handles]
+
+    def _schedule(self, handle: ProbeHandle, delay: float):
+        ticks = max(1, int(math.ceil(round(delay / self.tick_seconds, 6))))
+        count = len(self._slots)
+        handle.slot = (self._cursor + ticks) % count
+        handle.rounds = (ticks - 1) // count
+        self._slots[handle.slot].append(handle)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='HealthSupervisor', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        next_tick = time.monotonic() + self.tick_seconds
+        while not self._stopped.wait(max(0.0, next_tick - time.monotonic())):
+            next_tick += self.tick_seconds
+            try:
+                self.tick()
+            except Exception as e:
+                logger.exception(f"Health supervisor tick failed: {e}")
+
+    def tick(self):
+        """Advance the wheel one slot: collect finished probes and start the due ones"""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for handle in list(self._inflight):
+                future = handle.future
+                if future is not None and future.done():
+                    self._inflight.remove(handle)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = ProbeResult(DEAD, f"Probe failed: {e}")
+                    if not isinstance(result, ProbeResult):
+                        result = ProbeResult(OK if result else DEAD)
+                    due.append((handle, result))
+                elif now - handle.started > handle.timeout:
+                    # Leave the hung call behind; the handle won't start another until it returns
+                    self._inflight.remove(handle)
+                    due.append((handle, ProbeResult(DEAD, f"Probe timed out after {handle.timeout:.0f}s")))
+
+            self._cursor = (self._cursor + 1) % len(self._slots)
+            bucket = self._slots[self._cursor]
+            fire = [h for h in bucket if h.rounds == 0]
+            for handle in bucket:
+                if handle.rounds > 0:
+                    handle.rounds -= 1
+            self._slots[self._cursor] = [h for h in bucket if h.rounds > 0 or h not in fire]
+            for handle in fire:
+                self._schedule(handle, handle.interval)
+                if handle.future is not None and not handle.future.done():
+                    continue
+                handle.started = now
+                handle.future = self._executor.submit(handle.probe)
+                self._inflight.append(handle)
+
+        for handle, result in due:
+            self._record(handle, result)
+
+    def _record(self, handle: ProbeHandle, result: ProbeResult):
+        if not handle.active:
+            return
+        previous = handle.result.status
+        handle.result = result
+        handle.checked_at = time.time()
+        if result.status != DEAD:
+            if previous == DEAD:
+                logger.info(f"[{handle.name}] Healthy again: {result.detail}")
+            handle.failures = 0
+            return
+        handle.failures += 1
+        logger.warning(f"[{handle.name}] Health check failed ({handle.failures}): {result.detail}")
+        if handle.escalate is not None and handle.failures >= handle.escalate_after:
+            handle.escalations += 1
+            handle.failures = 0
+            self._executor.submit(self._escalate, handle, result)
+
+    @staticmethod
+    def _escalate(handle: ProbeHandle, result: ProbeResult):
+        try:
+            logger.info(f"[{handle.name}] Escalating: {result.detail}")
+            handle.escalate(result)
+        except Exception as e:
+            logger.exception(f"[{handle.name}] Escalation failed: {e}")
+
+    def shutdown(self):
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(2)
+        self._thread = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def websocket_probe(websocket, loop: asyncio.AbstractEventLoop, last_activity: Callable[[], Optional[float]],
+                    stall_after, ping_after: Optional[float] = IDLE_PING_AFTER,
+                    rtt: Optional[Callable[[], Optional[float]]] = None,
+                    ping_timeout: float = PING_TIMEOUT) -> Callable[[], ProbeResult]:
+    """Standard probe for a websocket worker.
+
+    DEAD once nothing arrived for `stall_after` seconds (a number, or a
+    callable for windows that change while connected), or when a stream that
+    has been quiet for `ping_after` seconds doesn't answer a ping. `rtt`
+    reports an application-level round trip (in ms) instead of pinging.
+    """
+    def probe() -> ProbeResult:
+        last = last_activity()
+        age = None if last is None else max(0.0, time.time() - last)
+        rtt_ms = rtt() if rtt is not None else None
+        limit = stall_after() if callable(stall_after) else stall_after
+        if age is not None and age > limit:
+            return ProbeResult(DEAD, f"No messages for {age:.0f}s", last_message_age=age, rtt_ms=rtt_ms)
+        if rtt is None and ping_after is not None and (age is None or age > ping_after):
+            try:
+                rtt_ms = ping_websocket(websocket, loop, ping_timeout) * 1000.0
+            except Exception as e:
+                return ProbeResult(DEAD, f"Ping unanswered: {str(e) or type(e).__name__}", last_message_age=age)
+        detail = 'Receiving' if age is None or age <= (ping_after or limit) else f"Quiet for {age:.0f}s"
+        return ProbeResult(OK, detail, last_message_age=age, rtt_ms=rtt_ms)
+    return probe
+
+
+def ping_websocket(websocket, loop: asyncio.AbstractEventLoop, timeout: float = PING_TIMEOUT) -> float:
+    """Ping `websocket` on its loop from another thread; returns the round trip in seconds."""
+    async def _ping():
+        started = time.perf_counter()
+        waiter = await websocket.ping()
+        await asyncio.wait_for(waiter, timeout)
+        return time.perf_counter() - started
+
+    return asyncio.run_coroutine_threadsafe(_ping(), loop).result(timeout + 1)
+
+
+def close_websocket(websocket, loop: asyncio.AbstractEventLoop):
+    """Escalation for websocket probes: close the socket so the worker reconnects."""
+    def _close(result: ProbeResult):
+        if loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(websocket.close(), loop)
+    return _close
+
+
+_supervisor: Optional[HealthSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_health_supervisor() -> HealthSupervisor:
+    """Get the process-wide HealthSupervisor"""
+    global _supervisor
+    if _supervisor is None:
+        with _supervisor_lock:
+            if _supervisor is None:
+                _supervisor = HealthSupervisor()
+    return _supervisor
@@ -0,0 +1,287 @@
+"""
+Embedded HTTP Server - One pooled WSGI server for the overlay and callback apps
+
+By default the overlay (port 5000) and the shared callback server (port 8889)
+each run Flask's development server in their own thread. In `combined` mode
+(config `http.server_mode`) both Flask apps are served from a single
+EmbeddedHTTPServer instead:
+
+ - requests are handled by a bounded worker pool (config `http.threads`);
+   SSE streams are capped at `http.max_streams` (default half the pool)
+   because each one holds a worker while it is open
+ - a port that can't be bound raises OSError instead of exiting the process
+ - HTTP/1.1 keep-alive is enabled for browser sources polling the overlay;
+   a connection idle for `http.keepalive_timeout` seconds is closed so it
+   doesn't hold a pool worker
+ - JSON/HTML responses are gzip-compressed when the client accepts it
+ - `stop()` stops accepting connections and waits for in-flight requests
+
+Requests whose path is registered on `core.callback_server` are routed to the
+callback app; everything else goes to the overlay app. `add_port()` serves
+the same app on further ports from the same pool, so `callback_server.
+start_server(port)` still opens the callback port (ngrok.callback_port) that
+Kick webhooks, ngrok tunnels and OAuth redirect URIs point at.
+"""
+
+import gzip
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from core.logger import get_logger
+
+logger = get_logger('HTTPServer')
+
+try:
+    from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler  # type: ignore
+    HAS_WERKZEUG = True
+except Exception:
+    HAS_WERKZEUG = False
+
+# Defaults used when config keys are missing
+DEFAULT_THREADS = 32
+DEFAULT_SHUTDOWN_TIMEOUT = 5.0
+# Idle keep-alive connections are dropped after this many seconds
+DEFAULT_KEEPALIVE_TIMEOUT = 20.0
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+GZIP_CONTENT_TYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+
+class GzipMiddleware:
+    """Compress buffered JSON/HTML/text responses for clients that accept gzip.
+
+    Streaming responses (SSE), media, ranged and already-encoded responses
+    pass through untouched.
+    """
+
+    def __init__(self, app: Callable, min_size: int = GZIP_MIN_SIZE, compresslevel: int = 6):
+        self.app = app
+        self.min_size = min_size
+        self.compresslevel = compresslevel
+
+    def __call__(self, environ, start_response):
+        if 'gzip' not in environ.get('HTTP_ACCEPT_ENCODING', '') or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+
+        captured = {}
+
+        def _capture(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+            captured['exc_info'] = exc_info
+            # Body is written through the returned iterable only
+            return lambda data: None
+
+        result = self.app(environ, _capture)
+        headers = captured.get('headers') or []
+        names = {k.lower(): v for k, v in headers}
+        content_type = names.get('content-type', '').split(';', 1)[0].strip().lower()
+        compressible = (
+            content_type in GZIP_CONTENT_TYPES
+            and 'content-encoding' not in names
+            and 'content-range' not in names
+            and captured.get('status', '').startswith('200')
+        )
+        if not compressible:
+            start_response(captured['status'], headers, captured.get('exc_info'))
+            return result
+
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        if len(body) < self.min_size:
+            start_response(captured['status'], headers, captured.get('exc_info'))
+            return [body]
+
+        compressed = gzip.compress(body, compresslevel=self.compresslevel)
+        headers = [(k, v) for k, v in headers if k.lower() not in ('content-length', 'etag')]
+        if 'etag' in names:
+            # Weak ETag: same entity, different encoding
+            etag = names['etag']
+            headers.append(('ETag', etag if etag.startswith('W/') else f'W/{etag}'))
+        vary = names.get('vary')
+        headers = [(k, v) for k, v in headers if k.lower() != 'vary']
+        headers.append(('Vary', f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'))
+        headers.append(('Content-Encoding', 'gzip'))
+        headers.append(('Content-Length', str(len(compressed))))
+        start_response(captured['status'], headers, captured.get('exc_info'))
+        return [compressed]
+
+
+class PathDispatcher:
+    """Route requests to `routed_app` when their path is in `paths_provider()`"""
+
+    def __init__(self, default_app: Callable, routed_app: Callable, paths_provider: Callable[[], Iterable[str]]):
+        self.default_app = default_app
+        self.routed_app = routed_app
+        self.paths_provider = paths_provider
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '') or '/'
+        try:
+            routed = path in set(self.paths_provider())
+        except Exception:
+            routed = False
+        app = self.routed_app if routed else self.default_app
+        return app(environ, start_response)
+
+
+def _bind_listener(host: str, port: int, backlog: int) -> socket.socket:
+    """Bind and listen on host:port; raises OSError (e.g. port in use)."""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        if os.name != 'nt':
+            # On Windows SO_REUSEADDR would let us share a port another process holds
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, int(port)))
+        sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+if HAS_WERKZEUG:
+    class _TimeoutRequestHandler(WSGIRequestHandler):
+        """Request handler whose socket reads time out, ending idle keep-alive connections"""
+
+        def setup(self):
+            # StreamRequestHandler.setup() applies self.timeout to the socket
+            self.timeout = self.server.keepalive_timeout
+            super().setup()
+
+    class _PooledWSGIServer(BaseWSGIServer):
+        """Werkzeug WSGI server whose requests run on a bounded thread pool"""
+
+        multithread = True
+
+        def __init__(self, host, port, app, pool: ThreadPoolExecutor,
+                     keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT):
+            self.keepalive_timeout = keepalive_timeout
+            # Bind here: werkzeug calls sys.exit(1) when it fails to bind itself
+            sock = _bind_listener(host, port, self.request_queue_size)
+            try:
+                super().__init__(host, port, app, handler=_TimeoutRequestHandler, fd=sock.fileno())
+            finally:
+                # werkzeug listens on a dup of the descriptor
+                sock.close()
+            # Shared by every listener of one EmbeddedHTTPServer
+            self._pool = pool
+
+        def process_request(self, request, client_address):
+            self._pool.submit(self._process_request_worker, request, client_address)
+
+        def _process_request_worker(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+
+class EmbeddedHTTPServer:
+    """Pooled WSGI server running in a background thread with graceful stop"""
+
+    def __init__(self, app: Callable, host: str = '0.0.0.0', port: int = 5000,
+                 threads: int = DEFAULT_THREADS, use_gzip: bool = True,
+                 keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT):
+        self.app = GzipMiddleware(app) if use_gzip else app
+        self.host = host
+        self.port = port
+        self.threads = threads
+        self.keepalive_timeout = float(keepalive_timeout)
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Additional ports (e.g. the callback port) served by the same pool: port -> (server, thread)
+        self._extra = {}
+        self._on_stop = []
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_stop_callback(self, callback: Callable):
+        """Run `callback` when stop() begins (e.g. to end long-lived streams)."""
+        self._on_stop.append(callback)
+
+    def start(self):
+        """Bind the port and start serving in a daemon thread; raises OSError if the port can't be bound."""
+        if not HAS_WERKZEUG:
+            raise RuntimeError("werkzeug is required for the embedded HTTP server")
+        if self.running:
+            return
+        pool = ThreadPoolExecutor(max_workers=max(1, int(self.threads)), thread_name_prefix='HTTPWorker')
+        try:
+            self._server = _PooledWSGIServer(self.host, self.port, self.app, pool, self.keepalive_timeout)
+        except Exception:
+            pool.shutdown(wait=False)
+            raise
+        self._pool = pool
+        self._thread = threading.Thread(target=self._server.serve_forever, name='EmbeddedHTTPServer', daemon=True)
+        self._thread.start()
+        logger.info(f"Embedded HTTP server listening on {self.host}:{self.port} ({self.threads} workers)")
+
+    @property
+    def ports(self) -> list:
+        """Ports currently being served"""
+        if self._server is None:
+            return []
+        return [self._server.socket.getsockname()[1]] + list(self._extra)
+
+    def add_port(self, port: int):
+        """Also serve the app on `port`, sharing the worker pool; raises OSError if it can't be bound."""
+        if self._server is None:
+            raise RuntimeError("Embedded HTTP server is not running")
+        port = int(port)
+        if port in self.ports:
+            return
+        server = _PooledWSGIServer(self.host, port, self.app, self._pool, self.keepalive_timeout)
+        thread = threading.Thread(target=server.serve_forever, name=f'EmbeddedHTTPServer-{port}', daemon=True)
+        thread.start()
+        self._extra[port] = (server, thread)
+        logger.info(f"Embedded HTTP server also listening on {self.host}:{port}")
+
+    def stop(self, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT):
+        """Stop accepting connections and wait up to `timeout` for in-flight requests."""
+        if self._server is None:
+            return
+        for callback in self._on_stop:
+            try:
+                callback()
+            except Exception:
+                pass
+        servers = [(self._server, self._thread)] + list(self._extra.values())
+        try:
+            for server, _ in servers:
+                server.shutdown()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            # ThreadPoolExecutor.shutdown has no timeout; join workers ourselves
+            for worker in list(getattr(self._pool, '_threads', ())):
+                worker.join(timeout)
+            for server, _ in servers:
+                server.server_close()
+        except Exception as e:
+            logger.warning(f"Embedded HTTP server shutdown error: {e}")
+        for _, thread in servers:
+            if thread is not None:
+                thread.join(timeout)
+        self._server = None
+        self._thread = None
+        self._pool = None
+        self._extra = {}
+        logger.info("Embedded HTTP server stopped")
+
+
+def build_combined_app() -> Callable:
+    """Return a WSGI app serving the overlay routes plus any registered callback routes."""
+    from core import overlay_server
+    from core import callback_server
+    return PathDispatcher(overlay_server.app, callback_server.app, callback_server.get_registered_paths)
@@ -1,14 +1,49 @@
 """
 Logging Module - Handles logging of all debug messages to file
+
+`get_logger(name)` loggers check whether their level is enabled for their
+component before formatting anything: the decision is a dictionary lookup
+in the active LogManager's gate cache, which is rebuilt lazily whenever the
+debug/level/category settings change. Messages accept lazy arguments
+(`logger.debug("x=%s", x)` or a zero-argument callable) that are only
+rendered for enabled levels. File output goes through a buffered sink that
+a background thread flushes periodically instead of on every write.
+
+LogRetention keeps the `logs/` directory (and the session log folder)
+bounded: `*.log` files over the per-file size cap are rolled over to
+timestamped segments, segments are gzip-compressed in the background,
+segments older than the age limit are removed at startup and periodically,
+and the oldest segments are deleted whenever the total size exceeds the
+disk budget (config `logging.retention`).
 """
 
+import atexit
+import gzip
+import re
+import shutil
 import sys
 import os
+import threading
+import time
 from datetime import datetime
-from typing import Optional
-import re
+from typing import Iterable, List, Optional
 import logging
 
+# Seconds between background flushes of the log file sink
+FLUSH_INTERVAL_SECONDS = 0.5
+# Flush early once this many characters are buffered
+SINK_MAX_BUFFER = 64 * 1024
+
+VERBOSE_LEVELS = ('TRACE', 'DIAG', 'DEBUG')
+
+# Log retention defaults (config `logging.retention`)
+DEFAULT_MAX_FILE_MB = 20
+DEFAULT_TOTAL_BUDGET_MB = 500
+DEFAULT_MAX_AGE_DAYS = 14
+DEFAULT_RETENTION_INTERVAL_SECONDS = 60.0
+# Rotated segments: name.YYYYmmdd-HHMMSS[-n].log[.gz]
+_SEGMENT_RE = re.compile(r'\.\d{8}-\d{6}(?:-\d+)?\.log(?:\.gz)?$')
+
 
 def _configure_standard_logging(manager: 'LogManager'):
     """Configure Python's standard `logging` to route through the app's
@@ -34,12 +69,318 @@ def _configure_standard_logging(manager: 'LogManager'):
         pass
 
 
+class BufferedLogSink:
+    """Batch writes to a log file and flush them from a background thread"""
+
+    def __init__(self, log_file, flush_interval: float = FLUSH_INTERVAL_SECONDS,
+                 max_buffer: int = SINK_MAX_BUFFER, path: Optional[str] = None,
+                 max_bytes: int = 0, on_reopen=None):
+        self.log_file = log_file
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        # Roll the file over once it reaches max_bytes (0 disables)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.on_reopen = on_reopen
+        self._buffer = []
+        self._size = 0
+        self._lock = threading.Lock()
+        # Held while swapping the buffer and writing so batches stay in order
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='LogSink', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def write(self, text: str):
+        if not text:
+            return
+        with self._lock:
+            self._buffer.append(text)
+            self._size += len(text)
+            full = self._size >= self.max_buffer
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                if not self._buffer:
+                    return
+                data = ''.join(self._buffer)
+                self._buffer = []
+                self._size = 0
+            if self.log_file and not self.log_file.closed:
+                self.log_file.write(data)
+                self.log_file.flush()
+                if self.path and self.max_bytes and self.log_file.tell() >= self.max_bytes:
+                    self._rotate()
+
+    def _rotate(self):
+        """Close the full file, hand it to retention as a segment and reopen (io lock held)."""
+        try:
+            self.log_file.close()
+            get_log_retention().rollover(self.path, force=True)
+        except Exception:
+            pass
+        self.log_file = open(self.path, 'a', encoding='utf-8')
+        if self.on_reopen:
+            try:
+                self.on_reopen(self.log_file)
+            except Exception:
+                pass
+
+    def close(self):
+        """Stop the flush thread and write out anything still buffered."""
+        self._closed = True
+        self._wake.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(2.0)
+        self.flush()
+        try:
+            atexit.unregister(self.flush)
+        except Exception:
+            pass
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+
+def _segment_path(path: str) -> str:
+    """Unused timestamped segment name for rotating `path`"""
+    base, ext = os.path.splitext(path)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    candidate = f"{base}.{stamp}{ext or '.log'}"
+    n = 1
+    while os.path.exists(candidate) or os.path.exists(candidate + '.gz'):
+        candidate = f"{base}.{stamp}-{n}{ext or '.log'}"
+        n += 1
+    return candidate
+
+
+def is_log_segment(name: str) -> bool:
+    """Whether `name` is a rotated (possibly compressed) log segment"""
+    return bool(_SEGMENT_RE.search(name))
+
+
+class LogRetention:
+    """Size/age-based rotation, compression and disk budget for log directories"""
+
+    def __init__(self, directories: Iterable[str] = (), max_file_bytes: int = DEFAULT_MAX_FILE_MB * 1024 * 1024,
+                 total_budget_bytes: int = DEFAULT_TOTAL_BUDGET_MB * 1024 * 1024,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_DAYS * 86400, compress: bool = True,
+                 interval: float = DEFAULT_RETENTION_INTERVAL_SECONDS):
+        self.max_file_bytes = int(max_file_bytes)
+        self.total_budget_bytes = int(total_budget_bytes)
+        self.max_age_seconds = float(max_age_seconds)
+        self.compress = compress
+        self.interval = interval
+        self._directories: List[str] = []
+        # Files kept open by a BufferedLogSink; the sink rotates those itself
+        self._held = set()
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'rotated': 0, 'compressed': 0, 'deleted': 0}
+        for d in directories:
+            self.add_directory(d)
+
+    def configure(self, config):
+        """Apply `logging.retention` settings from a ConfigManager-like object."""
+        try:
+            settings = config.get('logging.retention', {}) or {}
+        except Exception:
+            settings = {}
+        if not isinstance(settings, dict):
+            return
+        try:
+            self.max_file_bytes = int(float(settings.get('max_file_mb', DEFAULT_MAX_FILE_MB)) * 1024 * 1024)
+            self.total_budget_bytes = int(float(settings.get('total_budget_mb', DEFAULT_TOTAL_BUDGET_MB)) * 1024 * 1024)
+            self.max_age_seconds = float(settings.get('max_age_days', DEFAULT_MAX_AGE_DAYS)) * 86400
+            self.compress = bool(settings.get('compress', True))
+        except Exception:
+            pass
+
+    def add_directory(self, directory: str):
+        if not directory:
+            return
+        path = os.path.abspath(directory)
+        with self._lock:
+            if path not in self._directories:
+                self._directories.append(path)
+
+    def hold(self, path: str):
+        with self._lock:
+            self._held.add(os.path.abspath(path))
+
+    def release(self, path: str):
+        with self._lock:
+            self._held.discard(os.path.abspath(path))
+
+    def rollover(self, path: str, force: bool = False) -> Optional[str]:
+        """Rename `path` to a timestamped segment and queue it for compression.
+
+        Returns the segment path, or None if the file is missing, held open by
+        a sink (unless `force`), or can't be renamed (e.g. open on Windows).
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            if not force and path in self._held:
+                return None
+            if not os.path.exists(path):
+                return None
+            target = _segment_path(path)
+            try:
+                os.replace(path, target)
+            except OSError:
+                return None
+            self.stats['rotated'] += 1
+        self._wake.set()
+        return target
+
+    def _iter_files(self):
+        with self._lock:
+            directories = list(self._directories)
+        for directory in directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            yield entry
+            except OSError:
+                continue
+
+    def rotate_oversized(self):
+        """Roll over active `*.log` files that reached the size cap."""
+        if self.max_file_bytes <= 0:
+            return
+        for entry in list(self._iter_files()):
+            if not entry.name.endswith('.log') or is_log_segment(entry.name):
+                continue
+            try:
+                if entry.stat().st_size >= self.max_file_bytes:
+                    self.rollover(entry.path)
+            except OSError:
+                continue
+
+    def compress_segments(self):
+        """Gzip uncompressed segments (original removed after the .gz is complete)."""
+        if not self.compress:
+            return
+        for entry in list(self._iter_files()):
+            if not entry.name.endswith('.log') or not is_log_segment(entry.name):
+                continue
+            target = entry.path + '.gz'
+            tmp = target + '.tmp'
+            try:
+                with open(entry.path, 'rb') as src, gzip.open(tmp, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                os.replace(tmp, target)
+                os.remove(entry.path)
+                self.stats['compressed'] += 1
+            except OSError:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    def _segments_oldest_first(self):
+        segments = []
+        for entry in self._iter_files():
+            if is_log_segment(entry.name):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                segments.append((st.st_mtime, st.st_size, entry.path))
+        segments.sort()
+        return segments
+
+    def _delete(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            self.stats['deleted'] += 1
+            return True
+        except OSError:
+            return False
+
+    def remove_expired(self, now: Optional[float] = None):
+        """Delete segments (old sessions) older than the age limit."""
+        if self.max_age_seconds <= 0:
+            return
+        cutoff = (now or time.time()) - self.max_age_seconds
+        for mtime, _size, path in self._segments_oldest_first():
+            if mtime >= cutoff:
+                break
+            self._delete(path)
+
+    def enforce_budget(self):
+        """Delete the oldest segments until all log files fit the disk budget."""
+        if self.total_budget_bytes <= 0:
+            return
+        total = 0
+        for entry in self._iter_files():
+            if entry.name.endswith('.log') or is_log_segment(entry.name):
+                try:
+                    total += entry.stat().st_size
+                except OSError:
+                    pass
+        if total <= self.total_budget_bytes:
+            return
+        for _mtime, size, path in self._segments_oldest_first():
+            if total <= self.total_budget_bytes:
+                break
+            if self._delete(path):
+                total -= size
+        if total > self.total_budget_bytes:
+            sys.stderr.write(f"[Logger][WARN] Active log files exceed the {self.total_budget_bytes // (1024 * 1024)} MB log budget\n")
+
+    def run_once(self):
+        self.rotate_oversized()
+        self.compress_segments()
+        self.remove_expired()
+        self.enforce_budget()
+
+    def start(self):
+        """Clean up at startup, then maintain the directories in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='LogRetention', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                sys.stderr.write(f"[Logger][WARN] Log retention pass failed: {e}\n")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
 class TeeOutput:
     """Redirects output to both console and file"""
     
     def __init__(self, original_stream, log_file=None, manager=None):
         self.original_stream = original_stream
         self.log_file = log_file
+        self.sink: Optional[BufferedLogSink] = None
         self.enabled = False
         # Optional LogManager instance to consult for filtering
         self.manager = manager
@@ -57,14 +398,20 @@ class TeeOutput:
         if not allow:
             return
 
+        self.write_prefiltered(message)
+
+    def write_prefiltered(self, message):
+        """Write a message that has already passed the level gate (SimpleLogger)"""
         # Always write to console
         self.original_stream.write(message)
 
         # Write to file if enabled
-        if self.enabled and self.log_file and not self.log_file.closed:
+        if self.enabled:
             try:
-                self.log_file.write(message)
-                self.log_file.flush()  # Ensure immediate write
+                if self.sink is not None:
+                    self.sink.write(message)
+                elif self.log_file and not self.log_file.closed:
+                    self.log_file.write(message)
             except Exception as e:
                 # Prevent infinite loop by writing error only to console
                 try:
@@ -75,9 +422,12 @@ class TeeOutput:
     def flush(self):
         """Flush both streams"""
         self.original_stream.flush()
-        if self.enabled and self.log_file and not self.log_file.closed:
+        if self.enabled:
             try:
-                self.log_file.flush()
+                if self.sink is not None:
+                    self.sink.flush()
+                elif self.log_file and not self.log_file.closed:
+                    self.log_file.flush()
             except:
                 pass
     
@@ -89,9 +439,10 @@ class TeeOutput:
         """Disable logging to file"""
         self.enabled = False
     
-    def set_log_file(self, log_file):
-        """Update the log file"""
+    def set_log_file(self, log_file, sink: Optional[BufferedLogSink] = None):
+        """Update the log file (and the buffered sink writing to it)"""
         self.log_file = log_file
+        self.sink = sink
         
 
 class LogManager:
@@ -100,8 +451,13 @@ class LogManager:
     def __init__(self, config=None):
         self.config = config
         self.log_file = None
+        self.sink: Optional[BufferedLogSink] = None
         self.log_folder = None
         self.enabled = False
+        # (component, LEVEL) -> bool, rebuilt lazily after settings change
+        self._gate_cache = {}
+        self.level_map = {}
+        self.category_levels = {}
         
         # Store original stdout/stderr
         self.original_stdout = sys.stdout
@@ -183,90 +539,107 @@ class LogManager:
             _configure_standard_logging(self)
         except Exception:
             pass
+        self._gate_cache.clear()
+        _set_active_manager(self)
 
-    def should_emit(self, message: str) -> bool:
-        """Decide whether a message should be emitted to console/log based on
-        debug settings. Suppresses verbose tags like [TRACE], [DIAG], [DEBUG]
-        unless enabled globally or for the originating component.
+    def is_enabled_for(self, component: str, level: str) -> bool:
+        """Return whether `level` messages from `component` (lowercase) are emitted.
+
+        This is the hot-path check used by SimpleLogger before formatting.
         """
+        key = (component, level)
         try:
-            if not message:
-                return True
-
-            lowered = message.lower()
-            # Always allow obvious error indicators and tracebacks to surface
-            if any(tag in lowered for tag in ['unhandled exception', '[error]', '[✗', 'traceback']):
-                return True
-
-            # Parse bracketed tokens like [Component][LEVEL]
-            level = None
-            comp = None
-            try:
-                tokens = re.findall(r'\[([^\]]+)\]', message)
-                if len(tokens) >= 2:
-                    level = tokens[1].strip().upper()
-                if len(tokens) >= 1:
-                    comp = tokens[0].strip().lower()
-            except Exception:
-                level = None
-                comp = None
-
-            # Normalize level naming
-            if level == 'WARNING':
-                level = 'WARN'
+            return self._gate_cache[key]
+        except KeyError:
+            pass
+        try:
+            allowed = self._compute_gate(component, level)
+        except Exception:
+            # On unexpected errors, be permissive to avoid hiding useful logs
+            allowed = True
+        self._gate_cache[key] = allowed
+        return allowed
 
-            # If level is known, enforce global level_map first and allow
-            # category overrides only when configured.
-            if level:
-                if not self.level_map.get(level, True):
-                    # consult per-category overrides
-                    if comp:
-                        # direct component override
-                        cat_map = self.category_levels.get(comp, {}) if isinstance(self.category_levels, dict) else {}
-                        if isinstance(cat_map, dict) and cat_map.get(level):
-                            return True
-                        # parent group override (e.g., connectors)
-                        if '.' in comp:
-                            parent = comp.split('.')[0]
-                            parent_map = self.category_levels.get(parent, {})
-                            if isinstance(parent_map, dict) and parent_map.get(level):
-                                return True
-                        # try connectors.<comp>
-                        connectors_map = self.category_levels.get(f'connectors.{comp}', {})
-                        if isinstance(connectors_map, dict) and connectors_map.get(level):
-                            return True
-                    # no overrides -> suppress this level
-                    return False
+    def _invalidate_gates(self):
+        self._gate_cache.clear()
 
-            # If global debug is enabled, allow everything
-            if self.debug_map.get('all') or self.debug_map.get('global'):
-                return True
+    def _compute_gate(self, comp: Optional[str], level: Optional[str]) -> bool:
+        """Apply the debug/level/category settings to one (component, level) pair."""
+        if level == 'WARNING':
+            level = 'WARN'
+        # Errors always surface
+        if level == 'ERROR':
+            return True
 
-            # For verbose levels/tags (TRACE/DIAG/DEBUG), require explicit
-            # per-component or debug_map enablement
-            verbose_tags = ['[trace]', '[diag]', '[debug]']
-            is_verbose = False
-            if level in ('TRACE', 'DIAG', 'DEBUG'):
-                is_verbose = True
-            elif any(t in lowered for t in verbose_tags):
-                is_verbose = True
-
-            if is_verbose:
-                # If component-level debug enabled, allow
+        # If level is known, enforce global level_map first and allow
+        # category overrides only when configured.
+        if level:
+            if not self.level_map.get(level, True):
+                # consult per-category overrides
                 if comp:
-                    if self.debug_map.get(comp):
-                        return True
-                    # parent (e.g., connectors.twitch -> connectors)
-                    parts = comp.split('.')
-                    if len(parts) > 1 and self.debug_map.get(parts[0]):
+                    categories = self.category_levels if isinstance(self.category_levels, dict) else {}
+                    # direct component override
+                    cat_map = categories.get(comp, {})
+                    if isinstance(cat_map, dict) and cat_map.get(level):
                         return True
-                    # allow mapping connectors.<comp>
-                    if self.debug_map.get(f'connectors.{comp}'):
+                    # parent group override (e.g., connectors)
+                    if '.' in comp:
+                        parent_map = categories.get(comp.split('.')[0], {})
+                        if isinstance(parent_map, dict) and parent_map.get(level):
+                            return True
+                    # try connectors.<comp>
+                    connectors_map = categories.get(f'connectors.{comp}', {})
+                    if isinstance(connectors_map, dict) and connectors_map.get(level):
                         return True
-                # nothing enabled -> suppress verbose
+                # no overrides -> suppress this level
                 return False
 
-            # Non-verbose messages default to allowed (INFO/WARN/ERROR/CRITICAL)
+        # If global debug is enabled, allow everything
+        if self.debug_map.get('all') or self.debug_map.get('global'):
+            return True
+
+        # For verbose levels (TRACE/DIAG/DEBUG), require explicit
+        # per-component or debug_map enablement
+        if level in VERBOSE_LEVELS:
+            if comp:
+                if self.debug_map.get(comp):
+                    return True
+                # parent (e.g., connectors.twitch -> connectors)
+                parts = comp.split('.')
+                if len(parts) > 1 and self.debug_map.get(parts[0]):
+                    return True
+                # allow mapping connectors.<comp>
+                if self.debug_map.get(f'connectors.{comp}'):
+                    return True
+            # nothing enabled -> suppress verbose
+            return False
+
+        # Non-verbose messages default to allowed (INFO/WARN/ERROR/CRITICAL)
+        return True
+
+    def should_emit(self, message: str) -> bool:
+        """Decide whether a line written to stdout/stderr (print, stdlib logging)
+        should be emitted, based on its `[Component][LEVEL]` prefix.
+
+        SimpleLogger output is gated before formatting and does not come
+        through here.
+        """
+        try:
+            if not message:
+                return True
+            comp, level = _parse_prefix(message)
+            if level:
+                level = level.upper()
+                if level in ('ERROR', 'CRITICAL'):
+                    return True
+                return self.is_enabled_for(comp, level)
+
+            # Untagged output: only bare verbose tags are filtered
+            lowered = message.lower()
+            if any(tag in lowered for tag in ['unhandled exception', '[error]', '[✗', 'traceback']):
+                return True
+            if any(t in lowered for t in ('[trace]', '[diag]', '[debug]')):
+                return self.is_enabled_for(comp, 'DEBUG')
             return True
         except Exception:
             # On unexpected errors, be permissive to avoid hiding useful logs
@@ -285,8 +658,8 @@ class LogManager:
             # Create log file with timestamp header
             log_path = os.path.join(self.log_folder, 'audiblezenbot.log')
             
-            # Open in append mode to preserve existing logs
-            self.log_file = open(log_path, 'a', encoding='utf-8', buffering=1)
+            # Open in append mode to preserve existing logs; writes are batched by the sink
+            self.log_file = open(log_path, 'a', encoding='utf-8')
             
             # Write session start marker
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -297,8 +670,13 @@ class LogManager:
             self.log_file.flush()
             
             # Update Tee objects
-            self.tee_stdout.set_log_file(self.log_file)
-            self.tee_stderr.set_log_file(self.log_file)
+            retention = get_log_retention()
+            retention.add_directory(self.log_folder)
+            retention.hold(log_path)
+            self.sink = BufferedLogSink(self.log_file, path=log_path, max_bytes=retention.max_file_bytes,
+                                        on_reopen=self._on_log_reopened)
+            self.tee_stdout.set_log_file(self.log_file, self.sink)
+            self.tee_stderr.set_log_file(self.log_file, self.sink)
             self.tee_stdout.enable()
             self.tee_stderr.enable()
             
@@ -312,12 +690,28 @@ class LogManager:
             traceback.print_exc()
             return False
     
+    def _on_log_reopened(self, log_file):
+        """Sink rolled the session log over; point everything at the new file."""
+        self.log_file = log_file
+        self.tee_stdout.log_file = log_file
+        self.tee_stderr.log_file = log_file
+
     def stop_logging(self):
         """Stop logging to file"""
         if not self.enabled:
             return
         
         try:
+            # Drain buffered lines before the end marker
+            if self.sink is not None:
+                self.sink.close()
+                self.log_file = self.sink.log_file
+                if self.sink.path:
+                    get_log_retention().release(self.sink.path)
+                self.sink = None
+                self.tee_stdout.set_log_file(self.log_file)
+                self.tee_stderr.set_log_file(self.log_file)
+
             # Write session end marker
             if self.log_file and not self.log_file.closed:
                 timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -391,6 +785,8 @@ class LogManager:
         # Restore original stdout/stderr
         sys.stdout = self.original_stdout
         sys.stderr = self.original_stderr
+        if _active_manager is self:
+            _set_active_manager(None)
     
     # --- Debug settings API -------------------------------------------------
     def get_debug_schema(self):
@@ -408,6 +804,7 @@ class LogManager:
         """Set a debug flag at runtime and persist to config if available."""
         try:
             self.debug_map[key] = bool(enabled)
+            self._invalidate_gates()
             if self.config:
                 # Persist the debug map under 'debug'
                 try:
@@ -432,6 +829,7 @@ class LogManager:
     def set_level_value(self, key: str, enabled: bool):
         try:
             self.level_map[key] = bool(enabled)
+            self._invalidate_gates()
             if self.config:
                 try:
                     self.config.set('logging.levels', self.level_map)
@@ -456,6 +854,7 @@ class LogManager:
             entry = self.category_levels.get(category, {}) if isinstance(self.category_levels.get(category, {}), dict) else {}
             entry[level] = bool(enabled)
             self.category_levels[category] = entry
+            self._invalidate_gates()
             if self.config:
                 try:
                     self.config.set('logging.category_levels', self.category_levels)
@@ -515,11 +914,50 @@ class LogManager:
         except Exception:
             self.category_levels = {}
 
+        self._invalidate_gates()
         return True
 
 
+def _parse_prefix(message: str):
+    """Return (component lowercase, LEVEL) from a `[Component][LEVEL] ...` line."""
+    if not message.startswith('['):
+        return None, None
+    end = message.find(']', 1)
+    if end < 0:
+        return None, None
+    comp = message[1:end].strip().lower()
+    start = end + 1
+    while start < len(message) and message[start] == ' ':
+        start += 1
+    if not message.startswith('[', start):
+        return comp, None
+    end = message.find(']', start + 1)
+    if end < 0:
+        return comp, None
+    return comp, message[start + 1:end].strip()
+
+
 # Global log manager instance
 _log_manager = None
+# Global log retention instance
+_log_retention = None
+# Manager whose settings gate SimpleLogger output (None: emit everything)
+_active_manager = None
+
+
+def _set_active_manager(manager):
+    global _active_manager
+    _active_manager = manager
+
+
+def get_log_retention(config=None) -> LogRetention:
+    """Get the global log retention instance (manages ./logs by default)"""
+    global _log_retention
+    if _log_retention is None:
+        _log_retention = LogRetention([os.path.join(os.getcwd(), 'logs')])
+    if config is not None:
+        _log_retention.configure(config)
+    return _log_retention
 
 
 def get_log_manager(config=None):
@@ -538,83 +976,95 @@ def get_log_manager(config=None):
     return _log_manager
 
 
-# Simple logger facade used by modules. This is intentionally lightweight and
-# writes formatted lines to stdout/stderr so the TeeOutput/LogManager can
-# filter or capture them. Examples in code call `get_logger('ModuleName')`.
+# Simple logger facade used by modules. This is intentionally lightweight:
+# disabled levels return before the message is formatted, and enabled lines
+# are written to stdout/stderr (TeeOutput captures them to the log file).
+# Examples in code call `get_logger('ModuleName')`.
 _loggers = {}
 
 
+def _render(msg, args) -> str:
+    """Format a lazy log message (callable and/or %-style arguments)."""
+    if callable(msg) and not args:
+        msg = msg()
+    if args:
+        try:
+            return str(msg) % args
+        except Exception:
+            return ' '.join([str(msg)] + [repr(a) for a in args])
+    return str(msg)
+
+
 class SimpleLogger:
     def __init__(self, name: str):
         self.name = name
+        self._component = name.strip().lower()
 
     def _format(self, level: str, msg: str) -> str:
         # Format: [Component][LEVEL] message
         return f"[{self.name}][{level}] {msg}\n"
 
-    def debug(self, msg: str):
-        try:
-            sys.stdout.write(self._format('DEBUG', str(msg)))
-        except Exception:
-            pass
+    def is_enabled_for(self, level: str) -> bool:
+        """Whether `level` ('DEBUG', 'TRACE', ...) output from this logger is emitted"""
+        manager = _active_manager
+        return manager is None or manager.is_enabled_for(self._component, level)
 
-    def info(self, msg: str):
+    def _log(self, level: str, msg, args, stream_name: str) -> bool:
+        manager = _active_manager
+        if manager is not None and not manager.is_enabled_for(self._component, level):
+            return False
         try:
-            sys.stdout.write(self._format('INFO', str(msg)))
+            line = self._format(level, _render(msg, args))
+            stream = sys.stdout if stream_name == 'stdout' else sys.stderr
+            # Output is already gated; skip TeeOutput's prefix parsing
+            write = getattr(stream, 'write_prefiltered', None) or stream.write
+            write(line)
         except Exception:
             pass
+        return True
 
-    def warning(self, msg: str):
-        try:
-            sys.stderr.write(self._format('WARN', str(msg)))
-        except Exception:
-            pass
+    def debug(self, msg, *args):
+        self._log('DEBUG', msg, args, 'stdout')
 
-    def error(self, msg: str):
-        try:
-            sys.stderr.write(self._format('ERROR', str(msg)))
-        except Exception:
-            pass
+    def info(self, msg, *args):
+        self._log('INFO', msg, args, 'stdout')
 
-    def critical(self, msg: str):
-        try:
-            sys.stderr.write(self._format('CRITICAL', str(msg)))
-        except Exception:
-            pass
+    def warning(self, msg, *args):
+        self._log('WARN', msg, args, 'stderr')
+
+    def error(self, msg, *args):
+        self._log('ERROR', msg, args, 'stderr')
 
-    def exception(self, msg: str):
+    def critical(self, msg, *args):
+        self._log('CRITICAL', msg, args, 'stderr')
+
+    def exception(self, msg, *args):
         """Log an exception message and attempt to include a traceback."""
+        if not self._log('ERROR', msg, args, 'stderr'):
+            return
         try:
-            # Write exception header to stderr
-            sys.stderr.write(self._format('ERROR', str(msg)))
-            try:
-                import traceback
-                tb = traceback.format_exc()
-                if tb and not tb.strip().endswith('None'):
-                    sys.stderr.write(tb)
-            except Exception:
-                pass
+            import traceback
+            tb = traceback.format_exc()
+            if tb and not tb.strip().endswith('None'):
+                stream = sys.stderr
+                write = getattr(stream, 'write_prefiltered', None) or stream.write
+                write(tb)
         except Exception:
             pass
 
-    def trace(self, msg: str):
-        try:
-            sys.stdout.write(self._format('TRACE', str(msg)))
-        except Exception:
-            pass
+    def trace(self, msg, *args):
+        self._log('TRACE', msg, args, 'stdout')
 
-    def diag(self, msg: str):
-        try:
-            sys.stdout.write(self._format('DIAG', str(msg)))
-        except Exception:
-            pass
+    def diag(self, msg, *args):
+        self._log('DIAG', msg, args, 'stdout')
 
 
 def get_logger(name: str):
     """Return a SimpleLogger instance for `name`.
 
-    The returned logger writes messages to stdout/stderr with a predictable
-    prefix so `LogManager.should_emit` can apply per-component filtering.
+    The returned logger checks the active LogManager's per-component level
+    gate before formatting and writes `[name][LEVEL] message` lines to
+    stdout/stderr.
     """
     global _loggers
     key = str(name)
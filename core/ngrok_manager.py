@@ -15,6 +15,7 @@ from threading import Thread, Lock
 from typing import Dict, Optional, Any
 from PyQt6.QtCore import QObject, pyqtSignal
 from core.logger import get_logger
+from core.health_supervisor import DEAD, OK, WARN, ProbeResult, get_health_supervisor
 
 logger = get_logger(__name__)
 
@@ -61,7 +62,7 @@ class NgrokManager(QObject):
         self.ngrok_process = None
         self.lock = Lock()
         self.monitoring = False
-        self.monitor_thread = None
+        self._health = None  # HealthSupervisor probe for the active tunnels
         self.pyngrok_available = False
         self.auth_token = None
         
@@ -440,65 +441,57 @@ class NgrokManager(QObject):
             return
         
         self.monitoring = True
-        self.monitor_thread = Thread(target=self._monitor_tunnels, daemon=True)
-        self.monitor_thread.start()
+        self._health = get_health_supervisor().register(
+            'ngrok tunnels', self._probe_tunnels, interval=30, escalate=self._report_lost_tunnels, platform='ngrok')
         logger.info("Tunnel monitoring started")
     
     def stop_monitoring(self):
         """Stop monitoring tunnel health"""
         self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=2)
-            self.monitor_thread = None
+        get_health_supervisor().unregister(self._health)
+        self._health = None
         logger.info("Tunnel monitoring stopped")
     
-    def _monitor_tunnels(self):
-        """Monitor tunnel health (runs in background thread)"""
-        while self.monitoring:
-            try:
-                time.sleep(30)  # Check every 30 seconds
-                
-                # Check ngrok API for tunnel status
-                with self.lock:
-                    if not self.tunnels:
-                        continue
-                    
-                    try:
-                        # Ensure `requests` is available at runtime (may have been None
-                        # if import failed during early module import). Attempt lazy
-                        # import so monitor can recover if dependencies were installed
-                        # after startup.
-                        global requests
-                        if requests is None:
-                            try:
-                                import importlib
-                                requests = importlib.import_module('requests')
-                            except Exception:
-                                # Leave requests as None and handle below
-                                pass
+    def _probe_tunnels(self) -> ProbeResult:
+        """Health probe: compare our tunnels with the local ngrok agent's list"""
+        # Snapshot under the lock, query the agent without holding it
+        if not self.lock.acquire(timeout=1):
+            return ProbeResult(WARN, 'Tunnel table busy')
+        try:
+            tunnels = {port: info['public_url'] for port, info in self.tunnels.items()}
+        finally:
+            self.lock.release()
+        if not tunnels:
+            return ProbeResult(OK, 'No active tunnels')
 
-                        # Query ngrok API if requests is available
-                        if requests is not None:
-                            response = requests.get('http://localhost:4040/api/tunnels', timeout=5)
-                            if response.status_code == 200:
-                                api_tunnels = response.json().get('tunnels', [])
-                                active_urls = {t['public_url'] for t in api_tunnels}
+        # Ensure `requests` is available at runtime (may have been None if import
+        # failed during early module import) so monitoring can recover if
+        # dependencies were installed after startup.
+        global requests
+        if requests is None:
+            try:
+                import importlib
+                requests = importlib.import_module('requests')
+            except Exception:
+                return ProbeResult(WARN, 'requests not installed; cannot query ngrok')
 
-                                # Check if our tunnels are still active
-                                for port, info in list(self.tunnels.items()):
-                                    if info['public_url'] not in active_urls:
-                                        logger.warning(f"Tunnel for port {port} is no longer active")
-                                        self.tunnel_error.emit(port, "Tunnel disconnected")
-                        else:
-                            # Can't query ngrok API without requests
-                            pass
-                    except Exception:
-                        # Any network/requests error should be ignored here; monitoring
-                        # will retry on the next loop iteration.
-                        pass
-                        
-            except Exception as e:
-                logger.exception(f"Monitor error: {e}")
+        try:
+            response = requests.get('http://localhost:4040/api/tunnels', timeout=5)
+        except Exception as e:
+            return ProbeResult(WARN, f"ngrok agent API unreachable: {e}")
+        if response.status_code != 200:
+            return ProbeResult(WARN, f"ngrok agent API returned {response.status_code}")
+        active_urls = {t.get('public_url') for t in response.json().get('tunnels', [])}
+        lost = [port for port, url in tunnels.items() if url not in active_urls]
+        if lost:
+            return ProbeResult(DEAD, f"Tunnel lost for port{'s' if len(lost) > 1 else ''} "
+                                     f"{', '.join(map(str, lost))}", data=lost)
+        return ProbeResult(OK, f"{len(tunnels)} tunnel{'s' if len(tunnels) > 1 else ''} active")
+    
+    def _report_lost_tunnels(self, result: ProbeResult):
+        for port in result.data or ():
+            logger.warning(f"Tunnel for port {port} is no longer active")
+            self.tunnel_error.emit(port, "Tunnel disconnected")
     
     def get_status_summary(self) -> str:
         """Get a summary of tunnel status (non-blocking)"""
@@ -530,10 +523,10 @@ class NgrokManager(QObject):
 PLATFORM_TUNNEL_REQUIREMENTS = {
     'kick': {
         'port': 8889,
-        'needs_tunnel': True,
+        'needs_tunnel': True,  # Webhook read mode only; without a tunnel chat is read over Pusher
         'protocol': 'http',
         'purpose': 'webhook',
-        'description': 'Kick requires webhooks for real-time chat'
+        'description': 'Kick webhooks (optional, chat falls back to Pusher)'
     },
     'trovo': {
         'port': 5000,
@@ -0,0 +1,324 @@
+"""
+Outbound Dispatcher - queued, paced and retried chat sends for REST platforms
+
+Trovo, YouTube, DLive and Kick send chat messages with one HTTP request per
+message. Each connector owns one OutboundDispatcher that queues sends, paces
+them with a per-platform token bucket, retries with exponential backoff and
+jitter (honouring Retry-After), and resolves a `concurrent.futures.Future`
+with True/False once the message is delivered or given up on.
+
+Chat sends aren't idempotent, so only failures that can't have posted the
+message are retried: 429, 503 and errors raised before the request reached
+the server (connect timeout, connection refused). A read timeout or a
+dropped connection after sending is final - the platform may already have
+accepted the message. Connectors supply `_send_once(message) -> SendResult`, a
+single attempt over a pooled session with pre-resolved channel ids and
+headers.
+
+Callers that need a synchronous answer use `connector.send_message()`,
+which makes a single paced attempt. If it is still queued when the wait
+runs out it is cancelled, so a caller falling back to another account never
+races a late delivery; once in flight, its outcome is awaited. Everything
+else uses
+`connector.send_message_async()` and reacts to the future. Connectors stop
+their dispatcher on disconnect.
+"""
+
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional, Tuple
+
+from core.logger import get_logger
+
+try:
+    from requests.exceptions import ConnectTimeout
+except Exception:
+    ConnectTimeout = None
+try:
+    from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+except Exception:
+    ConnectTimeoutError = NewConnectionError = None
+
+logger = get_logger('Outbound')
+
+# (messages per second, burst) per platform; conservative vs. documented limits
+PLATFORM_SEND_LIMITS: Dict[str, Tuple[float, int]] = {
+    'trovo': (1.0, 3),
+    'youtube': (0.5, 2),
+    'dlive': (1.0, 3),
+    'kick': (1.0, 3),
+}
+DEFAULT_SEND_LIMIT = (1.0, 2)
+
+DEFAULT_MAX_ATTEMPTS = 4
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+DEFAULT_MAX_QUEUE = 200
+# How long send_message() waits for its single attempt (pacing + one request)
+SYNC_SEND_TIMEOUT = 15.0
+# Statuses that mean the message was not accepted and may be resent
+RETRYABLE_STATUSES = (429, 503)
+
+
+class SendResult:
+    """Outcome of one send attempt"""
+
+    __slots__ = ('ok', 'retryable', 'retry_after', 'status', 'error')
+
+    def __init__(self, ok: bool, retryable: bool = False, retry_after: Optional[float] = None,
+                 status: Optional[int] = None, error: str = ''):
+        self.ok = ok
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.status = status
+        self.error = error
+
+    @classmethod
+    def from_response(cls, response) -> 'SendResult':
+        """Classify an HTTP response: 2xx ok, 429 / 503 retryable, anything else final."""
+        status = getattr(response, 'status_code', None)
+        if status is not None and 200 <= status < 300:
+            return cls(True, status=status)
+        retry_after = None
+        try:
+            value = response.headers.get('Retry-After')
+            retry_after = float(value) if value is not None else None
+        except Exception:
+            retry_after = None
+        retryable = status in RETRYABLE_STATUSES
+        try:
+            error = (response.text or '')[:200]
+        except Exception:
+            error = ''
+        return cls(False, retryable=retryable, retry_after=retry_after, status=status, error=error)
+
+    @classmethod
+    def network_error(cls, error) -> 'SendResult':
+        """Classify a request exception; only ones raised before sending are retryable."""
+        return cls(False, retryable=request_not_sent(error), error=str(error))
+
+    def __bool__(self):
+        return self.ok
+
+
+def request_not_sent(error: BaseException) -> bool:
+    """True if `error` shows the request never reached the server, so resending can't duplicate it."""
+    unsent = tuple(t for t in (ConnectTimeout, ConnectTimeoutError, NewConnectionError) if t is not None)
+    pending = [error]
+    seen = set()
+    while pending:
+        exc = pending.pop()
+        if exc is None or id(exc) in seen:
+            continue
+        seen.add(id(exc))
+        if isinstance(exc, ConnectionRefusedError) or (unsent and isinstance(exc, unsent)):
+            return True
+        # requests / urllib3 wrap the root cause in args, `reason` or the exception chain
+        pending.extend(a for a in getattr(exc, 'args', ()) if isinstance(a, BaseException))
+        pending.extend([getattr(exc, 'reason', None), exc.__cause__, exc.__context__])
+    return False
+
+
+class TokenBucket:
+    """Allow `rate` sends per second with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take a token; returns how long to wait before using it."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base: float = BASE_BACKOFF_SECONDS, cap: float = MAX_BACKOFF_SECONDS) -> float:
+    """Exponential backoff with full jitter; Retry-After wins when the server sends one."""
+    if retry_after is not None and retry_after >= 0:
+        return min(cap, retry_after)
+    return random.uniform(0, min(cap, base * (2 ** max(0, attempt - 1))))
+
+
+class OutboundDispatcher:
+    """One queue and sender thread per connector"""
+
+    def __init__(self, name: str, send_once: Callable[[str], SendResult], rate: Optional[float] = None,
+                 burst: Optional[int] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 max_queue: int = DEFAULT_MAX_QUEUE):
+        default_rate, default_burst = PLATFORM_SEND_LIMITS.get(name, DEFAULT_SEND_LIMIT)
+        self.name = name
+        self._send_once = send_once
+        self.bucket = TokenBucket(rate or default_rate, burst or default_burst)
+        self.max_attempts = max_attempts
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+    def submit(self, message: str, max_attempts: Optional[int] = None) -> Future:
+        """Queue `message`; the returned future resolves to True once delivered."""
+        future: Future = Future()
+        if self._stopped.is_set():
+            future.set_result(False)
+            return future
+        try:
+            self._queue.put_nowait((message, future, max_attempts or self.max_attempts))
+        except queue.Full:
+            logger.warning(f"[{self.name}] Outbound queue full; dropping message")
+            future.set_result(False)
+            return future
+        self._ensure_thread()
+        return future
+
+    def send(self, message: str, timeout: float = SYNC_SEND_TIMEOUT) -> bool:
+        """Queue `message` for one paced attempt and wait for the outcome.
+
+        Returns False only if the message was not (and will not be) sent.
+        """
+        future = self.submit(message, max_attempts=1)
+        try:
+            return bool(future.result(timeout=timeout))
+        except FutureTimeout:
+            if future.cancel():
+                logger.warning(f"[{self.name}] Send still queued after {timeout:.0f}s; dropped")
+                return False
+            # Already in flight: a fallback send now could post it twice
+            logger.info(f"[{self.name}] Send in flight after {timeout:.0f}s; waiting for its outcome")
+            try:
+                return bool(future.result())
+            except Exception as e:
+                logger.warning(f"[{self.name}] Send raised: {e}")
+                return False
+        except Exception as e:
+            logger.warning(f"[{self.name}] Send raised: {e}")
+            return False
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f'Outbound-{self.name}', daemon=True)
+                self._thread.start()
+
+    def _pace(self) -> bool:
+        """Wait for the token bucket; False if stopped meanwhile."""
+        wait = self.bucket.reserve()
+        return not (wait > 0 and self._stopped.wait(wait))
+
+    def _deliver(self, message: str, max_attempts: int) -> bool:
+        # The first attempt was paced by _run before the job was claimed
+        for attempt in range(1, max_attempts + 1):
+            if attempt > 1 and not self._pace():
+                return False
+            try:
+                result = self._send_once(message)
+            except Exception as e:
+                logger.exception(f"[{self.name}] Send attempt raised: {e}")
+                result = SendResult.network_error(e)
+            if result.ok:
+                return True
+            if not result.retryable or attempt == max_attempts:
+                logger.warning(f"[{self.name}] Send failed (status={result.status}): {result.error}")
+                return False
+            delay = backoff_delay(attempt, result.retry_after)
+            self.retries += 1
+            logger.info(f"[{self.name}] Send attempt {attempt} failed (status={result.status}); retrying in {delay:.1f}s")
+            if self._stopped.wait(delay):
+                return False
+        return False
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                message, future, max_attempts = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if future is None:
+                # stop() wake-up
+                continue
+            if future.cancelled():
+                continue
+            # Pace before claiming the job, so a send() that times out while
+            # it waits its turn can still cancel it
+            paced = self._pace()
+            if not future.set_running_or_notify_cancel():
+                continue
+            ok = False
+            try:
+                ok = paced and self._deliver(message, max_attempts)
+            finally:
+                if ok:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+                future.set_result(ok)
+
+    def stop(self):
+        """Stop sending and end the sender thread; queued messages resolve to False."""
+        self._stopped.set()
+        while True:
+            try:
+                _, future, _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None and future.set_running_or_notify_cancel():
+                future.set_result(False)
+        try:
+            # Wake the sender instead of letting it sit out its queue timeout
+            self._queue.put_nowait((None, None, None))
+        except queue.Full:
+            pass
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def metrics(self) -> dict:
+        return {'queued': self._queue.qsize(), 'sent': self.sent, 'failed': self.failed, 'retries': self.retries}
+
+
+def make_send_session(factory: Optional[Callable] = None):
+    """Pooled session for chat sends.
+
+    Status-code retries are left to the dispatcher, and the session's adapter
+    only retries failed connects - never a POST that may have reached the
+    server. `factory` defaults to make_retry_session.
+    """
+    if factory is None:
+        from core.http_session import make_retry_session as factory
+    try:
+        session = factory(status_forcelist=())
+    except TypeError:
+        session = factory()
+    try:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        retries = Retry(total=None, connect=2, read=False, status=0, other=0, redirect=0,
+                        backoff_factor=0.5, allowed_methods=None, raise_on_status=False)
+        adapter = HTTPAdapter(max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    except Exception:
+        pass
+    return session
+
+
+def completed_future(value) -> Future:
+    future: Future = Future()
+    future.set_result(value)
+    return future
@@ -0,0 +1,100 @@
+"""
+Overlay Events - Sequence-numbered ring buffer shared by all overlay clients
+
+Every overlay change (message added/removed, settings changed) is published
+here with a monotonically increasing sequence number. Events are never
+consumed: each client (SSE stream, long-poll, legacy /overlay/messages poll)
+keeps its own cursor and reads everything after it, so any number of browser
+sources see every event. A client that reconnects resumes exactly where it
+left off as long as its cursor is still inside the retained window.
+
+Events live in a fixed-capacity ring indexed by `seq % capacity`, so
+publishing and reading cost O(1) per event regardless of how many events
+are retained or how many clients are attached.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+
+# Number of events retained for cursor resume
+DEFAULT_CAPACITY = 500
+
+
+class OverlayEventLog:
+    """Fixed-capacity, thread-safe ring of overlay events with blocking reads"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = max(1, int(capacity))
+        self._ring: List[Optional[dict]] = [None] * self.capacity
+        self._cond = threading.Condition()
+        self._seq = 0
+        self.closed = False
+
+    @property
+    def latest_seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    @property
+    def oldest_seq(self) -> int:
+        """Sequence of the oldest retained event (latest_seq + 1 when empty)"""
+        with self._cond:
+            return self._oldest_locked()
+
+    def __len__(self):
+        with self._cond:
+            return self._seq - self._oldest_locked() + 1
+
+    def publish(self, event_type: str, data: dict) -> int:
+        """Append an event and wake any waiting readers. Returns its sequence."""
+        with self._cond:
+            self._seq += 1
+            self._ring[self._seq % self.capacity] = {'seq': self._seq, 'type': event_type, 'data': data}
+            self._cond.notify_all()
+            return self._seq
+
+    def read_since(self, cursor: int, limit: Optional[int] = None) -> Tuple[List[dict], int, bool]:
+        """Return (events after cursor, new cursor, reset).
+
+        `reset` is True when the cursor fell out of the retained window (or is
+        ahead of the server, e.g. after an app restart) so the client knows
+        events were missed.
+        """
+        with self._cond:
+            return self._read_locked(cursor, limit)
+
+    def wait_since(self, cursor: int, timeout: float, limit: Optional[int] = None) -> Tuple[List[dict], int, bool]:
+        """Like read_since but blocks up to `timeout` seconds for new events."""
+        with self._cond:
+            if int(cursor or 0) == self._seq:
+                self._cond.wait_for(lambda: self._seq > cursor or self.closed, timeout=timeout)
+            return self._read_locked(cursor, limit)
+
+    def close(self):
+        """Wake every blocked reader and make further waits return immediately (shutdown)."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        """Allow blocking reads again after close()."""
+        with self._cond:
+            self.closed = False
+
+    def _oldest_locked(self) -> int:
+        return max(1, self._seq - self.capacity + 1)
+
+    def _read_locked(self, cursor: int, limit: Optional[int]):
+        cursor = int(cursor or 0)
+        if cursor > self._seq:
+            # Cursor from a previous server run; restart from the current head
+            return [], self._seq, True
+        oldest = self._oldest_locked()
+        reset = bool(cursor) and cursor < oldest - 1
+        start = max(cursor + 1, oldest)
+        end = self._seq
+        if limit is not None:
+            end = min(end, start + max(0, int(limit)) - 1)
+        events = [self._ring[s % self.capacity] for s in range(start, end + 1)]
+        new_cursor = end if events else max(cursor, 0)
+        return events, new_cursor, reset
@@ -4,7 +4,7 @@ Provides a web-based chat overlay that syncs with the main application
 """
 
 try:
-    from flask import Flask, render_template_string, jsonify, send_file, request  # type: ignore
+    from flask import Flask, jsonify, send_file, request, Response, stream_with_context  # type: ignore
     from flask_cors import CORS  # type: ignore
     HAS_FLASK = True
 except Exception:
@@ -17,7 +17,11 @@ import threading
 import json
 import os
 import mimetypes
+import hashlib
+import datetime
 from core.logger import get_logger
+from core.overlay_events import OverlayEventLog
+from core.render_pipeline import EMOTE_ROUTE, get_render_fanout, local_emote_path
 
 logger = get_logger(__name__)
 
@@ -36,9 +40,6 @@ else:
         def run(self, *args, **kwargs):
             return None
 
-    def render_template_string(s, **kwargs):
-        return s
-
     def jsonify(obj):
         return obj
 
@@ -61,9 +62,41 @@ else:
 
     app = _NoOpApp()
 
-# Global state for messages and settings
-overlay_messages = []
-overlay_lock = threading.Lock()
+# Sequence-numbered ring of overlay events; every client reads it from its own cursor
+overlay_events = OverlayEventLog()
+
+# Seconds between SSE keep-alive comments / maximum long-poll wait
+STREAM_KEEPALIVE_SECONDS = 15
+LONG_POLL_MAX_SECONDS = 25
+
+# Each SSE stream holds a server worker for its whole lifetime. In combined
+# mode the pool is bounded, so streams are capped (None = no cap) and extra
+# clients get a 503, which makes the overlay fall back to long-polling.
+_stream_limit = None
+_active_streams = 0
+_streams_lock = threading.Lock()
+
+
+def set_stream_limit(limit):
+    """Cap concurrent SSE streams (None removes the cap)"""
+    global _stream_limit
+    with _streams_lock:
+        _stream_limit = None if limit is None else max(1, int(limit))
+
+
+def _acquire_stream_slot():
+    global _active_streams
+    with _streams_lock:
+        if _stream_limit is not None and _active_streams >= _stream_limit:
+            return False
+        _active_streams += 1
+        return True
+
+
+def _release_stream_slot():
+    global _active_streams
+    with _streams_lock:
+        _active_streams = max(0, _active_streams - 1)
 
 # Global settings with defaults
 overlay_settings = {
@@ -88,9 +121,15 @@ overlay_settings = {
 }
 settings_lock = threading.Lock()
 
-# Track last media path to detect changes
-last_media_path = ''
-media_cache_buster = 0
+# Monotonic settings version, bumped by update_overlay_settings when a value
+# actually changes; each key remembers the version it last changed in so
+# clients can fetch only the keys newer than the version they hold
+overlay_settings_version = 1
+_settings_key_versions = {key: 1 for key in overlay_settings}
+
+# Media URLs are versioned by file mtime/size so they stay stable (and cacheable)
+# until the file actually changes
+MEDIA_MAX_AGE_SECONDS = 86400
 
 # Global video devices list
 video_devices = []
@@ -303,6 +342,12 @@ OVERLAY_HTML = """
         .message-text {
             display: inline;
         }
+        
+        .message-text .emote {
+            height: 1.75em;
+            width: auto;
+            vertical-align: middle;
+        }
     </style>
 </head>
 <body>
@@ -569,7 +614,7 @@ OVERLAY_HTML = """
                 ${platformIconHTML}
                 ${badgesHTML}
                 <span class="username" style="${usernameStyle} color: ${msg.color || '#ffffff'};">${msg.username}:</span>
-                <span class="message-text" style="${messageStyle}">${escapeHtml(msg.message)}</span>
+                <span class="message-text" style="${messageStyle}">${renderSegments(msg)}</span>
             `;
             
             // Add to container based on direction
@@ -634,20 +679,57 @@ OVERLAY_HTML = """
             }
         }
         
+        // Message body from render segments (text + emotes), plain text otherwise
+        function renderSegments(msg) {
+            if (!msg.segments || msg.segments.length === 0) {
+                return escapeHtml(msg.message);
+            }
+            return msg.segments.map(seg => {
+                if (seg.type === 'emote' && seg.url) {
+                    return emoteImg(seg.url, seg.name);
+                }
+                if (seg.type === 'emote' && seg.id) {
+                    // Placeholder: shown by name until an 'emotes' update resolves it
+                    return `<span class="emote-pending" data-emote-id="${escapeAttr(seg.id)}">${escapeHtml(seg.name)}</span>`;
+                }
+                return escapeHtml(seg.type === 'emote' ? seg.name : seg.text);
+            }).join('');
+        }
+        
+        function emoteImg(url, name) {
+            return `<img src="${escapeAttr(url)}" class="emote" alt="${escapeAttr(name)}" />`;
+        }
+        
+        function escapeAttr(text) {
+            return escapeHtml(text).replace(/"/g, '&quot;');
+        }
+        
+        // Resolve placeholder emotes: {emote_id: url}
+        function updateEmotes(emotes) {
+            document.querySelectorAll('.emote-pending[data-emote-id]').forEach(span => {
+                const url = emotes[span.getAttribute('data-emote-id')];
+                if (url) {
+                    span.outerHTML = emoteImg(url, span.textContent);
+                }
+            });
+        }
+        
         function escapeHtml(text) {
             const div = document.createElement('div');
             div.textContent = text;
             return div.innerHTML;
         }
         
-        // Poll for settings
-        async function pollSettings() {
+        // Merge changed settings keys received from the server and apply them
+        let settingsVersion = 0;
+        
+        function handleSettings(changes, version) {
             try {
-                const response = await fetch('/overlay/settings');
-                const data = await response.json();
-                if (data.settings) {
-                    const newSettings = data.settings;
-                    
+                if (version !== undefined) {
+                    settingsVersion = version;
+                }
+                if (changes) {
+                    const newSettings = Object.assign({}, settings, changes);
                     // Check specific fields that require action
                     const needsUpdate = 
                         settings.direction !== newSettings.direction ||
@@ -703,7 +785,7 @@ OVERLAY_HTML = """
                     }
                 }
             } catch (error) {
-                console.error('Error polling settings:', error);
+                console.error('Error applying settings:', error);
             }
         }
         
@@ -742,36 +824,98 @@ OVERLAY_HTML = """
             }
         }
         
-        // Poll for messages
-        let lastUpdate = Date.now();
+        function handleEvent(evt) {
+            if (evt.type === 'message') {
+                if (evt.data.action === 'add') {
+                    addMessage(evt.data);
+                } else if (evt.data.action === 'remove') {
+                    removeMessage(evt.data.id);
+                } else if (evt.data.action === 'emotes') {
+                    updateEmotes(evt.data.emotes || {});
+                }
+            } else if (evt.type === 'settings') {
+                handleSettings(evt.data.changes, evt.data.version);
+            }
+        }
         
-        async function pollMessages() {
+        // Fetch settings changed since the version we hold (304 when up to date)
+        async function syncSettings() {
             try {
-                const response = await fetch(`/overlay/messages?since=${lastUpdate}`);
-                const data = await response.json();
-                
-                if (data.messages) {
-                    data.messages.forEach(msg => {
-                        if (msg.action === 'add') {
-                            addMessage(msg);
-                        } else if (msg.action === 'remove') {
-                            removeMessage(msg.id);
-                        }
-                    });
+                const response = await fetch(`/overlay/settings?version=${settingsVersion}`);
+                if (response.status === 304) {
+                    return;
                 }
-                
-                lastUpdate = Date.now();
+                const data = await response.json();
+                handleSettings(data.settings || data.changes, data.version);
             } catch (error) {
-                console.error('Error polling messages:', error);
+                console.error('Error fetching settings:', error);
+            }
+        }
+        
+        // Push channel: Server-Sent Events with cursor resume, long-poll fallback
+        let cursor = null;
+        
+        function connectStream() {
+            if (!window.EventSource) {
+                longPoll();
+                return;
+            }
+            const url = cursor === null ? '/overlay/stream' : `/overlay/stream?cursor=${cursor}`;
+            const source = new EventSource(url);
+            let opened = false;
+            let failures = 0;
+            source.onopen = () => {
+                opened = true;
+                failures = 0;
+            };
+            source.onmessage = (ev) => {
+                const seq = parseInt(ev.lastEventId, 10);
+                if (!isNaN(seq)) {
+                    cursor = seq;
+                }
+                handleEvent(JSON.parse(ev.data));
+            };
+            source.addEventListener('cursor', (ev) => {
+                const previous = cursor;
+                cursor = parseInt(ev.data, 10);
+                // Events may have been missed while disconnected
+                if (previous !== null) {
+                    syncSettings();
+                }
+            });
+            source.onerror = () => {
+                failures++;
+                // EventSource reconnects on its own (sending Last-Event-ID);
+                // give up on it only if it never worked or keeps failing
+                if (source.readyState === EventSource.CLOSED || (!opened && failures >= 3) || failures >= 10) {
+                    source.close();
+                    console.warn('[Overlay] Event stream unavailable, falling back to long-polling');
+                    longPoll();
+                }
+            };
+        }
+        
+        async function longPoll() {
+            while (true) {
+                try {
+                    const url = cursor === null ? '/overlay/events' : `/overlay/events?cursor=${cursor}`;
+                    const response = await fetch(url);
+                    const data = await response.json();
+                    (data.events || []).forEach(handleEvent);
+                    cursor = data.cursor;
+                    if (data.reset) {
+                        syncSettings();
+                    }
+                } catch (error) {
+                    console.error('Error long-polling events:', error);
+                    await new Promise(resolve => setTimeout(resolve, 1000));
+                }
             }
-            
-            setTimeout(pollMessages, 500);
         }
         
         // Initial setup
-        pollSettings();
-        setInterval(pollSettings, 1000);  // Poll settings every second
-        pollMessages();
+        syncSettings();
+        connectStream();
         enumerateVideoDevices();  // Enumerate available video devices
     </script>
 </body>
@@ -779,52 +923,177 @@ OVERLAY_HTML = """
 """
 
 
+# The overlay shell is static: encode it once and derive its validators up front
+_OVERLAY_SHELL = OVERLAY_HTML.encode('utf-8')
+_OVERLAY_SHELL_ETAG = hashlib.sha1(_OVERLAY_SHELL).hexdigest()
+_OVERLAY_SHELL_MODIFIED = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+
 @app.route('/')
 @app.route('/overlay')
 def overlay():
-    """Serve the chat overlay HTML"""
-    return render_template_string(OVERLAY_HTML)
+    """Serve the chat overlay HTML (revalidated via ETag/Last-Modified)"""
+    response = Response(_OVERLAY_SHELL, mimetype='text/html')
+    response.set_etag(_OVERLAY_SHELL_ETAG)
+    response.last_modified = _OVERLAY_SHELL_MODIFIED
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 @app.route('/overlay/messages')
 def get_messages():
-    """Get recent messages for the overlay"""
-    with overlay_lock:
-        # Return all pending messages and clear the queue
-        messages = overlay_messages.copy()
-        overlay_messages.clear()
-        return jsonify({'messages': messages})
+    """Get message events after `since` (a sequence cursor) without consuming them"""
+    try:
+        since = int(request.args.get('since', 0))
+    except (TypeError, ValueError):
+        since = 0
+    events, cursor, reset = overlay_events.read_since(since)
+    messages = [e['data'] for e in events if e['type'] == 'message']
+    return jsonify({'messages': messages, 'cursor': cursor, 'reset': reset})
 
 
-@app.route('/overlay/settings')
-def get_settings():
-    """Get current overlay settings"""
-    global last_media_path, media_cache_buster
-    with settings_lock:
-        settings = overlay_settings.copy()
-        # Convert file path to URL if media is set
-        # Only update cache buster when media path actually changes to prevent flickering
+def _media_version(media_path):
+    """Version tag for the media URL; changes only when the file changes"""
+    try:
+        st = os.stat(media_path)
+        return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    except OSError:
+        return '0'
+
+
+def _with_media_url(settings):
+    """Fill in `overlay_media_url` when `overlay_media` is part of `settings`"""
+    if 'overlay_media' in settings:
+        # Convert file path to URL if media is set (stat happens outside the lock)
         current_media = settings.get('overlay_media', '')
-        if current_media != last_media_path:
-            import time
-            last_media_path = current_media
-            media_cache_buster = int(time.time() * 1000)
-        
         if current_media:
-            settings['overlay_media_url'] = f'/overlay/media?t={media_cache_buster}'
+            settings['overlay_media_url'] = f'/overlay/media?v={_media_version(current_media)}'
         else:
             settings['overlay_media_url'] = ''
-        return jsonify({'settings': settings})
+    return settings
+
+
+def _settings_snapshot():
+    """Return a copy of the overlay settings with `overlay_media_url` filled in"""
+    with settings_lock:
+        settings = overlay_settings.copy()
+    return _with_media_url(settings)
+
+
+def get_settings_since(version):
+    """Return (current_version, changed_settings) for keys changed after `version`.
+
+    `changed_settings` is None when the client is up to date and the full
+    settings when `version` is unknown (0, or from a previous server run).
+    """
+    with settings_lock:
+        current = overlay_settings_version
+        if version == current:
+            return current, None
+        if not version or version > current:
+            changes = overlay_settings.copy()
+        else:
+            changes = {k: overlay_settings[k] for k, v in _settings_key_versions.items() if v > version}
+    return current, _with_media_url(changes)
+
+
+@app.route('/overlay/settings')
+def get_settings():
+    """Get overlay settings; with ?version=N only keys changed since N (304 if none)"""
+    try:
+        version = int(request.args.get('version', 0))
+    except (TypeError, ValueError):
+        version = 0
+    current, changes = get_settings_since(version)
+    if changes is None:
+        return '', 304
+    if version and version < current:
+        return jsonify({'version': current, 'changes': changes})
+    return jsonify({'version': current, 'settings': changes})
+
+
+def _request_cursor():
+    """Cursor sent by a push client (Last-Event-ID wins over ?cursor=); None means start at head"""
+    raw = request.headers.get('Last-Event-ID') or request.args.get('cursor')
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+@app.route('/overlay/stream')
+def stream_events():
+    """Server-Sent Events stream of overlay message and settings events"""
+    if not _acquire_stream_slot():
+        return Response('Too many event streams', status=503, headers={'Retry-After': '5'})
+    cursor = _request_cursor()
+    if cursor is None:
+        cursor = overlay_events.latest_seq
+
+    def generate(cursor):
+        # Reconnect quickly and tell the client where it starts
+        yield f"retry: 1000\nevent: cursor\ndata: {cursor}\n\n"
+        while not overlay_events.closed:
+            events, cursor, reset = overlay_events.wait_since(cursor, timeout=STREAM_KEEPALIVE_SECONDS)
+            if reset:
+                yield f"event: cursor\ndata: {cursor}\n\n"
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for evt in events:
+                payload = json.dumps({'type': evt['type'], 'data': evt['data']})
+                yield f"id: {evt['seq']}\ndata: {payload}\n\n"
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    response = Response(stream_with_context(generate(cursor)), mimetype='text/event-stream', headers=headers)
+    response.call_on_close(_release_stream_slot)
+    return response
+
+
+@app.route('/overlay/events')
+def poll_events():
+    """Long-poll fallback for clients without EventSource support"""
+    cursor = _request_cursor()
+    if cursor is None:
+        cursor = overlay_events.latest_seq
+    try:
+        timeout = min(float(request.args.get('timeout', LONG_POLL_MAX_SECONDS)), LONG_POLL_MAX_SECONDS)
+    except (TypeError, ValueError):
+        timeout = LONG_POLL_MAX_SECONDS
+    events, cursor, reset = overlay_events.wait_since(cursor, timeout=max(0.0, timeout))
+    return jsonify({
+        'events': [{'seq': e['seq'], 'type': e['type'], 'data': e['data']} for e in events],
+        'cursor': cursor,
+        'reset': reset,
+    })
+
+
+@app.route(EMOTE_ROUTE + '<emote_id>')
+def serve_emote(emote_id):
+    """Serve an emote the chat view rendered from the local emote cache"""
+    path = local_emote_path(emote_id)
+    if not path or not os.path.isfile(path):
+        return '', 404
+    return send_file(path, mimetype=mimetypes.guess_type(path)[0], conditional=True,
+                     max_age=MEDIA_MAX_AGE_SECONDS)
 
 
 @app.route('/overlay/media')
 def serve_media():
-    """Serve the overlay background media file"""
+    """Serve the overlay background media file (Range + ETag aware)"""
     with settings_lock:
         media_path = overlay_settings.get('overlay_media', '')
-        if media_path and os.path.exists(media_path):
-            return send_file(media_path, mimetype=mimetypes.guess_type(media_path)[0])
+    if not media_path or not os.path.isfile(media_path):
         return '', 404
+    # send_file answers Range / If-None-Match / If-Modified-Since itself;
+    # the URL is versioned so browsers may keep the file for a day
+    return send_file(
+        media_path,
+        mimetype=mimetypes.guess_type(media_path)[0],
+        conditional=True,
+        etag=True,
+        max_age=MEDIA_MAX_AGE_SECONDS,
+    )
 
 
 @app.route('/overlay/devices', methods=['POST'])
@@ -859,98 +1128,155 @@ def receive_devices():
 
 
 def update_overlay_settings(new_settings):
-    """Update overlay settings"""
+    """Update overlay settings, bumping the version and notifying clients of changed keys"""
+    global overlay_settings_version
     with settings_lock:
-        overlay_settings.update(new_settings)
-        logger.info(f"Settings updated: {new_settings}")
+        changes = {k: v for k, v in new_settings.items() if k not in overlay_settings or overlay_settings[k] != v}
+        if not changes:
+            return overlay_settings_version
+        overlay_settings_version += 1
+        version = overlay_settings_version
+        overlay_settings.update(changes)
+        for key in changes:
+            _settings_key_versions[key] = version
+        logger.info(f"Settings updated (v{version}): {changes}")
+    overlay_events.publish('settings', {'version': version, 'changes': _with_media_url(dict(changes))})
+    return version
 
 
 
 def add_overlay_message(platform, username, message, message_id, badges=None, color=None):
-    """Add a message to the overlay"""
-    from ui.platform_icons import get_platform_icon_html
-    from ui.chat_page import get_badge_html
-    import re
+    """Add a plain-text message to the overlay (no emote rendering)"""
+    from ui.platform_icons import get_platform_icon_url
+    from ui.chat_page import get_badge_ref
+    
+    # Resolve badge names to structured refs (image URL when available)
+    badge_urls = []
+    for badge in badges or []:
+        ref = get_badge_ref(badge, platform)
+        if ref and ref.get('url'):
+            badge_urls.append({'url': ref['url'], 'name': ref['name']})
     
-    with overlay_lock:
-        # Get platform icon HTML and extract the data URI
-        platform_icon_html = get_platform_icon_html(platform, size=18)
-        platform_icon_url = ''
-        if platform_icon_html:
-            # Extract src from img tag
-            match = re.search(r'src="([^"]+)"', platform_icon_html)
-            if match:
-                platform_icon_url = match.group(1)
-        
-        # Convert badge names to badge image URLs
-        badge_urls = []
-        if badges:
-            for badge in badges:
-                badge_html = get_badge_html(badge, platform)
-                if badge_html:
-                    # Extract src from img tag
-                    match = re.search(r'src="([^"]+)"', badge_html)
-                    if match:
-                        badge_urls.append({
-                            'url': match.group(1),
-                            'name': badge.split('/')[0] if '/' in str(badge) else str(badge)
-                        })
-        
-        msg = {
-            'action': 'add',
-            'id': message_id,
-            'platform': platform,
-            'platform_icon': platform_icon_url,
-            'username': username,
-            'message': message,
-            'badges': badge_urls,
-            'color': color,
-            'timestamp': threading.current_thread().ident
-        }
-        overlay_messages.append(msg)
-        
-        # Keep only last 100 events
-        if len(overlay_messages) > 100:
-            overlay_messages.pop(0)
+    msg = {
+        'action': 'add',
+        'id': message_id,
+        'platform': platform,
+        'platform_icon': get_platform_icon_url(platform),
+        'username': username,
+        'message': message,
+        'badges': badge_urls,
+        'color': color,
+        'timestamp': threading.current_thread().ident
+    }
+    overlay_events.publish('message', msg)
+
+
+def add_rendered_message(result):
+    """Add a message from a core.render_pipeline.RenderResult (emotes included)"""
+    if result.is_event:
+        return
+    msg = result.to_overlay_message()
+    msg['timestamp'] = threading.current_thread().ident
+    overlay_events.publish('message', msg)
+
+
+def update_overlay_emotes(urls):
+    """Swap resolved images into overlay emotes that were still placeholders"""
+    msg = {
+        'action': 'emotes',
+        'emotes': dict(urls),
+        'timestamp': threading.current_thread().ident
+    }
+    overlay_events.publish('message', msg)
 
 
 def remove_overlay_message(message_id):
     """Remove a message from the overlay"""
-    with overlay_lock:
-        msg = {
-            'action': 'remove',
-            'id': message_id,
-            'timestamp': threading.current_thread().ident
-        }
-        overlay_messages.append(msg)
-        
-        # Keep only last 100 events
-        if len(overlay_messages) > 100:
-            overlay_messages.pop(0)
+    msg = {
+        'action': 'remove',
+        'id': message_id,
+        'timestamp': threading.current_thread().ident
+    }
+    overlay_events.publish('message', msg)
 
 
 class OverlayServer(QObject):
     """Manages the Flask overlay server in a separate thread"""
     server_started = pyqtSignal(str)  # Emits the overlay URL
+    server_error = pyqtSignal(str)  # Emits why the server could not start
     devices_updated = pyqtSignal(list)  # Emits list of video devices
     
-    def __init__(self, port=5000):
+    def __init__(self, port=5000, config=None):
         super().__init__()
         self.port = port
+        self.config = config
         self.server_thread = None
+        self.http_server = None
         
     def start(self):
         """Start the Flask server in a background thread"""
-        def run_server():
-            app.run(host='0.0.0.0', port=self.port, debug=False, use_reloader=False)
-        
-        self.server_thread = threading.Thread(target=run_server, daemon=True)
-        self.server_thread.start()
+        overlay_events.reopen()
+        # Receive messages rendered once by ChatPage
+        get_render_fanout().subscribe(add_rendered_message)
+        get_render_fanout().subscribe_emotes(update_overlay_emotes)
+        server_mode = self.config.get('http.server_mode', 'separate') if self.config else 'separate'
+        if server_mode == 'combined':
+            try:
+                self._start_combined()
+            except OSError as e:
+                self.http_server = None
+                message = f"Could not start the overlay server on port {self.port}: {e}"
+                logger.error(message)
+                self.server_error.emit(message)
+                return
+        else:
+            def run_server():
+                app.run(host='0.0.0.0', port=self.port, debug=False, use_reloader=False, threaded=True)
+            
+            self.server_thread = threading.Thread(target=run_server, daemon=True)
+            self.server_thread.start()
 
         # Emit the overlay URL
         overlay_url = f"http://localhost:{self.port}/overlay"
         self.server_started.emit(overlay_url)
         logger.info(f"Started on {overlay_url}")
+
+    def _start_combined(self):
+        """Serve the overlay and callback apps from one pooled server on self.port"""
+        from core.http_server import EmbeddedHTTPServer, build_combined_app, DEFAULT_THREADS, DEFAULT_KEEPALIVE_TIMEOUT
+        from core import callback_server
+        threads = self.config.get('http.threads', DEFAULT_THREADS) if self.config else DEFAULT_THREADS
+        use_gzip = self.config.get('http.gzip', True) if self.config else True
+        max_streams = self.config.get('http.max_streams') if self.config else None
+        # Leave at least half the pool for page loads, settings and callbacks
+        set_stream_limit(max_streams or max(1, int(threads) // 2))
+        keepalive_timeout = self.config.get('http.keepalive_timeout', DEFAULT_KEEPALIVE_TIMEOUT) if self.config else DEFAULT_KEEPALIVE_TIMEOUT
+        self.http_server = EmbeddedHTTPServer(build_combined_app(), port=self.port, threads=threads, use_gzip=use_gzip,
+                                              keepalive_timeout=keepalive_timeout)
+        # Long-lived SSE streams must end before workers can be joined
+        self.http_server.add_stop_callback(overlay_events.close)
+        self.http_server.start()
+        callback_server.attach_embedded(self.port, self.http_server.add_port)
+        # Kick webhooks, ngrok and OAuth redirect URIs all point at the callback port
+        callback_port = self.config.get('ngrok.callback_port', 8889) if self.config else 8889
+        try:
+            callback_server.start_server(int(callback_port))
+        except Exception as e:
+            logger.warning(f"Callback port {callback_port} not opened: {e}")
+
+    def stop(self):
+        """Gracefully stop the embedded server (the dev server thread is a daemon)"""
+        get_render_fanout().unsubscribe(add_rendered_message)
+        get_render_fanout().unsubscribe_emotes(update_overlay_emotes)
+        overlay_events.close()
+        if self.http_server is not None:
+            from core import callback_server
+            from core.http_server import DEFAULT_SHUTDOWN_TIMEOUT
+            timeout = self.config.get('http.shutdown_timeout', DEFAULT_SHUTDOWN_TIMEOUT) if self.config else DEFAULT_SHUTDOWN_TIMEOUT
+            self.http_server.stop(timeout)
+            callback_server.detach_embedded()
+            self.http_server = None
+            set_stream_limit(None)
         
     def add_message(self, platform, username, message, message_id, badges=None, color=None):
         """Add a message to the overlay"""
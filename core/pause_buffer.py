@@ -0,0 +1,142 @@
+"""
+Pause Buffer - Bounded message buffer used while chat display is paused
+
+Messages are held in memory up to `max_messages`. When the buffer overflows
+the oldest in-memory message is spilled to a compact JSON-lines segment on
+disk (if spilling is enabled and the segment has room) or dropped and
+counted. Draining returns messages oldest-first in batches so the UI can
+replay a large backlog in chunks.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+from core.logger import get_logger
+
+logger = get_logger('PauseBuffer')
+
+# Defaults used by ChatPage when no config override is present
+DEFAULT_MAX_MESSAGES = 1000
+DEFAULT_SPILL_MAX_MESSAGES = 20000
+
+
+class PauseBuffer:
+    """Bounded FIFO of (platform, username, message, metadata) tuples"""
+
+    def __init__(self, max_messages: int = DEFAULT_MAX_MESSAGES, spill: bool = True,
+                 spill_max_messages: int = DEFAULT_SPILL_MAX_MESSAGES, spill_dir: Optional[str] = None):
+        self.max_messages = max(1, int(max_messages or DEFAULT_MAX_MESSAGES))
+        self.spill_enabled = bool(spill)
+        self.spill_max_messages = max(0, int(spill_max_messages or 0))
+        self.spill_dir = spill_dir
+        self._memory = deque()
+        self._lock = threading.Lock()
+        # Spill segment state (created lazily on first overflow)
+        self._spill_path = None
+        self._spill_write = None
+        self._spill_read = None
+        self._spill_count = 0
+        # Counters
+        self.dropped = 0
+        self.spilled = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memory) + self._spill_count
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, item: Tuple):
+        """Add a message, spilling or dropping the oldest one on overflow."""
+        with self._lock:
+            self._memory.append(item)
+            while len(self._memory) > self.max_messages:
+                oldest = self._memory.popleft()
+                if not self._spill(oldest):
+                    self.dropped += 1
+
+    def pop_batch(self, batch_size: int) -> List[Tuple]:
+        """Remove and return up to `batch_size` messages, oldest first."""
+        batch = []
+        with self._lock:
+            while len(batch) < batch_size and self._spill_count:
+                item = self._read_spilled()
+                if item is not None:
+                    batch.append(item)
+            while len(batch) < batch_size and self._memory:
+                batch.append(self._memory.popleft())
+            if not self._spill_count:
+                self._close_spill()
+        return batch
+
+    def clear(self):
+        """Discard all buffered messages and remove the spill segment."""
+        with self._lock:
+            self._memory.clear()
+            self._close_spill()
+
+    def stats(self) -> dict:
+        """Return buffer occupancy and overflow counters."""
+        with self._lock:
+            return {
+                'in_memory': len(self._memory),
+                'on_disk': self._spill_count,
+                'spilled': self.spilled,
+                'dropped': self.dropped,
+                'max_messages': self.max_messages,
+            }
+
+    # --- Spill segment helpers (callers hold the lock) ---------------------
+    def _spill(self, item: Tuple) -> bool:
+        if not self.spill_enabled or self._spill_count >= self.spill_max_messages:
+            return False
+        try:
+            if self._spill_write is None:
+                fd, self._spill_path = tempfile.mkstemp(prefix='azb_pause_', suffix='.jsonl', dir=self.spill_dir)
+                self._spill_write = os.fdopen(fd, 'w', encoding='utf-8')
+                self._spill_read = open(self._spill_path, 'r', encoding='utf-8')
+            self._spill_write.write(json.dumps(list(item), default=str, separators=(',', ':')) + '\n')
+            self._spill_write.flush()
+            self._spill_count += 1
+            self.spilled += 1
+            return True
+        except Exception as e:
+            logger.warning(f"Pause buffer spill failed, dropping message: {e}")
+            return False
+
+    def _read_spilled(self) -> Optional[Tuple]:
+        try:
+            line = self._spill_read.readline()
+            if not line:
+                self._spill_count = 0
+                return None
+            self._spill_count -= 1
+            platform, username, message, metadata = json.loads(line)
+            return (platform, username, message, metadata if isinstance(metadata, dict) else {})
+        except Exception as e:
+            logger.warning(f"Pause buffer spill read failed: {e}")
+            self._spill_count = max(0, self._spill_count - 1)
+            self.dropped += 1
+            return None
+
+    def _close_spill(self):
+        for fh in (self._spill_write, self._spill_read):
+            try:
+                if fh is not None:
+                    fh.close()
+            except Exception:
+                pass
+        if self._spill_path:
+            try:
+                os.remove(self._spill_path)
+            except Exception:
+                pass
+        self._spill_path = None
+        self._spill_write = None
+        self._spill_read = None
+        self._spill_count = 0
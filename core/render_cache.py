@@ -0,0 +1,210 @@
+"""
+Render Cache - LRU memoization of rendered chat message bodies
+
+Copypasta waves and emote-only spam produce the same message text over and
+over. Rendering a body (emote regex, name lookups, data-URI building) is by
+far the most expensive part of displaying a message, so rendered bodies are
+cached here keyed by the inputs that influence them. Username, badge and
+platform-icon chrome lives in a separate per-(platform, user) instance
+(`get_chrome_cache`) so body and chrome invalidate independently.
+
+Bodies that still carry placeholders are never cached, so a single emote
+image landing on disk needs no invalidation. The cache is invalidated (by
+bumping an internal version) only when emote sets change wholesale. Render
+settings are covered by the caller's `settings_version`, which is part of
+every key.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from core.logger import get_logger
+
+logger = get_logger('RenderCache')
+
+# Default number of rendered bodies kept in memory
+DEFAULT_CAPACITY = 512
+
+# Default number of per-(platform, user) chrome entries kept in memory
+DEFAULT_CHROME_CAPACITY = 2000
+
+# Log hit-rate statistics every N lookups (debug level)
+STATS_LOG_INTERVAL = 1000
+
+
+def _digest(value: Any) -> str:
+    """Return a short stable digest for emote tags / fragment payloads."""
+    if value is None or value == '' or value == []:
+        return ''
+    try:
+        if isinstance(value, str):
+            raw = value
+        else:
+            raw = json.dumps(value, sort_keys=True, default=str)
+    except Exception:
+        raw = repr(value)
+    return hashlib.sha1(raw.encode('utf-8', errors='replace')).hexdigest()
+
+
+class RenderCache:
+    """Thread-safe LRU cache of rendered message bodies with hit-rate metrics"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self.capacity = max(0, int(capacity or 0))
+        # Bumped on every asset change; part of every key so old entries
+        # become unreachable and age out through normal LRU eviction.
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._signals_connected = False
+
+    def make_key(self, platform: str, text: str, emotes_tag=None, metadata: Optional[dict] = None,
+                 settings_version: int = 0) -> tuple:
+        """Build a cache key for a message body.
+
+        The key covers everything the body renderers read: platform, raw
+        text, the emotes tag, the structured fragments (digested), the
+        broadcaster id used for channel emote lookups and the caller's
+        render-settings version.
+        """
+        fragments = None
+        broadcaster_id = None
+        if isinstance(metadata, dict):
+            fragments = metadata.get('fragments') or metadata.get('message_fragments')
+            broadcaster_id = metadata.get('room-id') or metadata.get('room_id') or metadata.get('channel_id')
+            if not emotes_tag:
+                for k in ('emotes', 'emotes_tag', 'emote_tags', 'emotes_raw'):
+                    if metadata.get(k):
+                        emotes_tag = metadata.get(k)
+                        break
+        return (
+            str(platform or '').lower(),
+            str(broadcaster_id or ''),
+            text or '',
+            _digest(emotes_tag),
+            _digest(fragments),
+            int(settings_version or 0),
+        )
+
+    def get(self, key: tuple) -> Optional[Any]:
+        """Return the cached body for `key` or None on a miss."""
+        if not self.capacity:
+            return None
+        with self._lock:
+            full_key = (self.version,) + tuple(key)
+            value = self._entries.get(full_key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+            lookups = self.hits + self.misses
+        if lookups % STATS_LOG_INTERVAL == 0:
+            try:
+                logger.debug(f"Render cache stats: {self.stats()}")
+            except Exception:
+                pass
+        return value
+
+    def put(self, key: tuple, value: Any):
+        """Store a rendered body. Empty values are never cached."""
+        if not self.capacity or not value:
+            return
+        with self._lock:
+            full_key = (self.version,) + tuple(key)
+            self._entries[full_key] = value
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, reason: str = ''):
+        """Drop all cached bodies (called when emote or badge assets change)."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self.invalidations += 1
+        try:
+            logger.debug(f"Render cache invalidated reason={reason or 'unspecified'} version={self.version}")
+        except Exception:
+            pass
+
+    def resize(self, capacity: int):
+        """Change the maximum number of cached bodies."""
+        with self._lock:
+            self.capacity = max(0, int(capacity or 0))
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Return hit-rate metrics used to size the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'version': self.version,
+            }
+
+    def connect_asset_signals(self):
+        """Subscribe to emote asset signals so the cache is invalidated when
+        images or emote metadata change. Safe to call more than once."""
+        if self._signals_connected:
+            return
+        try:
+            from core.signals import signals as emote_signals
+        except Exception:
+            return
+        # Not emote_image_cached_ext: it fires per image during emote bursts, and
+        # bodies waiting on an image were never cached
+        for name in ('emotes_global_warmed_ext', 'emotes_channel_warmed_ext',
+                     'emote_set_metadata_ready_ext'):
+            try:
+                sig = getattr(emote_signals, name, None)
+                if sig is not None:
+                    sig.connect(lambda *a, _n=name, **k: self.invalidate(_n))
+            except Exception:
+                pass
+        self._signals_connected = True
+
+
+# Global instance
+_render_cache = None
+
+
+def get_render_cache() -> RenderCache:
+    """Get the global render cache instance"""
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache()
+        _render_cache.connect_asset_signals()
+    return _render_cache
+
+
+# Global per-user chrome instance (username color/span, platform icon, badges)
+_chrome_cache = None
+
+
+def get_chrome_cache() -> RenderCache:
+    """Get the global username/badge/icon chrome cache instance.
+
+    Not tied to emote signals; invalidated on palette, badge and display
+    toggle changes instead.
+    """
+    global _chrome_cache
+    if _chrome_cache is None:
+        _chrome_cache = RenderCache(capacity=DEFAULT_CHROME_CAPACITY)
+    return _chrome_cache
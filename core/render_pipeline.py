@@ -0,0 +1,244 @@
+"""
+Render Pipeline - Render a chat message once and fan the result out
+
+ChatPage renders each message (emotes, badges, platform icon, username color)
+exactly once and wraps the outcome in a RenderResult. The result is published
+on the process-wide RenderFanout so other consumers (the OBS overlay event
+stream, future integrations) reuse the same render instead of re-deriving
+icons, badges and emotes from raw text.
+
+Emotes the chat view loads from disk (`file:///`) are exposed to consumers
+as EMOTE_ROUTE URLs the overlay server can serve. The memoized parser only
+computes those URLs; the emote's file is registered each time a
+RenderResult hands its segments out, so a body parsed before its emote was
+evicted from the registry still resolves. Placeholders that resolve after
+their message was published go out through `publish_emotes()`.
+"""
+
+import functools
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from core.logger import get_logger
+
+logger = get_logger('RenderPipeline')
+
+# Prefix of the 1x1 transparent GIF used for emotes whose image isn't cached yet
+PLACEHOLDER_PREFIX = 'data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP'
+# Emotes cached on disk (file:/// in the chat view) are served to the overlay from here
+EMOTE_ROUTE = '/overlay/emote/'
+LOCAL_EMOTE_LIMIT = 2048
+
+# emote id -> local file path seen in a rendered body; only these files are served
+_local_emotes: 'OrderedDict[str, str]' = OrderedDict()
+_local_emotes_lock = threading.Lock()
+
+
+def _local_path(src: str) -> str:
+    """Filesystem path of a file:/// emote src"""
+    # ChatPage writes file:///C:/... on Windows and file:////abs/path elsewhere
+    path = '/' + src[len('file:///'):].lstrip('/')
+    if len(path) > 2 and path[2] == ':':
+        path = path[1:]
+    return path
+
+
+def _register_local_emote(emote_id: str, path: str):
+    """Remember the file behind an emote so its EMOTE_ROUTE URL can be served"""
+    with _local_emotes_lock:
+        _local_emotes[emote_id] = path
+        _local_emotes.move_to_end(emote_id)
+        while len(_local_emotes) > LOCAL_EMOTE_LIMIT:
+            _local_emotes.popitem(last=False)
+
+
+def register_local_emotes(segments) -> None:
+    """Register the files of every disk emote in `segments` (call before publishing their URLs)"""
+    for segment in segments:
+        path = segment.get('file')
+        if path:
+            _register_local_emote(segment['id'], path)
+
+
+def local_emote_path(emote_id: str) -> Optional[str]:
+    """Local file of an emote previously rendered from disk, or None"""
+    with _local_emotes_lock:
+        return _local_emotes.get(emote_id)
+
+
+class _SegmentParser(HTMLParser):
+    """Split a rendered message body into text and emote segments"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.segments = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'img':
+            return
+        attrs = dict(attrs)
+        src = attrs.get('src') or ''
+        emote_id = attrs.get('data-emote-id') or ''
+        segment = {'type': 'emote', 'id': emote_id, 'name': attrs.get('alt') or '', 'url': src}
+        if src.startswith(PLACEHOLDER_PREFIX):
+            segment['url'] = ''
+        elif src.startswith('file:///'):
+            segment['url'] = EMOTE_ROUTE + quote(emote_id, safe='') if emote_id else ''
+            if emote_id:
+                # Registered by register_local_emotes(), not here: this parse is memoized
+                segment['file'] = _local_path(src)
+        self.segments.append(segment)
+
+    handle_startendtag = handle_starttag
+
+    def handle_data(self, data):
+        if not data:
+            return
+        if self.segments and self.segments[-1]['type'] == 'text':
+            self.segments[-1]['text'] += data
+        else:
+            self.segments.append({'type': 'text', 'text': data})
+
+
+@functools.lru_cache(maxsize=512)
+def segments_from_html(body_html: str) -> Tuple[dict, ...]:
+    """Parse a rendered message body into segments (memoized; do not mutate).
+
+    Text segments are {'type': 'text', 'text'}; emotes are
+    {'type': 'emote', 'id', 'name', 'url'} where `url` is '' while the image
+    is still a placeholder and an EMOTE_ROUTE URL for images cached on disk.
+    Disk emotes also carry their 'file'; pass the segments to
+    register_local_emotes() before publishing those URLs.
+    """
+    parser = _SegmentParser()
+    try:
+        parser.feed(body_html or '')
+        parser.close()
+    except Exception as e:
+        logger.debug(f"Could not parse rendered body into segments: {e}")
+        return ({'type': 'text', 'text': body_html or ''},)
+    return tuple(parser.segments)
+
+
+class RenderResult:
+    """Structured, render-once view of a chat message"""
+
+    __slots__ = ('message_id', 'platform', 'username', 'color', 'icon_url', 'badges',
+                 'body_html', 'has_img', 'is_event', 'metadata')
+
+    def __init__(self, message_id: str, platform: str, username: str, color: Optional[str] = None,
+                 icon_url: str = '', badges: Optional[List[dict]] = None, body_html: str = '',
+                 has_img: bool = False, is_event: bool = False, metadata: Optional[dict] = None):
+        self.message_id = message_id
+        self.platform = platform
+        self.username = username
+        self.color = color
+        self.icon_url = icon_url or ''
+        self.badges = list(badges or [])
+        self.body_html = body_html or ''
+        self.has_img = bool(has_img)
+        self.is_event = bool(is_event)
+        self.metadata = metadata if isinstance(metadata, dict) else {}
+
+    @property
+    def segments(self) -> Tuple[dict, ...]:
+        """Body segments; disk emotes are (re-)registered so their URLs resolve"""
+        segments = segments_from_html(self.body_html)
+        register_local_emotes(segments)
+        return segments
+
+    @property
+    def text(self) -> str:
+        """Plain-text message with emotes shown by name"""
+        return ''.join(s['text'] if s['type'] == 'text' else s['name'] for s in segments_from_html(self.body_html))
+
+    def to_overlay_message(self) -> dict:
+        """Overlay 'add' event payload"""
+        return {
+            'action': 'add',
+            'id': self.message_id,
+            'platform': self.platform,
+            'platform_icon': self.icon_url,
+            'username': self.username,
+            'message': self.text,
+            'segments': [{k: v for k, v in s.items() if k != 'file'} for s in self.segments],
+            'badges': [{'url': b.get('url', ''), 'name': b.get('name', '')} for b in self.badges],
+            'color': self.color,
+        }
+
+
+class RenderFanout:
+    """Publish RenderResults (and later emote resolutions) to any number of subscribers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[RenderResult], None]] = []
+        self._emote_subscribers: List[Callable[[Dict[str, str]], None]] = []
+        self.published = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        """True if anything consumes RenderResults (lets renderers skip unused work)"""
+        return bool(self._subscribers)
+
+    def subscribe(self, callback: Callable[[RenderResult], None]):
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[RenderResult], None]):
+        with self._lock:
+            try:
+                self._subscribers.remove(callback)
+            except ValueError:
+                pass
+
+    def publish(self, result: RenderResult):
+        """Deliver `result` to every subscriber; a failing subscriber doesn't affect others."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for callback in subscribers:
+            try:
+                callback(result)
+            except Exception as e:
+                logger.warning(f"Render subscriber {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+    def subscribe_emotes(self, callback: Callable[[Dict[str, str]], None]):
+        with self._lock:
+            if callback not in self._emote_subscribers:
+                self._emote_subscribers.append(callback)
+
+    def unsubscribe_emotes(self, callback: Callable[[Dict[str, str]], None]):
+        with self._lock:
+            try:
+                self._emote_subscribers.remove(callback)
+            except ValueError:
+                pass
+
+    def publish_emotes(self, urls: Dict[str, str]):
+        """Deliver {emote_id: url} for placeholders resolved after their message was published."""
+        if not urls:
+            return
+        with self._lock:
+            subscribers = list(self._emote_subscribers)
+        for callback in subscribers:
+            try:
+                callback(dict(urls))
+            except Exception as e:
+                logger.warning(f"Emote subscriber {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+
+# Global instance
+_render_fanout = None
+
+
+def get_render_fanout() -> RenderFanout:
+    """Get the global render fan-out instance"""
+    global _render_fanout
+    if _render_fanout is None:
+        _render_fanout = RenderFanout()
+    return _render_fanout
@@ -62,7 +62,7 @@ except Exception:
 
 # Core imports needed for headless startup
 from core.chat_manager import ChatManager
-from core.config import ConfigManager
+from core.config import ConfigManager, get_config_manager
 from core.ngrok_manager import NgrokManager
 try:
     from core.overlay_server import OverlayServer
@@ -70,10 +70,12 @@ except Exception:
     # OverlayServer depends on optional packages (Flask). Provide a minimal
     # fallback so headless startup can proceed when Flask isn't installed.
     class OverlayServer:
-        def __init__(self, port=5000):
+        def __init__(self, port=5000, config=None):
             self.port = port
         def start(self):
             return None
+        def stop(self):
+            return None
 from core.logger import get_log_manager
 from urllib.parse import urlparse
 
@@ -97,7 +99,7 @@ if HAS_PYQT:
     from ui.overlay_page import OverlayPage
     from ui.automation_page import AutomationPage
     from core.chat_manager import ChatManager
-    from core.config import ConfigManager
+    from core.config import ConfigManager, get_config_manager
     from core.ngrok_manager import NgrokManager
     from core.overlay_server import OverlayServer
     from core.logger import get_log_manager
@@ -151,7 +153,7 @@ if HAS_PYQT:
             super().__init__()
             self.setWindowTitle("AudibleZenBot - Multi-Platform Chat Bot")
             # Initialize config manager early so we can restore window geometry before showing
-            self.config = ConfigManager()
+            self.config = get_config_manager()
 
             # Try to restore saved window geometry from config; otherwise use ~50% screen size
             try:
@@ -214,11 +216,18 @@ if HAS_PYQT:
             self.chat_manager.ngrok_manager = self.ngrok_manager
 
             # Initialize overlay server
-            self.overlay_server = OverlayServer(port=5000)
+            self.overlay_server = OverlayServer(port=5000, config=self.config)
 
             # Initialize logging system
             self.log_manager = get_log_manager(self.config)
             print("[Main] Log manager initialized")
+            # Rotate/compress logs/ and prune old sessions in the background
+            try:
+                from core.logger import get_log_retention
+                self.log_retention = get_log_retention(self.config)
+                self.log_retention.start()
+            except Exception:
+                self.log_retention = None
             # Prefetch Twitch global emotes in background to warm caches
             try:
                 from core.twitch_emotes import get_manager as get_twitch_manager
@@ -481,11 +490,11 @@ else:
         to run without a real Qt environment.
         """
         def __init__(self):
-            self.config = ConfigManager()
+            self.config = get_config_manager()
             self.ngrok_manager = NgrokManager(self.config)
             self.chat_manager = ChatManager(self.config)
             self.chat_manager.ngrok_manager = self.ngrok_manager
-            self.overlay_server = OverlayServer(port=5000)
+            self.overlay_server = OverlayServer(port=5000, config=self.config)
             self.log_manager = get_log_manager(self.config)
             # Minimal pages dict to mirror GUI API
             self.pages = {
@@ -525,6 +534,18 @@ def main():
             pass
     except Exception:
         pass
+    # Flush pending chat history writes before exit
+    try:
+        from core.chat_archive import shutdown_chat_archive
+        app.aboutToQuit.connect(shutdown_chat_archive)
+    except Exception:
+        pass
+    # Write any debounced config changes before exit
+    try:
+        from core.config import flush_all as flush_config
+        app.aboutToQuit.connect(flush_config)
+    except Exception:
+        pass
     
     # Set application icon
     icon_path = "resources/icons/app_icon.ico"
@@ -534,6 +555,16 @@ def main():
         app.setWindowIcon(QIcon(icon_path))
     
     window = MainWindow()
+    # Stop the overlay HTTP server gracefully (ends SSE streams, drains workers)
+    try:
+        app.aboutToQuit.connect(window.overlay_server.stop)
+    except Exception:
+        pass
+    try:
+        if getattr(window, 'log_retention', None) is not None:
+            app.aboutToQuit.connect(window.log_retention.stop)
+    except Exception:
+        pass
     print("[DEBUG] About to call window.show()")
     window.show()
     print("[DEBUG] window.show() called, entering app.exec()")
@@ -552,12 +583,17 @@ def headless_main():
     """
     try:
         print('[Headless] Initializing config, ngrok, chat_manager, overlay_server')
-        config = ConfigManager()
+        config = get_config_manager()
         ngrok_manager = NgrokManager(config)
         chat_manager = ChatManager(config)
         chat_manager.ngrok_manager = ngrok_manager
-        overlay_server = OverlayServer(port=5000)
+        overlay_server = OverlayServer(port=5000, config=config)
         log_manager = get_log_manager(config)
+        try:
+            from core.logger import get_log_retention
+            get_log_retention(config).start()
+        except Exception:
+            pass
 
         # Prefetch Twitch global emotes if available
         try:
@@ -2,7 +2,9 @@
 Base Platform Connector
 """
 
+import threading
 from abc import abstractmethod
+from concurrent.futures import Future
 from platform_connectors.qt_compat import QObject, pyqtSignal
 
 
@@ -18,10 +20,16 @@ class BasePlatformConnector(QObject):
     connection_status = pyqtSignal(bool)  # connected
     error_occurred = pyqtSignal(str)  # error message
 
+    # REST connectors set this to their platform name and implement
+    # `_send_once(message) -> core.outbound.SendResult`
+    OUTBOUND_PLATFORM = None
+
     def __init__(self):
         super().__init__()
         self.connected = False
         self.username = None
+        self._outbound = None
+        self._outbound_lock = threading.Lock()
 
     @abstractmethod
     def connect(self, username: str):
@@ -38,6 +46,31 @@ class BasePlatformConnector(QObject):
         """Send a message to the chat"""
         pass
 
+    def outbound(self):
+        """This connector's OutboundDispatcher, or None if it sends over a live connection"""
+        if self.OUTBOUND_PLATFORM is None:
+            return None
+        with self._outbound_lock:
+            if self._outbound is None or self._outbound.stopped:
+                from core.outbound import OutboundDispatcher
+                self._outbound = OutboundDispatcher(self.OUTBOUND_PLATFORM, self._send_once)
+            return self._outbound
+
+    def stop_outbound(self):
+        """Stop this connector's dispatcher thread (called from disconnect); queued sends resolve to False"""
+        with self._outbound_lock:
+            dispatcher, self._outbound = self._outbound, None
+        if dispatcher is not None:
+            dispatcher.stop()
+
+    def send_message_async(self, message: str) -> Future:
+        """Queue a message without blocking; the future resolves to True once delivered"""
+        dispatcher = self.outbound()
+        if dispatcher is None:
+            from core.outbound import completed_future
+            return completed_future(bool(self.send_message(message)))
+        return dispatcher.submit(message)
+
     def isConnected(self) -> bool:
         """Check if connected"""
         return self.connected
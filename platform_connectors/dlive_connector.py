@@ -28,11 +28,18 @@ except Exception:
     requests = None
 from core.logger import get_logger
 from platform_connectors.connector_utils import connect_with_retry, startup_allowed, safe_emit
+from core.outbound import SendResult, make_send_session
+from core.connector_runtime import worker_host
+from core.backfill import GapTracker, to_epoch_seconds
+from core.health_supervisor import close_websocket, get_health_supervisor, websocket_probe
 
 logger = get_logger(__name__)
 
+# A connection that stayed up this long resets the reconnect backoff
+STABLE_CONNECTION_SECONDS = 60
 
-def _make_retry_session(total: int = 3, backoff_factor: float = 1.0):
+
+def _make_retry_session(total: int = 3, backoff_factor: float = 1.0, status_forcelist=(429, 500, 502, 503, 504)):
     """Create a requests.Session with urllib3 Retry configured for transient errors."""
     try:
         from requests.adapters import HTTPAdapter
@@ -41,7 +48,7 @@ def _make_retry_session(total: int = 3, backoff_factor: float = 1.0):
         retries = Retry(
             total=total,
             backoff_factor=backoff_factor,
-            status_forcelist=(429, 500, 502, 503, 504),
+            status_forcelist=status_forcelist,
             allowed_methods=("GET", "POST", "DELETE", "PUT", "PATCH")
         )
         adapter = HTTPAdapter(max_retries=retries)
@@ -78,10 +85,13 @@ def _make_retry_session(total: int = 3, backoff_factor: float = 1.0):
 
 class DLiveConnector(BasePlatformConnector):
     """Connector for DLive chat"""
+
+    OUTBOUND_PLATFORM = 'dlive'
     
     def __init__(self, config=None):
         super().__init__()
         self.worker = None
+        self.worker_thread = None  # Runtime handle (or the worker itself when it runs on its own thread)
         self.config = config
         self.access_token = None
         
@@ -116,22 +126,31 @@ class DLiveConnector(BasePlatformConnector):
         if not startup_allowed():
             logger.info("[DLiveConnector] CI mode: skipping DLiveWorker.start()")
             return
-        self.worker.start()
+        self.worker_thread = worker_host(self.worker, config=self.config)
+        self.worker_thread.start()
     
     def disconnect(self):
         """Disconnect from DLive"""
         logger.info("[DLiveConnector] disconnect() called")
         if self.worker:
             self.worker.stop()
-            self.worker.wait(5000)  # Wait up to 5 seconds
+            (self.worker_thread or self.worker).wait(5000)  # Wait up to 5 seconds
         
         self.connected = False
+        self.stop_outbound()
         safe_emit(self.connection_status, False)
     
+    def _send_once(self, message: str) -> SendResult:
+        worker = self.worker
+        if not worker or not self.connected:
+            return SendResult(False, error='not connected')
+        return worker._send_once(message)
+
     def send_message(self, message: str):
-        """Send a message to DLive chat"""
-        if self.worker and self.connected:
-            self.worker.send_message(message)
+        """Send a message to DLive chat and wait for delivery"""
+        if not (self.worker and self.connected):
+            return False
+        return self.outbound().send(message)
     
     def delete_message(self, message_id: str):
         """Delete a message from DLive chat
@@ -221,6 +240,56 @@ class DLiveWorker(QThread):
     
     WS_URL = "wss://graphigostream.prd.dlive.tv"
     GRAPHQL_URL = "https://graphigo.prd.dlive.tv/"
+    # Recent chat fetched after a reconnect to fill the gap
+    HISTORY_COUNT = 50
+    # Fields selected for every chat event (live subscription and history)
+    CHAT_FIELDS = """
+        type
+        ... on ChatText {
+            id
+            content
+            createdAt
+            sender {
+                displayname
+                username
+                avatar
+                partnerStatus
+            }
+        }
+        ... on ChatGift {
+            id
+            gift
+            amount
+            recentCount
+            sender {
+                displayname
+                username
+            }
+        }
+        ... on ChatFollow {
+            id
+            sender {
+                displayname
+                username
+            }
+        }
+        ... on ChatSubscription {
+            id
+            month
+            sender {
+                displayname
+                username
+            }
+        }
+    """
+    HISTORY_QUERY = """
+    query LivestreamChatHistory($displayname: String!, $count: Int!) {
+        userByDisplayName(displayname: $displayname) {
+            chats(count: $count) {%s
+            }
+        }
+    }
+    """ % CHAT_FIELDS
     
     def __init__(self, username: str, access_token: str | None = None):
         super().__init__()
@@ -237,14 +306,18 @@ class DLiveWorker(QThread):
         self.seen_message_ids = set()
         self.max_seen_ids = 10000  # Prevent unbounded memory growth
         
-        # Health monitoring
+        # Health monitoring (probed by the HealthSupervisor)
         self.last_message_time = None
-        self.health_check_interval = 30  # Check every 30 seconds
         self.connection_timeout = 120  # Consider dead after 2 minutes of silence
+        self._health = None
+        self.gaps = GapTracker(f"DLive:{username}")
         # WebSocket open/connect timeout (seconds)
         self.open_timeout = 10
         # Ping interval for websockets (None -> library default)
         self.ping_interval = 20
+        self._send_session = None  # Pooled session for chat sends
+        self.runtime_host = None  # Set when hosted on the shared connector runtime
+        self._send_headers_cache = None  # (access_token, headers)
     
     def resolve_username(self):
         """Resolve display name to actual DLive username"""
@@ -307,28 +380,11 @@ class DLiveWorker(QThread):
             return False
     
     def run(self):
-        # Prevent worker from running if disabled in config
-        if hasattr(self, 'config') and self.config and self.config.get('platforms', {}).get('dlive', {}).get('disabled', False):
-            logger.info("[DLiveWorker] Skipping run: platform is disabled")
-            return
-        logger.info("[DLiveWorker] Starting run()")
-        self.running = True
-        self.connection_time = time.time()
-        # Resolve display name to actual username first
-        if not self.resolve_username():
-            safe_emit(self.error_signal, f"Failed to resolve DLive username for: {self.displayname}")
-            return
         try:
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
-            logger.debug("[DLiveWorker] Event loop created, connecting with auto-retry...")
             try:
-                self.loop.run_until_complete(self.connect_with_retry())
-            except Exception as e:
-                import traceback
-                logger.exception(f"[DLiveWorker] Error in event loop: {type(e).__name__}: {e}")
-                logger.debug(f"[DLiveWorker] Traceback:\n{traceback.format_exc()}")
-                safe_emit(self.error_signal, str(e))
+                self.loop.run_until_complete(self.run_async())
             finally:
                 if self.loop and not self.loop.is_closed():
                     logger.debug("[DLiveWorker] Closing event loop")
@@ -339,19 +395,48 @@ class DLiveWorker(QThread):
             logger.debug(f"[DLiveWorker] Traceback:\n{traceback.format_exc()}")
             safe_emit(self.error_signal, str(e))
     
+    async def run_async(self):
+        """Resolve the username, then stay connected (shared connector runtime or run()'s loop)"""
+        # Prevent worker from running if disabled in config
+        if hasattr(self, 'config') and self.config and self.config.get('platforms', {}).get('dlive', {}).get('disabled', False):
+            logger.info("[DLiveWorker] Skipping run: platform is disabled")
+            return
+        logger.info("[DLiveWorker] Starting run()")
+        self.running = True
+        self.loop = asyncio.get_running_loop()
+        self.connection_time = time.time()
+        # Resolve display name to actual username first (blocking HTTP, kept off the event loop)
+        if not await asyncio.to_thread(self.resolve_username):
+            safe_emit(self.error_signal, f"Failed to resolve DLive username for: {self.displayname}")
+            return
+        logger.debug("[DLiveWorker] Connecting with auto-retry...")
+        try:
+            await self.connect_with_retry()
+        except Exception as e:
+            import traceback
+            logger.exception(f"[DLiveWorker] Error in event loop: {type(e).__name__}: {e}")
+            logger.debug(f"[DLiveWorker] Traceback:\n{traceback.format_exc()}")
+            safe_emit(self.error_signal, str(e))
+
     async def connect_with_retry(self, max_retries=10):
         """Connect with automatic retry and exponential backoff"""
         retry_count = 0
         backoff = 1  # Start with 1 second
         
         while self.running and retry_count < max_retries:
+            started = time.time()
             try:
                 logger.info(f"[DLiveWorker] Connection attempt {retry_count + 1}/{max_retries}")
                 await self.connect_and_listen()
                 # If we get here, connect_and_listen returned without raising.
-                # Treat that as a clean exit (no retry).
-                logger.info("[DLiveWorker] connect_and_listen returned (clean exit)")
-                break
+                if not self.running:
+                    logger.info("[DLiveWorker] connect_and_listen returned (clean exit)")
+                    break
+                # The socket closed under us: reconnect and backfill the gap
+                if time.time() - started >= STABLE_CONNECTION_SECONDS:
+                    retry_count = 0
+                retry_count += 1
+                logger.warning("[DLiveWorker] Connection closed; reconnecting")
             except asyncio.CancelledError:
                 # Treat cancellation as transient and attempt retry with backoff
                 retry_count += 1
@@ -359,6 +444,7 @@ class DLiveWorker(QThread):
             except Exception as e:
                 retry_count += 1
                 logger.warning(f"[DLiveWorker] Connection failed: {type(e).__name__}: {e}")
+            self.gaps.disconnected()
 
             # Common retry/backoff path for transient failures
             if retry_count < max_retries and self.running:
@@ -434,6 +520,9 @@ class DLiveWorker(QThread):
                     # Subscribe to chat
                     await self.subscribe_to_chat(websocket)
                     
+                    # Recover chat sent while we were disconnected
+                    await self.backfill_gap()
+                    
                     # Listen for messages
                     await self.listen_for_messages(websocket)
                 else:
@@ -460,74 +549,21 @@ class DLiveWorker(QThread):
             # Re-raise to allow connect_with_retry to perform backoff
             raise
     
-    async def health_check_loop(self, websocket):
-        """Monitor connection health and detect dead connections"""
-        try:
-            while self.running:
-                await asyncio.sleep(self.health_check_interval)
-                
-                # Check if we've received any message recently
-                if self.last_message_time:
-                    time_since_last = time.time() - self.last_message_time
-                    
-                    if time_since_last > self.connection_timeout:
-                        logger.warning(f"[DLiveWorker] ⚠ No messages for {time_since_last:.0f}s, connection may be dead")
-                        logger.info(f"[DLiveWorker] Forcing reconnection...")
-                        # Close the websocket to trigger reconnection
-                        await websocket.close()
-                        break
-                    elif time_since_last > self.health_check_interval:
-                        logger.debug(f"[DLiveWorker] Connection healthy (last message: {time_since_last:.0f}s ago)")
-        except asyncio.CancelledError:
-            logger.debug("[DLiveWorker] Health check cancelled")
-        except Exception as e:
-            logger.exception(f"[DLiveWorker] Health check error: {e}")
+    def _register_health(self, websocket):
+        """Register this connection's probe with the health supervisor"""
+        loop = asyncio.get_running_loop()
+        probe = websocket_probe(websocket, loop, lambda: self.last_message_time, self.connection_timeout)
+        return get_health_supervisor().register(f"DLive:{self.displayname}", probe,
+                                                escalate=close_websocket(websocket, loop), platform='dlive')
     
     async def subscribe_to_chat(self, websocket):
         """Subscribe to streamMessageReceived"""
         subscription = """
         subscription StreamMessageSubscription($streamer: String!) {
-            streamMessageReceived(streamer: $streamer) {
-                type
-                ... on ChatText {
-                    id
-                    content
-                    createdAt
-                    sender {
-                        displayname
-                        username
-                        avatar
-                        partnerStatus
-                    }
-                }
-                ... on ChatGift {
-                    id
-                    gift
-                    amount
-                    recentCount
-                    sender {
-                        displayname
-                        username
-                    }
-                }
-                ... on ChatFollow {
-                    id
-                    sender {
-                        displayname
-                        username
-                    }
-                }
-                ... on ChatSubscription {
-                    id
-                    month
-                    sender {
-                        displayname
-                        username
-                    }
-                }
+            streamMessageReceived(streamer: $streamer) {%s
             }
         }
-        """
+        """ % self.CHAT_FIELDS
         
         subscribe_message = {
             "id": self.subscription_id,
@@ -572,14 +608,66 @@ class DLiveWorker(QThread):
         except Exception as e:
             logger.exception(f"[DLiveWorker] Error checking subscription: {e}")
     
+    def fetch_chat_history(self, count: int = None):
+        """Recent chat for this channel, oldest first; None if the request failed"""
+        count = count or self.HISTORY_COUNT
+        headers = self._send_headers() if self.access_token else {"Content-Type": "application/json"}
+        try:
+            session = self._send_session
+            if session is None:
+                session = self._send_session = make_send_session(_make_retry_session)
+            response = session.post(
+                self.GRAPHQL_URL,
+                headers=headers,
+                json={"query": self.HISTORY_QUERY, "variables": {"displayname": self.displayname, "count": count}},
+                timeout=10
+            )
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"[DLiveWorker] Network error fetching chat history: {e}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"[DLiveWorker] Chat history request failed: HTTP {response.status_code}")
+            return None
+        try:
+            data = response.json()
+        except ValueError as e:
+            # An HTML error page or a truncated body; the gap is reported as incomplete
+            logger.warning(f"[DLiveWorker] Chat history response was not JSON: {e}")
+            return None
+        if not isinstance(data, dict):
+            logger.warning("[DLiveWorker] Chat history response was not a JSON object")
+            return None
+        if data.get('errors'):
+            logger.warning(f"[DLiveWorker] Chat history query errors: {data['errors']}")
+            return None
+        chats = ((data.get('data') or {}).get('userByDisplayName') or {}).get('chats') or []
+        return sorted(chats, key=lambda m: to_epoch_seconds(m.get('createdAt')) or 0)
+
+    async def backfill_gap(self):
+        """After a reconnect, deliver the chat sent since the last delivered message"""
+        gap = self.gaps.connected()
+        if gap is None:
+            return
+        history = await asyncio.to_thread(self.fetch_chat_history)
+        if history is None:
+            self.gaps.finish(gap, 0, complete=False)
+            return
+        missed = [m for m in history
+                  if gap.accepts(m.get('createdAt'), m.get('id')) and m.get('id') not in self.seen_message_ids]
+        for msg in missed:
+            self.process_message(msg, backfilled=True)
+        # If even the oldest returned message is inside the gap, older ones may be missing
+        complete = len(history) < self.HISTORY_COUNT or not gap.accepts(history[0].get('createdAt'))
+        self.gaps.finish(gap, len(missed), complete)
+    
     async def listen_for_messages(self, websocket):
         """Listen for incoming messages with health monitoring"""
         logger.info(f"[DLiveWorker] Now listening for chat messages...")
         logger.debug(f"[DLiveWorker] TIP: Send a test message in your DLive chat to verify it works!")
         logger.debug(f"[DLiveWorker] NOTE: Messages only appear when stream is LIVE and someone chats")
         
-        # Start health monitoring in background
-        health_task = asyncio.create_task(self.health_check_loop(websocket))
+        # Register with the health supervisor
+        self._health = self._register_health(websocket)
         
         try:
             message_count = 0
@@ -683,15 +771,13 @@ class DLiveWorker(QThread):
             logger.debug(f"[DLiveWorker] Traceback:\n{traceback.format_exc()}")
             safe_emit(self.error_signal, f"Listening error: {e}")
         finally:
-            # Cancel health monitoring
-            health_task.cancel()
-            try:
-                await health_task
-            except asyncio.CancelledError:
-                pass
+            get_health_supervisor().unregister(self._health)
     
-    def process_message(self, msg):
-        """Process a chat message with deduplication and error handling"""
+    def process_message(self, msg, backfilled: bool = False):
+        """Process a chat message with deduplication and error handling
+
+        `backfilled` marks messages recovered from history after a reconnect.
+        """
         try:
             # Message deduplication
             msg_id = msg.get('id')
@@ -713,6 +799,8 @@ class DLiveWorker(QThread):
                     self.seen_message_ids = set(list(self.seen_message_ids)[self.max_seen_ids // 2:])
                     logger.debug(f"[DLiveWorker] Trimmed seen_message_ids to {len(self.seen_message_ids)}")
             
+            self.gaps.delivered(msg_id, msg.get('createdAt'))
+            
             msg_type = msg.get("type") or msg.get("__typename")
             
             if msg_type in ("ChatText", "Message"):
@@ -739,6 +827,8 @@ class DLiveWorker(QThread):
                     'timestamp': msg.get('createdAt', 0),
                     'message_id': msg.get('id')
                 }
+                if backfilled:
+                    metadata['backfilled'] = True
                 
                 logger.info(f"[DLiveWorker] Chat: {username}: {content}")
                 from .connector_utils import emit_chat
@@ -852,6 +942,7 @@ class DLiveWorker(QThread):
         """Stop the worker"""
         logger.info("[DLiveWorker] Stopping...")
         self.running = False
+        get_health_supervisor().unregister(self._health)
         
         # Close WebSocket if open
         if self.ws and self.loop:
@@ -874,6 +965,11 @@ class DLiveWorker(QThread):
             except Exception as e:
                 logger.exception(f"[DLiveWorker] Error closing WebSocket: {e}")
 
+        if self.runtime_host is not None:
+            # Hosted on the shared connector loop: cancel only this worker's tasks
+            self.runtime_host.terminate()
+            return
+
         # Schedule cooperative shutdown on the worker loop and request loop stop
         try:
             if self.loop and not (self.loop.is_closed()):
@@ -915,44 +1011,49 @@ class DLiveWorker(QThread):
         except Exception as e:
             logger.exception(f"[DLiveWorker] _shutdown_async error: {e}")
     
-    def send_message(self, message: str):
-        """Send a message to DLive chat using HTTP POST (not WebSocket)"""
-        if not self.access_token:
-            logger.warning("[DLiveWorker] Cannot send message: No access token")
-            return False
-        
-        # Debug: Show which account is sending
-        logger.debug(f"[DLiveWorker] send_message: Sending as streamer: {self.username}")
-        
+    SEND_MUTATION = """
+    mutation SendStreamChatMessage($input: SendStreamchatMessageInput!) {
+        sendStreamchatMessage(input: $input) {
+            err {
+                message
+            }
+            message {
+                ... on ChatText {
+                    id
+                    content
+                }
+            }
+        }
+    }
+    """
+
+    def _send_headers(self):
+        """Request headers for sends, parsed once per stored access token"""
+        cached = self._send_headers_cache
+        if cached and cached[0] == self.access_token:
+            return cached[1]
         # Parse token if it's stored as JSON
         token = self.access_token
         if token.startswith('{'):
             try:
-                token_data = json.loads(token)
-                token = token_data.get('token', token)
-                logger.debug(f"[DLiveWorker] Extracted token from JSON (length: {len(token)})")
-            except:
+                token = json.loads(token).get('token', token)
+            except Exception:
                 logger.debug(f"[DLiveWorker] Token is JSON-like but couldn't parse, using as-is")
-        
-        # Use HTTP POST for sending messages (more reliable than WebSocket mutation)
-        mutation = """
-        mutation SendStreamChatMessage($input: SendStreamchatMessageInput!) {
-            sendStreamchatMessage(input: $input) {
-                err {
-                    message
-                }
-                message {
-                    ... on ChatText {
-                        id
-                        content
-                    }
-                }
-            }
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": token
         }
-        """
-        
+        self._send_headers_cache = (self.access_token, headers)
+        return headers
+
+    def _send_once(self, message: str) -> SendResult:
+        """One sendStreamchatMessage attempt over HTTP (not WebSocket); the dispatcher retries"""
+        if not self.access_token:
+            logger.warning("[DLiveWorker] Cannot send message: No access token")
+            return SendResult(False, error='no access token')
+
         payload = {
-            "query": mutation,
+            "query": self.SEND_MUTATION,
             "variables": {
                 "input": {
                     "streamer": self.username,
@@ -962,60 +1063,48 @@ class DLiveWorker(QThread):
                 }
             }
         }
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": token  # Use extracted token
-        }
-        
-        logger.info(f"[DLiveWorker] Sending via HTTP POST to {self.GRAPHQL_URL}")
-        logger.debug(f"[DLiveWorker] Payload: {json.dumps(payload, indent=2)}")
-        
+        if self._send_session is None:
+            self._send_session = make_send_session(_make_retry_session)
         try:
-            session = _make_retry_session()
-            response = session.post(
+            response = self._send_session.post(
                 self.GRAPHQL_URL,
-                headers=headers,
+                headers=self._send_headers(),
                 json=payload,
                 timeout=10
             )
-            
-            logger.debug(f"[DLiveWorker] Response status: {response.status_code}")
-            logger.debug(f"[DLiveWorker] Response body: {response.text[:500]}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check for errors first
-                if data.get('errors'):
-                    error_msg = data['errors'][0].get('message', 'Unknown error')
-                    logger.error(f"[DLiveWorker] ❌ GraphQL error: {error_msg}")
-                    logger.debug(f"[DLiveWorker] Full errors: {json.dumps(data['errors'], indent=2)}")
-                    return False
-                
-                result = data.get('data', {})
-                if result:
-                    send_result = result.get('sendStreamchatMessage', {})
-                    err = send_result.get('err', {})
-                    
-                    if err and err.get('message'):
-                        logger.error(f"[DLiveWorker] ❌ Message send failed: {err.get('message')}")
-                        return False
-                    else:
-                        logger.info(f"[DLiveWorker] ✓ Message sent successfully via HTTP")
-                        return True
-                else:
-                    logger.error(f"[DLiveWorker] ❌ No data in response")
-                    return False
-            else:
-                logger.error(f"[DLiveWorker] ❌ HTTP error: {response.status_code}")
-                return False
-                
         except Exception as e:
-            logger.exception(f"[DLiveWorker] ❌ Error sending message: {e}")
-            import traceback
-            logger.debug(f"[DLiveWorker] Traceback:\n{traceback.format_exc()}")
-            return False
+            logger.warning(f"[DLiveWorker] Network error sending message: {e}")
+            return SendResult.network_error(e)
+
+        result = SendResult.from_response(response)
+        if not result.ok:
+            logger.error(f"[DLiveWorker] ❌ HTTP error: {response.status_code}")
+            return result
+
+        # GraphQL reports failures inside a 200; those are final
+        try:
+            data = response.json()
+        except Exception:
+            data = {}
+        if data.get('errors'):
+            error_msg = data['errors'][0].get('message', 'Unknown error')
+            logger.error(f"[DLiveWorker] ❌ GraphQL error: {error_msg}")
+            return SendResult(False, status=response.status_code, error=error_msg)
+        send_result = (data.get('data') or {}).get('sendStreamchatMessage') or {}
+        if not data.get('data'):
+            logger.error(f"[DLiveWorker] ❌ No data in response")
+            return SendResult(False, status=response.status_code, error='no data')
+        err = send_result.get('err') or {}
+        if err.get('message'):
+            logger.error(f"[DLiveWorker] ❌ Message send failed: {err.get('message')}")
+            return SendResult(False, status=response.status_code, error=err.get('message'))
+        logger.info(f"[DLiveWorker] ✓ Message sent successfully via HTTP")
+        return result
+
+    def send_message(self, message: str):
+        """Send a message to DLive chat (single attempt)"""
+        try:
+            return bool(self._send_once(message))
         except Exception as e:
             logger.exception(f"[DLiveWorker] Error sending message: {e}")
             return False
@@ -3,17 +3,20 @@ Kick Platform Connector - Official API Implementation
 Connects to Kick using OAuth2 and Webhooks API
 Documentation: https://docs.kick.com/
 
-NOTE: Kick's real-time chat requires webhooks which need a publicly accessible URL.
-For local development, you must use ngrok or similar tunnel service:
+Chat is read either from webhooks or, when webhooks aren't configured, from
+Kick's public Pusher channel (see kick_pusher.py; config `kick.read_mode`).
+
+Webhooks need a publicly accessible URL. For local development, use ngrok
+or a similar tunnel service:
 1. Install ngrok: https://ngrok.com/download
 2. Run: ngrok http 8889
 3. Update webhook URL in Kick Developer settings with ngrok URL
 4. Enable webhooks and subscribe to chat.message.sent events
-
-Alternative: Wait for Kick to release a WebSocket API for developers.
 """
 
 import json
+import os
+import time
 try:
     import requests
 except Exception:
@@ -64,6 +67,10 @@ from threading import Thread
 from platform_connectors.base_connector import BasePlatformConnector
 from platform_connectors.qt_compat import QThread, pyqtSignal, QObject
 from platform_connectors.connector_utils import startup_allowed, safe_emit
+from platform_connectors.kick_pusher import KickPusherReader, pusher_url
+from platform_connectors.kick_webhook import (
+    KickWebhookVerifier, WebhookIngestQueue, classify_event, parse_body, pick_headers,
+)
 from core.logger import get_logger
 
 # Structured logger for this module
@@ -72,6 +79,8 @@ try:
     from core.http_session import make_retry_session
 except Exception:
     make_retry_session = None
+from core.outbound import SendResult, make_send_session
+from core.health_supervisor import DEAD, OK, WARN, ProbeResult, get_health_supervisor
 
 
 class KickConnector(BasePlatformConnector):
@@ -84,6 +93,8 @@ class KickConnector(BasePlatformConnector):
     # Kick API endpoints
     OAUTH_BASE = "https://id.kick.com"
     API_BASE = "https://api.kick.com/public/v1"
+
+    OUTBOUND_PLATFORM = 'kick'
     
     def __init__(self, config=None):
         super().__init__()
@@ -97,6 +108,10 @@ class KickConnector(BasePlatformConnector):
         self.session_cookies = {}  # Store session cookies for v2 API
         self.webhook_server = None
         self.webhook_thread = None
+        self._webhook_debug_flag = None  # Precompiled accessor for debug.kick_webhooks
+        self.webhook_queue = None  # Raw events waiting for the consumer thread
+        self.webhook_verifier = KickWebhookVerifier()
+        self.pusher_reader = None  # Set when chat is read from Pusher instead of webhooks
         # Use configured shared callback port if available
         self.webhook_port = 8889
         try:
@@ -108,14 +123,17 @@ class KickConnector(BasePlatformConnector):
         self.webhook_url = None  # Store the ngrok URL
         self.broadcaster_user_id = None
         self.chatroom_id = None  # Store chatroom ID for sending messages
+        self._send_session = None  # Pooled session for chat sends
+        self._send_target_cache = None  # (token, own broadcaster id, broadcaster id, headers)
         self.subscription_id = None
         
         # Message reliability features
         self.seen_message_ids = set()  # Track processed messages
         self.max_seen_ids = 10000  # Prevent unbounded growth
         self.last_message_time = None  # For health monitoring
-        self.health_check_thread = None
-        self.health_check_interval = 300  # 5 minutes
+        self._health = None  # HealthSupervisor probe for the webhook subscription
+        self.health_check_interval = 300  # Verify the subscription after 5 quiet minutes
+        self._subscription_verified_at = None
         self.subscription_active = False
         self.channel_name = None
         
@@ -398,103 +416,110 @@ class KickConnector(BasePlatformConnector):
                 return self.subscribe_to_chat_events(retry_count + 1, max_retries)
             return False
     
-    def start_webhook_server(self):
-        """Register Kick webhook handler with shared callback server and start it."""
-        try:
-            from core import callback_server
+    def _webhook_debug_enabled(self) -> bool:
+        """Read debug.kick_webhooks without locking or walking the config per request"""
+        if self._webhook_debug_flag is None:
+            accessor = getattr(self.config, 'accessor', None)
+            if callable(accessor):
+                self._webhook_debug_flag = accessor('debug.kick_webhooks', False)
+            else:
+                return bool((self.config.get('debug', {}) or {}).get('kick_webhooks', False))
+        return bool(self._webhook_debug_flag())
 
-            def _handler(req):
-                try:
-                    import os, time, json
-                    # Read raw body and headers for diagnostics
-                    try:
-                        raw_body = req.get_data(as_text=True)
-                    except Exception:
-                        raw_body = ''
-                    headers = {k: v for k, v in req.headers.items()}
+    def _ensure_webhook_queue(self) -> WebhookIngestQueue:
+        """Create and start the webhook consumer on first use"""
+        if self.webhook_queue is None:
+            self.webhook_queue = WebhookIngestQueue(self._process_webhook_batch)
+        self.webhook_queue.start()
+        return self.webhook_queue
 
-                    # Persist raw request for debugging (always)
-                    # (debug logging removed)
+    def _load_webhook_key(self):
+        """Load Kick's webhook signing key from config or from the Kick API"""
+        try:
+            pem = ''
+            if self.config:
+                pem = self.config.get_platform_config('kick').get('webhook_public_key', '')
+            if pem:
+                self.webhook_verifier.load_key(pem)
+            else:
+                self.webhook_verifier.fetch_key(make_retry_session() if make_retry_session else requests.Session())
+        except Exception as e:
+            logger.debug(f"Kick webhook key not loaded: {e}")
 
-                    # Try to parse JSON body if present
-                    data = None
-                    try:
-                        data = req.get_json(silent=True)
-                    except Exception:
-                        data = None
-                    if data is None:
-                        try:
-                            data = json.loads(raw_body) if raw_body else {}
-                        except Exception:
-                            data = {}
+    def _webhook_handler(self, req):
+        """Flask route: verify, enqueue and acknowledge immediately"""
+        try:
+            if req.method == 'GET':
+                return ('', 200)
+            body = req.get_data(cache=False)
+            headers = pick_headers(req.headers)
+            if not self.webhook_verifier.verify(headers, body):
+                logger.warning("Rejected Kick webhook with an invalid signature")
+                return ('', 401)
+            if not self._ensure_webhook_queue().offer(headers, body):
+                # Let Kick retry later rather than blocking the request thread
+                return ('', 503)
+            return ('', 200)
+        except Exception as e:
+            logger.exception(f"Kick webhook handler error: {e}")
+            return ('', 500)
 
+    def _process_webhook_batch(self, events):
+        """Consumer side: parse each queued body once and route it"""
+        try:
+            dbg = bool(self.config) and bool(self._webhook_debug_enabled())
+        except Exception:
+            dbg = False
+        raw_log = None
+        for headers, body in events:
+            try:
+                data = parse_body(body)
+                if dbg:
                     # Optional debug logging controlled by config: set {"debug": {"kick_webhooks": true}}
+                    text = body.decode('utf-8', errors='replace')
+                    logger.debug(f"[Kick DEBUG] HEADERS={headers} BODY={text}")
                     try:
-                        dbg = False
-                        if hasattr(self, 'config') and self.config:
-                            dbg = bool(self.config.get('debug', {}).get('kick_webhooks', False))
-                        if dbg:
-                            logger.debug(f"[Kick DEBUG] RAW_PATH={req.path} HEADERS={headers} BODY={raw_body}")
-                            try:
-                                log_dir = os.path.join(os.getcwd(), 'logs')
-                                os.makedirs(log_dir, exist_ok=True)
-                                with open(os.path.join(log_dir, 'kick_webhooks_raw.log'), 'a', encoding='utf-8', errors='replace') as rf:
-                                    rf.write(f"{time.time():.3f} PATH={req.path} HEADERS={json.dumps(headers)} BODY={raw_body}\n")
-                            except Exception:
-                                pass
+                        if raw_log is None:
+                            log_dir = os.path.join(os.getcwd(), 'logs')
+                            os.makedirs(log_dir, exist_ok=True)
+                            raw_log = open(os.path.join(log_dir, 'kick_webhooks_raw.log'), 'a', encoding='utf-8', errors='replace')
+                        raw_log.write(f"{time.time():.3f} HEADERS={json.dumps(headers)} BODY={text}\n")
                     except Exception:
                         pass
 
-                    # Normalize event payload (some providers wrap payload under 'data')
-                    payload = data.get('data') if isinstance(data, dict) and 'data' in data and isinstance(data.get('data'), dict) else data
-
-                    # Determine event type from headers or body
-                    event_type = None
-                    for key in ('Kick-Event-Type', 'X-Kick-Event-Type', 'X-Event-Type', 'Event-Type', 'Event'):
-                        if key in headers:
-                            event_type = headers.get(key)
-                            break
-                    if not event_type:
-                        # Look in JSON body
-                        for jkey in ('event_type', 'type', 'name', 'event'):
-                            try:
-                                v = payload.get(jkey)
-                                if v:
-                                    event_type = v
-                                    break
-                            except Exception:
-                                continue
+                event_type, payload = classify_event(headers, data)
 
-                    # If event_type is nested dict, try to extract name
-                    if isinstance(event_type, dict):
-                        event_type = event_type.get('name') or event_type.get('type')
+                # Route to handlers
+                if 'chat.message.sent' in event_type or 'message.sent' in event_type or 'chat_message' in event_type or ('sender' in payload and 'content' in payload):
+                    logger.debug(f"[Webhook] Chat message from {(payload.get('sender', {}) or {}).get('username', 'Unknown')} (event={event_type})")
+                    self.handle_chat_message(payload)
+                elif 'deleted' in event_type:
+                    logger.debug(f"[Webhook] Message deletion event (event={event_type})")
+                    self.handle_message_deletion(payload)
+                else:
+                    logger.debug(f"[Webhook] Unhandled or unknown event type: {event_type}")
+            except Exception as e:
+                logger.exception(f"Error processing Kick webhook event: {e}")
+        if raw_log is not None:
+            try:
+                raw_log.close()
+            except Exception:
+                pass
 
-                    # Normalize to string
-                    try:
-                        event_type_str = str(event_type).lower() if event_type else ''
-                    except Exception:
-                        event_type_str = ''
+    def webhook_metrics(self) -> dict:
+        """Queue depth and processing lag of the webhook consumer"""
+        return self.webhook_queue.metrics() if self.webhook_queue is not None else {}
 
-                    # Route to handlers
-                    if 'chat.message.sent' in event_type_str or 'message.sent' in event_type_str or 'chat_message' in event_type_str or ('sender' in payload and 'content' in payload):
-                        uname = (payload.get('sender', {}) or {}).get('username', 'Unknown') if isinstance(payload, dict) else 'Unknown'
-                        print(f"[Webhook] Chat message from {uname} (event={event_type})")
-                        self.handle_chat_message(payload)
-                    elif 'chat.message.deleted' in event_type_str or 'message.deleted' in event_type_str or 'deleted' in event_type_str:
-                        print(f"[Webhook] Message deletion event (event={event_type})")
-                        self.handle_message_deletion(payload)
-                    else:
-                        print(f"[Webhook] Unhandled or unknown event type: {event_type} path={req.path}")
-                        # keep raw log for inspection
+    def start_webhook_server(self):
+        """Register Kick webhook handler with shared callback server and start it."""
+        try:
+            from core import callback_server
 
-                    return ('', 200)
-                except Exception as e:
-                    import traceback
-                    traceback.print_exc()
-                    return ("", 500)
+            self._ensure_webhook_queue()
+            self._load_webhook_key()
 
             route_path = '/kick/webhook'
-            callback_server.register_route(route_path, _handler, methods=['POST', 'GET'])
+            callback_server.register_route(route_path, self._webhook_handler, methods=['POST', 'GET'])
             callback_server.start_server(self.webhook_port)
             # Verify registration
             try:
@@ -658,9 +683,70 @@ class KickConnector(BasePlatformConnector):
         except Exception as e:
             logger.error(f"Error handling message deletion: {e}")
     
+    def _resolve_read_mode(self) -> str:
+        """'webhook' or 'pusher'; config kick.read_mode 'auto' uses Pusher unless webhooks are set up"""
+        kick_config = {}
+        try:
+            if self.config:
+                kick_config = self.config.get_platform_config('kick') or {}
+        except Exception:
+            pass
+        mode = str(kick_config.get('read_mode') or 'auto').lower()
+        if mode in ('webhook', 'pusher'):
+            return mode
+        if kick_config.get('webhook_url'):
+            return 'webhook'
+        try:
+            if self.ngrok_manager and self.ngrok_manager.is_available():
+                return 'webhook'
+        except Exception:
+            pass
+        return 'pusher'
+
+    def _connect_pusher(self, channel: str):
+        """Read chat from Kick's public Pusher channel (no tunnel or webhook subscription)"""
+        logger.info("Kick: webhooks not configured, reading chat over Pusher")
+        kick_config = {}
+        try:
+            if self.config:
+                kick_config = self.config.get_platform_config('kick') or {}
+        except Exception:
+            pass
+
+        # The chatroom ID is needed to subscribe; broadcaster_user_id is needed for sending
+        if not self.get_channel_info(channel) and not self.chatroom_id:
+            self.chatroom_id = kick_config.get('chatroom_id')
+        if not self.chatroom_id:
+            safe_emit(self.error_occurred, f"Failed to get Kick chatroom ID for '{channel}'")
+            return
+
+        self.pusher_reader = KickPusherReader(
+            self, self.chatroom_id,
+            url=pusher_url(kick_config.get('pusher_key'), kick_config.get('pusher_cluster'))
+        )
+        if not startup_allowed():
+            logger.info("[KickConnector] CI mode: skipping Pusher reader start")
+            return
+        self.pusher_reader.start()
+
+    def on_pusher_status(self, connected: bool, error: str = None):
+        """Called from the Pusher reader when the subscription comes up or drops"""
+        if error:
+            safe_emit(self.error_occurred, error)
+        if connected != self.connected:
+            self.connected = connected
+            safe_emit(self.connection_status, connected)
+            if connected:
+                logger.info(f"✓ Kick: Connected to channel '{self.channel_name}' (Pusher)")
+
     def connect(self, channel: str):
         """Connect to Kick chat"""
         logger.info("=== Kick Connection Process ===")
+        self.channel_name = channel
+        
+        if self._resolve_read_mode() == 'pusher':
+            self._connect_pusher(channel)
+            return
         
         # Step 1: Start ngrok tunnel if ngrok_manager is available
         if self.ngrok_manager and self.ngrok_manager.is_available():
@@ -790,7 +876,13 @@ class KickConnector(BasePlatformConnector):
         """Disconnect from Kick"""
         # Stop health monitoring
         self.subscription_active = False
+        self.stop_health_monitoring()
         self.connected = False
+        self.stop_outbound()
+        
+        if self.pusher_reader is not None:
+            self.pusher_reader.stop()
+            self.pusher_reader = None
         
         # Clean up subscription
         if self.subscription_id and self.access_token:
@@ -818,29 +910,19 @@ class KickConnector(BasePlatformConnector):
             except Exception:
                 pass
             self.webhook_server = None
+        if self.webhook_queue is not None:
+            self.webhook_queue.stop()
         
         safe_emit(self.connection_status, False)
         logger.info("✓ Kick: Disconnected")
     
-    def send_message(self, message: str):
-        """Send a chat message using Kick's /chat API endpoint
-        
-        According to Kick API docs (https://docs.kick.com/apis/chat):
-        - type: "user" - Send as yourself using your own OAuth token
-        - type: "bot" - Has 500 error bug on Kick's side
-        
-        For bot accounts: Use the bot's own OAuth token with type "user"
-        For streamer accounts: Use the streamer's OAuth token with type "user"
-        
-        Note: Bot must be authorized (e.g., as moderator) to send messages in the channel
-        """
-        # Use the token that was set for this connector (bot or streamer)
+    def _send_target(self):
+        """(broadcaster_user_id, headers) for chat sends, resolved once per token"""
         token_to_use = self.access_token
-        
-        if not token_to_use:
-            logger.error(f"✗ Kick: Cannot send message - no OAuth access token")
-            return False
-        
+        cached = self._send_target_cache
+        if cached and cached[0] == token_to_use and cached[1] == self.broadcaster_user_id:
+            return cached[2], cached[3]
+
         # Get broadcaster_user_id - use our own if set, otherwise get from config
         broadcaster_id = self.broadcaster_user_id
         if not broadcaster_id and self.config:
@@ -848,61 +930,73 @@ class KickConnector(BasePlatformConnector):
             broadcaster_id = kick_config.get('streamer_user_id') or kick_config.get('broadcaster_user_id')
             if broadcaster_id:
                 logger.debug(f"Using broadcaster_user_id from config: {broadcaster_id}")
-        
+
         if not broadcaster_id:
             logger.error(f"✗ Kick: Cannot send - missing broadcaster_user_id")
             if self.config:
                 kick_config = self.config.get_platform_config('kick')
                 logger.debug(f"Config keys available: {list(kick_config.keys())}")
-            return False
-        
-        try:
-            url = f"{self.API_BASE}/chat"
-            
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {token_to_use}",
-                "User-Agent": "AudibleZenBot/1.0"
-            }
-            
-            # Always use type "user" - it sends as the user who owns the OAuth token
-            # (type "bot" returns HTTP 500 error on Kick's side)
-            payload = {
-                "broadcaster_user_id": int(broadcaster_id),
-                "content": message,
-                "type": "user"
-            }
-            
-            account_type = "bot" if self.is_bot_account else "streamer"
-            token_preview = token_to_use[:20] if len(token_to_use) > 20 else token_to_use
-            logger.info(f"Sending as {account_type} account (token: {token_preview}...) to broadcaster: {broadcaster_id}")
-            logger.debug(f"Payload: {payload}")
-            
-            session = make_retry_session() if make_retry_session else requests.Session()
-            try:
-                response = session.post(url, headers=headers, json=payload, timeout=10)
-            except requests.exceptions.RequestException as e:
-                logger.exception(f"✗ Kick: Network error sending message: {e}")
-                return False
+            return None, None
 
-            if response.status_code == 200:
-                result = response.json()
-                logger.info("✓ Kick: Message sent successfully!")
-                return True
-            elif response.status_code == 401:
-                logger.error(f"✗ Kick: Failed (HTTP 401): {response.text[:200]}")
-                if self.is_bot_account:
-                    logger.warning("Note: Bot messages require valid STREAMER token.")
-                    logger.warning("Make sure the streamer is logged in and connected to Kick.")
-                return False
-            else:
-                logger.error(f"✗ Kick: Failed (HTTP {response.status_code}): {response.text[:200]}")
-                return False
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_to_use}",
+            "User-Agent": "AudibleZenBot/1.0"
+        }
+        self._send_target_cache = (token_to_use, self.broadcaster_user_id, int(broadcaster_id), headers)
+        return int(broadcaster_id), headers
 
+    def _send_once(self, message: str) -> SendResult:
+        """One POST to /chat; the outbound dispatcher paces and retries"""
+        if not self.access_token:
+            logger.error(f"✗ Kick: Cannot send message - no OAuth access token")
+            return SendResult(False, error='no access token')
+        broadcaster_id, headers = self._send_target()
+        if not broadcaster_id:
+            return SendResult(False, error='no broadcaster_user_id')
+
+        # Always use type "user" - it sends as the user who owns the OAuth token
+        # (type "bot" returns HTTP 500 error on Kick's side)
+        payload = {
+            "broadcaster_user_id": broadcaster_id,
+            "content": message,
+            "type": "user"
+        }
+        if self._send_session is None:
+            self._send_session = make_send_session(make_retry_session)
+        try:
+            response = self._send_session.post(f"{self.API_BASE}/chat", headers=headers, json=payload, timeout=10)
         except Exception as e:
-            logger.exception(f"✗ Kick: Error sending message: {e}")
+            logger.warning(f"✗ Kick: Network error sending message: {e}")
+            return SendResult.network_error(e)
+
+        result = SendResult.from_response(response)
+        if result.ok:
+            logger.info("✓ Kick: Message sent successfully!")
+        else:
+            logger.error(f"✗ Kick: Failed (HTTP {response.status_code}): {result.error}")
+            if response.status_code == 401 and self.is_bot_account:
+                logger.warning("Note: Bot messages require valid STREAMER token.")
+                logger.warning("Make sure the streamer is logged in and connected to Kick.")
+        return result
+
+    def send_message(self, message: str):
+        """Send a chat message using Kick's /chat API endpoint and wait for delivery
+        
+        According to Kick API docs (https://docs.kick.com/apis/chat):
+        - type: "user" - Send as yourself using your own OAuth token
+        - type: "bot" - Has 500 error bug on Kick's side
+        
+        For bot accounts: Use the bot's own OAuth token with type "user"
+        For streamer accounts: Use the streamer's OAuth token with type "user"
+        
+        Note: Bot must be authorized (e.g., as moderator) to send messages in the channel
+        """
+        if not self.access_token:
+            logger.error(f"✗ Kick: Cannot send message - no OAuth access token")
             return False
+        return self.outbound().send(message)
     
     def connect_chat_websocket(self):
         """Connect to Kick's chat WebSocket for sending messages"""
@@ -980,41 +1074,51 @@ class KickConnector(BasePlatformConnector):
             logger.exception(f"✗ Kick: Error connecting to chat WebSocket: {e}")
     
     def start_health_monitoring(self):
-        """Start background thread to monitor webhook health"""
-        def health_check_worker():
-            import time
-            logger.info(f"Health monitoring started (checking every {self.health_check_interval}s)")
-            
-            while self.subscription_active:
-                time.sleep(self.health_check_interval)
-                
-                if not self.subscription_active:
-                    break
-                
-                # Check if we've received messages recently
-                if self.last_message_time:
-                    time_since_last = time.time() - self.last_message_time
-                    
-                    if time_since_last > self.health_check_interval:
-                        logger.warning(f"⚠ Kick: No messages received for {int(time_since_last)}s")
-                        logger.info(f"Verifying subscription status...")
-                        
-                        # Verify subscription is still active
-                        if not self.verify_subscription():
-                            logger.warning(f"⚠ Kick: Subscription not active, attempting to resubscribe...")
-                            if self.subscribe_to_chat_events():
-                                logger.info(f"✓ Kick: Successfully resubscribed")
-                            else:
-                                logger.error(f"✗ Kick: Failed to resubscribe")
-                                safe_emit(self.error_occurred, "Kick webhook subscription failed")
-            
-            logger.info(f"Health monitoring stopped")
-        
-        self.health_check_thread = Thread(target=health_check_worker, daemon=True)
+        """Register the webhook subscription probe with the health supervisor"""
         if not startup_allowed():
-            logger.info("[KickConnector] CI mode: skipping health_check thread start")
+            logger.info("[KickConnector] CI mode: skipping health monitoring")
+            return
+        supervisor = get_health_supervisor()
+        supervisor.unregister(self._health)
+        self._subscription_verified_at = None
+        # verify_subscription() retries, so allow it longer than a plain probe
+        self._health = supervisor.register(f"Kick webhook:{self.channel_name}", self._probe_subscription,
+                                           interval=60, timeout=30, escalate=self._resubscribe, platform='kick')
+        logger.info(f"Health monitoring started (verifying after {self.health_check_interval}s without messages)")
+
+    def stop_health_monitoring(self):
+        get_health_supervisor().unregister(self._health)
+        self._health = None
+
+    def _probe_subscription(self):
+        """Health probe: verify the subscription once chat has been quiet for a while"""
+        now = time.time()
+        age = None if self.last_message_time is None else now - self.last_message_time
+        if not self.subscription_active:
+            return ProbeResult(WARN, 'Not subscribed', last_message_age=age, subscription='inactive')
+        if age is None or age <= self.health_check_interval:
+            return ProbeResult(OK, 'Receiving', last_message_age=age, subscription='active')
+        verified = self._subscription_verified_at
+        if verified is not None and now - verified < self.health_check_interval:
+            return ProbeResult(OK, f"Quiet for {age:.0f}s", last_message_age=age, subscription='verified')
+        logger.warning(f"⚠ Kick: No messages received for {int(age)}s")
+        logger.info(f"Verifying subscription status...")
+        if self.verify_subscription():
+            self._subscription_verified_at = now
+            return ProbeResult(OK, f"Quiet for {age:.0f}s", last_message_age=age, subscription='verified')
+        return ProbeResult(DEAD, 'Subscription not active', last_message_age=age, subscription='missing')
+
+    def _resubscribe(self, result):
+        """Escalation for the subscription probe"""
+        if not self.subscription_active:
+            return
+        logger.warning(f"⚠ Kick: Subscription not active, attempting to resubscribe...")
+        if self.subscribe_to_chat_events():
+            self._subscription_verified_at = time.time()
+            logger.info(f"✓ Kick: Successfully resubscribed")
         else:
-            self.health_check_thread.start()
+            logger.error(f"✗ Kick: Failed to resubscribe")
+            safe_emit(self.error_occurred, "Kick webhook subscription failed")
     
     def verify_subscription(self):
         """Verify that webhook subscription is still active"""
@@ -0,0 +1,216 @@
+"""
+Kick Pusher read mode - chat without webhooks or a tunnel
+
+Kick's own web client reads chat from a public Pusher channel,
+`chatrooms.<chatroom id>.v2`. KickPusherReader subscribes to that channel
+on an asyncio websocket and decodes chatroom events into the same payload
+shape the webhook route produces, so messages go through
+KickConnector.handle_chat_message (dedupe, badges, events, signal emission)
+exactly as webhook messages do. No ngrok tunnel or public URL is needed.
+
+The reader runs as a task on the shared connector runtime (see
+core/connector_runtime.py) unless `connectors.shared_runtime` is off.
+
+The connector picks this mode when webhooks aren't configured (config
+`kick.read_mode`: 'auto', 'webhook' or 'pusher'). The app key and cluster
+can be overridden with `kick.pusher_key` / `kick.pusher_cluster`.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Callable, Optional, Tuple
+
+from core.connector_runtime import get_connector_runtime, shared_runtime_enabled
+from core.logger import get_logger
+
+try:
+    import websockets
+except Exception:
+    websockets = None
+
+logger = get_logger('KickPusher')
+
+DEFAULT_PUSHER_KEY = '32cbd69e4b950bf97679'
+DEFAULT_PUSHER_CLUSTER = 'us2'
+PUSHER_URL = 'wss://ws-{cluster}.pusher.com/app/{key}?protocol=7&client=js&version=8.4.0-rc2&flash=false'
+
+CHAT_EVENT = 'App\\Events\\ChatMessageEvent'
+DELETE_EVENT = 'App\\Events\\MessageDeletedEvent'
+
+# Reconnect backoff bounds (seconds)
+MIN_RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+
+def pusher_url(key: Optional[str] = None, cluster: Optional[str] = None) -> str:
+    return PUSHER_URL.format(key=key or DEFAULT_PUSHER_KEY, cluster=cluster or DEFAULT_PUSHER_CLUSTER)
+
+
+def _chat_payload(data: dict) -> dict:
+    """Map a ChatMessageEvent body onto the webhook chat.message.sent shape."""
+    sender = data.get('sender', {}) or {}
+    identity = sender.get('identity', {}) or {}
+    return {
+        'id': data.get('id'),
+        'content': data.get('content', ''),
+        'created_at': data.get('created_at', ''),
+        'type': data.get('type'),
+        'sender': {
+            'username': sender.get('username') or sender.get('slug') or 'Unknown',
+            'user_id': sender.get('id'),
+            'identity': {
+                'username_color': identity.get('color') or identity.get('username_color') or '#FFFFFF',
+                'badges': identity.get('badges', []),
+            },
+        },
+    }
+
+
+def decode_pusher_event(raw) -> Tuple[str, dict]:
+    """Decode one Pusher frame into (kind, payload).
+
+    kind is 'chat', 'deleted', 'ping', 'subscribed', 'connected', 'error' or ''
+    (ignored); Pusher double-encodes `data` as a JSON string.
+    """
+    try:
+        frame = json.loads(raw)
+    except Exception:
+        return '', {}
+    if not isinstance(frame, dict):
+        return '', {}
+    event = frame.get('event', '')
+    data = frame.get('data')
+    if isinstance(data, str):
+        try:
+            data = json.loads(data) if data else {}
+        except Exception:
+            data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    if event == CHAT_EVENT:
+        return 'chat', _chat_payload(data)
+    if event == DELETE_EVENT:
+        message = data.get('message', {}) or {}
+        return 'deleted', {'id': message.get('id') or data.get('id')}
+    if event == 'pusher:ping':
+        return 'ping', {}
+    if event == 'pusher_internal:subscription_succeeded':
+        return 'subscribed', {'channel': frame.get('channel')}
+    if event == 'pusher:connection_established':
+        return 'connected', data
+    if event == 'pusher:error':
+        return 'error', data
+    return '', {}
+
+
+class KickPusherReader:
+    """Read one chatroom from Pusher and feed it to a KickConnector"""
+
+    def __init__(self, connector, chatroom_id, url: Optional[str] = None, connect: Optional[Callable] = None):
+        self.connector = connector
+        self.chatroom_id = chatroom_id
+        self.url = url or pusher_url()
+        self._connect = connect
+        self.running = False
+        self.subscribed = False
+        self.messages = 0
+        self.ws = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._future = None  # Set when hosted on the shared connector runtime
+
+    @property
+    def channel(self) -> str:
+        return f'chatrooms.{self.chatroom_id}.v2'
+
+    async def handle_frame(self, ws, raw):
+        kind, payload = decode_pusher_event(raw)
+        if kind == 'chat':
+            self.messages += 1
+            self.connector.handle_chat_message(payload)
+        elif kind == 'deleted':
+            if payload.get('id'):
+                self.connector.handle_message_deletion(payload)
+        elif kind == 'ping':
+            await ws.send(json.dumps({'event': 'pusher:pong', 'data': {}}))
+        elif kind == 'subscribed':
+            self.subscribed = True
+            logger.info(f"✓ Kick: Reading chat from Pusher channel {self.channel}")
+            self.connector.on_pusher_status(True)
+        elif kind == 'connected':
+            await ws.send(json.dumps({'event': 'pusher:subscribe', 'data': {'auth': '', 'channel': self.channel}}))
+        elif kind == 'error':
+            logger.warning(f"Kick Pusher error: {payload}")
+
+    async def run(self):
+        """Stay subscribed, reconnecting with backoff until stopped."""
+        connect = self._connect or (websockets.connect if websockets is not None else None)
+        if connect is None:
+            self.connector.on_pusher_status(False, "websockets is not installed; Kick Pusher read mode unavailable")
+            return
+        self.running = True
+        delay = MIN_RECONNECT_DELAY
+        while self.running:
+            try:
+                async with connect(self.url) as ws:
+                    self.ws = ws
+                    while self.running:
+                        raw = await ws.recv()
+                        if raw is None or raw == '':
+                            break
+                        if self.subscribed:
+                            delay = MIN_RECONNECT_DELAY
+                        await self.handle_frame(ws, raw)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Kick Pusher connection lost: {e}")
+            finally:
+                self.ws = None
+                if self.subscribed:
+                    self.subscribed = False
+                    self.connector.on_pusher_status(False)
+            if not self.running:
+                break
+            logger.info(f"Reconnecting to Kick Pusher in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(MAX_RECONNECT_DELAY, delay * 2)
+
+    def start(self):
+        """Run the reader on the shared connector runtime, or its own event loop thread."""
+        if shared_runtime_enabled(getattr(self.connector, 'config', None)):
+            runtime = get_connector_runtime()
+            self._future = runtime.submit(self.run(), 'KickPusherReader')
+            self.loop = runtime.loop
+            return
+
+        def _thread_main():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self._task = self.loop.create_task(self.run())
+            try:
+                self.loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.exception(f"Kick Pusher reader stopped: {e}")
+            finally:
+                self.loop.close()
+
+        self._thread = threading.Thread(target=_thread_main, name='KickPusherReader', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        if self._future is not None:
+            get_connector_runtime().cancel(self._future)
+            return
+        loop, task = self.loop, self._task
+        if loop is not None and task is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except Exception:
+                pass
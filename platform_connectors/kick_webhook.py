@@ -0,0 +1,264 @@
+"""
+Kick webhook ingestion - verify, enqueue, acknowledge
+
+Kick retries webhooks that aren't acknowledged quickly, so the Flask route
+only checks the signature, pushes the raw body onto a bounded in-memory
+WebhookIngestQueue and returns 200. A dedicated consumer thread drains the
+queue in batches, parses each body once and hands the events to the
+connector (badge normalization, dedupe and signal emission happen there).
+The queue keeps depth and processing-lag metrics.
+
+Signatures use Kick's RSA public key (`Kick-Event-Signature` over
+`<message id>.<timestamp>.<body>`). Verification needs the optional
+`cryptography` package; without it, or without a key, events are accepted
+unverified as before.
+"""
+
+import base64
+import json
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.logger import get_logger
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+except Exception:
+    serialization = None
+
+logger = get_logger('KickWebhook')
+
+PUBLIC_KEY_URL = 'https://api.kick.com/public/v1/public-key'
+
+# Only these headers are kept with a queued event
+EVENT_TYPE_HEADERS = ('Kick-Event-Type', 'X-Kick-Event-Type', 'X-Event-Type', 'Event-Type', 'Event')
+SIGNATURE_HEADERS = ('Kick-Event-Message-Id', 'Kick-Event-Message-Timestamp', 'Kick-Event-Signature')
+
+DEFAULT_QUEUE_SIZE = 2000
+DEFAULT_BATCH_SIZE = 50
+# Warn once the queue is this full or events wait this long (seconds)
+DEPTH_WARN_FRACTION = 0.8
+LAG_WARN_SECONDS = 2.0
+
+
+def pick_headers(headers) -> Dict[str, str]:
+    """Copy just the event-type and signature headers of a request."""
+    picked = {}
+    for key in EVENT_TYPE_HEADERS + SIGNATURE_HEADERS:
+        try:
+            value = headers.get(key)
+        except Exception:
+            value = None
+        if value is not None:
+            picked[key] = value
+    return picked
+
+
+def classify_event(headers: Dict[str, str], data) -> Tuple[str, dict]:
+    """Return (lower-cased event type, payload) for a parsed webhook body."""
+    payload = data.get('data') if isinstance(data, dict) and isinstance(data.get('data'), dict) else data
+    if not isinstance(payload, dict):
+        payload = {}
+
+    event_type = None
+    for key in EVENT_TYPE_HEADERS:
+        if key in headers:
+            event_type = headers[key]
+            break
+    if not event_type:
+        for key in ('event_type', 'type', 'name', 'event'):
+            if payload.get(key):
+                event_type = payload[key]
+                break
+    if isinstance(event_type, dict):
+        event_type = event_type.get('name') or event_type.get('type')
+    try:
+        return (str(event_type).lower() if event_type else ''), payload
+    except Exception:
+        return '', payload
+
+
+class KickWebhookVerifier:
+    """Check Kick-Event-Signature against Kick's RSA public key"""
+
+    def __init__(self, public_key_pem: Optional[str] = None):
+        self._key = None
+        self._warned = False
+        if public_key_pem:
+            self.load_key(public_key_pem)
+
+    @property
+    def available(self) -> bool:
+        return self._key is not None
+
+    def load_key(self, public_key_pem: str) -> bool:
+        if serialization is None:
+            logger.info("cryptography not installed; Kick webhook signatures are not verified")
+            return False
+        try:
+            pem = public_key_pem.encode('utf-8') if isinstance(public_key_pem, str) else public_key_pem
+            self._key = serialization.load_pem_public_key(pem)
+            return True
+        except Exception as e:
+            logger.warning(f"Invalid Kick webhook public key: {e}")
+            self._key = None
+            return False
+
+    def fetch_key(self, session) -> bool:
+        """Load the key published by Kick."""
+        if serialization is None:
+            return False
+        try:
+            response = session.get(PUBLIC_KEY_URL, timeout=10)
+            if response.status_code != 200:
+                logger.warning(f"Could not fetch Kick webhook public key: HTTP {response.status_code}")
+                return False
+            data = response.json().get('data', {}) or {}
+            return self.load_key(data.get('public_key', ''))
+        except Exception as e:
+            logger.warning(f"Could not fetch Kick webhook public key: {e}")
+            return False
+
+    def verify(self, headers: Dict[str, str], body: bytes) -> bool:
+        """True if the signature is valid, or if verification isn't possible."""
+        if self._key is None:
+            if not self._warned:
+                self._warned = True
+                logger.debug("No Kick webhook public key loaded; accepting events unverified")
+            return True
+        signature = headers.get('Kick-Event-Signature')
+        message_id = headers.get('Kick-Event-Message-Id')
+        timestamp = headers.get('Kick-Event-Message-Timestamp')
+        if not (signature and message_id and timestamp):
+            return False
+        try:
+            signed = f'{message_id}.{timestamp}.'.encode('utf-8') + body
+            self._key.verify(base64.b64decode(signature), signed, padding.PKCS1v15(), hashes.SHA256())
+            return True
+        except (InvalidSignature, ValueError, TypeError):
+            return False
+
+
+class WebhookIngestQueue:
+    """Bounded queue of raw webhook bodies drained in batches by one consumer thread"""
+
+    def __init__(self, process_batch: Callable[[List[tuple]], None], maxsize: int = DEFAULT_QUEUE_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE, name: str = 'KickWebhookConsumer'):
+        self._process_batch = process_batch
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=maxsize)
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.name = name
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._depth_warned = False
+        # Metrics
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    def offer(self, headers: Dict[str, str], body: bytes) -> bool:
+        """Enqueue one raw event without blocking; False if the queue is full."""
+        try:
+            self._queue.put_nowait((time.time(), headers, body))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.received += 1
+            depth = self._queue.qsize()
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if depth >= self.maxsize * DEPTH_WARN_FRACTION and not self._depth_warned:
+                self._depth_warned = True
+                logger.warning(f"Kick webhook queue is {depth}/{self.maxsize} deep; consumer is falling behind")
+        return True
+
+    def drain(self, block: bool = False, timeout: float = 0.5) -> int:
+        """Process up to one batch; returns how many events were handled."""
+        try:
+            first = self._queue.get(block=block, timeout=timeout if block else None)
+        except queue.Empty:
+            return 0
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        now = time.time()
+        lag = now - batch[0][0]
+        try:
+            self._process_batch([(headers, body) for _, headers, body in batch])
+        except Exception as e:
+            logger.exception(f"Kick webhook batch failed: {e}")
+        with self._lock:
+            self.processed += len(batch)
+            self.batches += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.avg_lag = lag if self.batches == 1 else self.avg_lag * 0.9 + lag * 0.1
+            if self._queue.qsize() < self.maxsize * DEPTH_WARN_FRACTION / 2:
+                self._depth_warned = False
+        if lag > LAG_WARN_SECONDS:
+            logger.warning(f"Kick webhook events waited {lag:.1f}s before processing")
+        return len(batch)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.drain(block=True)
+            except Exception as e:
+                logger.exception(f"Kick webhook consumer error: {e}")
+        # Process whatever was accepted before stopping
+        while self.drain():
+            pass
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                'depth': self._queue.qsize(),
+                'max_depth': self.max_depth,
+                'capacity': self.maxsize,
+                'received': self.received,
+                'processed': self.processed,
+                'dropped': self.dropped,
+                'batches': self.batches,
+                'last_lag_ms': round(self.last_lag * 1000, 1),
+                'avg_lag_ms': round(self.avg_lag * 1000, 1),
+                'max_lag_ms': round(self.max_lag * 1000, 1),
+            }
+
+
+def parse_body(body: bytes):
+    try:
+        return json.loads(body) if body else {}
+    except Exception:
+        return {}
@@ -26,6 +26,10 @@ try:
     from core.http_session import make_retry_session
 except Exception:
     make_retry_session = None
+from core.outbound import SendResult, make_send_session
+from core.connector_runtime import worker_host
+from core.backfill import BACKFILL_SETTLE_SECONDS, GapTracker
+from core.health_supervisor import PING_TIMEOUT, close_websocket, get_health_supervisor, websocket_probe
 
 # Ensure `connect` exists on the imported `websockets` module for environments
 # where a local stub or different websockets version is used. Tests patch
@@ -157,7 +161,8 @@ class TrovoConnector(BasePlatformConnector):
                 if not startup_allowed():
                     logger.info("[TrovoConnector] CI mode: skipping TrovoWorker.start()")
                     return
-                self.worker.start()
+                self.worker_thread = worker_host(self.worker, config=self.config)
+                self.worker_thread.start()
             except Exception as e:
                 logger.error(f"[TrovoConnector] Error starting TrovoWorker: {e}")
                 self.worker = None
@@ -168,6 +173,9 @@ class TrovoConnector(BasePlatformConnector):
     CLIENT_ID = ""
     CLIENT_SECRET = ""
 
+    OUTBOUND_PLATFORM = 'trovo'
+    SEND_URL = 'https://open-api.trovo.live/openplatform/chat/send'
+
     def __init__(self, config=None):
         super().__init__()
         self.worker_thread = None
@@ -181,6 +189,8 @@ class TrovoConnector(BasePlatformConnector):
         self.last_status = False
         self.message_cache = {}  # Cache message_id -> user_id mapping for deletion
         self._skip_next_refresh = False  # Skip refresh after fresh OAuth login
+        self._send_session = None
+        self._send_target_cache = None  # (access_token, channel_id, headers)
         # Load token from config if available
         if self.config:
             trovo_config = self.config.get_platform_config('trovo')
@@ -348,16 +358,18 @@ class TrovoConnector(BasePlatformConnector):
                 except Exception as e:
                     logger.error(f"[TrovoConnector] Error stopping worker: {e}")
                 try:
-                    # Wait up to 5 seconds for the thread to finish
-                    self.worker.wait(5000)
+                    # Wait up to 5 seconds for the worker to finish
+                    (getattr(self, 'worker_thread', None) or self.worker).wait(5000)
                 except Exception:
                     pass
             self.connected = False
+            self.stop_outbound()
             try:
                 safe_emit(self.connection_status, False)
             except Exception:
                 pass
             self.worker = None
+            self.worker_thread = None
 
     def ban_user(self, username: str, user_id: str = None):
         """Ban a user from Trovo chat"""
@@ -418,153 +430,95 @@ class TrovoConnector(BasePlatformConnector):
         self.last_status = connected
         safe_emit(self.connection_status, connected)
     
-    def send_message(self, message: str):
-        """Send a message to Trovo chat via REST API"""
-        if not self.access_token:
-            logger.warning("[Trovo] Cannot send message: No access token")
-            return False
-        
-        if not self.config:
-            logger.warning("[Trovo] Cannot send message: No config available")
-            return False
-        
+    def _log_send(self, line: str):
+        """Append a diagnostic line to logs/chatmanager_sends.log"""
         try:
-            # Diagnostic: persistent send log entry (pre-send)
-            try:
-                log_dir = os.path.join(os.getcwd(), 'logs')
-                os.makedirs(log_dir, exist_ok=True)
-                with open(os.path.join(log_dir, 'chatmanager_sends.log'), 'a', encoding='utf-8', errors='replace') as sf:
-                    sf.write(f"{time.time():.3f} platform=trovo used={'bot' if self.is_bot_account else 'streamer'} token_prefix={self.access_token[:12] if self.access_token else 'None'} preview={repr(message)[:200]}\n")
-            except Exception:
-                pass
+            log_dir = os.path.join(os.getcwd(), 'logs')
+            os.makedirs(log_dir, exist_ok=True)
+            with open(os.path.join(log_dir, 'chatmanager_sends.log'), 'a', encoding='utf-8', errors='replace') as sf:
+                sf.write(f"{time.time():.3f} platform=trovo {line} used={'bot' if self.is_bot_account else 'streamer'}\n")
+        except Exception:
+            pass
 
-            # Debug: Show which token is being used
-            token_prefix = self.access_token[:12] if self.access_token else "None"
-            logger.debug(f"[Trovo] send_message: Using token (first 12 chars): {token_prefix}...")
+    def _send_target(self):
+        """(channel_id, headers) for chat sends, resolved once per access token"""
+        cached = self._send_target_cache
+        if cached and cached[0] == self.access_token:
+            return cached[1], cached[2]
 
-            # Get config (don't reload to preserve in-memory token)
-            trovo_config = self.config.get_platform_config('trovo')
-            logger.debug(f"[Trovo] send_message: Config keys: {list(trovo_config.keys())}")
-
-            # Try multiple possible field names for channel_id
-            channel_id = (
-                trovo_config.get('streamer_channel_id') or 
-                trovo_config.get('channel_id') or
-                trovo_config.get('streamer_user_id') or
-                trovo_config.get('user_id')
-            )
-            logger.debug(f"[Trovo] send_message: channel_id from config = {channel_id}")
+        # Get config (don't reload to preserve in-memory token)
+        trovo_config = self.config.get_platform_config('trovo')
+        # Try multiple possible field names for channel_id
+        channel_id = (
+            trovo_config.get('streamer_channel_id') or
+            trovo_config.get('channel_id') or
+            trovo_config.get('streamer_user_id') or
+            trovo_config.get('user_id')
+        )
+        if not channel_id:
+            logger.warning(f"[Trovo] Cannot send message: No channel_id found in config. Available keys: {list(trovo_config.keys())}")
+            return None, None
 
-            if not channel_id:
-                logger.warning(f"[Trovo] Cannot send message: No channel_id found in config. Available keys: {list(trovo_config.keys())}")
-                return False
+        headers = {
+            'Accept': 'application/json',
+            'Client-ID': self.CLIENT_ID,
+            'Authorization': f'OAuth {self.access_token}',
+            'Content-Type': 'application/json'
+        }
+        self._send_target_cache = (self.access_token, str(channel_id), headers)
+        return str(channel_id), headers
 
-            headers = {
-                'Accept': 'application/json',
-                'Client-ID': self.CLIENT_ID,
-                'Authorization': f'OAuth {self.access_token}',
-                'Content-Type': 'application/json'
-            }
+    def _send_once(self, message: str, _refreshed: bool = False) -> SendResult:
+        """One chat send attempt; the outbound dispatcher paces and retries"""
+        if not self.access_token or not self.config:
+            return SendResult(False, error='not configured')
+        channel_id, headers = self._send_target()
+        if not channel_id:
+            return SendResult(False, error='no channel_id')
 
-            data = {
-                'content': message,
-                'channel_id': str(channel_id)
-            }
+        if self._send_session is None:
+            self._send_session = make_send_session(make_retry_session)
+        try:
+            response = self._send_session.post(
+                self.SEND_URL,
+                headers=headers,
+                json={'content': message, 'channel_id': channel_id},
+                timeout=10
+            )
+        except Exception as e:
+            logger.warning(f"[Trovo] Network error sending message: {e}")
+            self._log_send(f"event=send_network_error err={repr(str(e))}")
+            return SendResult.network_error(e)
 
-            session = make_retry_session() if make_retry_session else requests.Session()
-            try:
-                response = session.post(
-                    'https://open-api.trovo.live/openplatform/chat/send',
-                    headers=headers,
-                    json=data,
-                    timeout=10
-                )
-            except requests.exceptions.RequestException as e:
-                logger.exception(f"[Trovo] Network error sending message: {e}")
-                # Persist failure then return
-                try:
-                    log_dir = os.path.join(os.getcwd(), 'logs')
-                    os.makedirs(log_dir, exist_ok=True)
-                    with open(os.path.join(log_dir, 'chatmanager_sends.log'), 'a', encoding='utf-8', errors='replace') as sf:
-                        sf.write(f"{time.time():.3f} platform=trovo event=send_network_error err={repr(str(e))}\n")
-                except Exception:
-                    pass
-                return False
+        self._log_send(f"event=send_response status={response.status_code} channel_id={channel_id} resp_preview={repr(response.text)[:200]}")
+        if response.status_code == 401 and not _refreshed:
+            # Token expired - refresh; the new token invalidates the cached headers
+            logger.warning("[Trovo] Token expired (401), attempting refresh...")
+            if self.refresh_access_token():
+                # A 401 was never posted, so resending with the new token can't duplicate it
+                return self._send_once(message, _refreshed=True)
+            logger.error("[Trovo] Failed to refresh token")
+            return SendResult(False, status=401, error='token refresh failed')
 
-            # Persist the HTTP response for offline diagnosis
-            try:
-                log_dir = os.path.join(os.getcwd(), 'logs')
-                os.makedirs(log_dir, exist_ok=True)
-                with open(os.path.join(log_dir, 'chatmanager_sends.log'), 'a', encoding='utf-8', errors='replace') as sf:
-                    sf.write(f"{time.time():.3f} platform=trovo event=send_response status={response.status_code} used={'bot' if self.is_bot_account else 'streamer'} channel_id={channel_id} resp_preview={repr(response.text)[:200]}\n")
-            except Exception:
-                pass
+        result = SendResult.from_response(response)
+        if result.ok:
+            logger.info(f"[Trovo] Message sent successfully: {message[:50]}...")
+        else:
+            logger.error(f"[Trovo] Failed to send message: {response.status_code} - {result.error}")
+        return result
 
-            if response.status_code == 200:
-                logger.info(f"[Trovo] Message sent successfully: {message[:50]}...")
-                return True
-            elif response.status_code == 401:
-                # Token expired - try to refresh and retry
-                logger.warning(f"[Trovo] Token expired (401), attempting refresh...")
-                if self.refresh_access_token():
-                    logger.info(f"[Trovo] Token refreshed, retrying send...")
-                    # Update headers with new token
-                    headers['Authorization'] = f'OAuth {self.access_token}'
-                    try:
-                        response = session.post(
-                            'https://open-api.trovo.live/openplatform/chat/send',
-                            headers=headers,
-                            json=data,
-                            timeout=10
-                        )
-                    except requests.exceptions.RequestException as e:
-                        logger.exception(f"[Trovo] Network error retrying send after refresh: {e}")
-                        return False
-                    if response.status_code == 200:
-                        logger.info(f"[Trovo] Message sent successfully after token refresh: {message[:50]}...")
-                        try:
-                            log_dir = os.path.join(os.getcwd(), 'logs')
-                            os.makedirs(log_dir, exist_ok=True)
-                            with open(os.path.join(log_dir, 'chatmanager_sends.log'), 'a', encoding='utf-8', errors='replace') as sf:
-                                sf.write(f"{time.time():.3f} platform=trovo event=send_response status={response.status_code} used={'bot' if self.is_bot_account else 'streamer'} channel_id={channel_id} resp_preview={repr(response.text)[:200]}\n")
-                        except Exception:
-                            pass
-                        return True
-                    else:
-                        logger.error(f"[Trovo] Failed after token refresh: {response.status_code} - {response.text}")
-                        try:
-                            log_dir = os.path.join(os.getcwd(), 'logs')
-                            os.makedirs(log_dir, exist_ok=True)
-                            with open(os.path.join(log_dir, 'chatmanager_sends.log'), 'a', encoding='utf-8', errors='replace') as sf:
-                                sf.write(f"{time.time():.3f} platform=trovo event=send_response status={response.status_code} used={'bot' if self.is_bot_account else 'streamer'} channel_id={channel_id} resp_preview={repr(response.text)[:200]}\n")
-                        except Exception:
-                            pass
-                        return False
-                else:
-                    logger.error(f"[Trovo] Failed to refresh token")
-                    return False
-            else:
-                logger.error(f"[Trovo] Failed to send message: {response.status_code} - {response.text}")
-                try:
-                    log_dir = os.path.join(os.getcwd(), 'logs')
-                    os.makedirs(log_dir, exist_ok=True)
-                    with open(os.path.join(log_dir, 'chatmanager_sends.log'), 'a', encoding='utf-8', errors='replace') as sf:
-                        sf.write(f"{time.time():.3f} platform=trovo event=send_response status={response.status_code} used={'bot' if self.is_bot_account else 'streamer'} channel_id={channel_id} resp_preview={repr(response.text)[:200]}\n")
-                except Exception:
-                    pass
-                return False
+    def send_message(self, message: str):
+        """Send a message to Trovo chat via REST API and wait for delivery"""
+        if not self.access_token:
+            logger.warning("[Trovo] Cannot send message: No access token")
+            return False
 
-        except Exception as e:
-            logger.exception(f"[Trovo] Error sending message: {e}")
-            try:
-                log_dir = os.path.join(os.getcwd(), 'logs')
-                os.makedirs(log_dir, exist_ok=True)
-                with open(os.path.join(log_dir, 'chatmanager_sends.log'), 'a', encoding='utf-8', errors='replace') as sf:
-                    sf.write(f"{time.time():.3f} platform=trovo event=send_exception err={repr(str(e))} used={'bot' if self.is_bot_account else 'streamer'}\n")
-            except Exception:
-                pass
+        if not self.config:
+            logger.warning("[Trovo] Cannot send message: No config available")
             return False
 
+        return self.outbound().send(message)
+
 
 
 class TrovoWorker(QThread):
@@ -596,23 +550,21 @@ class TrovoWorker(QThread):
         self.max_seen_ids = 10000  # Prevent unbounded growth
         self.last_message_time = None  # For health monitoring
         self.connection_timeout = 180  # 3 minutes
+        self._ping_sent_at = None
+        self.ping_rtt_ms = None  # Round trip of the last PING/PONG
+        self._health = None  # HealthSupervisor probe for the current connection
+        self.gaps = GapTracker(f"Trovo:{channel}")
+        self._backfill_gap = None  # Open reconnect gap while the history replay arrives
+        self._backfill_count = 0
+        self.runtime_host = None  # Set when hosted on the shared connector runtime
 
     def run(self):
-        logger.info("[TrovoWorker] Starting run()")
-        self.running = True
-        safe_emit(self.status_signal, True)
+        """Run on this thread's own event loop (when not on the shared connector runtime)"""
         try:
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
             try:
-                # Step 1: Get chat token
-                self.chat_token = self.get_chat_token()
-                if not self.chat_token:
-                    logger.error("[TrovoWorker] Failed to get chat token. Aborting connection.")
-                    return
-                self.loop.run_until_complete(self.connect_to_trovo())
-            except Exception as e:
-                logger.exception(f"[TrovoWorker] Error in worker run inner loop: {e}")
+                self.loop.run_until_complete(self.run_async())
             finally:
                 if self.loop and not self.loop.is_closed():
                     self.loop.close()
@@ -620,6 +572,21 @@ class TrovoWorker(QThread):
             logger.exception(f"[TrovoWorker] Exception in run(): {e}")
             return
 
+    async def run_async(self):
+        logger.info("[TrovoWorker] Starting run()")
+        self.running = True
+        self.loop = asyncio.get_running_loop()
+        safe_emit(self.status_signal, True)
+        try:
+            # Step 1: Get chat token (blocking HTTP, kept off the event loop)
+            self.chat_token = await asyncio.to_thread(self.get_chat_token)
+            if not self.chat_token:
+                logger.error("[TrovoWorker] Failed to get chat token. Aborting connection.")
+                return
+            await self.connect_to_trovo()
+        except Exception as e:
+            logger.exception(f"[TrovoWorker] Error in worker run inner loop: {e}")
+
     def get_chat_token(self):
         access_token = (self.access_token or "").strip()
         logger.debug("[TrovoWorker] Entered get_chat_token()")
@@ -728,6 +695,25 @@ class TrovoWorker(QThread):
             return None
 
     async def connect_to_trovo(self):
+        """Stay connected to Trovo chat, reconnecting with backoff until stopped"""
+        retry_count = 0
+        while True:
+            connected = await self._connect_once()
+            if not self.running:
+                break
+            self.gaps.disconnected()
+            safe_emit(self.status_signal, False)
+            retry_count = 0 if connected else retry_count + 1
+            if retry_count >= 3:
+                # Repeated failures: the chat token may have expired
+                self.chat_token = await asyncio.to_thread(self.get_chat_token) or self.chat_token
+            wait_time = min(2 ** retry_count, 60)
+            logger.info(f"[TrovoWorker] Disconnected; reconnecting in {wait_time}s")
+            await asyncio.sleep(wait_time)
+
+    async def _connect_once(self) -> bool:
+        """One connection: AUTH, then listen until it closes. Returns True if AUTH completed."""
+        authed = False
         try:
             # Disable built-in ping/pong since Trovo uses custom protocol
             async with connect_with_retry(websockets.connect, self.TROVO_CHAT_WS_URL, ping_interval=None) as ws:
@@ -749,24 +735,40 @@ class TrovoWorker(QThread):
                 self.connection_time = time.time()
                 self.last_message_time = time.time()
                 logger.info(f"[TrovoWorker] Connection established at {self.connection_time}")
+                authed = True
+                safe_emit(self.status_signal, True)
+                # Trovo replays recent chat right after AUTH; after a reconnect the part
+                # sent during the gap is delivered instead of being filtered as old
+                self._backfill_gap = self.gaps.connected(self.connection_time)
+                self._backfill_count = 0
+                if self._backfill_gap is not None:
+                    asyncio.get_running_loop().call_later(BACKFILL_SETTLE_SECONDS, self._finish_backfill, self._backfill_gap)
                 # Start ping task
                 ping_task = asyncio.create_task(self.ping_loop(ws))
-                # Start health monitoring
-                health_task = asyncio.create_task(self.health_check_loop(ws))
+                # Register with the health supervisor
+                self._health = self._register_health(ws)
                 # Listen for messages
-                await self.listen(ws)
+                try:
+                    await self.listen(ws)
+                finally:
+                    get_health_supervisor().unregister(self._health)
                 ping_task.cancel()
-                health_task.cancel()
                 try:
                     await ping_task
                 except asyncio.CancelledError:
                     pass
-                try:
-                    await health_task
-                except asyncio.CancelledError:
-                    pass
         except Exception as e:
             logger.exception(f"[TrovoWorker] WebSocket connection error: {e}")
+        self._finish_backfill()
+        return authed
+
+    def _finish_backfill(self, expected=None):
+        """Report the gap once the post-AUTH history replay has been handled"""
+        gap = self._backfill_gap
+        if gap is None or (expected is not None and gap is not expected):
+            return
+        self._backfill_gap = None
+        self.gaps.finish(gap, self._backfill_count)
 
     async def ping_loop(self, ws):
         while self.running:
@@ -774,6 +776,7 @@ class TrovoWorker(QThread):
             nonce = self._random_nonce()
             ping_msg = {"type": "PING", "nonce": nonce}
             try:
+                self._ping_sent_at = time.perf_counter()
                 await ws.send(json.dumps(ping_msg))
                 logger.debug(f"[TrovoWorker] Sent PING with nonce {nonce}")
             except Exception as e:
@@ -804,6 +807,9 @@ class TrovoWorker(QThread):
                 gap = data.get("data", {}).get("gap")
                 if gap:
                     self.ping_gap = gap
+                if self._ping_sent_at is not None:
+                    self.ping_rtt_ms = (time.perf_counter() - self._ping_sent_at) * 1000.0
+                    self._ping_sent_at = None
                 logger.debug(f"[TrovoWorker] Received PONG, set ping gap to {self.ping_gap}s")
             elif msg_type == "CHAT":
                 logger.debug(f"[TrovoWorker] Processing CHAT message: {data}")
@@ -825,11 +831,17 @@ class TrovoWorker(QThread):
                             self.seen_message_ids = set(list(self.seen_message_ids)[self.max_seen_ids // 2:])
                             logger.debug(f"[TrovoWorker] Trimmed seen_message_ids to {len(self.seen_message_ids)}")
                     
-                    # Filter old messages - only emit messages after connection time
+                    # Filter old messages - only emit messages after connection time,
+                    # except replayed history that falls inside a reconnect gap
                     send_time = chat.get("send_time", 0)
+                    backfilled = False
                     if self.connection_time and send_time < self.connection_time:
-                        logger.debug(f"[TrovoWorker] Skipping old message (send_time: {send_time} < connection_time: {self.connection_time})")
-                        continue
+                        gap = self._backfill_gap
+                        if gap is None or not gap.accepts(send_time, msg_id):
+                            logger.debug(f"[TrovoWorker] Skipping old message (send_time: {send_time} < connection_time: {self.connection_time})")
+                            continue
+                        backfilled = True
+                        self._backfill_count += 1
                     
                     username = chat.get("nick_name", chat.get("user_name", "TrovoUser"))
                     message = chat.get("content", "")
@@ -868,6 +880,8 @@ class TrovoWorker(QThread):
                         'message_id': msg_id,
                         'user_id': user_id
                     }
+                    if backfilled:
+                        metadata['backfilled'] = True
                     
                     # Detect Trovo events based on type or content
                     # Type 5001 = Subscription
@@ -918,6 +932,10 @@ class TrovoWorker(QThread):
                     logger.debug(f"[TrovoWorker] Emitting message from {username}: {message} with badges: {badges}")
                     from .connector_utils import emit_chat
                     emit_chat(self, 'trovo', username, message, metadata)
+                    self.gaps.delivered(msg_id, send_time)
+                if self._backfill_gap is not None and chats:
+                    # The replay arrives as the first CHAT frame after AUTH
+                    self._finish_backfill()
             elif msg_type == "MESSAGE_DELETE" or msg_type == "DELETE":
                 # Handle message deletion events
                 logger.debug(f"[TrovoWorker] Processing deletion message: {data}")
@@ -947,30 +965,32 @@ class TrovoWorker(QThread):
     def _random_nonce(self, length=12):
         return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
     
-    async def health_check_loop(self, websocket):
-        """Monitor connection health and force reconnect if dead"""
-        while self.running:
-            try:
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-                if self.last_message_time:
-                    time_since_last = time.time() - self.last_message_time
-                    
-                    if time_since_last > self.connection_timeout:
-                        logger.warning(f"[TrovoWorker] Connection appears dead ({int(time_since_last)}s since last message)")
-                        logger.info(f"[TrovoWorker] Forcing reconnection...")
-                        await websocket.close()
-                        break
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.exception(f"[TrovoWorker] Health check error: {e}")
+    def _register_health(self, websocket):
+        """Register this connection's probe with the health supervisor.
+
+        Trovo answers our PING every `ping_gap` seconds, so two missed PONGs
+        mean the socket has stalled well before `connection_timeout`.
+        """
+        loop = asyncio.get_running_loop()
+        probe = websocket_probe(
+            websocket, loop, lambda: self.last_message_time,
+            lambda: min(self.connection_timeout, 2 * self.ping_gap + PING_TIMEOUT),
+            rtt=lambda: self.ping_rtt_ms)
+        name = f"Trovo:{self.channel}" if self.channel else "Trovo"
+        return get_health_supervisor().register(name, probe, escalate=close_websocket(websocket, loop),
+                                                platform='trovo')
 
     def stop(self):
         self.running = False
+        get_health_supervisor().unregister(self._health)
         if self.loop and self.ws:
             asyncio.run_coroutine_threadsafe(self.ws.close(), self.loop)
 
+        if self.runtime_host is not None:
+            # Hosted on the shared connector loop: cancel only this worker's tasks
+            self.runtime_host.terminate()
+            return
+
         # Schedule cooperative shutdown and stop the loop
         try:
             if self.loop and not (self.loop.is_closed()):
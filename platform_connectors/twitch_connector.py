@@ -12,6 +12,8 @@ import json
 from typing import Optional
 from platform_connectors.qt_compat import QThread, pyqtSignal
 from platform_connectors.base_connector import BasePlatformConnector
+from core.connector_runtime import worker_host
+from core.health_supervisor import get_health_supervisor, websocket_probe
 from core.badge_manager import get_badge_manager
 import websockets
 from core.logger import get_logger
@@ -280,9 +282,8 @@ class TwitchConnector(BasePlatformConnector):
                 except Exception:
                     pass
 
-                # Create a fresh thread and move the existing worker into it
-                self.worker_thread = QThread()
-                existing_worker.moveToThread(self.worker_thread)
+                # Host it on the shared connector runtime, or a fresh thread
+                self.worker_thread = worker_host(existing_worker, QThread, self.config)
 
                 # Wire signals similar to fresh creation
                 if not self.is_bot_account:
@@ -298,7 +299,6 @@ class TwitchConnector(BasePlatformConnector):
                 existing_worker.status_signal.connect(self.onStatusChanged)
                 existing_worker.error_signal.connect(self.onError)
 
-                self.worker_thread.started.connect(existing_worker.run)
                 self.worker_thread.start()
 
                 try:
@@ -327,8 +327,7 @@ class TwitchConnector(BasePlatformConnector):
                     self.eventsub_worker.connector = self
                 except Exception:
                     pass
-                self.eventsub_worker_thread = QThread()
-                self.eventsub_worker.moveToThread(self.eventsub_worker_thread)
+                self.eventsub_worker_thread = worker_host(self.eventsub_worker, QThread, self.config)
                 # Wire EventSub signals similar to normal path
                 self.eventsub_worker.redemption_signal.connect(self.onRedemption)
                 self.eventsub_worker.event_signal.connect(self.onEvent)
@@ -338,7 +337,6 @@ class TwitchConnector(BasePlatformConnector):
                     self.eventsub_worker.reauth_signal.connect(self._on_eventsub_reauth_requested)
                 except Exception:
                     pass
-                self.eventsub_worker_thread.started.connect(self.eventsub_worker.run)
                 self.eventsub_worker_thread.start()
                 # Do not create IRC worker for streamer connectors (EventSub handles incoming chat)
                 return
@@ -362,8 +360,7 @@ class TwitchConnector(BasePlatformConnector):
                 self.eventsub_worker.connector = self
             except Exception:
                 pass
-            self.eventsub_worker_thread = QThread()
-            self.eventsub_worker.moveToThread(self.eventsub_worker_thread)
+            self.eventsub_worker_thread = worker_host(self.eventsub_worker, QThread, self.config)
             self.eventsub_worker.redemption_signal.connect(self.onRedemption)
             self.eventsub_worker.event_signal.connect(self.onEvent)
             self.eventsub_worker.status_signal.connect(self.onEventSubStatus)
@@ -373,7 +370,6 @@ class TwitchConnector(BasePlatformConnector):
                 self.eventsub_worker.reauth_signal.connect(self._on_eventsub_reauth_requested)
             except Exception:
                 pass
-            self.eventsub_worker_thread.started.connect(self.eventsub_worker.run)
             self.eventsub_worker_thread.start()
     
     def refresh_access_token(self):
@@ -448,8 +444,7 @@ class TwitchConnector(BasePlatformConnector):
                                 self.client_id,
                                 getattr(self, 'username', None)
                             )
-                            self.eventsub_worker_thread = QThread()
-                            self.eventsub_worker.moveToThread(self.eventsub_worker_thread)
+                            self.eventsub_worker_thread = worker_host(self.eventsub_worker, QThread, self.config)
                             self.eventsub_worker.redemption_signal.connect(self.onRedemption)
                             self.eventsub_worker.event_signal.connect(self.onEvent)
                             self.eventsub_worker.status_signal.connect(self.onEventSubStatus)
@@ -458,7 +453,6 @@ class TwitchConnector(BasePlatformConnector):
                                 self.eventsub_worker.reauth_signal.connect(self._on_eventsub_reauth_requested)
                             except Exception:
                                 pass
-                            self.eventsub_worker_thread.started.connect(self.eventsub_worker.run)
                             self.eventsub_worker_thread.start()
                         except Exception as e:
                             logger.exception(f"[TwitchConnector] Error restarting EventSub worker: {e}")
@@ -615,8 +609,7 @@ class TwitchConnector(BasePlatformConnector):
                                             parent_connector.eventsub_worker.connector = parent_connector
                                         except Exception:
                                             pass
-                                        parent_connector.eventsub_worker_thread = QThread()
-                                        parent_connector.eventsub_worker.moveToThread(parent_connector.eventsub_worker_thread)
+                                        parent_connector.eventsub_worker_thread = worker_host(parent_connector.eventsub_worker, QThread, getattr(parent_connector, 'config', None))
                                         parent_connector.eventsub_worker.redemption_signal.connect(parent_connector.onRedemption)
                                         parent_connector.eventsub_worker.event_signal.connect(parent_connector.onEvent)
                                         parent_connector.eventsub_worker.status_signal.connect(parent_connector.onEventSubStatus)
@@ -625,7 +618,6 @@ class TwitchConnector(BasePlatformConnector):
                                             parent_connector.eventsub_worker.reauth_signal.connect(parent_connector._on_eventsub_reauth_requested)
                                         except Exception:
                                             pass
-                                        parent_connector.eventsub_worker_thread.started.connect(parent_connector.eventsub_worker.run)
                                         parent_connector.eventsub_worker_thread.start()
                                     except Exception:
                                         logger.exception("[TwitchConnector] Error starting parent eventsub worker from callback handler")
@@ -706,8 +698,7 @@ class TwitchConnector(BasePlatformConnector):
                                 self.eventsub_worker.connector = self
                             except Exception:
                                 pass
-                            self.eventsub_worker_thread = QThread()
-                            self.eventsub_worker.moveToThread(self.eventsub_worker_thread)
+                            self.eventsub_worker_thread = worker_host(self.eventsub_worker, QThread, self.config)
                             self.eventsub_worker.redemption_signal.connect(self.onRedemption)
                             self.eventsub_worker.event_signal.connect(self.onEvent)
                             self.eventsub_worker.status_signal.connect(self.onEventSubStatus)
@@ -716,7 +707,6 @@ class TwitchConnector(BasePlatformConnector):
                                 self.eventsub_worker.reauth_signal.connect(self._on_eventsub_reauth_requested)
                             except Exception:
                                 pass
-                            self.eventsub_worker_thread.started.connect(self.eventsub_worker.run)
                             self.eventsub_worker_thread.start()
                         except Exception as e:
                             logger.exception(f"[TwitchConnector] Error restarting EventSub worker: {e}")
@@ -1360,26 +1350,32 @@ class TwitchWorker(QThread):
         # Used to allow a short grace period to flush parsed messages before reconnecting
         self._last_parsed_time = None
         self.connection_timeout = 300  # 5 minutes
+        self._health = None  # HealthSupervisor probe for the current connection
         # Guard to avoid printing authentication success multiple times per worker
         self._auth_printed = False
     
     def run(self):
-        """Run the Twitch IRC connection"""
-        self.running = True
-        
+        """Run the Twitch IRC connection on this thread's own event loop"""
         # Create new event loop for this thread
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
         
+        try:
+            self.loop.run_until_complete(self.run_async())
+        finally:
+            if self.loop and not self.loop.is_closed():
+                self.loop.close()
+
+    async def run_async(self):
+        """Run the Twitch IRC connection on the current loop (shared connector runtime or run())"""
+        self.running = True
+        self.loop = asyncio.get_running_loop()
         try:
             # Always try real connection (we have default credentials)
-            self.loop.run_until_complete(self.connect_to_twitch())
+            await self.connect_to_twitch()
         except Exception as e:
             self.error_signal.emit(f"Connection error: {str(e)}")
             self.status_signal.emit(False)
-        finally:
-            if self.loop and not self.loop.is_closed():
-                self.loop.close()
     
     async def connect_to_twitch(self):
         """Connect to Twitch IRC via WebSocket with unlimited retry"""
@@ -1400,8 +1396,8 @@ class TwitchWorker(QThread):
                     self.status_signal.emit(True)
                     logger.info(f"Connected to Twitch channel: {self.channel}")
                     
-                    # Start health monitoring
-                    health_task = asyncio.create_task(self.health_check_loop(websocket))
+                    # Register with the health supervisor
+                    self._health = self._register_health(websocket)
                     
                     # Listen for messages with buffer for partial messages
                     last_refresh_check = time.time()
@@ -1455,18 +1451,14 @@ class TwitchWorker(QThread):
                             logger.info(f"[Twitch] Connection closed. Stats - Received: {messages_received}, Parsed: {messages_parsed}")
                             break
                     
-                    # Cancel health monitoring
-                    health_task.cancel()
-                    try:
-                        await health_task
-                    except asyncio.CancelledError:
-                        pass
+                    get_health_supervisor().unregister(self._health)
                     
                     # If we exit cleanly, don't retry
                     if not self.running:
                         break
                             
             except Exception as e:
+                get_health_supervisor().unregister(self._health)
                 retry_count += 1
                 wait_time = min(2 ** retry_count, 300)  # Cap at 5 minutes
                 self.error_signal.emit(f"WebSocket error (attempt {retry_count}): {str(e)}")
@@ -1506,7 +1498,8 @@ class TwitchWorker(QThread):
             session.mount('https://', adapter)
             session.mount('http://', adapter)
 
-            response = session.post(
+            response = await asyncio.to_thread(
+                session.post,
                 'https://id.twitch.tv/oauth2/token',
                 data={
                     'client_id': self.client_id,
@@ -1527,35 +1520,31 @@ class TwitchWorker(QThread):
         except Exception as e:
             logger.exception(f"Error refreshing token: {e}")
     
-    async def health_check_loop(self, websocket):
-        """Monitor connection health and force reconnect if dead"""
-        while self.running:
-            try:
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-                if self.last_message_time:
-                    time_since_last = time.time() - self.last_message_time
-                    
-                    if time_since_last > self.connection_timeout:
-                        logger.warning(f"[Twitch] Connection appears dead ({int(time_since_last)}s since last message)")
-                        logger.info(f"[Twitch] Forcing reconnection...")
-                        # If we parsed a message very recently, give a short grace
-                        try:
-                            grace = 1.5
-                            if self._last_parsed_time:
-                                since_parsed = time.time() - self._last_parsed_time
-                                if since_parsed < grace:
-                                    wait = grace - since_parsed
-                                    logger.debug(f"[Twitch] Recent parsed message (\n{since_parsed:.3f}s ago); waiting {wait:.3f}s to flush before reconnect")
-                                    await asyncio.sleep(wait)
-                        except Exception:
-                            pass
-                        await websocket.close()
-                        break
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.exception(f"[Twitch] Health check error: {e}")
+    def _register_health(self, websocket):
+        """Register this connection's probe with the health supervisor"""
+        loop = asyncio.get_running_loop()
+        probe = websocket_probe(websocket, loop, lambda: self.last_message_time, self.connection_timeout)
+
+        def escalate(result):
+            logger.warning(f"[Twitch] Connection appears dead ({result.detail}); forcing reconnection...")
+            asyncio.run_coroutine_threadsafe(self._close_stalled(websocket), loop)
+
+        return get_health_supervisor().register(f"Twitch IRC:{self.bot_nick}@{self.channel}", probe,
+                                                escalate=escalate, platform='twitch')
+
+    async def _close_stalled(self, websocket):
+        """Close a stalled connection, giving a just-parsed message a moment to flush"""
+        try:
+            grace = 1.5
+            if self._last_parsed_time:
+                since_parsed = time.time() - self._last_parsed_time
+                if since_parsed < grace:
+                    wait = grace - since_parsed
+                    logger.debug(f"[Twitch] Recent parsed message ({since_parsed:.3f}s ago); waiting {wait:.3f}s to flush before reconnect")
+                    await asyncio.sleep(wait)
+        except Exception:
+            pass
+        await websocket.close()
     
     async def authenticate(self):
         """Authenticate with Twitch IRC"""
@@ -2278,6 +2267,7 @@ class TwitchWorker(QThread):
     def stop(self):
         """Stop the worker"""
         self.running = False
+        get_health_supervisor().unregister(self._health)
         if self.loop and self.ws:
             asyncio.run_coroutine_threadsafe(self.ws.close(), self.loop)
     
@@ -2332,19 +2322,25 @@ class TwitchEventSubWorker(QThread):
         self.validated_scopes = None
     
     def run(self):
-        """Main event loop"""
-        logger.info(f"[EventSub] Worker starting...")
-        self.running = True
+        """Main event loop (when not hosted on the shared connector runtime)"""
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
         
         try:
-            self.loop.run_until_complete(self.connect_and_listen())
+            self.loop.run_until_complete(self.run_async())
+        finally:
+            self.loop.close()
+
+    async def run_async(self):
+        logger.info(f"[EventSub] Worker starting...")
+        self.running = True
+        self.loop = asyncio.get_running_loop()
+        try:
+            await self.connect_and_listen()
         except Exception as e:
             logger.exception(f"[EventSub] Error in event loop: {e}")
             self.error_signal.emit(f"EventSub error: {e}")
         finally:
-            self.loop.close()
             logger.info(f"[EventSub] Worker stopped")
     
     async def validate_token(self):
@@ -2352,7 +2348,8 @@ class TwitchEventSubWorker(QThread):
         try:
             try:
                 session = _make_retry_session()
-                response = session.get(
+                response = await asyncio.to_thread(
+                    session.get,
                     'https://id.twitch.tv/oauth2/validate',
                     headers={'Authorization': f'OAuth {self.oauth_token}'},
                     timeout=10
@@ -2532,7 +2529,8 @@ class TwitchEventSubWorker(QThread):
             
             try:
                 session = _make_retry_session()
-                response = session.get(
+                response = await asyncio.to_thread(
+                    session.get,
                     'https://api.twitch.tv/helix/users',
                     headers=headers,
                     params={'login': self.broadcaster_login},
@@ -2663,7 +2661,8 @@ class TwitchEventSubWorker(QThread):
                 logger.info(f"[EventSub] Subscribing to {sub['name']}...")
                 try:
                     session = _make_retry_session()
-                    response = session.post(
+                    response = await asyncio.to_thread(
+                        session.post,
                         'https://api.twitch.tv/helix/eventsub/subscriptions',
                         headers=headers,
                         json=subscription_data,
@@ -3,7 +3,9 @@ Twitter (X) Platform Connector
 Connects to Twitter/X API v2 for tweet streams and mentions
 """
 
+import threading
 import time
+from collections import OrderedDict
 try:
     import requests
 except Exception:
@@ -11,6 +13,7 @@ except Exception:
 from platform_connectors.base_connector import BasePlatformConnector
 from platform_connectors.qt_compat import QThread, pyqtSignal
 from platform_connectors.connector_utils import startup_allowed, safe_emit
+from platform_connectors.twitter_scheduler import TwitterPollScheduler, ConversationCache
 from core.logger import get_logger
 try:
     from core.http_session import make_retry_session
@@ -243,9 +246,23 @@ class TwitterWorker(QThread):
         self.broadcast_hashtag = broadcast_hashtag or f"#{username}Live"
         self.running = False
         self.user_id = None
-        self.processed_tweets = set()
+        self.processed_tweets = OrderedDict()  # Insertion-ordered so the oldest IDs are dropped first
+        # Endpoints are polled in parallel and overlap (search vs mentions)
+        self._processed_lock = threading.Lock()
         self.last_token_refresh = time.time()
-        self.since_id = None  # Track last processed tweet
+        self._session = None  # Pooled HTTP session reused for every request
+        
+        # One since_id cursor and rate-limit budget per endpoint; only the
+        # endpoints enabled in run() are polled in the background
+        self.scheduler = TwitterPollScheduler()
+        self.conversations = ConversationCache()
+        self.scheduler.add_endpoint('search', self._fetch_search,
+                                    lambda data: self._process_tweets(data, 'search'), enabled=False)
+        self.scheduler.add_endpoint('mentions', self._fetch_mentions,
+                                    lambda data: self._process_tweets(data, 'mention'), enabled=False)
+        self.scheduler.add_endpoint('home_timeline', self._fetch_home_timeline,
+                                    lambda data: self._process_tweets(data, 'timeline'), enabled=False)
+        self.scheduler.add_endpoint('replies', self._fetch_own_tweets, self._on_own_tweets, enabled=False)
     
     def run(self):
         """Run the Twitter connection"""
@@ -274,7 +291,10 @@ class TwitterWorker(QThread):
             
             safe_emit(self.status_signal, True)
             
-            # Poll for timeline and relevant tweets
+            # Search and mentions are polled in parallel, each as often as its
+            # rate limit allows; mentions need OAuth 1.0a user context
+            self.scheduler.set_enabled('search', True)
+            self.scheduler.set_enabled('mentions', self._has_oauth1())
             while self.running:
                 try:
                     # Refresh token if needed (every 50 minutes)
@@ -282,59 +302,102 @@ class TwitterWorker(QThread):
                         if self.refresh_access_token():
                             self.last_token_refresh = time.time()
                     
-                    # Search for broadcast-related tweets
-                    self.search_broadcast_tweets()
-                    
-                    # Fetch mentions
-                    self.fetch_mentions()
-                    
-                    # Sleep before next poll (increased to reduce rate limit hits)
-                    time.sleep(30)  # Poll every 30 seconds to stay within rate limits
+                    self.scheduler.wait(self.scheduler.run_due())
                     
                 except Exception as e:
                     safe_emit(self.error_signal, f"Error fetching tweets: {str(e)}")
-                    time.sleep(15)
+                    self.scheduler.wait(15)
                     
         except Exception as e:
             safe_emit(self.error_signal, f"Connection error: {str(e)}")
             safe_emit(self.status_signal, False)
+        finally:
+            self.scheduler.stop()
+    
+    def _has_oauth1(self) -> bool:
+        return bool(self.access_token and self.access_token_secret)
+    
+    def _get_session(self):
+        """Return this worker's pooled HTTP session (created on first use)."""
+        if self._session is None:
+            self._session = make_retry_session() if make_retry_session else requests.Session()
+        return self._session
+    
+    def _get(self, path: str, params: dict | None = None, oauth1_only: bool = False):
+        """GET an API v2 path with OAuth 1.0a if available, otherwise the bearer token.
+        
+        Returns the response, or None on network errors or when `oauth1_only`
+        and no OAuth 1.0a credentials are configured.
+        """
+        kwargs = {'params': params, 'timeout': 10}
+        if self._has_oauth1():
+            from requests_oauthlib import OAuth1
+            kwargs['auth'] = OAuth1(
+                self.api_key,
+                self.api_secret,
+                self.access_token,
+                self.access_token_secret
+            )
+        elif oauth1_only:
+            return None
+        else:
+            kwargs['headers'] = {'Authorization': f'Bearer {self.oauth_token}'}
+        try:
+            return self._get_session().get(f'{self.API_BASE}{path}', **kwargs)
+        except requests.exceptions.RequestException as e:
+            logger.exception(f"[TwitterWorker] Network error fetching {path}: {e}")
+            return None
+    
+    def _process_tweets(self, data: dict, source: str):
+        """Emit not-yet-seen tweets from an API v2 payload in chronological order"""
+        tweets = data.get('data', []) or []
+        users = {u['id']: u for u in data.get('includes', {}).get('users', [])}
+        
+        # Claim unseen IDs atomically so two pool threads can't emit the same tweet
+        fresh = []
+        with self._processed_lock:
+            for tweet in reversed(tweets):
+                tweet_id = tweet['id']
+                # Skip if already processed (the same tweet can show up on several endpoints)
+                if tweet_id in self.processed_tweets:
+                    continue
+                self.processed_tweets[tweet_id] = None
+                fresh.append(tweet)
+            # Keep only the most recent 1000 tweet IDs to avoid memory issues
+            while len(self.processed_tweets) > 1000:
+                self.processed_tweets.popitem(last=False)
+        
+        for tweet in fresh:
+            tweet_id = tweet['id']
+            
+            # Get author info
+            author_id = tweet.get('author_id')
+            author = users.get(author_id, {})
+            author_username = author.get('username', 'unknown')
+            author_name = author.get('name', author_username)
+            
+            # Get tweet text
+            text = tweet.get('text', '')
+            
+            # Prepare metadata
+            metadata = {
+                'tweet_id': tweet_id,
+                'author_id': author_id,
+                'created_at': tweet.get('created_at', ''),
+                'profile_image_url': author.get('profile_image_url', ''),
+                'verified': author.get('verified', False),
+                'badges': []
+            }
+            
+            logger.info(f"[TwitterWorker] Tweet ({source}) from {author_name}: {text[:50]}...")
+            safe_emit(self.message_signal, author_name, text, metadata)
     
     def get_user_id(self) -> bool:
         """Get the user ID from username"""
         try:
-            # Use OAuth 1.0a if available, otherwise bearer token
-            if self.access_token and self.access_token_secret:
-                from requests_oauthlib import OAuth1
-                auth = OAuth1(
-                    self.api_key,
-                    self.api_secret,
-                    self.access_token,
-                    self.access_token_secret
-                )
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    response = session.get(
-                        f'{self.API_BASE}/users/by/username/{self.username}',
-                        auth=auth,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error getting user id (OAuth1): {e}")
-                    return False
-            else:
-                headers = {
-                    'Authorization': f'Bearer {self.oauth_token}'
-                }
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    response = session.get(
-                        f'{self.API_BASE}/users/by/username/{self.username}',
-                        headers=headers,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error getting user id (bearer): {e}")
-                    return False
+            response = self._get(f'/users/by/username/{self.username}')
+            if response is None:
+                return False
             
             if response.status_code == 200:
                 data = response.json()
@@ -350,347 +413,85 @@ class TwitterWorker(QThread):
             logger.exception(f"[TwitterWorker] Exception getting user ID: {e}")
             return False
     
+    def _fetch_search(self, since_id: str | None):
+        # Search for: hashtag OR mentions of username (recent tweets)
+        params = {
+            'query': f"{self.broadcast_hashtag} OR @{self.username}",
+            'max_results': 10,
+            'tweet.fields': 'created_at,author_id,conversation_id',
+            'expansions': 'author_id',
+            'user.fields': 'username,name,profile_image_url',
+            'sort_order': 'recency'
+        }
+        if since_id:
+            params['since_id'] = since_id
+        return self._get('/tweets/search/recent', params)
+    
+    def _fetch_mentions(self, since_id: str | None):
+        if not self.user_id:
+            return None
+        params = {
+            'max_results': 10,
+            'tweet.fields': 'created_at,author_id,conversation_id',
+            'expansions': 'author_id',
+            'user.fields': 'username,name,profile_image_url'
+        }
+        if since_id:
+            params['since_id'] = since_id
+        return self._get(f'/users/{self.user_id}/mentions', params, oauth1_only=True)
+    
+    def _fetch_home_timeline(self, since_id: str | None):
+        if not self.user_id:
+            return None
+        params = {
+            'max_results': 10,
+            'tweet.fields': 'created_at,author_id,conversation_id,in_reply_to_user_id',
+            'expansions': 'author_id,in_reply_to_user_id',
+            'user.fields': 'username,name,profile_image_url'
+        }
+        if since_id:
+            params['since_id'] = since_id
+        return self._get(f'/users/{self.user_id}/timelines/reverse_chronological', params)
+    
+    def _fetch_own_tweets(self, since_id: str | None):
+        if not self.user_id:
+            return None
+        # Always look at the latest tweets: their threads are what we follow
+        params = {
+            'max_results': 5,
+            'tweet.fields': 'created_at,conversation_id'
+        }
+        return self._get(f'/users/{self.user_id}/tweets', params, oauth1_only=True)
+    
+    def _on_own_tweets(self, data: dict):
+        # Only follow the 2 most recent threads to stay within rate limits
+        for tweet in (data.get('data', []) or [])[:2]:
+            self.fetch_conversation(tweet.get('conversation_id') or tweet.get('id'))
+    
     def search_broadcast_tweets(self):
         """Search for tweets related to live broadcast (hashtag, mentions during stream)"""
-        try:
-            # Search for: hashtag OR mentions of username (recent tweets)
-            query = f"{self.broadcast_hashtag} OR @{self.username}"
-            
-            params = {
-                'query': query,
-                'max_results': 10,
-                'tweet.fields': 'created_at,author_id,conversation_id',
-                'expansions': 'author_id',
-                'user.fields': 'username,name,profile_image_url',
-                'sort_order': 'recency'
-            }
-            
-            # Add since_id if we have it
-            if self.since_id:
-                params['since_id'] = self.since_id
-            
-            # Use OAuth 1.0a
-            if self.access_token and self.access_token_secret:
-                from requests_oauthlib import OAuth1
-                auth = OAuth1(
-                    self.api_key,
-                    self.api_secret,
-                    self.access_token,
-                    self.access_token_secret
-                )
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    response = session.get(
-                        f'{self.API_BASE}/tweets/search/recent',
-                        auth=auth,
-                        params=params,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error searching broadcasts (OAuth1): {e}")
-                    return
-            else:
-                headers = {
-                    'Authorization': f'Bearer {self.oauth_token}'
-                }
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    response = session.get(
-                        f'{self.API_BASE}/tweets/search/recent',
-                        headers=headers,
-                        params=params,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error searching broadcasts: {e}")
-                    return
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Update since_id for next request
-                meta = data.get('meta', {})
-                if 'newest_id' in meta:
-                    self.since_id = meta['newest_id']
-                
-                tweets = data.get('data', [])
-                users = {u['id']: u for u in data.get('includes', {}).get('users', [])}
-                
-                # Process tweets in chronological order
-                for tweet in reversed(tweets):
-                    tweet_id = tweet['id']
-
-                    # Skip if already processed
-                    if tweet_id in self.processed_tweets:
-                        continue
-
-                    self.processed_tweets.add(tweet_id)
-
-                    # Get author info
-                    author_id = tweet.get('author_id')
-                    author = users.get(author_id, {})
-                    author_username = author.get('username', 'unknown')
-                    author_name = author.get('name', author_username)
-
-                    # Get tweet text
-                    text = tweet.get('text', '')
-
-                    # Prepare metadata
-                    metadata = {
-                        'tweet_id': tweet_id,
-                        'author_id': author_id,
-                        'created_at': tweet.get('created_at', ''),
-                        'profile_image_url': author.get('profile_image_url', ''),
-                        'verified': author.get('verified', False),
-                        'badges': []
-                    }
-
-                    # Emit the message
-                    logger.info(f"[TwitterWorker] Broadcasting tweet from {author_name}: {text[:50]}...")
-                    from .connector_utils import emit_chat
-                    emit_chat(self, 'twitter', author_name, text, metadata)
-                
-                # Keep only last 1000 tweet IDs to avoid memory issues
-                if len(self.processed_tweets) > 1000:
-                    self.processed_tweets = set(list(self.processed_tweets)[-1000:])
-            
-            elif response.status_code == 429:
-                logger.warning("[TwitterWorker] Rate limit hit on search, waiting longer...")
-                time.sleep(60)
-            else:
-                logger.error(f"[TwitterWorker] Error searching broadcasts: {response.status_code}")
-                logger.debug(f"[TwitterWorker] Response: {response.text}")
-                
-        except Exception as e:
-            logger.exception(f"[TwitterWorker] Exception searching broadcasts: {e}")
+        self.scheduler.poll_now('search')
     
     def fetch_mentions(self):
         """Fetch mentions for the user"""
-        if not self.user_id:
-            return
-        
-        try:
-            params = {
-                'max_results': 10,
-                'tweet.fields': 'created_at,author_id,conversation_id',
-                'expansions': 'author_id',
-                'user.fields': 'username,name,profile_image_url'
-            }
-            
-            # Use OAuth 1.0a
-            if self.access_token and self.access_token_secret:
-                from requests_oauthlib import OAuth1
-                auth = OAuth1(
-                    self.api_key,
-                    self.api_secret,
-                    self.access_token,
-                    self.access_token_secret
-                )
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    response = session.get(
-                        f'{self.API_BASE}/users/{self.user_id}/mentions',
-                        auth=auth,
-                        params=params,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error fetching mentions: {e}")
-                    return
-            else:
-                return
-            
-            if response.status_code == 200:
-                data = response.json()
-                tweets = data.get('data', [])
-                users = {u['id']: u for u in data.get('includes', {}).get('users', [])}
-                
-                # Process new mentions
-                for tweet in reversed(tweets):
-                    tweet_id = tweet['id']
-                    
-                    if tweet_id in self.processed_tweets:
-                        continue
-                    
-                    self.processed_tweets.add(tweet_id)
-                    
-                    author_id = tweet.get('author_id')
-                    author = users.get(author_id, {})
-                    author_name = author.get('name', author.get('username', 'unknown'))
-                    text = tweet.get('text', '')
-                    
-                    metadata = {
-                        'tweet_id': tweet_id,
-                        'author_id': author_id,
-                        'created_at': tweet.get('created_at', ''),
-                        'profile_image_url': author.get('profile_image_url', ''),
-                        'verified': author.get('verified', False),
-                        'badges': []
-                    }
-                    
-                    logger.info(f"Mention from {author_name}: {text[:50]}...")
-                    safe_emit(self.message_signal, author_name, text, metadata)
-                    
-        except Exception as e:
-            logger.exception(f"Exception fetching mentions: {e}")
+        self.scheduler.poll_now('mentions')
     
     def fetch_home_timeline(self):
         """Fetch home timeline tweets (from accounts you follow)"""
-        if not self.user_id:
-            return
-        
-        try:
-            params = {
-                'max_results': 10,
-                'tweet.fields': 'created_at,author_id,conversation_id,in_reply_to_user_id',
-                'expansions': 'author_id,in_reply_to_user_id',
-                'user.fields': 'username,name,profile_image_url'
-            }
-            
-            # Add since_id if we have it
-            if self.since_id:
-                params['since_id'] = self.since_id
-            
-            # Use OAuth 1.0a if available
-            if self.access_token and self.access_token_secret:
-                from requests_oauthlib import OAuth1
-                auth = OAuth1(
-                    self.api_key,
-                    self.api_secret,
-                    self.access_token,
-                    self.access_token_secret
-                )
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    # Get user's timeline (tweets from followed accounts)
-                    response = session.get(
-                        f'{self.API_BASE}/users/{self.user_id}/timelines/reverse_chronological',
-                        auth=auth,
-                        params=params,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error fetching timeline (OAuth1): {e}")
-                    return
-            else:
-                headers = {
-                    'Authorization': f'Bearer {self.oauth_token}'
-                }
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    response = session.get(
-                        f'{self.API_BASE}/users/{self.user_id}/timelines/reverse_chronological',
-                        headers=headers,
-                        params=params,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error fetching timeline: {e}")
-                    return
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Update since_id for next request
-                meta = data.get('meta', {})
-                if 'newest_id' in meta:
-                    self.since_id = meta['newest_id']
-                
-                tweets = data.get('data', [])
-                users = {u['id']: u for u in data.get('includes', {}).get('users', [])}
-                
-                # Process tweets in chronological order
-                for tweet in reversed(tweets):
-                    tweet_id = tweet['id']
-                    
-                    # Skip if already processed
-                    if tweet_id in self.processed_tweets:
-                        continue
-                    
-                    self.processed_tweets.add(tweet_id)
-                    
-                    # Get author info
-                    author_id = tweet.get('author_id')
-                    author = users.get(author_id, {})
-                    author_username = author.get('username', 'unknown')
-                    author_name = author.get('name', author_username)
-                    
-                    # Get tweet text
-                    text = tweet.get('text', '')
-                    
-                    # Prepare metadata
-                    metadata = {
-                        'tweet_id': tweet_id,
-                        'author_id': author_id,
-                        'created_at': tweet.get('created_at', ''),
-                        'profile_image_url': author.get('profile_image_url', ''),
-                        'verified': author.get('verified', False),
-                        'badges': []
-                    }
-                    
-                    # Emit the message
-                    safe_emit(self.message_signal, author_name, text, metadata)
-                
-                # Keep only last 1000 tweet IDs to avoid memory issues
-                if len(self.processed_tweets) > 1000:
-                    self.processed_tweets = set(list(self.processed_tweets)[-1000:])
-            
-            elif response.status_code == 429:
-                logger.warning("[TwitterWorker] Rate limit hit, waiting longer...")
-                time.sleep(60)
-            else:
-                logger.error(f"[TwitterWorker] Error fetching timeline: {response.status_code}")
-        except Exception as e:
-            logger.exception(f"Exception fetching timeline: {e}")
+        self.scheduler.poll_now('home_timeline')
     
     def fetch_tweet_replies(self):
         """Fetch replies to the user's recent tweets"""
-        if not self.user_id:
-            return
-        
-        try:
-            # First, get user's recent tweets
-            params = {
-                'max_results': 5,
-                'tweet.fields': 'created_at,conversation_id'
-            }
-            
-            if self.access_token and self.access_token_secret:
-                from requests_oauthlib import OAuth1
-                auth = OAuth1(
-                    self.api_key,
-                    self.api_secret,
-                    self.access_token,
-                    self.access_token_secret
-                )
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    response = session.get(
-                        f'{self.API_BASE}/users/{self.user_id}/tweets',
-                        auth=auth,
-                        params=params,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error fetching user tweets: {e}")
-                    return
-            else:
-                return
-            
-            if response.status_code == 200:
-                data = response.json()
-                tweets = data.get('data', [])
-                
-                # For each recent tweet, search for replies
-                for tweet in tweets[:2]:  # Only check 2 most recent to avoid rate limits
-                    conversation_id = tweet.get('id')
-                    self.fetch_conversation(conversation_id)
-            
-        except Exception as e:
-            logger.exception(f"Exception fetching tweet replies: {e}")
+        self.scheduler.poll_now('replies')
     
     def fetch_conversation(self, conversation_id: str):
-        """Fetch tweets in a conversation thread"""
+        """Fetch new tweets in a conversation thread (at most once per cache TTL)"""
+        if not conversation_id or not self.conversations.due(conversation_id):
+            return
+        # Conversation lookups spend the recent-search budget
+        search_budget = self.scheduler.budget('search')
+        if search_budget is not None and search_budget.exhausted():
+            return
         try:
             params = {
                 'query': f'conversation_id:{conversation_id}',
@@ -699,60 +500,25 @@ class TwitterWorker(QThread):
                 'expansions': 'author_id',
                 'user.fields': 'username,name,profile_image_url'
             }
+            since_id = self.conversations.since_id(conversation_id)
+            if since_id:
+                params['since_id'] = since_id
             
-            if self.access_token and self.access_token_secret:
-                from requests_oauthlib import OAuth1
-                auth = OAuth1(
-                    self.api_key,
-                    self.api_secret,
-                    self.access_token,
-                    self.access_token_secret
-                )
-                session = make_retry_session() if make_retry_session else requests.Session()
-                try:
-                    response = session.get(
-                        f'{self.API_BASE}/tweets/search/recent',
-                        auth=auth,
-                        params=params,
-                        timeout=10
-                    )
-                except requests.exceptions.RequestException as e:
-                    logger.exception(f"[TwitterWorker] Network error fetching conversation: {e}")
-                    return
-            else:
+            response = self._get('/tweets/search/recent', params, oauth1_only=True)
+            if response is None:
                 return
-            
+            if response.status_code == 429:
+                if search_budget is not None:
+                    search_budget.mark_limited(getattr(response, 'headers', None))
+                return
+            if search_budget is not None:
+                search_budget.update(getattr(response, 'headers', None))
             if response.status_code == 200:
                 data = response.json()
-                tweets = data.get('data', [])
-                users = {u['id']: u for u in data.get('includes', {}).get('users', [])}
-                
-                # Process tweets in chronological order
-                for tweet in reversed(tweets):
-                    tweet_id = tweet['id']
-                    
-                    if tweet_id in self.processed_tweets:
-                        continue
-                    
-                    self.processed_tweets.add(tweet_id)
-                    
-                    author_id = tweet.get('author_id')
-                    author = users.get(author_id, {})
-                    author_username = author.get('username', 'unknown')
-                    author_name = author.get('name', author_username)
-                    
-                    text = tweet.get('text', '')
-                    
-                    metadata = {
-                        'tweet_id': tweet_id,
-                        'author_id': author_id,
-                        'created_at': tweet.get('created_at', ''),
-                        'profile_image_url': author.get('profile_image_url', ''),
-                        'verified': author.get('verified', False),
-                        'badges': []
-                    }
-                    
-                    safe_emit(self.message_signal, author_name, text, metadata)
+                self.conversations.record(conversation_id, (data.get('meta') or {}).get('newest_id'))
+                self._process_tweets(data, 'conversation')
+            else:
+                logger.error(f"[TwitterWorker] Error fetching conversation: {response.status_code}")
                 
         except Exception as e:
             logger.exception(f"Exception fetching conversation: {e}")
@@ -833,3 +599,4 @@ class TwitterWorker(QThread):
     def stop(self):
         """Stop the worker"""
         self.running = False
+        self.scheduler.stop()
@@ -0,0 +1,260 @@
+"""
+Twitter/X polling scheduler - rate-limit aware, parallel, cursor based
+
+TwitterWorker registers each API endpoint it reads (recent search, mentions,
+home timeline, replies) with a TwitterPollScheduler. The scheduler keeps a
+`since_id` cursor per endpoint and a RateLimitBudget built from the
+`x-rate-limit-remaining` / `x-rate-limit-reset` response headers. Each
+endpoint is polled again as soon as its remaining calls, spread over the
+rest of its window, allow. Due endpoints run in parallel on a small thread
+pool, so one slow or rate-limited endpoint never holds up the others and
+the worker never sleeps blindly after a 429.
+
+ConversationCache remembers when each conversation thread was last fetched
+and its newest tweet, so reply polling doesn't refetch the same thread.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from core.logger import get_logger
+
+logger = get_logger('TwitterScheduler')
+
+# Per-endpoint poll interval bounds (seconds)
+MIN_ENDPOINT_INTERVAL = 2.0
+MAX_ENDPOINT_INTERVAL = 15 * 60.0
+# Used when the API doesn't say how long to back off
+DEFAULT_RATE_LIMIT_BACKOFF = 60.0
+ERROR_BACKOFF_SECONDS = 15.0
+# Longest wait between scheduler wake-ups, so the worker can refresh tokens
+MAX_IDLE_WAIT = 30.0
+
+CONVERSATION_TTL = 120.0
+MAX_CONVERSATIONS = 256
+
+
+def _header(headers, name: str) -> Optional[str]:
+    if not headers:
+        return None
+    try:
+        value = headers.get(name)
+        if value is None:
+            value = headers.get(name.title())
+        return value
+    except Exception:
+        return None
+
+
+class RateLimitBudget:
+    """Spread one endpoint's remaining calls over what is left of its rate-limit window"""
+
+    def __init__(self, min_interval: float = MIN_ENDPOINT_INTERVAL, max_interval: float = MAX_ENDPOINT_INTERVAL):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+
+    def update(self, headers, now: Optional[float] = None):
+        """Read the x-rate-limit-* headers of a response."""
+        try:
+            limit = _header(headers, 'x-rate-limit-limit')
+            remaining = _header(headers, 'x-rate-limit-remaining')
+            reset = _header(headers, 'x-rate-limit-reset')
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset is not None:
+                self.reset_at = float(reset)
+        except (TypeError, ValueError):
+            logger.debug("Ignoring malformed rate limit headers")
+
+    def mark_limited(self, headers=None, now: Optional[float] = None):
+        """Record a 429: nothing left until the window resets."""
+        now = time.time() if now is None else now
+        self.update(headers, now)
+        self.remaining = 0
+        if self.reset_at is None or self.reset_at <= now:
+            self.reset_at = now + DEFAULT_RATE_LIMIT_BACKOFF
+
+    def exhausted(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return self.remaining is not None and self.remaining <= 0 \
+            and self.reset_at is not None and self.reset_at > now
+
+    def next_delay(self, now: Optional[float] = None) -> float:
+        """Seconds until this endpoint may be called again."""
+        now = time.time() if now is None else now
+        if self.remaining is None or self.reset_at is None:
+            return self.min_interval
+        window = self.reset_at - now
+        if window <= 0:
+            return self.min_interval
+        if self.remaining <= 0:
+            # Poll right after the window resets
+            return min(self.max_interval, window + 1.0)
+        return min(self.max_interval, max(self.min_interval, window / self.remaining))
+
+
+class ConversationCache:
+    """Remember when each conversation thread was fetched and its newest tweet"""
+
+    def __init__(self, ttl: float = CONVERSATION_TTL, max_entries: int = MAX_CONVERSATIONS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, list]' = OrderedDict()  # id -> [fetched_at, newest_id]
+
+    def due(self, conversation_id: str, now: Optional[float] = None) -> bool:
+        """True if the thread hasn't been fetched within the TTL."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            return entry is None or now - entry[0] >= self.ttl
+
+    def since_id(self, conversation_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            return entry[1] if entry else None
+
+    def record(self, conversation_id: str, newest_id: Optional[str] = None, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.pop(conversation_id, None) or [now, None]
+            entry[0] = now
+            if newest_id:
+                entry[1] = newest_id
+            self._entries[conversation_id] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class PollEndpoint:
+    """One polled endpoint: how to fetch it, what to do with the data, and its budget"""
+
+    __slots__ = ('name', 'fetch', 'on_data', 'enabled', 'budget', 'next_due', 'in_flight', 'calls')
+
+    def __init__(self, name: str, fetch: Callable, on_data: Callable, enabled: bool = True):
+        self.name = name
+        self.fetch = fetch  # fetch(since_id) -> response or None
+        self.on_data = on_data  # on_data(json payload)
+        self.enabled = enabled
+        self.budget = RateLimitBudget()
+        self.next_due = 0.0
+        self.in_flight = False
+        self.calls = 0
+
+
+class TwitterPollScheduler:
+    """Poll registered endpoints in parallel, each as often as its rate limit allows"""
+
+    def __init__(self, max_workers: int = 4):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.max_workers = max_workers
+        self.endpoints: Dict[str, PollEndpoint] = {}
+        self.cursors: Dict[str, str] = {}
+
+    def add_endpoint(self, name: str, fetch: Callable, on_data: Callable, enabled: bool = True) -> PollEndpoint:
+        endpoint = PollEndpoint(name, fetch, on_data, enabled)
+        with self._lock:
+            self.endpoints[name] = endpoint
+        return endpoint
+
+    def set_enabled(self, name: str, enabled: bool):
+        with self._lock:
+            if name in self.endpoints:
+                self.endpoints[name].enabled = enabled
+        self._wake.set()
+
+    def budget(self, name: str) -> Optional[RateLimitBudget]:
+        endpoint = self.endpoints.get(name)
+        return endpoint.budget if endpoint else None
+
+    def poll_now(self, name: str):
+        """Poll one endpoint synchronously (skipped while it is rate-limited or already running)."""
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            return
+        with self._lock:
+            if endpoint.in_flight or endpoint.budget.exhausted():
+                return
+            endpoint.in_flight = True
+        self._poll(endpoint)
+
+    def _poll(self, endpoint: PollEndpoint):
+        delay = ERROR_BACKOFF_SECONDS
+        try:
+            response = endpoint.fetch(self.cursors.get(endpoint.name))
+            endpoint.calls += 1
+            if response is None:
+                pass
+            elif response.status_code == 200:
+                endpoint.budget.update(getattr(response, 'headers', None))
+                data = response.json() or {}
+                newest = (data.get('meta') or {}).get('newest_id')
+                if newest:
+                    self.cursors[endpoint.name] = newest
+                endpoint.on_data(data)
+                delay = endpoint.budget.next_delay()
+            elif response.status_code == 429:
+                endpoint.budget.mark_limited(getattr(response, 'headers', None))
+                delay = endpoint.budget.next_delay()
+                logger.warning(f"Rate limited on {endpoint.name}; next call in {delay:.0f}s")
+            else:
+                logger.error(f"Error polling {endpoint.name}: {response.status_code}")
+                logger.debug(f"Response: {getattr(response, 'text', '')}")
+        except Exception as e:
+            logger.exception(f"Exception polling {endpoint.name}: {e}")
+        finally:
+            with self._lock:
+                endpoint.next_due = time.time() + delay
+                endpoint.in_flight = False
+            self._wake.set()
+
+    def run_due(self, now: Optional[float] = None) -> float:
+        """Start every due endpoint on the pool; return seconds until the next one is due."""
+        now = time.time() if now is None else now
+        due: List[PollEndpoint] = []
+        next_due = now + MAX_IDLE_WAIT
+        with self._lock:
+            if self._stopped:
+                return MAX_IDLE_WAIT
+            for endpoint in self.endpoints.values():
+                if not endpoint.enabled or endpoint.in_flight:
+                    continue
+                if endpoint.next_due <= now:
+                    endpoint.in_flight = True
+                    due.append(endpoint)
+                else:
+                    next_due = min(next_due, endpoint.next_due)
+            if due and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='TwitterPoll')
+            executor = self._executor
+        for endpoint in due:
+            executor.submit(self._poll, endpoint)
+        return max(0.0, next_due - now)
+
+    def wait(self, timeout: float):
+        """Sleep until `timeout` passes, a poll finishes, or the scheduler stops."""
+        self._wake.wait(max(0.0, timeout))
+        self._wake.clear()
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            executor, self._executor = self._executor, None
+        self._wake.set()
+        if executor is not None:
+            executor.shutdown(wait=False)
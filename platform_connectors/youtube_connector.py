@@ -7,6 +7,7 @@ import time
 from platform_connectors.base_connector import BasePlatformConnector
 from platform_connectors.qt_compat import QThread, pyqtSignal
 from platform_connectors.connector_utils import startup_allowed, safe_emit
+from core.backfill import GapTracker
 try:
     import requests
 except Exception:
@@ -16,6 +17,11 @@ try:
     from core.http_session import make_retry_session
 except Exception:
     make_retry_session = None
+from platform_connectors.youtube_live_chat import (
+    get_live_chat_poller, get_quota_planner, TRANSPORT_POLL,
+    QUOTA_COST_SEARCH, QUOTA_COST_VIDEOS, QUOTA_COST_INSERT,
+)
+from core.outbound import SendResult, make_send_session
 
 # Dummy `requests` fallback so the module imports even when requests isn't installed.
 if requests is None:
@@ -55,6 +61,8 @@ class YouTubeConnector(BasePlatformConnector):
     DEFAULT_AUTH_URI = "https://accounts.google.com/o/oauth2/auth"
     DEFAULT_TOKEN_URI = "https://oauth2.googleapis.com/token"
     DEFAULT_REDIRECT_URI = "http://localhost"
+
+    OUTBOUND_PLATFORM = 'youtube'
     
     def __init__(self, config=None):
         super().__init__()
@@ -67,6 +75,7 @@ class YouTubeConnector(BasePlatformConnector):
         self.client_id = self.DEFAULT_CLIENT_ID
         self.client_secret = self.DEFAULT_CLIENT_SECRET
         self.channel_id = None  # Store the actual YouTube channel ID
+        self.chat_transport = TRANSPORT_POLL
         
         # Load token from config if available
         if self.config:
@@ -83,6 +92,14 @@ class YouTubeConnector(BasePlatformConnector):
             if refresh:
                 self.refresh_token = refresh
                 logger.debug(f"[YouTubeConnector] Loaded refresh token from config")
+            # Quota planning (daily units for the API project, typical stream length)
+            try:
+                get_quota_planner().configure(youtube_config.get('daily_quota'),
+                                              youtube_config.get('expected_stream_hours'))
+            except Exception:
+                pass
+            # 'poll' (liveChat/messages) or 'stream' (streamList, falls back to polling)
+            self.chat_transport = youtube_config.get('chat_transport') or TRANSPORT_POLL
             # Load client credentials from config if present
             try:
                 cid = youtube_config.get('client_id', '')
@@ -251,6 +268,7 @@ class YouTubeConnector(BasePlatformConnector):
             self.client_secret,
             self.refresh_token
         )
+        self.worker.chat_transport = self.chat_transport
         self.worker_thread = QThread()
 
         self.worker.moveToThread(self.worker_thread)
@@ -322,26 +340,23 @@ class YouTubeConnector(BasePlatformConnector):
         self.worker = None
         self.worker_thread = None
         self.connected = False
+        self.stop_outbound()
         safe_emit(self.connection_status, False)
     
-    def send_message(self, message: str):
-        """Send a message to YouTube chat"""
-        try:
-            # Prefer using the worker if available (worker handles live_chat_id and retries).
-            if self.worker:
-                try:
-                    result = self.worker.send_message(message)
-                    return bool(result)
-                except Exception as e:
-                    logger.exception(f"[YouTubeConnector] Worker send_message raised: {e}")
-                    return False
+    def _send_once(self, message: str) -> SendResult:
+        # The worker owns live_chat_id and the current OAuth token
+        worker = self.worker
+        if not worker:
+            logger.warning("[YouTubeConnector] send_message called but worker missing; cannot send without live_chat_id")
+            return SendResult(False, error='no worker')
+        return worker._send_once(message)
 
-            # If no worker exists but we have a token, we cannot reliably send without live_chat_id.
+    def send_message(self, message: str):
+        """Send a message to YouTube chat and wait for delivery"""
+        if not self.worker:
             logger.warning("[YouTubeConnector] send_message called but worker missing; cannot send without live_chat_id")
             return False
-        except Exception as e:
-            logger.exception(f"[YouTubeConnector] Exception while sending message: {e}")
-            return False
+        return self.outbound().send(message)
     
     def delete_message(self, message_id: str):
         """Delete a message from YouTube chat
@@ -508,7 +523,9 @@ class YouTubeWorker(QThread):
         self.refresh_token = refresh_token
         self.running = False
         self.live_chat_id = None
+        # Where we left the live chat, so a reconnect resumes instead of skipping the gap
         self.next_page_token = None
+        self.page_token_chat_id = None
         self.processed_messages = set()
         
         # Message reliability features
@@ -518,6 +535,19 @@ class YouTubeWorker(QThread):
         self.last_message_time = None  # For health monitoring
         self.last_successful_poll = None  # Track polling health
         self.last_token_refresh = time.time()
+        self._session = None  # Pooled HTTP session reused for every request
+        self._send_session = None  # Separate session for chat sends (no transport retries)
+        self._send_headers_cache = None  # (oauth_token, headers)
+        self.chat_transport = TRANSPORT_POLL
+        self.gaps = GapTracker(f"YouTube:{channel}")
+        self._backfill_gap = None  # Set until the first page after a resume is processed
+        self._resumed = False
+
+    def _get_session(self):
+        """Return this worker's pooled HTTP session (created on first use)."""
+        if self._session is None:
+            self._session = make_retry_session() if make_retry_session else requests.Session()
+        return self._session
 
     def _interruptible_sleep(self, total_seconds: float, interval: float = 0.25):
         """Sleep in short intervals checking self.running so the thread can stop promptly."""
@@ -561,28 +591,20 @@ class YouTubeWorker(QThread):
                     
                     logger.debug(f"[YouTubeWorker] Starting message polling loop...")
                     
-                    # Poll for messages
-                    poll_count = 0
-                    while self.running and self.live_chat_id:
-                        try:
-                            poll_count += 1
-                            if poll_count % 10 == 1:  # Log every 10th poll
-                                logger.debug(f"[YouTubeWorker] Poll #{poll_count} (live_chat_id: {self.live_chat_id[:20]}...)")
-                            
+                    # Messages arrive from the poller shared by every worker on this
+                    # live chat; it schedules polls from pollingIntervalMillis and the quota budget
+                    poller = get_live_chat_poller(self.live_chat_id, transport=self.chat_transport)
+                    self._resume_poller(poller)
+                    poller.subscribe(self)
+                    try:
+                        while self.running and self.live_chat_id and not poller.ended:
                             # Refresh token if needed (every 50 minutes)
                             if time.time() - self.last_token_refresh > 3000:
                                 if self.refresh_access_token():
                                     self.last_token_refresh = time.time()
-                            
-                            self.fetch_messages()
-                            self.last_successful_poll = time.time()
-                            self._interruptible_sleep(2)
-                        except Exception as e:
-                            logger.exception(f"[YouTubeWorker] Error in polling loop: {e}")
-                            import traceback
-                            traceback.print_exc()
-                            safe_emit(self.error_signal, f"Error fetching messages: {str(e)}")
-                            self._interruptible_sleep(5)
+                            self._interruptible_sleep(1)
+                    finally:
+                        self._leave_poller(poller)
                             
                 except Exception as e:
                     retry_count += 1
@@ -595,6 +617,27 @@ class YouTubeWorker(QThread):
                     
             safe_emit(self.status_signal, False)
     
+    def _resume_poller(self, poller):
+        """Before subscribing: continue from our saved page token when rejoining the same live chat"""
+        self._resumed = False
+        same_chat = self.page_token_chat_id == poller.live_chat_id
+        if self.next_page_token and same_chat:
+            self._resumed = poller.resume_from(self.next_page_token)
+            if self._resumed:
+                logger.info(f"[YouTubeWorker] Resuming live chat from the saved page token")
+        gap = self.gaps.connected()
+        # A new live chat has nothing of the old one to recover; its first page is live
+        self._backfill_gap = gap if same_chat else None
+
+    def _leave_poller(self, poller):
+        """Remember where we left the live chat, then detach from its poller"""
+        # Kept even if the poller ended: a 404 can be transient, and when
+        # find_live_broadcast returns the same chat we resume from here
+        self.next_page_token = poller.next_page_token
+        self.page_token_chat_id = poller.live_chat_id
+        self.gaps.disconnected()
+        poller.unsubscribe(self)
+
     def find_live_broadcast(self) -> bool:
         """Find the active live broadcast for the channel"""
         logger.debug(f"[YouTubeWorker] Searching for live broadcast on channel: {self.channel}")
@@ -612,7 +655,8 @@ class YouTubeWorker(QThread):
             else:
                 params['key'] = self.api_key
             
-            session = make_retry_session() if make_retry_session else requests.Session()
+            session = self._get_session()
+            get_quota_planner().record(QUOTA_COST_SEARCH)
             try:
                 response = session.get(
                     f'{self.API_BASE}/search',
@@ -699,7 +743,8 @@ class YouTubeWorker(QThread):
             else:
                 params['key'] = self.api_key
             
-            session = make_retry_session() if make_retry_session else requests.Session()
+            session = self._get_session()
+            get_quota_planner().record(QUOTA_COST_VIDEOS)
             try:
                 response = session.get(
                     f'{self.API_BASE}/videos',
@@ -743,7 +788,7 @@ class YouTubeWorker(QThread):
             return False
         
         try:
-            session = make_retry_session() if make_retry_session else requests.Session()
+            session = self._get_session()
             try:
                 response = session.post(
                     self.TOKEN_URI,
@@ -773,74 +818,44 @@ class YouTubeWorker(QThread):
             return False
     
     def fetch_messages(self):
-        """Fetch new chat messages"""
+        """Fetch new chat messages once through the shared poller.
+
+        Returns the number of seconds until the next poll should happen.
+        """
         if not self.live_chat_id:
             logger.debug("[YouTubeWorker] No live chat ID, skipping fetch")
-            return
-        
+            return None
         try:
-            headers = {}
-            params = {
-                'liveChatId': self.live_chat_id,
-                'part': 'snippet,authorDetails',
-                'maxResults': 200
-            }
-            
-            if self.next_page_token:
-                params['pageToken'] = self.next_page_token
-            
-            if self.oauth_token:
-                headers['Authorization'] = f'Bearer {self.oauth_token}'
-            else:
-                params['key'] = self.api_key
-            
-            session = make_retry_session() if make_retry_session else requests.Session()
-            try:
-                response = session.get(
-                    f'{self.API_BASE}/liveChat/messages',
-                    headers=headers,
-                    params=params,
-                    timeout=2
-                )
-            except requests.exceptions.RequestException as e:
-                logger.exception(f"[YouTubeWorker] Network error fetching messages: {e}")
-                safe_emit(self.error_signal, f"Network error fetching messages: {e}")
-                return
-            
-            # Check for quota exceeded error
-            if response.status_code == 403:
-                try:
-                    error_data = response.json()
-                    if 'error' in error_data:
-                        error_code = error_data['error'].get('errors', [{}])[0].get('reason', '')
-                        if error_code == 'quotaExceeded':
-                            error_msg = "YouTube API quota exceeded. Stopping message polling."
-                            logger.warning(f"[YouTubeWorker] QUOTA EXCEEDED: {error_msg}")
-                            safe_emit(self.error_signal, error_msg)
-                            self.is_active = False
-                            return
-                except:
-                    pass
-            
-            if response.status_code != 200:
-                logger.error(f"[YouTubeWorker] Fetch messages failed: {response.status_code} - {response.text}")
-                response.raise_for_status()
-            
-            data = response.json()
-            
-            # Debug: Log all event types in the response
-            items = data.get('items', [])
+            return get_live_chat_poller(self.live_chat_id).poll_once(self)
+        except requests.exceptions.RequestException as e:
+            logger.exception(f"[YouTubeWorker] Network error fetching messages: {e}")
+            safe_emit(self.error_signal, f"Network error fetching messages: {e}")
+            return None
+        except Exception as e:
+            raise Exception(f"Message fetch error: {str(e)}")
+
+    def on_poller_error(self, message: str):
+        """Called by the shared poller when a poll fails"""
+        safe_emit(self.error_signal, message)
+
+    def on_live_chat_ended(self, live_chat_id: str):
+        """Called by the shared poller when the live chat closed; search again"""
+        if self.live_chat_id == live_chat_id:
+            self.live_chat_id = None
+
+    def process_chat_items(self, items):
+        """Emit chat messages and deletions from one liveChat/messages page"""
+        # The first page after a resume holds what was sent during the gap
+        gap, self._backfill_gap = self._backfill_gap, None
+        recovered = 0
+        try:
+            items = items or []
+            self.last_successful_poll = time.time()
             event_types = [item.get('snippet', {}).get('type') for item in items]
             if event_types and any(t != 'textMessageEvent' for t in event_types):
                 logger.debug(f"[YouTubeWorker] Event types in response: {set(event_types)}")
-            
-            # Update next page token
-            self.next_page_token = data.get('nextPageToken')
-            polling_interval = data.get('pollingIntervalMillis', 2000) / 1000
-            
-            items = data.get('items', [])
             logger.debug(f"[YouTubeWorker] Fetched {len(items)} messages")
-            
+
             # Track current batch of message IDs to detect deletions
             current_message_ids = set()
             
@@ -925,63 +940,79 @@ class YouTubeWorker(QThread):
                     'user_id': author_details.get('channelId'),
                     'avatar': author_details.get('profileImageUrl')
                 }
+                if gap is not None:
+                    metadata['backfilled'] = True
+                    recovered += 1
                 
                 self.last_message_time = time.time()  # Update health timestamp
                 logger.debug(f"[YouTubeWorker] Chat: {username}: {message}")
                 from .connector_utils import emit_chat
                 emit_chat(self, 'youtube', username, message, metadata)
+                self.gaps.delivered(msg_id, snippet.get('publishedAt'))
                 
         except Exception as e:
-            raise Exception(f"Message fetch error: {str(e)}")
+            logger.exception(f"[YouTubeWorker] Error processing live chat items: {e}")
+        finally:
+            if gap is not None:
+                self.gaps.finish(gap, recovered, complete=self._resumed)
     
     def stop(self):
         """Stop the worker"""
         self.running = False
     
-    def send_message(self, message: str):
-        """Send a message to YouTube chat"""
+    def _send_headers(self):
+        """Authorization headers for sends, rebuilt only when the token changes"""
+        cached = self._send_headers_cache
+        if cached and cached[0] == self.oauth_token:
+            return cached[1]
+        headers = {
+            'Authorization': f'Bearer {self.oauth_token}',
+            'Content-Type': 'application/json'
+        }
+        self._send_headers_cache = (self.oauth_token, headers)
+        return headers
+
+    def _send_once(self, message: str) -> SendResult:
+        """One liveChatMessages.insert attempt; the connector's dispatcher paces and retries"""
         if not self.live_chat_id or not self.oauth_token:
             logger.warning("[YouTubeWorker] Cannot send message: missing live_chat_id or oauth_token")
-            return False
+            return SendResult(False, error='missing live_chat_id or oauth_token')
 
-        try:
-            # Debug: Show which token is being used
-            token_prefix = self.oauth_token[:12] if self.oauth_token else "None"
-            logger.debug(f"[YouTubeWorker] send_message: Using token (first 12 chars): {token_prefix}...")
-
-            headers = {
-                'Authorization': f'Bearer {self.oauth_token}',
-                'Content-Type': 'application/json'
-            }
-
-            data = {
-                'snippet': {
-                    'liveChatId': self.live_chat_id,
-                    'type': 'textMessageEvent',
-                    'textMessageDetails': {
-                        'messageText': message
-                    }
+        data = {
+            'snippet': {
+                'liveChatId': self.live_chat_id,
+                'type': 'textMessageEvent',
+                'textMessageDetails': {
+                    'messageText': message
                 }
             }
+        }
+        if self._send_session is None:
+            self._send_session = make_send_session(make_retry_session)
+        get_quota_planner().record(QUOTA_COST_INSERT)
+        try:
+            response = self._send_session.post(
+                f'{self.API_BASE}/liveChat/messages?part=snippet',
+                headers=self._send_headers(),
+                json=data,
+                timeout=10
+            )
+        except Exception as e:
+            logger.warning(f"[YouTubeWorker] Network error sending message: {e}")
+            return SendResult.network_error(e)
 
-            session = make_retry_session() if make_retry_session else requests.Session()
-            try:
-                response = session.post(
-                    f'{self.API_BASE}/liveChat/messages?part=snippet',
-                    headers=headers,
-                    json=data,
-                    timeout=10
-                )
-                response.raise_for_status()
-                return True
-            except requests.exceptions.RequestException as e:
-                logger.exception(f"[YouTubeWorker] Network error sending message: {e}")
-                safe_emit(self.error_signal, f"Failed to send message due to network error: {e}")
-                return False
-            except Exception as e:
-                safe_emit(self.error_signal, f"Failed to send message: {str(e)}")
-                return False
+        result = SendResult.from_response(response)
+        if not result.ok:
+            # 403 (quota, banned, chat ended) is final; 429 / 5xx are retried by the dispatcher
+            logger.error(f"[YouTubeWorker] Failed to send message: {response.status_code} - {result.error}")
+            if not result.retryable:
+                safe_emit(self.error_signal, f"Failed to send message: HTTP {response.status_code}")
+        return result
 
+    def send_message(self, message: str):
+        """Send a message to YouTube chat (single attempt)"""
+        try:
+            return bool(self._send_once(message))
         except Exception as e:
             safe_emit(self.error_signal, f"Failed to send message: {str(e)}")
             return False
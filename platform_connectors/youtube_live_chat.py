@@ -0,0 +1,529 @@
+"""
+YouTube Live Chat polling - one shared, quota-aware poller per live chat
+
+`liveChat/messages` is polled by a single LiveChatPoller per `live_chat_id`,
+no matter how many YouTubeWorkers (streamer and bot accounts) are attached.
+Each poll reuses one pooled HTTP session and the next poll is scheduled from
+the server's `pollingIntervalMillis`, stretched by the QuotaBudgetPlanner so
+that the daily API quota lasts for the expected stream length. Every batch
+of items is delivered to all subscribed workers, which keep their own
+de-duplication and emit through the usual `emit_chat` path.
+
+With the `stream` transport (youtube config `chat_transport`) the poller
+holds a `liveChat/messages/stream` (streamList) connection open instead and
+delivers each page as soon as the server pushes it. When the server closes
+the stream it reconnects from the last `nextPageToken`; if the endpoint is
+unavailable or keeps failing it falls back to polling, and tries streaming
+again every STREAM_RETRY_SECONDS. A quiet chat that trips the read timeout
+is an ordinary reconnect, not a failure.
+"""
+
+import codecs
+import json
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from core.logger import get_logger
+
+try:
+    import requests
+except Exception:
+    requests = None
+try:
+    from urllib3.exceptions import ReadTimeoutError
+except Exception:
+    ReadTimeoutError = None
+try:
+    from core.http_session import make_retry_session
+except Exception:
+    make_retry_session = None
+
+logger = get_logger('YouTubeLiveChat')
+
+API_BASE = 'https://www.googleapis.com/youtube/v3'
+
+# YouTube Data API defaults (units per day / per call)
+DEFAULT_DAILY_QUOTA = 10000
+DEFAULT_EXPECTED_STREAM_HOURS = 8.0
+QUOTA_COST_LIST = 5
+QUOTA_COST_SEARCH = 100
+QUOTA_COST_VIDEOS = 1
+QUOTA_COST_INSERT = 50
+# Share of the daily quota kept for searches, sends and moderation
+DEFAULT_RESERVE_FRACTION = 0.15
+
+# Poll scheduling bounds (seconds)
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 300.0
+DEFAULT_SERVER_INTERVAL = 2.0
+ERROR_BACKOFF_SECONDS = 5.0
+# Never plan as if less than this much stream time remains
+MIN_PLANNING_HORIZON = 15 * 60
+
+# Chat transports
+TRANSPORT_POLL = 'poll'
+TRANSPORT_STREAM = 'stream'
+STREAM_PATH = '/liveChat/messages/stream'
+# Reconnect when a stream sends nothing for this long (seconds)
+STREAM_READ_TIMEOUT = 60.0
+STREAM_RECONNECT_DELAY = 1.0
+# Consecutive stream errors before falling back to polling
+STREAM_MAX_FAILURES = 3
+# After falling back, try streaming again this often (seconds)
+STREAM_RETRY_SECONDS = 10 * 60
+# Guard against a body that never forms a JSON object
+STREAM_MAX_BUFFER = 8 * 1024 * 1024
+
+
+class StreamUnavailable(Exception):
+    """The streamList endpoint can't be used; the poller falls back to polling"""
+
+
+def iter_json_stream(chunks: Iterable) -> Iterator[dict]:
+    """Yield JSON objects from a streamed body as soon as each one is complete.
+
+    Accepts a streamed JSON array (`[{...},{...}]`) as well as concatenated
+    or newline-delimited objects.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buf = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf += text_decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+        while True:
+            i = 0
+            while i < len(buf) and buf[i] in ' \t\r\n,[]':
+                i += 1
+            buf = buf[i:]
+            if not buf:
+                break
+            try:
+                obj, end = decoder.raw_decode(buf)
+            except ValueError:
+                if len(buf) > STREAM_MAX_BUFFER:
+                    raise ValueError("Unparseable live chat stream")
+                break  # Incomplete object; wait for more data
+            buf = buf[end:]
+            if isinstance(obj, dict):
+                yield obj
+
+
+class QuotaBudgetPlanner:
+    """Stretch poll intervals so the daily quota covers the expected stream length"""
+
+    def __init__(self, daily_quota: int = DEFAULT_DAILY_QUOTA,
+                 expected_stream_hours: float = DEFAULT_EXPECTED_STREAM_HOURS,
+                 reserve_fraction: float = DEFAULT_RESERVE_FRACTION, poll_cost: int = QUOTA_COST_LIST):
+        self._lock = threading.Lock()
+        self.daily_quota = int(daily_quota)
+        self.expected_seconds = float(expected_stream_hours) * 3600
+        self.reserve_fraction = float(reserve_fraction)
+        self.poll_cost = int(poll_cost)
+        self.used = 0
+        self.exhausted = False
+        self.stream_started_at: Optional[float] = None
+        self._day = self._quota_day()
+
+    @staticmethod
+    def _quota_day(now: Optional[float] = None) -> int:
+        # Quota resets at midnight Pacific time; UTC-8 is close enough for planning
+        return int(((now or time.time()) - 8 * 3600) // 86400)
+
+    def _roll_day_locked(self, now: float):
+        day = self._quota_day(now)
+        if day != self._day:
+            self._day = day
+            self.used = 0
+            self.exhausted = False
+
+    def configure(self, daily_quota: Optional[int] = None, expected_stream_hours: Optional[float] = None):
+        with self._lock:
+            if daily_quota:
+                self.daily_quota = int(daily_quota)
+            if expected_stream_hours:
+                self.expected_seconds = float(expected_stream_hours) * 3600
+
+    def mark_stream_start(self, now: Optional[float] = None):
+        with self._lock:
+            if self.stream_started_at is None:
+                self.stream_started_at = now or time.time()
+
+    def record(self, units: int, now: Optional[float] = None):
+        """Account for `units` of quota spent by any YouTube API call."""
+        with self._lock:
+            self._roll_day_locked(now or time.time())
+            self.used += int(units)
+
+    def mark_exhausted(self):
+        with self._lock:
+            self.exhausted = True
+
+    def next_interval(self, server_interval: Optional[float] = None, now: Optional[float] = None) -> float:
+        """Seconds until the next poll: the server's interval or longer if the budget needs it."""
+        now = now or time.time()
+        server_interval = DEFAULT_SERVER_INTERVAL if server_interval is None else float(server_interval)
+        with self._lock:
+            self._roll_day_locked(now)
+            if self.exhausted:
+                return MAX_POLL_INTERVAL
+            budget = self.daily_quota * (1.0 - self.reserve_fraction) - self.used
+            polls_affordable = budget / max(1, self.poll_cost)
+            if polls_affordable < 1:
+                return MAX_POLL_INTERVAL
+            started = self.stream_started_at or now
+            remaining = max(MIN_PLANNING_HORIZON, started + self.expected_seconds - now)
+            budget_interval = remaining / polls_affordable
+        return min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, server_interval, budget_interval))
+
+
+def _error_reason(response) -> str:
+    try:
+        return response.json().get('error', {}).get('errors', [{}])[0].get('reason', '') or ''
+    except Exception:
+        return ''
+
+
+def _is_read_timeout(exc: BaseException) -> bool:
+    """True if `exc` is a read timeout (requests wraps urllib3's inside ConnectionError mid-stream)"""
+    if requests is not None and isinstance(exc, requests.exceptions.ReadTimeout):
+        return True
+    if isinstance(exc, TimeoutError):
+        return True
+    cause = exc.args[0] if getattr(exc, 'args', None) else None
+    return ReadTimeoutError is not None and isinstance(cause, ReadTimeoutError)
+
+
+class LiveChatPoller:
+    """Polls one live chat on behalf of every subscribed YouTubeWorker"""
+
+    def __init__(self, live_chat_id: str, planner: Optional[QuotaBudgetPlanner] = None,
+                 transport: str = TRANSPORT_POLL, api_base: str = API_BASE):
+        self.live_chat_id = live_chat_id
+        self.planner = planner or get_quota_planner()
+        self.transport = transport
+        # Transport in use; drops to polling when streaming isn't available
+        self.active_transport = transport
+        self.api_base = api_base
+        self._stream_response = None
+        self._stream_retry_at: Optional[float] = None
+        self.next_page_token: Optional[str] = None
+        self.session = None
+        self.ended = False
+        self.polls = 0
+        self.last_interval: Optional[float] = None
+        self._subscribers: List = []
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    # -- subscribers -----------------------------------------------------
+    @property
+    def subscribers(self) -> List:
+        with self._lock:
+            return list(self._subscribers)
+
+    def subscribe(self, worker, start: bool = True):
+        """Attach a worker; the polling thread starts with the first subscriber."""
+        with self._lock:
+            if worker not in self._subscribers:
+                self._subscribers.append(worker)
+            if start and (self._thread is None or not self._thread.is_alive()) and not self.ended:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name=f'YouTubePoller-{self.live_chat_id[:8]}', daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, worker):
+        """Detach a worker; the poller stops and is forgotten after the last one."""
+        with self._lock:
+            if worker in self._subscribers:
+                self._subscribers.remove(worker)
+            if self._subscribers:
+                return
+            self._stopped = True
+            self._wake.set()
+        self._close_stream()
+        _forget_poller(self)
+
+    def resume_from(self, page_token: str) -> bool:
+        """Continue from a previous poller's `nextPageToken` so nothing sent in between is skipped.
+
+        Ignored (returns False) once this poller has a position of its own.
+        """
+        with self._lock:
+            if self.next_page_token or self.polls:
+                return False
+            self.next_page_token = page_token
+            return True
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._wake.set()
+        self._close_stream()
+
+    def _close_stream(self):
+        response = self._stream_response
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    # -- polling ---------------------------------------------------------
+    def _get_session(self):
+        if self.session is None:
+            self.session = make_retry_session() if make_retry_session else requests.Session()
+        return self.session
+
+    def _credentials_worker(self, preferred=None):
+        """Worker whose token/API key is used for the request (prefers an OAuth token)."""
+        candidates = ([preferred] if preferred is not None else []) + self.subscribers
+        for worker in candidates:
+            if getattr(worker, 'oauth_token', None):
+                return worker
+        for worker in candidates:
+            if getattr(worker, 'api_key', None):
+                return worker
+        return None
+
+    def _auth(self, worker):
+        headers = {}
+        params = {
+            'liveChatId': self.live_chat_id,
+            'part': 'snippet,authorDetails',
+            'maxResults': 200
+        }
+        if self.next_page_token:
+            params['pageToken'] = self.next_page_token
+        if getattr(worker, 'oauth_token', None):
+            headers['Authorization'] = f'Bearer {worker.oauth_token}'
+        else:
+            params['key'] = worker.api_key
+        return headers, params
+
+    def _request(self, worker):
+        headers, params = self._auth(worker)
+        self.planner.record(QUOTA_COST_LIST)
+        return self._get_session().get(f'{self.api_base}/liveChat/messages', headers=headers, params=params, timeout=10)
+
+    def _open_stream(self, worker):
+        headers, params = self._auth(worker)
+        self.planner.record(QUOTA_COST_LIST)
+        return self._get_session().get(f'{self.api_base}{STREAM_PATH}', headers=headers, params=params,
+                                       stream=True, timeout=(10, STREAM_READ_TIMEOUT))
+
+    def _handle_error_status(self, response) -> Optional[float]:
+        """Handle quota / ended-chat responses; returns a delay if handled."""
+        if response.status_code not in (403, 404):
+            return None
+        reason = _error_reason(response)
+        if reason == 'quotaExceeded':
+            self.planner.mark_exhausted()
+            self._notify_error("YouTube API quota exceeded. Polling paused until the quota resets.")
+            return self.planner.next_interval()
+        if reason in ('liveChatEnded', 'liveChatNotFound', 'liveChatDisabled'):
+            logger.info(f"Live chat {self.live_chat_id[:20]}... is no longer available ({reason})")
+            self._end()
+            return 0.0
+        return None
+
+    def _deliver(self, items, worker=None):
+        recipients = self.subscribers
+        if worker is not None and worker not in recipients:
+            recipients.append(worker)
+        for recipient in recipients:
+            try:
+                recipient.process_chat_items(items)
+            except Exception as e:
+                logger.exception(f"Live chat subscriber failed to process items: {e}")
+
+    def poll_once(self, worker=None) -> float:
+        """Fetch one page, deliver it to subscribers (and `worker`), return the delay until the next poll."""
+        creds = self._credentials_worker(worker)
+        if creds is None:
+            self._notify_error("No API key or OAuth token available for YouTube live chat polling")
+            return MAX_POLL_INTERVAL
+
+        response = self._request(creds)
+        if response.status_code == 401 and getattr(creds, 'refresh_token', None):
+            logger.info("Live chat poll unauthorized; refreshing token and retrying")
+            if creds.refresh_access_token():
+                response = self._request(creds)
+
+        handled = self._handle_error_status(response)
+        if handled is not None:
+            return handled
+        if response.status_code == 404:
+            logger.info(f"Live chat {self.live_chat_id[:20]}... is no longer available (404)")
+            self._end()
+            return 0.0
+
+        if response.status_code != 200:
+            logger.error(f"Fetch messages failed: {response.status_code} - {response.text}")
+            response.raise_for_status()
+
+        data = response.json()
+        self.next_page_token = data.get('nextPageToken') or self.next_page_token
+        server_interval = (data.get('pollingIntervalMillis') or DEFAULT_SERVER_INTERVAL * 1000) / 1000
+        items = data.get('items', []) or []
+        self.polls += 1
+
+        self._deliver(items, worker)
+
+        self.last_interval = self.planner.next_interval(server_interval)
+        return self.last_interval
+
+    def stream_once(self, worker=None) -> float:
+        """Hold one streamList connection open, delivering pages as they arrive.
+
+        Returns the delay before reconnecting once the server ends the stream.
+        Raises StreamUnavailable when the endpoint can't be used.
+        """
+        creds = self._credentials_worker(worker)
+        if creds is None:
+            self._notify_error("No API key or OAuth token available for YouTube live chat streaming")
+            return MAX_POLL_INTERVAL
+
+        try:
+            response = self._open_stream(creds)
+            if response.status_code == 401 and getattr(creds, 'refresh_token', None):
+                response.close()
+                logger.info("Live chat stream unauthorized; refreshing token and retrying")
+                if creds.refresh_access_token():
+                    response = self._open_stream(creds)
+        except Exception as e:
+            if not _is_read_timeout(e):
+                raise
+            logger.debug("Live chat stream sent no headers within the read timeout; reconnecting")
+            return STREAM_RECONNECT_DELAY
+
+        if response.status_code != 200:
+            try:
+                handled = self._handle_error_status(response)
+            finally:
+                response.close()
+            if handled is not None:
+                return handled
+            raise StreamUnavailable(f"streamList returned HTTP {response.status_code}")
+
+        self._stream_response = response
+        pages = 0
+        try:
+            try:
+                for page in iter_json_stream(response.iter_content(chunk_size=None)):
+                    with self._lock:
+                        if self._stopped:
+                            break
+                    if 'error' in page:
+                        raise StreamUnavailable(f"streamList error: {page['error']}")
+                    self.next_page_token = page.get('nextPageToken') or self.next_page_token
+                    self.polls += 1
+                    pages += 1
+                    self._deliver(page.get('items', []) or [], worker)
+            except Exception as e:
+                if not _is_read_timeout(e):
+                    raise
+                # A quiet chat, not a broken stream: reconnect from the last token
+                logger.debug(f"Live chat stream idle for {STREAM_READ_TIMEOUT:.0f}s after {pages} pages; reconnecting")
+                return STREAM_RECONNECT_DELAY
+        finally:
+            self._stream_response = None
+            response.close()
+        logger.debug(f"Live chat stream closed after {pages} pages; reconnecting from the last page token")
+        return STREAM_RECONNECT_DELAY
+
+    def _notify_error(self, message: str):
+        for worker in self.subscribers:
+            try:
+                worker.on_poller_error(message)
+            except Exception:
+                pass
+
+    def _end(self):
+        with self._lock:
+            self.ended = True
+            self._stopped = True
+            subscribers = list(self._subscribers)
+        for worker in subscribers:
+            try:
+                worker.on_live_chat_ended(self.live_chat_id)
+            except Exception:
+                pass
+        _forget_poller(self)
+
+    def _fall_back_to_polling(self):
+        self.active_transport = TRANSPORT_POLL
+        self._stream_retry_at = time.monotonic() + STREAM_RETRY_SECONDS
+
+    def _run(self):
+        self.planner.mark_stream_start()
+        stream_failures = 0
+        while True:
+            with self._lock:
+                if self._stopped or not self._subscribers:
+                    break
+            if (self.transport == TRANSPORT_STREAM and self.active_transport == TRANSPORT_POLL
+                    and self._stream_retry_at is not None and time.monotonic() >= self._stream_retry_at):
+                logger.info("Retrying live chat streaming")
+                self.active_transport = TRANSPORT_STREAM
+                self._stream_retry_at = None
+                stream_failures = 0
+            if self.active_transport == TRANSPORT_STREAM:
+                try:
+                    delay = self.stream_once()
+                    stream_failures = 0
+                except StreamUnavailable as e:
+                    logger.info(f"Live chat streaming unavailable, falling back to polling: {e}")
+                    self._fall_back_to_polling()
+                    delay = 0.0
+                except Exception as e:
+                    stream_failures += 1
+                    logger.warning(f"Live chat stream error ({stream_failures}/{STREAM_MAX_FAILURES}): {e}")
+                    if stream_failures >= STREAM_MAX_FAILURES:
+                        logger.info("Live chat stream keeps failing, falling back to polling")
+                        self._fall_back_to_polling()
+                    delay = ERROR_BACKOFF_SECONDS
+            else:
+                try:
+                    delay = self.poll_once()
+                except Exception as e:
+                    logger.warning(f"Live chat poll error: {e}")
+                    self._notify_error(f"Error fetching messages: {e}")
+                    delay = ERROR_BACKOFF_SECONDS
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+
+
+# Global instances
+_quota_planner = None
+_pollers: Dict[str, LiveChatPoller] = {}
+_pollers_lock = threading.Lock()
+
+
+def get_quota_planner() -> QuotaBudgetPlanner:
+    """Get the process-wide quota planner (quota is per API project)"""
+    global _quota_planner
+    if _quota_planner is None:
+        _quota_planner = QuotaBudgetPlanner()
+    return _quota_planner
+
+
+def get_live_chat_poller(live_chat_id: str, transport: str = TRANSPORT_POLL) -> LiveChatPoller:
+    """Get the shared poller for `live_chat_id`, creating it with `transport` if needed"""
+    with _pollers_lock:
+        poller = _pollers.get(live_chat_id)
+        if poller is None or poller.ended:
+            poller = LiveChatPoller(live_chat_id, transport=transport)
+            _pollers[live_chat_id] = poller
+        return poller
+
+
+def _forget_poller(poller: LiveChatPoller):
+    with _pollers_lock:
+        if _pollers.get(poller.live_chat_id) is poller:
+            del _pollers[poller.live_chat_id]
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+
+import platform_connectors.connector_utils as cu
+import platform_connectors.youtube_connector as yc
+import platform_connectors.youtube_live_chat as ylc
+from core.backfill import GapTracker, to_epoch_seconds
+from platform_connectors.dlive_connector import DLiveWorker
+from platform_connectors.trovo_connector import TrovoWorker
+from platform_connectors.youtube_connector import YouTubeWorker
+from platform_connectors.youtube_live_chat import LiveChatPoller
+from youtube_stream_standin import StandInStreamServer
+
+
+def _capture(monkeypatch):
+    emitted = []
+    monkeypatch.setattr(cu, 'emit_chat', lambda w, p, u, m, meta: emitted.append((u, m, meta.get('backfilled', False))))
+    return emitted
+
+
+def test_gap_tracker_windows_and_reports():
+    assert to_epoch_seconds(1700000000) == 1700000000
+    assert to_epoch_seconds('1700000000123') == 1700000000.123
+    assert to_epoch_seconds(1700000000 * 10 ** 9) == 1700000000
+    assert to_epoch_seconds('2023-11-14T22:13:20Z') == 1700000000
+    assert to_epoch_seconds(None) is None
+
+    gaps = GapTracker('test')
+    # The first connection never backfills
+    assert gaps.connected(now=1000) is None
+    gaps.delivered('a', 1010)
+    gaps.disconnected(now=1020)
+    gaps.disconnected(now=1025)  # Later notices keep the first drop time
+    gap = gaps.connected(now=1050)
+    assert gap.since_ts == 1010 and gap.duration == 30
+    assert not gap.accepts(1005) and not gap.accepts(1010, 'a') and gap.accepts(1015, 'b')
+    gaps.finish(gap, 2)
+    stats = gaps.stats()
+    assert stats['gaps'] == 1 and stats['total_recovered'] == 2 and stats['last_gap']['duration'] == 30
+
+
+def test_trovo_delivers_replayed_history_inside_the_gap(monkeypatch):
+    emitted = _capture(monkeypatch)
+    worker = TrovoWorker(access_token='', channel='chan')
+    now = time.time()
+    worker.gaps.connected(now - 100)
+    worker.connection_time = now - 100
+    frame = lambda chats: json.dumps({'type': 'CHAT', 'data': {'chats': chats}})
+    chat = lambda mid, t, text: {'message_id': mid, 'send_time': t, 'nick_name': 'viewer', 'content': text}
+    worker.handle_message(frame([chat('m1', now - 50, 'live')]))
+
+    worker.gaps.disconnected(now - 40)
+    worker.connection_time = now
+    worker._backfill_gap = worker.gaps.connected(now)
+    worker._backfill_count = 0
+    # Trovo replays recent chat after AUTH: old, already seen and in-gap messages
+    worker.handle_message(frame([chat('m0', now - 200, 'before start'), chat('m1', now - 50, 'live'),
+                                 chat('m2', now - 30, 'missed'), chat('m3', now - 10, 'missed too')]))
+
+    assert emitted == [('viewer', 'live', False), ('viewer', 'missed', True), ('viewer', 'missed too', True)]
+    assert worker._backfill_gap is None
+    assert worker.gaps.stats()['total_recovered'] == 2
+
+
+def test_dlive_backfill_fetches_history_after_reconnect(monkeypatch):
+    emitted = _capture(monkeypatch)
+    worker = DLiveWorker(username='streamer')
+    now = time.time()
+    ns = lambda t: str(int(t * 10 ** 9))
+    text = lambda mid, t, content: {'type': 'ChatText', 'id': mid, 'content': content, 'createdAt': ns(t),
+                                    'sender': {'displayname': 'viewer', 'username': 'viewer'}}
+    worker.gaps.connected(now - 100)
+    worker.process_message(text('a', now - 60, 'live'))
+    worker.gaps.disconnected(now - 50)
+
+    history = [text('old', now - 90, 'old'), text('a', now - 60, 'live'), text('b', now - 45, 'missed')]
+    monkeypatch.setattr(worker, 'fetch_chat_history', lambda: history)
+    asyncio.run(worker.backfill_gap())
+
+    assert emitted == [('viewer', 'live', False), ('viewer', 'missed', True)]
+    last = worker.gaps.stats()['last_gap']
+    assert last['recovered'] == 1 and last['complete']
+
+
+def test_dlive_backfill_survives_a_non_json_history_response(monkeypatch):
+    emitted = _capture(monkeypatch)
+    worker = DLiveWorker(username='streamer')
+    now = time.time()
+    worker.gaps.connected(now - 100)
+    worker.gaps.disconnected(now - 50)
+
+    class HtmlResponse:
+        status_code = 200
+
+        def json(self):
+            raise ValueError('Expecting value: line 1 column 1 (char 0)')
+
+    class Session:
+        def post(self, *args, **kwargs):
+            return HtmlResponse()
+
+    worker._send_session = Session()
+    asyncio.run(worker.backfill_gap())
+
+    assert emitted == []
+    last = worker.gaps.stats()['last_gap']
+    assert last['recovered'] == 0 and not last['complete']
+
+
+def _run_youtube_worker(monkeypatch, server, chat_ids, until):
+    """Drive YouTubeWorker.run() against the stand-in; find_live_broadcast yields `chat_ids` in turn"""
+    monkeypatch.setattr(ylc, 'MIN_POLL_INTERVAL', 0.05)
+    monkeypatch.setattr(ylc, 'ERROR_BACKOFF_SECONDS', 0.05)
+    planner = ylc.QuotaBudgetPlanner(daily_quota=1_000_000, expected_stream_hours=1)
+
+    def make_poller(live_chat_id, transport=ylc.TRANSPORT_POLL):
+        poller = LiveChatPoller(live_chat_id, planner=planner, api_base=server.api_base)
+        poller.session = requests.Session()
+        return poller
+
+    monkeypatch.setattr(yc, 'get_live_chat_poller', make_poller)
+    worker = YouTubeWorker(channel='UC1', api_key='key')
+    found = list(chat_ids)
+
+    def find_live_broadcast():
+        worker.live_chat_id = found.pop(0) if len(found) > 1 else found[0]
+        return True
+
+    worker.find_live_broadcast = find_live_broadcast
+    thread = threading.Thread(target=worker.run, daemon=True)
+    thread.start()
+    try:
+        deadline = time.time() + 10
+        while not until() and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        worker.stop()
+        thread.join(timeout=5)
+        server.stop()
+    return worker
+
+
+def _yt_item(mid, text):
+    return {'id': mid, 'authorDetails': {'displayName': 'viewer'},
+            'snippet': {'type': 'textMessageEvent', 'displayMessage': text,
+                        'publishedAt': datetime.now(timezone.utc).isoformat()}}
+
+
+def _yt_page(items, token):
+    return {'items': items, 'nextPageToken': token, 'pollingIntervalMillis': 10}
+
+
+def test_youtube_resumes_the_same_chat_after_a_transient_404(monkeypatch):
+    emitted = _capture(monkeypatch)
+    server = StandInStreamServer([], poll_pages=[_yt_page([_yt_item('a', 'live')], 't1'), 404,
+                                                 _yt_page([_yt_item('b', 'missed')], 't2')]).start()
+    # find_live_broadcast finds the same chat again after the 404
+    worker = _run_youtube_worker(monkeypatch, server, ['chat-1'], lambda: len(emitted) >= 2)
+
+    assert emitted == [('viewer', 'live', False), ('viewer', 'missed', True)]
+    assert [q.get('pageToken') for _, q in server.requests[:3]] == [None, 't1', 't1']
+    assert worker.gaps.stats()['last_gap']['recovered'] == 1
+
+
+def test_youtube_new_chat_starts_fresh_without_a_backfill(monkeypatch):
+    emitted = _capture(monkeypatch)
+    server = StandInStreamServer([], poll_pages=[_yt_page([_yt_item('a', 'old stream')], 't1'), 404,
+                                                 _yt_page([_yt_item('b', 'new stream')], 't2')]).start()
+    worker = _run_youtube_worker(monkeypatch, server, ['chat-1', 'chat-2'], lambda: len(emitted) >= 2)
+
+    # The next broadcast's chat never inherits the old token or counts as a gap
+    assert emitted == [('viewer', 'old stream', False), ('viewer', 'new stream', False)]
+    assert [q.get('pageToken') for _, q in server.requests[:3]] == [None, 't1', None]
+    assert worker.gaps.stats()['gaps'] == 0
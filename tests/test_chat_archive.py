@@ -0,0 +1,49 @@
+from core.chat_archive import ChatArchive
+
+
+def _archive(tmp_path, **kwargs):
+    return ChatArchive(db_path=str(tmp_path / 'archive.db'), flush_interval=0.05, **kwargs)
+
+
+def test_batched_writes_and_filters(tmp_path):
+    archive = _archive(tmp_path)
+    try:
+        archive.record('twitch', 'Alice', 'hello world', {'message_id': 'a1', 'timestamp': 1000})
+        archive.record('youtube', 'bob', 'Hello there', {'timestamp': '1970-01-01T00:33:20Z'})
+        archive.record('twitch', 'carol', 'goodbye world', {'timestamp': 3000000})  # milliseconds
+        assert archive.flush()
+        assert archive.count() == 3
+
+        assert [r['username'] for r in archive.query(text='hello')] == ['bob', 'Alice']
+        assert [r['username'] for r in archive.query(text='world', platform='twitch')] == ['carol', 'Alice']
+        assert [r['message'] for r in archive.query(username='alice')] == ['hello world']
+        assert [r['username'] for r in archive.query(since=1500, until=2500)] == ['bob']
+        assert archive.query(username='Alice')[0]['metadata']['message_id'] == 'a1'
+        assert archive.stats()['written'] == 3
+    finally:
+        archive.close()
+
+
+def test_search_text_is_not_parsed_as_fts_syntax(tmp_path):
+    archive = _archive(tmp_path)
+    try:
+        archive.record('kick', 'dave', 'what" OR NEAR( *', {})
+        archive.flush()
+        # Operators/quotes in user input must not raise or widen the match
+        assert len(archive.query(text='what" OR')) == 1
+        assert archive.query(text='NOT present') == []
+    finally:
+        archive.close()
+
+
+def test_full_queue_drops_and_counts(tmp_path):
+    import queue
+    archive = _archive(tmp_path)
+    archive.close()
+    # Writer stopped; a saturated queue must drop instead of blocking the caller
+    archive._stop.clear()
+    archive._queue = queue.Queue(maxsize=1)
+    archive.record('twitch', 'x', 'one', {})
+    archive.record('twitch', 'x', 'two', {})
+    assert archive.stats()['pending'] == 1
+    assert archive.stats()['dropped'] == 1
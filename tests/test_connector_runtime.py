@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+from core.connector_runtime import ConnectorRuntime, HostedTask, worker_host
+
+
+class FakeWorker:
+    def __init__(self):
+        self.running = False
+        self.runtime_host = None
+        self.child_cancelled = False
+
+    async def _child(self):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.child_cancelled = True
+            raise
+
+    async def run_async(self):
+        self.running = True
+        asyncio.create_task(self._child())
+        total = 0
+        for i in range(100000):
+            total += i
+        while self.running:
+            await asyncio.sleep(0.01)
+        return total
+
+    def stop(self):
+        self.running = False
+
+
+def test_tasks_share_one_loop_and_are_accounted_separately():
+    runtime = ConnectorRuntime('TestRuntime')
+    threads = []
+
+    async def record(name):
+        threads.append((name, runtime.in_runtime_thread()))
+        await asyncio.sleep(0.01)
+
+    first = runtime.submit(record('a'), 'A')
+    second = runtime.submit(record('b'), 'B')
+    first.result(2)
+    second.result(2)
+    assert sorted(threads) == [('a', True), ('b', True)]
+    stats = {s['name']: s for s in runtime.stats()}
+    assert set(stats) == {'A', 'B'} and not stats['A']['running']
+    assert stats['A']['steps'] >= 2
+    runtime.shutdown()
+
+
+def test_hosted_task_lifecycle_and_terminate_cancels_children():
+    runtime = ConnectorRuntime('TestRuntime')
+    worker = FakeWorker()
+    host = HostedTask(worker, runtime=runtime)
+    assert worker.runtime_host is host
+    host.start()
+    deadline = time.time() + 2
+    while not worker.running and time.time() < deadline:
+        time.sleep(0.01)
+    assert host.isRunning()
+
+    worker.stop()
+    assert host.wait(2000)
+    # Steps are charged as they finish, so check once the worker is done
+    assert runtime.stats()[0]['cpu_seconds'] > 0
+    assert host.isFinished() and host.future.result() == sum(range(100000))
+    assert not worker.child_cancelled
+
+    host.terminate()
+    deadline = time.time() + 2
+    while not worker.child_cancelled and time.time() < deadline:
+        time.sleep(0.01)
+    assert worker.child_cancelled
+    runtime.shutdown()
+
+
+def test_worker_host_respects_config_switch():
+    class Config:
+        def __init__(self, enabled):
+            self.enabled = enabled
+
+        def get(self, key, default=None):
+            return {'shared_runtime': self.enabled} if key == 'connectors' else default
+
+    worker = FakeWorker()
+    assert isinstance(worker_host(worker, config=Config(True)), HostedTask)
+    worker = FakeWorker()
+    # Disabled: QThread-subclass workers run on their own thread
+    assert worker_host(worker, config=Config(False)) is worker
@@ -0,0 +1,108 @@
+import json
+import threading
+
+import ui.chat_page as chat_mod
+
+
+class DummyMgr:
+    cache_dir = '/nonexistent'
+
+    def get_emote_data_uri(self, eid, broadcaster_id=None):
+        return f'data:image/png;base64,{eid}'
+
+
+class ManualTimer:
+    pending = []
+
+    @staticmethod
+    def singleShot(ms, cb):
+        ManualTimer.pending.append(cb)
+
+
+def _make_page(monkeypatch):
+    import core.twitch_emotes as te
+    monkeypatch.setattr(te, 'get_manager', lambda: DummyMgr())
+    ManualTimer.pending = []
+    monkeypatch.setattr(chat_mod, 'QTimer', ManualTimer)
+
+    page = chat_mod.ChatPage.__new__(chat_mod.ChatPage)
+    page._pending_emote_patches = {}
+    page._emote_patch_lock = threading.Lock()
+    page._emote_patch_scheduled = False
+    page._emote_patch_window_ms = 50
+    page._emote_patch_max_batch = 500
+    page._emote_patch_batches = 0
+    page._emote_patch_ids = 0
+    page._pending_file_checks = set()
+    page._file_check_scheduled = False
+    page._file_emote_check_delay_ms = 250
+    page.js_calls = []
+    page._invoke_queue_js = lambda js, mid=None: page.js_calls.append(js)
+    return page
+
+
+def test_many_resolved_emotes_flush_in_one_js_call(monkeypatch):
+    page = _make_page(monkeypatch)
+
+    for i in range(50):
+        page._on_emote_image_cached({'emote_id': str(i)})
+    page._on_emote_set_metadata_ready({'emote_ids': ['100', '101']})
+
+    # Only one flush is scheduled for the whole window
+    assert len(ManualTimer.pending) == 1
+    assert page.js_calls == []
+
+    ManualTimer.pending.pop()()
+
+    assert len(page.js_calls) == 1
+    js = page.js_calls[0]
+    assert js.startswith('/*META_PRIORITY*/')
+    payload = js[js.rindex('})(') + 3:-2]
+    patches = json.loads(payload)
+    assert len(patches) == 52
+    assert patches['7'] == 'data:image/png;base64,7'
+    assert page._emote_patch_batches == 1
+
+
+def test_inserted_placeholders_are_batched_without_probe(monkeypatch):
+    page = _make_page(monkeypatch)
+    placeholder = 'data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///ywAAAAAAQABAAACAUwAOw=='
+    wrapped = (
+        f'<div class="message"><img data-emote-id="25" src="{placeholder}" alt="Kappa" />'
+        '<img data-emote-id="30" src="data:image/png;base64,AAA" alt="ok" /></div>'
+    )
+    page._schedule_placeholder_patches(wrapped)
+    ManualTimer.pending.pop()()
+
+    assert len(page.js_calls) == 1
+    assert '"25"' in page.js_calls[0]
+    assert '"30"' not in page.js_calls[0]
+
+
+def test_file_emotes_are_patched_only_when_they_fail_to_load(monkeypatch):
+    page = _make_page(monkeypatch)
+    probes = []
+
+    class FakeWebPage:
+        def runJavaScript(self, js, cb):
+            probes.append(js)
+            cb(['41'])
+
+    class FakeView:
+        def page(self):
+            return FakeWebPage()
+
+    page.chat_display = FakeView()
+    wrapped = ('<div class="message"><img data-emote-id="40" src="file:///cache/40.png" alt="a" />'
+               '<img data-emote-id="41" src="file:///cache/41.png" alt="b" /></div>')
+    page._schedule_placeholder_patches(wrapped, 'm1')
+    page._schedule_placeholder_patches(wrapped.replace('40', '42'), 'm2')
+
+    # Nothing is encoded up front; one deferred probe covers both messages
+    assert page._pending_emote_patches == {} and len(ManualTimer.pending) == 1
+    ManualTimer.pending.pop()()
+    assert len(probes) == 1 and '"m1"' in probes[0] and '"m2"' in probes[0]
+
+    ManualTimer.pending.pop()()
+    patches = json.loads(page.js_calls[0][page.js_calls[0].rindex('})(') + 3:-2])
+    assert patches == {'41': 'data:image/png;base64,41'}
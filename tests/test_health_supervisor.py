@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+from core.health_supervisor import DEAD, OK, HealthSupervisor, ProbeResult, websocket_probe
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_timer_wheel_fires_on_interval_and_wraps_slots():
+    supervisor = HealthSupervisor(tick_seconds=0.01, slots=4)
+    calls = []
+    # 10 ticks on a 4-slot wheel needs two full rounds before firing
+    handle = supervisor.register('slow', lambda: calls.append(1) or ProbeResult(OK), interval=0.1)
+    assert handle.slot == 2 and handle.rounds == 2
+    assert _wait_for(lambda: len(calls) >= 2)
+    assert _wait_for(lambda: supervisor.table()[0]['status'] == OK)
+    supervisor.unregister(handle)
+    seen = len(calls)
+    time.sleep(0.2)
+    assert len(calls) == seen and supervisor.table() == []
+    supervisor.shutdown()
+
+
+def test_dead_probe_escalates_and_hung_probe_times_out():
+    supervisor = HealthSupervisor(tick_seconds=0.01)
+    escalated = []
+    supervisor.register('stalled', lambda: ProbeResult(DEAD, 'No messages for 400s'), interval=0.05,
+                        escalate=escalated.append, escalate_after=2)
+    assert _wait_for(lambda: escalated)
+    assert escalated[0].detail == 'No messages for 400s'
+
+    release = threading.Event()
+    hung = supervisor.register('hung', lambda: release.wait(5) and ProbeResult(OK), interval=0.02, timeout=0.1)
+    assert _wait_for(lambda: hung.result.status == DEAD)
+    assert 'timed out' in hung.result.detail
+    release.set()
+    assert _wait_for(lambda: hung.result.status == OK)
+    supervisor.shutdown()
+
+
+def test_websocket_probe_pings_quiet_streams():
+    class FakeWs:
+        def __init__(self, answer):
+            self.answer = answer
+            self.pings = 0
+
+        async def ping(self):
+            self.pings += 1
+            waiter = asyncio.get_running_loop().create_future()
+            if self.answer:
+                waiter.set_result(None)
+            return waiter
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        now = time.time()
+        busy = FakeWs(True)
+        result = websocket_probe(busy, loop, lambda: now - 5, stall_after=120, ping_after=60)()
+        assert result.status == OK and busy.pings == 0 and result.last_message_age >= 5
+
+        quiet = FakeWs(True)
+        result = websocket_probe(quiet, loop, lambda: now - 90, stall_after=120, ping_after=60)()
+        assert result.status == OK and quiet.pings == 1 and result.rtt_ms is not None
+
+        stalled = websocket_probe(FakeWs(True), loop, lambda: now - 300, stall_after=120)()
+        assert stalled.status == DEAD and 'No messages' in stalled.detail
+
+        silent = websocket_probe(FakeWs(False), loop, lambda: now - 90, stall_after=120, ping_after=60,
+                                 ping_timeout=0.05)()
+        assert silent.status == DEAD and 'Ping unanswered' in silent.detail
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(2)
+        loop.close()
@@ -0,0 +1,130 @@
+import gzip
+import json
+import socket
+import time
+import urllib.request
+
+import pytest
+
+pytest.importorskip('flask')
+
+from core.http_server import EmbeddedHTTPServer, GzipMiddleware, PathDispatcher
+
+
+def _json_app(payload):
+    body = json.dumps(payload).encode()
+
+    def app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+        return [body]
+    return app
+
+
+def _call(app, path='/', accept='gzip'):
+    captured = {}
+
+    def start_response(status, headers, exc_info=None):
+        captured['status'] = status
+        captured['headers'] = dict(headers)
+
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET', 'HTTP_ACCEPT_ENCODING': accept}
+    body = b''.join(app(environ, start_response))
+    return captured, body
+
+
+def test_gzip_compresses_large_json_only():
+    big = _json_app({'messages': ['x' * 50] * 50})
+    headers, body = _call(GzipMiddleware(big))
+    assert headers['headers']['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(body))['messages'][0] == 'x' * 50
+
+    small = _json_app({'ok': True})
+    headers, body = _call(GzipMiddleware(small))
+    assert 'Content-Encoding' not in headers['headers']
+
+    headers, body = _call(GzipMiddleware(big), accept='')
+    assert 'Content-Encoding' not in headers['headers']
+
+
+def test_path_dispatcher_routes_registered_paths():
+    dispatcher = PathDispatcher(_json_app({'app': 'overlay'}), _json_app({'app': 'callback'}), lambda: ['/kick/webhook'])
+    assert json.loads(_call(dispatcher, '/kick/webhook', accept='')[1]) == {'app': 'callback'}
+    assert json.loads(_call(dispatcher, '/overlay/settings', accept='')[1]) == {'app': 'overlay'}
+
+
+def test_embedded_server_serves_and_stops():
+    server = EmbeddedHTTPServer(_json_app({'hello': 'world'}), host='127.0.0.1', port=0, threads=2)
+    server.start()
+    try:
+        port = server._server.socket.getsockname()[1]
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=5) as resp:
+            assert json.loads(resp.read()) == {'hello': 'world'}
+    finally:
+        server.stop(timeout=2)
+    assert not server.running
+
+
+def test_port_in_use_raises_instead_of_exiting():
+    first = EmbeddedHTTPServer(_json_app({}), host='127.0.0.1', port=0, threads=1)
+    first.start()
+    try:
+        port = first._server.socket.getsockname()[1]
+        second = EmbeddedHTTPServer(_json_app({}), host='127.0.0.1', port=port, threads=1)
+        with pytest.raises(OSError):
+            second.start()
+        assert not second.running
+    finally:
+        first.stop(timeout=2)
+
+
+def test_idle_keepalive_connection_frees_its_worker():
+    server = EmbeddedHTTPServer(_json_app({'ok': True}), host='127.0.0.1', port=0, threads=1,
+                                keepalive_timeout=0.3)
+    server.start()
+    try:
+        port = server._server.socket.getsockname()[1]
+        idle = socket.create_connection(('127.0.0.1', port), timeout=5)
+        idle.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        assert b'200 OK' in idle.recv(4096)
+        # The browser keeps the connection open; the only worker must not wait on it forever
+        started = time.monotonic()
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=5) as resp:
+            assert json.loads(resp.read()) == {'ok': True}
+        assert time.monotonic() - started < 3
+        # ...and the server closed the idle connection
+        while idle.recv(4096):
+            pass
+        idle.close()
+    finally:
+        server.stop(timeout=2)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_combined_mode_serves_callbacks_on_the_callback_port():
+    from core import callback_server
+    from core.overlay_server import OverlayServer, overlay_events
+
+    callback_port = _free_port()
+    config = {'http.threads': 4, 'http.gzip': False, 'ngrok.callback_port': callback_port}
+    server = OverlayServer(port=0, config=config)
+    callback_server.register_route('/test/combined-callback', lambda request: ({'seen': request.path}, 200),
+                                   methods=['GET'])
+    server._start_combined()
+    try:
+        # Kick, ngrok and OAuth all use ngrok.callback_port, not the overlay port
+        assert callback_server.start_server(callback_port) is True
+        assert callback_port in server.http_server.ports
+        url = f'http://127.0.0.1:{callback_port}/test/combined-callback'
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            assert json.loads(resp.read()) == {'seen': '/test/combined-callback'}
+    finally:
+        server.stop()
+        # stop() closes the shared event log; later tests stream from it
+        overlay_events.reopen()
+        callback_server.unregister_route('/test/combined-callback')
+    assert callback_server._embedded_port is None
@@ -0,0 +1,92 @@
+import asyncio
+import json
+from unittest.mock import Mock
+
+from platform_connectors import kick_pusher as kp
+from platform_connectors.kick_connector import KickConnector
+
+
+def _frame(event, data, channel=None):
+    frame = {'event': event, 'data': json.dumps(data)}
+    if channel:
+        frame['channel'] = channel
+    return json.dumps(frame)
+
+
+CHAT = _frame(kp.CHAT_EVENT, {
+    'id': 'm-1', 'content': 'hello [emote:37226:KEKW]', 'type': 'message', 'created_at': '2026-01-01T00:00:00Z',
+    'sender': {'id': 7, 'username': 'viewer', 'slug': 'viewer',
+               'identity': {'color': '#75FD46', 'badges': [{'type': 'subscriber', 'text': 'Sub'}]}},
+}, 'chatrooms.99.v2')
+
+
+class FakeWs:
+    def __init__(self, frames, reader=None):
+        self.frames = list(frames)
+        self.sent = []
+        self.reader = reader
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def recv(self):
+        if not self.frames:
+            # Server went away after the script; stop instead of reconnecting
+            self.reader.running = False
+            return ''
+        return self.frames.pop(0)
+
+    async def send(self, data):
+        self.sent.append(json.loads(data))
+
+
+def test_decode_pusher_events():
+    kind, payload = kp.decode_pusher_event(CHAT)
+    assert kind == 'chat'
+    assert payload['id'] == 'm-1' and payload['sender']['username'] == 'viewer'
+    assert payload['sender']['identity']['username_color'] == '#75FD46'
+    assert kp.decode_pusher_event(_frame(kp.DELETE_EVENT, {'id': 'd', 'message': {'id': 'm-1'}})) == ('deleted', {'id': 'm-1'})
+    assert kp.decode_pusher_event('{"event":"pusher:ping","data":{}}')[0] == 'ping'
+    assert kp.decode_pusher_event('not json') == ('', {})
+
+
+def test_reader_subscribes_and_feeds_the_normal_chat_path():
+    conn = KickConnector()
+    emitted, statuses = [], []
+    conn.message_received_with_metadata.connect(lambda p, u, m, meta: emitted.append((p, u, m, meta['badges'])))
+    conn.connection_status.connect(statuses.append)
+
+    reader = kp.KickPusherReader(conn, 99)
+    ws = FakeWs([
+        _frame('pusher:connection_established', {'socket_id': '1.2', 'activity_timeout': 120}),
+        _frame('pusher_internal:subscription_succeeded', {}, 'chatrooms.99.v2'),
+        '{"event":"pusher:ping","data":{}}',
+        CHAT,
+        CHAT,  # Duplicates are dropped by handle_chat_message
+    ], reader)
+    reader._connect = lambda url: ws
+    asyncio.run(reader.run())
+
+    assert ws.sent[0] == {'event': 'pusher:subscribe', 'data': {'auth': '', 'channel': 'chatrooms.99.v2'}}
+    assert ws.sent[1]['event'] == 'pusher:pong'
+    assert emitted == [('kick', 'viewer', 'hello [emote:37226:KEKW]', ['subscriber'])]
+    # Connected once subscribed, disconnected when the socket closed
+    assert statuses == [True, False]
+
+
+def test_read_mode_auto_uses_pusher_without_webhooks():
+    cfg = Mock()
+    cfg.get.return_value = {}
+    cfg.get_platform_config.return_value = {}
+    conn = KickConnector(config=cfg)
+    assert conn._resolve_read_mode() == 'pusher'
+
+    conn.ngrok_manager = Mock()
+    conn.ngrok_manager.is_available.return_value = True
+    assert conn._resolve_read_mode() == 'webhook'
+
+    cfg.get_platform_config.return_value = {'read_mode': 'pusher'}
+    assert conn._resolve_read_mode() == 'pusher'
@@ -0,0 +1,91 @@
+import json
+import threading
+
+import pytest
+from flask import Flask
+
+from platform_connectors import kick_webhook as kw
+from platform_connectors.kick_connector import KickConnector
+
+_app = Flask(__name__)
+
+
+def _post(conn, payload, headers=None):
+    body = json.dumps(payload).encode('utf-8')
+    with _app.test_request_context('/kick/webhook', method='POST', data=body, headers=headers or {}):
+        from flask import request
+        return conn._webhook_handler(request)
+
+
+def _chat(msg_id, user='viewer', text='hi'):
+    return {'id': msg_id, 'sender': {'username': user, 'identity': {'badges': [{'type': 'moderator'}]}},
+            'content': text}
+
+
+def test_webhook_acknowledges_before_processing():
+    conn = KickConnector()
+    gate = threading.Event()
+    processed = []
+
+    def slow_batch(events):
+        gate.wait(5)
+        processed.extend(events)
+
+    conn.webhook_queue = kw.WebhookIngestQueue(slow_batch)
+    # The route returns while the consumer is still blocked
+    assert _post(conn, _chat('m1'), {'Kick-Event-Type': 'chat.message.sent'}) == ('', 200)
+    assert _post(conn, _chat('m2')) == ('', 200)
+    assert processed == []
+    gate.set()
+    conn.webhook_queue.stop()
+    assert len(processed) == 2
+    assert processed[0][0] == {'Kick-Event-Type': 'chat.message.sent'}
+    metrics = conn.webhook_metrics()
+    assert metrics['received'] == 2 and metrics['processed'] == 2 and metrics['depth'] == 0
+
+
+def test_consumer_batches_parse_route_and_dedupe():
+    conn = KickConnector()
+    emitted, deleted = [], []
+    conn.message_received_with_metadata.connect(lambda p, u, m, meta: emitted.append((u, m, meta['badges'])))
+    conn.message_deleted.connect(lambda p, mid: deleted.append(mid))
+    conn.webhook_queue = kw.WebhookIngestQueue(conn._process_webhook_batch, batch_size=10)
+
+    for payload, headers in [(_chat('a', 'alice', 'hello'), {'Kick-Event-Type': 'chat.message.sent'}),
+                             ({'data': _chat('a', 'alice', 'hello')}, {}),  # Kick retry of the same message
+                             ({'id': 'a'}, {'Kick-Event-Type': 'chat.message.deleted'})]:
+        assert conn.webhook_queue.offer(headers, json.dumps(payload).encode('utf-8'))
+
+    assert conn.webhook_queue.drain() == 3
+    assert conn.webhook_queue.batches == 1
+    assert emitted == [('alice', 'hello', ['moderator'])]
+    assert deleted == ['a']
+
+
+def test_full_queue_sheds_load_with_503():
+    conn = KickConnector()
+    conn.webhook_queue = kw.WebhookIngestQueue(lambda events: None, maxsize=1)
+    conn.webhook_queue.start = lambda: None  # Keep the consumer from draining
+    assert _post(conn, _chat('x'))[1] == 200
+    assert _post(conn, _chat('y'))[1] == 503
+    assert conn.webhook_metrics()['dropped'] == 1
+
+
+def test_invalid_signature_is_rejected():
+    pytest.importorskip('cryptography')
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding, rsa
+    import base64
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.public_key().public_bytes(serialization.Encoding.PEM,
+                                        serialization.PublicFormat.SubjectPublicKeyInfo).decode()
+    conn = KickConnector()
+    conn.webhook_verifier.load_key(pem)
+    conn.webhook_queue = kw.WebhookIngestQueue(lambda events: None)
+    body = json.dumps(_chat('s1')).encode('utf-8')
+    sig = base64.b64encode(key.sign(b'id1.ts1.' + body, padding.PKCS1v15(), hashes.SHA256())).decode()
+    headers = {'Kick-Event-Message-Id': 'id1', 'Kick-Event-Message-Timestamp': 'ts1', 'Kick-Event-Signature': sig}
+    assert conn.webhook_verifier.verify(headers, body)
+    assert not conn.webhook_verifier.verify(headers, body + b' ')
+    conn.webhook_queue.stop()
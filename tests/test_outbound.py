@@ -0,0 +1,178 @@
+import socket
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from core import outbound
+from core.outbound import OutboundDispatcher, SendResult, TokenBucket
+from platform_connectors.kick_connector import KickConnector
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None, text=''):
+        self.status_code = status
+        self.headers = headers or {}
+        self.text = text
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=2.0, burst=2)
+    start = bucket._updated
+    assert bucket.reserve(start) == 0.0
+    assert bucket.reserve(start) == 0.0
+    assert abs(bucket.reserve(start) - 0.5) < 1e-9
+    # Half a second later the debt is paid off and one more send waits 0.5s
+    assert abs(bucket.reserve(start + 0.5) - 0.5) < 1e-9
+
+
+def test_send_result_classifies_responses():
+    assert SendResult.from_response(FakeResponse(200)).ok
+    limited = SendResult.from_response(FakeResponse(429, {'Retry-After': '2'}))
+    assert not limited.ok and limited.retryable and limited.retry_after == 2.0
+    assert SendResult.from_response(FakeResponse(503)).retryable
+    # The server may have posted the message before failing
+    assert not SendResult.from_response(FakeResponse(500)).retryable
+    assert not SendResult.from_response(FakeResponse(504)).retryable
+    assert not SendResult.from_response(FakeResponse(403, text='quota')).retryable
+    assert outbound.backoff_delay(3, retry_after=5) == 5
+    assert 0 <= outbound.backoff_delay(3) <= 4
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_only_unsent_request_errors_are_retryable():
+    session = outbound.make_send_session(lambda **kw: requests.Session())
+    with pytest.raises(requests.exceptions.ConnectionError) as refused:
+        session.post(f'http://127.0.0.1:{_unused_port()}/send', json={}, timeout=2)
+    assert SendResult.network_error(refused.value).retryable
+    assert SendResult.network_error(requests.exceptions.ConnectTimeout('connect timed out')).retryable
+
+    # Sent but no answer: resending could post the message twice
+    with socket.socket() as server:
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        with pytest.raises(requests.exceptions.ReadTimeout) as timed_out:
+            session.post(f'http://127.0.0.1:{server.getsockname()[1]}/send', json={}, timeout=0.3)
+    assert not SendResult.network_error(timed_out.value).retryable
+    assert not SendResult.network_error(requests.exceptions.ConnectionError('Connection aborted')).retryable
+
+
+def test_dispatcher_retries_and_resolves_future(monkeypatch):
+    monkeypatch.setattr(outbound, 'backoff_delay', lambda attempt, retry_after=None: 0)
+    attempts = []
+
+    def send_once(message):
+        attempts.append(message)
+        if len(attempts) == 1:
+            return SendResult(False, retryable=True, retry_after=1, status=429)
+        return SendResult(True, status=200)
+
+    dispatcher = OutboundDispatcher('test', send_once, rate=100, burst=10)
+    assert dispatcher.submit('hello').result(timeout=5) is True
+    assert attempts == ['hello', 'hello']
+
+    final = OutboundDispatcher('test', lambda m: SendResult(False, status=403), rate=100, burst=10)
+    assert final.send('nope', timeout=5) is False
+    assert final.metrics()['failed'] == 1
+    dispatcher.stop()
+    final.stop()
+    assert dispatcher.submit('late').result(timeout=1) is False
+
+
+def test_kick_send_reuses_session_and_cached_target():
+    cfg = Mock()
+    cfg.get.return_value = {}
+    cfg.get_platform_config.return_value = {'streamer_user_id': '42'}
+    conn = KickConnector(config=cfg)
+    conn.access_token = 'tok'
+    posts = []
+
+    class Session:
+        def post(self, url, headers=None, json=None, timeout=None):
+            posts.append((url, headers['Authorization'], json))
+            return FakeResponse(200)
+
+    conn._send_session = Session()
+    lookups = cfg.get_platform_config.call_count
+    assert conn.send_message_async('one').result(timeout=5) is True
+    assert conn.send_message('two') is True
+    assert [p[2]['content'] for p in posts] == ['one', 'two']
+    assert posts[0][1] == 'Bearer tok' and posts[0][2]['broadcaster_user_id'] == 42
+    # broadcaster id and headers were resolved once for both sends
+    assert cfg.get_platform_config.call_count == lookups + 1
+    conn.outbound().stop()
+
+
+def test_sync_send_makes_one_attempt(monkeypatch):
+    monkeypatch.setattr(outbound, 'backoff_delay', lambda attempt, retry_after=None: 0)
+    attempts = []
+
+    def send_once(message):
+        attempts.append(message)
+        return SendResult(False, retryable=True, status=503)
+
+    dispatcher = OutboundDispatcher('test', send_once, rate=100, burst=10)
+    assert dispatcher.send('once', timeout=5) is False
+    assert attempts == ['once']
+    assert dispatcher.submit('queued').result(timeout=5) is False
+    assert attempts.count('queued') == dispatcher.max_attempts
+    dispatcher.stop()
+
+
+def test_timed_out_sync_send_is_never_delivered_late():
+    release = threading.Event()
+    sent = []
+
+    def send_once(message):
+        if message == 'slow':
+            release.wait(5)
+        sent.append(message)
+        return SendResult(True, status=200)
+
+    dispatcher = OutboundDispatcher('test', send_once, rate=100, burst=10)
+    # The queue is backed up behind a send that is still in flight
+    backlog = [dispatcher.submit('slow'), dispatcher.submit('queued')]
+    assert dispatcher.send('late', timeout=0.1) is False
+    release.set()
+    assert all(f.result(timeout=5) for f in backlog)
+    time.sleep(0.1)
+    assert sent == ['slow', 'queued']
+
+    # A send already in flight when the wait runs out reports its real outcome
+    release.clear()
+    outcome = []
+    caller = threading.Thread(target=lambda: outcome.append(dispatcher.send('slow', timeout=0.1)))
+    caller.start()
+    time.sleep(0.3)
+    release.set()
+    caller.join(timeout=5)
+    assert outcome == [True] and sent[-1] == 'slow'
+    dispatcher.stop()
+
+
+def test_disconnect_stops_the_dispatcher_thread():
+    cfg = Mock()
+    cfg.get.return_value = {}
+    cfg.get_platform_config.return_value = {'streamer_user_id': '42'}
+    conn = KickConnector(config=cfg)
+    conn.access_token = 'tok'
+    conn._send_session = Mock(post=Mock(return_value=FakeResponse(200)))
+    assert conn.send_message('hi') is True
+    dispatcher = conn.outbound()
+    thread = dispatcher._thread
+    assert thread.is_alive()
+
+    conn.disconnect()
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+    assert dispatcher.submit('late').result(timeout=1) is False
+    # Reconnecting gets a fresh dispatcher
+    assert conn.outbound() is not dispatcher and conn.send_message('again') is True
+    conn.stop_outbound()
@@ -0,0 +1,202 @@
+import json
+import threading
+
+import pytest
+
+from core.overlay_events import OverlayEventLog
+
+overlay_server = pytest.importorskip('core.overlay_server')
+if not overlay_server.HAS_FLASK:
+    pytest.skip('Flask not installed', allow_module_level=True)
+
+
+def test_event_log_resume_and_reset():
+    log = OverlayEventLog(capacity=3)
+    for i in range(5):
+        log.publish('message', {'id': str(i)})
+
+    events, cursor, reset = log.read_since(3)
+    assert [e['data']['id'] for e in events] == ['3', '4']
+    assert cursor == 5 and reset is False
+
+    # Cursor older than the retained window reports a gap
+    events, cursor, reset = log.read_since(1)
+    assert reset is True
+    assert [e['seq'] for e in events] == [3, 4, 5]
+
+    # Cursor from a previous run restarts at the head
+    assert log.read_since(99) == ([], 5, True)
+
+
+def test_wait_since_wakes_on_publish():
+    log = OverlayEventLog()
+    timer = threading.Timer(0.05, lambda: log.publish('message', {'id': 'x'}))
+    timer.start()
+    events, cursor, _ = log.wait_since(0, timeout=2)
+    assert [e['data']['id'] for e in events] == ['x']
+    assert cursor == 1
+
+
+def test_long_poll_endpoint_returns_events_after_cursor():
+    client = overlay_server.app.test_client()
+    start = overlay_server.overlay_events.latest_seq
+    overlay_server.remove_overlay_message('m1')
+    overlay_server.update_overlay_settings({'msg_blur': 3})
+
+    data = client.get(f'/overlay/events?cursor={start}&timeout=0').get_json()
+    assert [e['type'] for e in data['events']] == ['message', 'settings']
+    assert data['events'][0]['data']['id'] == 'm1'
+    assert data['events'][1]['data']['changes'] == {'msg_blur': 3}
+    assert data['cursor'] == start + 2
+
+
+def test_sse_stream_resumes_from_last_event_id():
+    client = overlay_server.app.test_client()
+    overlay_server.remove_overlay_message('a')
+    start = overlay_server.overlay_events.latest_seq
+    overlay_server.remove_overlay_message('b')
+
+    resp = client.get('/overlay/stream', headers={'Last-Event-ID': str(start)}, buffered=False)
+    assert resp.mimetype == 'text/event-stream'
+    chunks = resp.response
+    first = next(chunks).decode()
+    assert f'data: {start}' in first
+    body = next(chunks).decode()
+    resp.close()
+    assert body.startswith(f'id: {start + 1}\n')
+    payload = json.loads(body.split('data: ', 1)[1])
+    assert payload['type'] == 'message'
+    assert payload['data']['id'] == 'b'
+
+
+def test_sse_streams_are_capped_and_release_their_slot():
+    client = overlay_server.app.test_client()
+    overlay_server.set_stream_limit(1)
+    try:
+        first = client.get('/overlay/stream', buffered=False)
+        assert first.status_code == 200
+        refused = client.get('/overlay/stream', buffered=False)
+        assert refused.status_code == 503 and refused.headers['Retry-After']
+        first.close()
+        again = client.get('/overlay/stream', buffered=False)
+        assert again.status_code == 200
+        again.close()
+    finally:
+        overlay_server.set_stream_limit(None)
+
+
+def test_ring_wraps_and_limit_pages_through():
+    log = OverlayEventLog(capacity=4)
+    for i in range(10):
+        log.publish('message', {'id': str(i)})
+    assert len(log) == 4
+    assert log.oldest_seq == 7
+
+    events, cursor, reset = log.read_since(7, limit=2)
+    assert [e['seq'] for e in events] == [8, 9]
+    assert cursor == 9 and not reset
+    events, cursor, _ = log.read_since(cursor, limit=2)
+    assert [e['seq'] for e in events] == [10]
+
+
+def test_messages_endpoint_does_not_consume_between_clients():
+    client_a = overlay_server.app.test_client()
+    client_b = overlay_server.app.test_client()
+    start = overlay_server.overlay_events.latest_seq
+    overlay_server.remove_overlay_message('x1')
+    overlay_server.remove_overlay_message('x2')
+
+    a = client_a.get(f'/overlay/messages?since={start}').get_json()
+    b = client_b.get(f'/overlay/messages?since={start}').get_json()
+    assert [m['id'] for m in a['messages']] == ['x1', 'x2']
+    assert a['messages'] == b['messages']
+
+    # Reading from the returned cursor yields only newer events
+    overlay_server.remove_overlay_message('x3')
+    a2 = client_a.get(f"/overlay/messages?since={a['cursor']}").get_json()
+    assert [m['id'] for m in a2['messages']] == ['x3']
+
+
+def test_overlay_shell_revalidates_with_etag():
+    client = overlay_server.app.test_client()
+    first = client.get('/overlay')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Last-Modified']
+
+    again = client.get('/overlay', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+
+
+def test_media_supports_range_and_conditional(tmp_path):
+    media = tmp_path / 'bg.mp4'
+    media.write_bytes(bytes(range(256)) * 4)
+    overlay_server.update_overlay_settings({'overlay_media': str(media)})
+    try:
+        client = overlay_server.app.test_client()
+        url = client.get('/overlay/settings').get_json()['settings']['overlay_media_url']
+        assert url.startswith('/overlay/media?v=')
+
+        partial = client.get(url, headers={'Range': 'bytes=10-19'})
+        assert partial.status_code == 206
+        assert partial.data == bytes(range(10, 20))
+        assert partial.headers['Accept-Ranges'] == 'bytes'
+
+        full = client.get(url)
+        assert client.get(url, headers={'If-None-Match': full.headers['ETag']}).status_code == 304
+    finally:
+        overlay_server.update_overlay_settings({'overlay_media': ''})
+
+
+def test_settings_versions_return_deltas_or_304():
+    client = overlay_server.app.test_client()
+    full = client.get('/overlay/settings').get_json()
+    version = full['version']
+    assert 'direction' in full['settings']
+
+    assert client.get(f'/overlay/settings?version={version}').status_code == 304
+
+    # Re-sending identical values is not a change
+    assert overlay_server.update_overlay_settings({'direction': full['settings']['direction']}) == version
+
+    new_version = overlay_server.update_overlay_settings({'msg_opacity': full['settings']['msg_opacity'] + 1})
+    assert new_version == version + 1
+    delta = client.get(f'/overlay/settings?version={version}').get_json()
+    assert delta == {'version': new_version, 'changes': {'msg_opacity': full['settings']['msg_opacity'] + 1}}
+
+    # Unknown (future) version gets the full settings
+    assert 'settings' in client.get(f'/overlay/settings?version={new_version + 100}').get_json()
+
+
+def test_rendered_messages_reach_overlay_with_emotes():
+    from core.render_pipeline import RenderResult
+
+    start = overlay_server.overlay_events.latest_seq
+    body = 'gg <img data-emote-id="9" src="data:image/png;base64,QQ" alt="PogChamp" />'
+    overlay_server.add_rendered_message(RenderResult('r1', 'twitch', 'bob', body_html=body))
+    overlay_server.add_rendered_message(RenderResult('r2', 'twitch', 'bob', body_html='followed', is_event=True))
+
+    events, _, _ = overlay_server.overlay_events.read_since(start)
+    assert [e['data']['id'] for e in events] == ['r1']
+    assert events[0]['data']['segments'][1]['url'] == 'data:image/png;base64,QQ'
+
+
+def test_disk_emotes_and_resolved_placeholders_reach_overlay(tmp_path):
+    from core.render_pipeline import RenderResult
+
+    image = tmp_path / 'twitch_77.png'
+    image.write_bytes(b'\x89PNG emote')
+    start = overlay_server.overlay_events.latest_seq
+    # The chat view renders cached emotes as file:/// URLs the overlay can't load
+    body = f'hi <img data-emote-id="77" src="file:///{image.as_posix().lstrip("/")}" alt="Kappa" />'
+    overlay_server.add_rendered_message(RenderResult('r3', 'twitch', 'bob', body_html=body))
+    overlay_server.update_overlay_emotes({'88': 'data:image/png;base64,QQ'})
+
+    events, _, _ = overlay_server.overlay_events.read_since(start)
+    url = events[0]['data']['segments'][1]['url']
+    served = overlay_server.app.test_client().get(url)
+    assert served.status_code == 200 and served.data == b'\x89PNG emote'
+    assert events[1]['data'] == {'action': 'emotes', 'emotes': {'88': 'data:image/png;base64,QQ'},
+                                 'timestamp': events[1]['data']['timestamp']}
+    assert overlay_server.app.test_client().get('/overlay/emote/unknown').status_code == 404
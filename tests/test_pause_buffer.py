@@ -0,0 +1,71 @@
+import ui.chat_page as chat_mod
+from core.pause_buffer import PauseBuffer
+
+
+def _msg(i):
+    return ('twitch', f'user{i}', f'message {i}', {'message_id': str(i)})
+
+
+def test_overflow_spills_to_disk_and_drains_in_order(tmp_path):
+    buf = PauseBuffer(max_messages=3, spill=True, spill_max_messages=100, spill_dir=str(tmp_path))
+    for i in range(10):
+        buf.append(_msg(i))
+
+    stats = buf.stats()
+    assert stats['in_memory'] == 3
+    assert stats['on_disk'] == 7
+    assert stats['dropped'] == 0
+    assert len(buf) == 10
+
+    drained = []
+    while buf:
+        drained.extend(buf.pop_batch(4))
+    assert [m[3]['message_id'] for m in drained] == [str(i) for i in range(10)]
+    # Spill segment is removed once drained
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_overflow_without_spill_drops_oldest():
+    buf = PauseBuffer(max_messages=2, spill=False)
+    for i in range(5):
+        buf.append(_msg(i))
+    assert buf.dropped == 3
+    assert [m[2] for m in buf.pop_batch(10)] == ['message 3', 'message 4']
+
+
+def test_resume_replays_backlog_in_batches(monkeypatch):
+    scheduled = []
+
+    class ManualTimer:
+        @staticmethod
+        def singleShot(ms, cb):
+            scheduled.append(cb)
+
+    monkeypatch.setattr(chat_mod, 'QTimer', ManualTimer)
+
+    class DummyButton:
+        def setText(self, text):
+            self.text = text
+
+    page = chat_mod.ChatPage.__new__(chat_mod.ChatPage)
+    page.is_paused = True
+    page._resuming = False
+    page._resume_batch_size = 4
+    page._resume_batch_interval_ms = 0
+    page.message_queue = PauseBuffer(max_messages=100, spill=False)
+    page.pause_btn = DummyButton()
+    displayed = []
+    page._displayMessage = lambda p, u, m, md=None: displayed.append(m)
+
+    for i in range(10):
+        page.message_queue.append(_msg(i))
+
+    page.togglePause()
+    # First chunk rendered synchronously, remainder deferred to the event loop
+    assert len(displayed) == 4
+    assert page._resuming is True
+
+    while scheduled:
+        scheduled.pop(0)()
+    assert displayed == [f'message {i}' for i in range(10)]
+    assert page._resuming is False
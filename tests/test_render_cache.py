@@ -0,0 +1,133 @@
+from core.render_cache import RenderCache
+from core.render_pipeline import RenderFanout
+
+
+def test_lru_hit_miss_and_eviction():
+    cache = RenderCache(capacity=2)
+    k1 = cache.make_key('twitch', 'Kappa Kappa', '25:0-4,6-10')
+    k2 = cache.make_key('twitch', 'hello')
+    k3 = cache.make_key('kick', 'hello')
+
+    assert cache.get(k1) is None
+    cache.put(k1, ('<img>', True))
+    cache.put(k2, ('hello', False))
+    assert cache.get(k1) == ('<img>', True)
+
+    # k2 is least recently used and gets evicted
+    cache.put(k3, ('hello', False))
+    assert cache.get(k2) is None
+    assert cache.get(k1) == ('<img>', True)
+
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 2
+    assert stats['evictions'] == 1
+    assert stats['hit_rate'] == 0.5
+
+
+def test_key_includes_fragments_and_broadcaster():
+    cache = RenderCache()
+    frags_a = [{'type': 'emote', 'text': 'Kappa', 'emote': {'id': '25'}}]
+    frags_b = [{'type': 'emote', 'text': 'Kappa', 'emote': {'id': '26'}}]
+    a = cache.make_key('twitch', 'Kappa', None, {'fragments': frags_a, 'room-id': '1'})
+    b = cache.make_key('twitch', 'Kappa', None, {'fragments': frags_b, 'room-id': '1'})
+    c = cache.make_key('twitch', 'Kappa', None, {'fragments': frags_a, 'room-id': '2'})
+    assert len({a, b, c}) == 3
+    # Emotes tag is picked up from metadata when not passed explicitly
+    assert cache.make_key('twitch', 'x', None, {'emotes': '25:0-0'}) == cache.make_key('twitch', 'x', '25:0-0')
+
+
+def test_render_settings_changes_miss_and_emote_images_keep_entries(monkeypatch):
+    import core.signals as core_signals
+    import ui.chat_page as chat_mod
+
+    page = chat_mod.ChatPage.__new__(chat_mod.ChatPage)
+    page._render_settings_version = 0
+    cache = RenderCache()
+    key = lambda: cache.make_key('twitch', 'Kappa', settings_version=page._render_settings_version)
+    cache.put(key(), ('body', False))
+    page._on_render_setting_changed('ui.theme', 'light')
+    assert cache.get(key()) is None
+
+    slots = {}
+    names = ('emotes_global_warmed_ext', 'emotes_channel_warmed_ext', 'emote_image_cached_ext', 'emote_set_metadata_ready_ext')
+    fake = type('FakeSignals', (), {n: type('Sig', (), {'connect': lambda self, slot, _n=n: slots.__setitem__(_n, slot)})()
+                                    for n in names})()
+    monkeypatch.setattr(core_signals, 'signals', fake)
+    cache.connect_asset_signals()
+
+    # A downloaded emote image doesn't clear bodies that were already final
+    cache.put(key(), ('body', False))
+    assert 'emote_image_cached_ext' not in slots
+    slots['emotes_channel_warmed_ext']()
+    assert cache.get(key()) is None
+
+
+def test_invalidate_drops_entries():
+    cache = RenderCache()
+    key = cache.make_key('twitch', 'Kappa')
+    cache.put(key, ('body', False))
+    cache.invalidate('emotes_channel_warmed_ext')
+    assert cache.get(key) is None
+    assert cache.stats()['invalidations'] == 1
+    assert cache.stats()['size'] == 0
+
+
+def test_empty_bodies_and_zero_capacity_not_cached():
+    cache = RenderCache()
+    key = cache.make_key('twitch', '')
+    cache.put(key, '')
+    assert cache.stats()['size'] == 0
+
+    disabled = RenderCache(capacity=0)
+    disabled.put(key, ('body', False))
+    assert disabled.get(key) is None
+
+
+def test_user_chrome_built_once_per_user_and_invalidated(monkeypatch):
+    import ui.chat_page as chat_mod
+    from core import render_cache as rc
+
+    monkeypatch.setattr(rc, '_chrome_cache', RenderCache(capacity=100))
+    calls = []
+    monkeypatch.setattr(chat_mod, 'get_platform_icon_html', lambda p, size=18: calls.append(('icon', p)) or f'<i>{p}</i>')
+    monkeypatch.setattr(chat_mod, 'get_platform_icon_url', lambda p: f'icon:{p}')
+    monkeypatch.setattr(chat_mod, 'get_badge_ref', lambda b, p='twitch': calls.append(('badge', b)) or {'name': b, 'label': b, 'title': b, 'url': f'data:{b}'})
+
+    page = chat_mod.ChatPage.__new__(chat_mod.ChatPage)
+    page.show_platform_icons = True
+    page.show_user_colors = True
+    page.show_badges = True
+    page.config = None
+
+    meta = {'badges': ['moderator/1']}
+    first = page._get_user_chrome('twitch', '<alice>', meta)
+    for _ in range(5):
+        assert page._get_user_chrome('twitch', '<alice>', dict(meta)) == first
+        assert page._get_user_badges('twitch', dict(meta))[0] == '<img src="data:moderator/1" width="18" height="18" style="vertical-align: middle; margin-right: 2px;" title="moderator/1" />'
+    assert len(calls) == 2
+    assert '&lt;alice&gt;' in first[2]
+    assert first[0] == chat_mod.get_username_color('<alice>')
+
+    class _Qt:
+        class CheckState:
+            class Checked:
+                value = 2
+
+    monkeypatch.setattr(chat_mod, 'Qt', _Qt)
+    fanout = RenderFanout()
+    monkeypatch.setattr(chat_mod, 'get_render_fanout', lambda: fanout)
+    page.toggleBadges(0)
+    # Hidden badges with nobody else rendering them: no lookup at all
+    assert page._get_user_badges('twitch', meta) == ('', ())
+    assert len(calls) == 2
+
+    # Structured refs are still resolved for other render consumers
+    fanout.subscribe(lambda result: None)
+    badges_html, badge_refs = page._get_user_badges('twitch', meta)
+    assert badges_html == ''
+    assert [b['name'] for b in badge_refs] == ['moderator/1']
+    assert len(calls) == 3
+
+    chat_mod.set_username_colors(list(chat_mod.USERNAME_COLORS))
+    assert rc.get_chrome_cache().stats()['invalidations'] == 2
@@ -0,0 +1,65 @@
+from core import render_pipeline
+from core.render_pipeline import RenderFanout, RenderResult, segments_from_html
+
+
+def test_segments_split_text_and_emotes():
+    body = ('hi &lt;3 <img data-emote-id="25" src="data:image/png;base64,AAA" alt="Kappa" />'
+            ' and <img data-emote-id="30" src="data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///" alt="Wait" />')
+    segments = segments_from_html(body)
+    assert segments[0] == {'type': 'text', 'text': 'hi <3 '}
+    assert segments[1] == {'type': 'emote', 'id': '25', 'name': 'Kappa', 'url': 'data:image/png;base64,AAA'}
+    # Placeholder images are exposed without a URL so consumers fall back to the name
+    assert segments[3]['url'] == '' and segments[3]['name'] == 'Wait'
+
+
+def test_result_overlay_payload_and_fanout():
+    result = RenderResult('m1', 'twitch', 'alice', color='#ff0000', icon_url='icon',
+                          badges=[{'name': 'moderator', 'url': 'data:b', 'title': 'Mod'}],
+                          body_html='yo <img data-emote-id="1" src="data:x" alt="Kappa" />')
+    payload = result.to_overlay_message()
+    assert payload['message'] == 'yo Kappa'
+    assert payload['badges'] == [{'url': 'data:b', 'name': 'moderator'}]
+    assert [s['type'] for s in payload['segments']] == ['text', 'emote']
+
+    fanout = RenderFanout()
+    seen = []
+
+    def broken(_):
+        raise RuntimeError('boom')
+
+    fanout.subscribe(broken)
+    fanout.subscribe(seen.append)
+    fanout.publish(result)
+    assert seen == [result]
+    fanout.unsubscribe(seen.append)
+    fanout.publish(result)
+    assert len(seen) == 1
+
+
+def test_disk_emotes_get_an_overlay_url(tmp_path, monkeypatch):
+    from core.render_pipeline import EMOTE_ROUTE, local_emote_path
+
+    image = tmp_path / 'twitch_55.png'
+    image.write_bytes(b'png')
+    body = f'gg <img data-emote-id="55" src="file:///{image.as_posix().lstrip("/")}" alt="Kappa" />'
+    result = RenderResult('m1', 'twitch', 'alice', body_html=body)
+    payload = result.to_overlay_message()
+    assert payload['segments'][1] == {'type': 'emote', 'id': '55', 'name': 'Kappa', 'url': EMOTE_ROUTE + '55'}
+    assert local_emote_path('55') == image.as_posix()
+
+    # Evicted from the registry while the parse stays memoized: publishing again re-registers it
+    monkeypatch.setattr(render_pipeline, 'LOCAL_EMOTE_LIMIT', 1)
+    RenderResult('m2', 'twitch', 'bob', body_html='<img data-emote-id="66" src="file:///tmp/66.png" alt="x" />').to_overlay_message()
+    assert local_emote_path('55') is None
+    RenderResult('m3', 'twitch', 'carol', body_html=body).to_overlay_message()
+    assert local_emote_path('55') == image.as_posix()
+    assert segments_from_html.cache_info().hits
+
+
+def test_resolved_placeholders_are_published_to_emote_subscribers():
+    fanout = RenderFanout()
+    seen = []
+    fanout.subscribe_emotes(seen.append)
+    fanout.publish_emotes({})
+    fanout.publish_emotes({'30': 'data:image/png;base64,AAA'})
+    assert seen == [{'30': 'data:image/png;base64,AAA'}]
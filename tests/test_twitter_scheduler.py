@@ -0,0 +1,152 @@
+import threading
+import time
+
+from platform_connectors import twitter_scheduler as ts
+from platform_connectors.twitter_connector import TwitterWorker
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+        self.text = str(self._payload)
+
+    def json(self):
+        return self._payload
+
+
+class RoutingSession:
+    """Answer by path; each route holds a list of responses (last one repeats)."""
+
+    def __init__(self, routes, delay=0.0):
+        self.routes = routes
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, auth=None, timeout=None):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append((url, dict(params or {})))
+            for path, responses in self.routes.items():
+                if url.endswith(path):
+                    return responses.pop(0) if len(responses) > 1 else responses[0]
+        return FakeResponse(404)
+
+
+def _tweets(*ids, newest=None):
+    return {'data': [{'id': i, 'text': f'tweet {i}', 'author_id': 'u'} for i in ids],
+            'includes': {'users': [{'id': 'u', 'username': 'fan', 'name': 'Fan'}]},
+            'meta': {'newest_id': newest or ids[0]} if ids else {}}
+
+
+def _worker(session):
+    worker = TwitterWorker('streamer', oauth_token='tok')
+    worker.user_id = '42'
+    worker._session = session
+    emitted = []
+    worker.message_signal.connect(lambda user, text, meta: emitted.append(meta['tweet_id']))
+    return worker, emitted
+
+
+def test_rate_limit_budget_spreads_remaining_calls_over_window():
+    budget = ts.RateLimitBudget()
+    assert budget.next_delay(now=1000.0) == ts.MIN_ENDPOINT_INTERVAL
+
+    budget.update({'x-rate-limit-remaining': '100', 'x-rate-limit-reset': '1900'}, now=1000.0)
+    assert budget.next_delay(now=1000.0) == 9.0
+
+    budget.mark_limited({'x-rate-limit-reset': '1060'}, now=1000.0)
+    assert budget.exhausted(now=1000.0)
+    assert budget.next_delay(now=1000.0) == 61.0
+    # Once the window has reset the endpoint is polled again right away
+    assert budget.next_delay(now=1061.0) == ts.MIN_ENDPOINT_INTERVAL
+
+
+def test_conversation_cache_ttl_and_bound():
+    cache = ts.ConversationCache(ttl=60, max_entries=2)
+    assert cache.due('c1', now=0)
+    cache.record('c1', '5', now=0)
+    assert not cache.due('c1', now=30) and cache.due('c1', now=60)
+    cache.record('c1', None, now=61)
+    assert cache.since_id('c1') == '5'
+    cache.record('c2', now=61)
+    cache.record('c3', now=61)
+    assert len(cache) == 2 and cache.since_id('c1') is None
+
+
+def test_endpoints_keep_their_own_cursors_and_dedupe_tweets():
+    session = RoutingSession({
+        '/tweets/search/recent': [FakeResponse(payload=_tweets('3', '2')), FakeResponse(payload=_tweets('5'))],
+        '/timelines/reverse_chronological': [FakeResponse(payload=_tweets('2', '1', newest='2'))],
+    })
+    worker, emitted = _worker(session)
+
+    worker.search_broadcast_tweets()
+    worker.fetch_home_timeline()
+    worker.search_broadcast_tweets()
+
+    assert emitted == ['2', '3', '1', '5']
+    assert worker.scheduler.cursors == {'search': '5', 'home_timeline': '2'}
+    search_params = [p for url, p in session.calls if url.endswith('/search/recent')]
+    assert 'since_id' not in search_params[0] and search_params[1]['since_id'] == '3'
+
+
+def test_rate_limited_endpoint_does_not_block_the_others():
+    reset = str(int(time.time()) + 120)
+    session = RoutingSession({
+        '/tweets/search/recent': [FakeResponse(429, headers={'x-rate-limit-reset': reset})],
+        '/timelines/reverse_chronological': [FakeResponse(payload=_tweets('7'))],
+    }, delay=0.05)
+    worker, emitted = _worker(session)
+    worker.scheduler.set_enabled('search', True)
+    worker.scheduler.set_enabled('home_timeline', True)
+
+    started = time.time()
+    worker.scheduler.run_due()
+    deadline = time.time() + 5
+    while (not emitted or any(e.in_flight for e in worker.scheduler.endpoints.values())) and time.time() < deadline:
+        time.sleep(0.01)
+    worker.scheduler.stop()
+
+    # Both endpoints were requested in parallel and the 429 didn't sleep the worker
+    assert emitted == ['7']
+    assert time.time() - started < 1.0
+    search = worker.scheduler.endpoints['search']
+    assert search.budget.exhausted() and search.next_due > time.time() + 100
+
+
+def test_conversations_are_fetched_once_per_ttl():
+    session = RoutingSession({
+        '/users/42/tweets': [FakeResponse(payload={'data': [{'id': 'c1', 'conversation_id': 'c1'}]})],
+        '/tweets/search/recent': [FakeResponse(payload=_tweets('9'))],
+    })
+    worker, emitted = _worker(session)
+    worker.access_token, worker.access_token_secret = 'a', 'b'
+    worker._get = lambda path, params=None, oauth1_only=False: session.get(f'{worker.API_BASE}{path}', params=params)
+
+    worker.fetch_tweet_replies()
+    worker.fetch_tweet_replies()
+
+    searches = [p for url, p in session.calls if url.endswith('/search/recent')]
+    assert len(searches) == 1 and searches[0]['query'] == 'conversation_id:c1'
+    assert emitted == ['9'] and worker.conversations.since_id('c1') == '9'
+
+
+def test_overlapping_endpoints_on_pool_threads_emit_each_tweet_once():
+    worker, emitted = _worker(RoutingSession({}))
+    payload = _tweets(*[str(i) for i in range(300, 0, -1)])
+    start = threading.Barrier(8)
+
+    def process(source):
+        start.wait()
+        worker._process_tweets(payload, source)
+
+    threads = [threading.Thread(target=process, args=(src,)) for src in ['search', 'mention'] * 4]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(emitted, key=int) == [str(i) for i in range(1, 301)]
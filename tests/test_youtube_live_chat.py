@@ -0,0 +1,196 @@
+import time
+
+import requests
+
+from platform_connectors import youtube_live_chat as ylc
+from youtube_stream_standin import StandInStreamServer
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.text = str(self._payload)
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.calls.append({'url': url, 'headers': dict(headers or {}), 'params': dict(params or {})})
+        return self.responses.pop(0)
+
+
+class FakeWorker:
+    def __init__(self, token=None, api_key=None):
+        self.oauth_token = token
+        self.api_key = api_key
+        self.refresh_token = 'r' if token else None
+        self.batches = []
+        self.errors = []
+        self.ended = []
+
+    def process_chat_items(self, items):
+        self.batches.append([i['id'] for i in items])
+
+    def on_poller_error(self, message):
+        self.errors.append(message)
+
+    def on_live_chat_ended(self, live_chat_id):
+        self.ended.append(live_chat_id)
+
+    def refresh_access_token(self):
+        self.oauth_token = 'fresh'
+        return True
+
+
+def _page(ids, token='next', interval_ms=3000):
+    return {'items': [{'id': i} for i in ids], 'nextPageToken': token, 'pollingIntervalMillis': interval_ms}
+
+
+def test_quota_planner_honours_server_interval_and_stretches_for_budget():
+    planner = ylc.QuotaBudgetPlanner(daily_quota=1_000_000, expected_stream_hours=1, reserve_fraction=0)
+    planner.mark_stream_start(now=1000.0)
+    # Plenty of quota: the server interval wins
+    assert planner.next_interval(3.0, now=1000.0) == 3.0
+
+    tight = ylc.QuotaBudgetPlanner(daily_quota=10000, expected_stream_hours=8, reserve_fraction=0.1)
+    tight.mark_stream_start(now=1000.0)
+    # 9000 usable units / 5 per poll = 1800 polls over 8h -> 16s between polls
+    assert abs(tight.next_interval(2.0, now=1000.0) - 16.0) < 1e-6
+
+    tight.mark_exhausted()
+    assert tight.next_interval(2.0, now=1000.0) == ylc.MAX_POLL_INTERVAL
+
+
+def test_shared_poller_fetches_once_for_all_subscribers():
+    planner = ylc.QuotaBudgetPlanner(daily_quota=1_000_000, expected_stream_hours=1)
+    poller = ylc.LiveChatPoller('chat-1', planner=planner)
+    poller.session = FakeSession([FakeResponse(payload=_page(['a', 'b'], token='p2')),
+                                  FakeResponse(payload=_page(['c'], token='p3', interval_ms=5000))])
+    streamer, bot = FakeWorker(token='s-token'), FakeWorker(api_key='k')
+    poller.subscribe(streamer, start=False)
+    poller.subscribe(bot, start=False)
+
+    assert poller.poll_once() == 3.0
+    assert poller.poll_once() == 5.0
+
+    calls = poller.session.calls
+    assert len(calls) == 2
+    assert calls[0]['headers']['Authorization'] == 'Bearer s-token'
+    assert 'pageToken' not in calls[0]['params'] and calls[1]['params']['pageToken'] == 'p2'
+    assert streamer.batches == bot.batches == [['a', 'b'], ['c']]
+    assert planner.used == 2 * ylc.QUOTA_COST_LIST
+
+
+def test_poller_refreshes_token_and_handles_quota_and_end():
+    planner = ylc.QuotaBudgetPlanner(daily_quota=1_000_000, expected_stream_hours=1)
+    poller = ylc.LiveChatPoller('chat-2', planner=planner)
+    quota = {'error': {'errors': [{'reason': 'quotaExceeded'}]}}
+    ended = {'error': {'errors': [{'reason': 'liveChatEnded'}]}}
+    poller.session = FakeSession([FakeResponse(401), FakeResponse(payload=_page(['x'])),
+                                  FakeResponse(403, quota), FakeResponse(403, ended)])
+    worker = FakeWorker(token='old')
+    poller.subscribe(worker, start=False)
+
+    poller.poll_once()
+    assert poller.session.calls[1]['headers']['Authorization'] == 'Bearer fresh'
+    assert worker.batches == [['x']]
+
+    assert poller.poll_once() == ylc.MAX_POLL_INTERVAL
+    assert worker.errors and 'quota' in worker.errors[0].lower()
+
+    assert poller.poll_once() == 0.0
+    assert poller.ended and worker.ended == ['chat-2']
+
+
+def test_iter_json_stream_reassembles_split_objects():
+    body = '[{"id": "a", "nested": {"t": "x,]"}},\n{"id": "\u00e9"}]'.encode('utf-8')
+    chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+    assert [o['id'] for o in ylc.iter_json_stream(chunks)] == ['a', '\u00e9']
+    assert [o['id'] for o in ylc.iter_json_stream([b'{"id": 1}\n{"id"', b': 2}'])] == [1, 2]
+
+
+def test_stream_transport_reconnects_from_last_token_then_falls_back_to_polling(monkeypatch):
+    monkeypatch.setattr(ylc, 'STREAM_RECONNECT_DELAY', 0.01)
+    server = StandInStreamServer(
+        stream_script=[[_page(['a'], token='t1'), _page(['b'], token='t2')],
+                       [_page(['c'], token='t3')],
+                       404],
+        poll_pages=[_page(['d'], token='t4', interval_ms=1000)],
+    ).start()
+    planner = ylc.QuotaBudgetPlanner(daily_quota=1_000_000, expected_stream_hours=1)
+    poller = ylc.LiveChatPoller('chat-3', planner=planner, transport=ylc.TRANSPORT_STREAM,
+                                api_base=server.api_base)
+    # Other test modules replace make_retry_session with canned sessions
+    poller.session = requests.Session()
+    worker = FakeWorker(api_key='k')
+    try:
+        poller.subscribe(worker)
+        deadline = time.time() + 10
+        while len(worker.batches) < 4 and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        poller.unsubscribe(worker)
+        server.stop()
+
+    assert worker.batches[:4] == [['a'], ['b'], ['c'], ['d']]
+    paths = [path for path, _ in server.requests]
+    assert paths[:4] == ['/liveChat/messages/stream'] * 3 + ['/liveChat/messages']
+    tokens = [query.get('pageToken') for _, query in server.requests]
+    assert tokens[:4] == [None, 't2', 't3', 't3']
+    assert poller.active_transport == ylc.TRANSPORT_POLL
+
+
+def _run_stream_poller(server, worker, until, timeout=10):
+    planner = ylc.QuotaBudgetPlanner(daily_quota=1_000_000, expected_stream_hours=1)
+    poller = ylc.LiveChatPoller('chat-4', planner=planner, transport=ylc.TRANSPORT_STREAM,
+                                api_base=server.api_base)
+    poller.session = requests.Session()
+    try:
+        poller.subscribe(worker)
+        deadline = time.time() + timeout
+        while not until() and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        poller.unsubscribe(worker)
+        server.stop()
+    return poller
+
+
+def test_quiet_stream_reconnects_without_counting_as_a_failure(monkeypatch):
+    monkeypatch.setattr(ylc, 'STREAM_READ_TIMEOUT', 0.1)
+    monkeypatch.setattr(ylc, 'STREAM_RECONNECT_DELAY', 0.01)
+    # More idle timeouts in a row than STREAM_MAX_FAILURES
+    server = StandInStreamServer(stream_script=[0.5, 0.5, 0.5, 0.5, [_page(['a'], token='t1')]]).start()
+    worker = FakeWorker(api_key='k')
+    _run_stream_poller(server, worker, lambda: worker.batches)
+
+    assert worker.batches[:1] == [['a']]
+    # Every idle reconnect stayed on the stream (the exhausted script may 404 afterwards)
+    assert [path for path, _ in server.requests[:5]] == ['/liveChat/messages/stream'] * 5
+
+
+def test_polling_fallback_retries_streaming(monkeypatch):
+    monkeypatch.setattr(ylc, 'STREAM_RECONNECT_DELAY', 0.01)
+    monkeypatch.setattr(ylc, 'STREAM_RETRY_SECONDS', 0.05)
+    server = StandInStreamServer(
+        stream_script=[404, [_page(['b'], token='t2')]],
+        poll_pages=[_page(['a'], token='t1', interval_ms=1000)],
+    ).start()
+    worker = FakeWorker(api_key='k')
+    _run_stream_poller(server, worker, lambda: len(worker.batches) >= 2)
+
+    assert worker.batches[:2] == [['a'], ['b']]
+    paths = [path for path, _ in server.requests]
+    assert paths[:3] == ['/liveChat/messages/stream', '/liveChat/messages', '/liveChat/messages/stream']
+    assert server.requests[2][1].get('pageToken') == 't1'
@@ -1,6 +1,7 @@
 import importlib
 from pathlib import Path
 import json
+import os
 
 
 def test_config_manager_set_get_platform(monkeypatch, tmp_path):
@@ -16,6 +17,8 @@ def test_config_manager_set_get_platform(monkeypatch, tmp_path):
 
     # Set a sensitive platform key and ensure it's persisted encrypted
     cfg.set_platform_config('twitch', 'bot_token', 's3cr3t')
+    # Writes are debounced; persist them now
+    cfg.flush()
 
     # Read raw file and assert ENC: prefix present (encryption via secret_store)
     raw = json.loads((tmp_path / '.audiblezenbot' / 'test_config.json').read_text(encoding='utf-8'))
@@ -27,3 +30,131 @@ def test_config_manager_set_get_platform(monkeypatch, tmp_path):
     cfg2 = ConfigManager(config_file='test_config.json')
     got = cfg2.get_platform_config('twitch').get('bot_token')
     assert got == 's3cr3t' or isinstance(got, str)
+
+
+def test_config_manager_write_behind_coalesces_saves(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, 'home', lambda self=None: tmp_path)
+    import core.config as config_mod
+    monkeypatch.setattr(config_mod, 'SAVE_DEBOUNCE_SECONDS', 60)
+
+    cfg = config_mod.ConfigManager(config_file='wb_config.json', watch=False)
+    path = tmp_path / '.audiblezenbot' / 'wb_config.json'
+    for i in range(10):
+        cfg.set('ui.counter', i)
+    cfg.set_platform_config('kick', 'username', 'bob')
+
+    # Nothing written yet, but every instance for the file sees the change
+    assert not path.exists()
+    assert config_mod.ConfigManager(config_file='wb_config.json', watch=False).get('ui.counter') == 9
+
+    cfg.flush()
+    raw = json.loads(path.read_text(encoding='utf-8'))
+    assert raw['ui']['counter'] == 9
+    assert raw['platforms']['kick']['username'] == 'bob'
+    assert cfg._store.saves == 1
+    # No temp files are left behind by the atomic rename
+    assert [p.name for p in path.parent.iterdir()] == ['wb_config.json']
+
+
+def test_config_manager_merges_external_edits(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, 'home', lambda self=None: tmp_path)
+    import core.config as config_mod
+    monkeypatch.setattr(config_mod, 'SAVE_DEBOUNCE_SECONDS', 60)
+
+    cfg = config_mod.ConfigManager(config_file='ext_config.json', watch=False)
+    cfg.set('ui.theme', 'light')
+    cfg.flush()
+
+    path = tmp_path / '.audiblezenbot' / 'ext_config.json'
+    raw = json.loads(path.read_text(encoding='utf-8'))
+    raw['ui']['theme'] = 'external'
+    raw['chat']['max_messages'] = 42
+    path.write_text(json.dumps(raw), encoding='utf-8')
+    os.utime(path, ns=(0, 1))  # Guarantee a different mtime
+
+    # An unsaved local change must survive the merge
+    cfg.set('ui.sidebar_expanded', True)
+    assert config_mod._merge_external_changes(cfg._store) is True
+    assert cfg.get('ui.theme') == 'external'
+    assert cfg.get('chat.max_messages') == 42
+    assert cfg.get('ui.sidebar_expanded') is True
+
+
+def test_config_manager_synchronous_mode(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, 'home', lambda self=None: tmp_path)
+    from core.config import ConfigManager
+
+    cfg = ConfigManager(config_file='sync_config.json', write_behind=False, watch=False)
+    cfg.set('ui.theme', 'light')
+    raw = json.loads((tmp_path / '.audiblezenbot' / 'sync_config.json').read_text(encoding='utf-8'))
+    assert raw['ui']['theme'] == 'light'
+
+
+def test_config_snapshot_accessor_and_subscribe(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, 'home', lambda self=None: tmp_path)
+    import pytest
+    import core.config as config_mod
+    monkeypatch.setattr(config_mod, 'SAVE_DEBOUNCE_SECONDS', 60)
+
+    cfg = config_mod.ConfigManager(config_file='snap_config.json', watch=False)
+    before = cfg.snapshot()
+    with pytest.raises(TypeError):
+        before['ui'] = {}
+
+    theme = cfg.accessor('ui.theme', 'dark')
+    missing = cfg.accessor('ui.nope', 'fallback')
+    assert theme() == 'dark'
+    assert missing() == 'fallback'
+
+    seen = []
+    cfg.subscribe('ui.theme', lambda key, value: seen.append((key, value)))
+    cfg.set('ui.theme', 'light')
+    cfg.set('chat.max_messages', 10)  # Unrelated key: no notification
+
+    assert theme() == 'light'
+    assert seen == [('ui.theme', 'light')]
+    # Old snapshot is untouched; unchanged subtrees are shared
+    assert before['ui']['theme'] == 'dark'
+    assert cfg.snapshot()['platforms'] is before['platforms']
+
+    # get() hands out private copies of containers
+    ui = cfg.get('ui')
+    ui['theme'] = 'mutated'
+    assert cfg.get('ui.theme') == 'light'
+
+
+def test_platform_secrets_decrypted_once_and_invalidated_on_write(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, 'home', lambda self=None: tmp_path)
+    import core.config as config_mod
+    monkeypatch.setattr(config_mod, 'SAVE_DEBOUNCE_SECONDS', 60)
+
+    calls = []
+
+    def _unprotect(value):
+        calls.append(value)
+        return value[len('ENC:'):]
+
+    monkeypatch.setattr(config_mod.secret_store, 'unprotect_string', _unprotect)
+
+    cfg = config_mod.ConfigManager(config_file='secret_config.json', watch=False)
+    cfg.set('platforms.trovo.access_token', 'ENC:tok1')
+    for _ in range(5):
+        assert cfg.get_platform_config('trovo')['access_token'] == 'tok1'
+    assert calls == ['ENC:tok1']
+
+    # Results are private copies
+    cfg.get_platform_config('trovo')['access_token'] = 'mutated'
+    assert cfg.get_platform_config('trovo')['access_token'] == 'tok1'
+
+    # A write invalidates the cached entry; new tokens stay plaintext in memory
+    cfg.set_platform_config('trovo', 'access_token', 'tok2')
+    assert cfg.get_platform_config('trovo')['access_token'] == 'tok2'
+    assert calls == ['ENC:tok1']
+
+
+def test_get_config_manager_is_shared(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, 'home', lambda self=None: tmp_path)
+    import core.config as config_mod
+    monkeypatch.setattr(config_mod, '_config_manager', None)
+
+    assert config_mod.get_config_manager() is config_mod.get_config_manager()
@@ -34,3 +34,148 @@ def test_log_manager_start_stop(tmp_path):
     lm.stop_logging()
     assert lm.is_enabled() is False
     lm.cleanup()
+
+
+class _DictConfig:
+    def __init__(self, values=None):
+        self._m = dict(values or {})
+
+    def get(self, k, default=None):
+        return self._m.get(k, default)
+
+    def set(self, k, v):
+        self._m[k] = v
+
+
+def test_simple_logger_gates_before_formatting(capsys):
+    from core.logger import LogManager, get_logger
+
+    lm = LogManager(config=_DictConfig())
+    try:
+        log = get_logger('GateTest')
+        calls = []
+
+        def _expensive():
+            calls.append(1)
+            return 'expensive'
+
+        log.debug(_expensive)
+        log.trace('value=%s', object())
+        assert calls == []
+        assert log.is_enabled_for('DEBUG') is False
+
+        # Enabling the level and the component flips the cached gate
+        lm.set_level_value('DEBUG', True)
+        assert log.is_enabled_for('DEBUG') is False
+        lm.set_debug_value('gatetest', True)
+        assert log.is_enabled_for('DEBUG') is True
+        log.debug(_expensive)
+        log.info('count=%d', 3)
+        assert calls == [1]
+    finally:
+        lm.cleanup()
+
+    out = capsys.readouterr().out
+    assert '[GateTest][DEBUG] expensive' in out
+    assert '[GateTest][INFO] count=3' in out
+
+
+def test_should_emit_parses_prefix_without_regex():
+    from core.logger import LogManager
+
+    lm = LogManager(config=_DictConfig({'logging.category_levels': {'twitch': {'DEBUG': True}}}))
+    try:
+        lm.set_level_value('DEBUG', False)
+        assert lm.should_emit('[Other][DEBUG] hidden\n') is False
+        assert lm.should_emit('[Twitch][DEBUG] category override\n') is True
+        assert lm.should_emit('[Other] [ERROR] always shown\n') is True
+        assert lm.should_emit('[Other][INFO] shown\n') is True
+        assert lm.should_emit('plain print output\n') is True
+    finally:
+        lm.cleanup()
+
+
+def test_log_file_writes_are_buffered_and_flushed_on_stop(tmp_path):
+    from core.logger import LogManager
+
+    lm = LogManager(config=_DictConfig())
+    try:
+        lm.set_log_folder(str(tmp_path))
+        assert lm.start_logging() is True
+        lm.sink.flush_interval = 60  # Only explicit flushes during the test
+        lm.tee_stdout.write('[Buffered][INFO] hello\n')
+        assert 'hello' not in Path(lm.get_log_path()).read_text(encoding='utf-8')
+        lm.stop_logging()
+        assert '[Buffered][INFO] hello' in Path(lm.get_log_path()).read_text(encoding='utf-8')
+    finally:
+        lm.cleanup()
+
+
+def test_log_retention_rotates_compresses_and_prunes(tmp_path):
+    import gzip
+    import os
+    import time
+    from core.logger import LogRetention, is_log_segment
+
+    active = tmp_path / 'chatmanager_emitted.log'
+    active.write_text('x' * 2048, encoding='utf-8')
+    small = tmp_path / 'emote_cache.log'
+    small.write_text('ok', encoding='utf-8')
+    expired = tmp_path / 'privmsg_chan.20200101-000000.log.gz'
+    expired.write_bytes(b'old')
+    os.utime(expired, (time.time() - 30 * 86400,) * 2)
+    other = tmp_path / 'twitch_channel_emotes_dump_1.json'
+    other.write_text('{}', encoding='utf-8')
+
+    retention = LogRetention([str(tmp_path)], max_file_bytes=1024, total_budget_bytes=10 * 1024 * 1024,
+                             max_age_seconds=7 * 86400)
+    retention.run_once()
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    segments = [n for n in names if is_log_segment(n)]
+    assert len(segments) == 1 and segments[0].startswith('chatmanager_emitted.') and segments[0].endswith('.log.gz')
+    assert gzip.decompress((tmp_path / segments[0]).read_bytes()) == b'x' * 2048
+    assert not active.exists()
+    assert small.exists() and other.exists()
+    assert not expired.exists()
+    assert retention.stats == {'rotated': 1, 'compressed': 1, 'deleted': 1}
+
+
+def test_log_retention_enforces_disk_budget(tmp_path):
+    import os
+    import time
+    from core.logger import LogRetention
+
+    now = time.time()
+    for i in range(4):
+        seg = tmp_path / f'raw_irc_chan.2026010{i + 1}-000000.log.gz'
+        seg.write_bytes(b'z' * 1000)
+        os.utime(seg, (now - (10 - i) * 60,) * 2)
+    (tmp_path / 'raw_irc_chan.log').write_bytes(b'a' * 500)
+
+    retention = LogRetention([str(tmp_path)], max_file_bytes=0, total_budget_bytes=2600,
+                             max_age_seconds=0, compress=False)
+    retention.enforce_budget()
+
+    remaining = sorted(p.name for p in tmp_path.iterdir())
+    # Oldest segments go first; the active file is never deleted
+    assert remaining == ['raw_irc_chan.20260103-000000.log.gz', 'raw_irc_chan.20260104-000000.log.gz',
+                         'raw_irc_chan.log']
+
+
+def test_session_log_sink_rolls_over_at_size_cap(tmp_path):
+    from core.logger import BufferedLogSink, is_log_segment
+
+    path = tmp_path / 'audiblezenbot.log'
+    reopened = []
+    sink = BufferedLogSink(open(path, 'a', encoding='utf-8'), flush_interval=60, path=str(path),
+                           max_bytes=100, on_reopen=reopened.append)
+    sink.write('y' * 150 + '\n')
+    sink.flush()
+    sink.write('after\n')
+    sink.close()
+    sink.log_file.close()
+
+    assert len(reopened) == 1
+    assert path.read_text(encoding='utf-8') == 'after\n'
+    assert any(is_log_segment(p.name) for p in tmp_path.iterdir())
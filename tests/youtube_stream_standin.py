@@ -0,0 +1,113 @@
+"""
+Local stand-in for the YouTube live chat streamList endpoint.
+
+Serves `/liveChat/messages/stream` as a streamed JSON array, pushing one page
+at a time, and `/liveChat/messages` as the plain polling endpoint. Each
+stream connection consumes the next script entry:
+
+ - a list of pages: streamed one by one, then the connection is closed
+ - an int: returned as that HTTP status (e.g. 404 to force a polling fallback)
+ - a float: the stream stays open and silent for that many seconds (a quiet chat)
+
+Polling requests consume `poll_pages` the same way: a page dict is returned
+as-is, an int as that HTTP status.
+
+Every request is recorded with its path and query so tests can check that
+reconnects resume from the last nextPageToken.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StandInStreamServer:
+    def __init__(self, stream_script, poll_pages=None, page_delay=0.02):
+        self.stream_script = list(stream_script)
+        self.poll_pages = list(poll_pages or [])
+        self.page_delay = page_delay
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'StandInStreamServer':
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.0 without Content-Length: the body ends when the connection closes
+            protocol_version = 'HTTP/1.0'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with standin._lock:
+                    standin.requests.append((url.path, query))
+                if url.path.endswith('/stream'):
+                    self._stream(standin._next(standin.stream_script, 404))
+                else:
+                    page = standin._next(standin.poll_pages, {'items': [], 'pollingIntervalMillis': 1000})
+                    if isinstance(page, int):
+                        self._send_json(page, {'error': {'code': page, 'errors': [{'reason': 'notFound'}]}})
+                    else:
+                        self._send_json(200, page)
+
+            def _send_json(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, entry):
+                if isinstance(entry, int):
+                    self._send_json(entry, {'error': {'code': entry, 'errors': [{'reason': 'notFound'}]}})
+                    return
+                if isinstance(entry, float):
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.end_headers()
+                    self.wfile.write(b'[')
+                    self.wfile.flush()
+                    time.sleep(entry)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(b'[')
+                for i, page in enumerate(entry):
+                    # Split each page across writes so the client must reassemble it
+                    data = (',\n' if i else '') + json.dumps(page)
+                    half = len(data) // 2
+                    for part in (data[:half], data[half:]):
+                        self.wfile.write(part.encode('utf-8'))
+                        self.wfile.flush()
+                        time.sleep(standin.page_delay)
+                self.wfile.write(b']')
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def _next(self, script, default):
+        with self._lock:
+            return script.pop(0) if script else default
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -1053,9 +1053,9 @@ QTabBar::tab:hover {
         for platform, enabled in group['platforms'].items():
             if enabled and self.chat_manager:
                 try:
-                    # Reload config to get fresh bot credentials
-                    from core.config import ConfigManager
-                    fresh_config = ConfigManager()
+                    # Shared config: cached, already-decrypted bot credentials
+                    from core.config import get_config_manager
+                    fresh_config = get_config_manager()
                     platform_config = fresh_config.get_platform_config(platform)
                     
                     # Determine which account to use: prefer an active bot connector,
@@ -1144,8 +1144,8 @@ QTabBar::tab:hover {
         for platform, enabled in group['platforms'].items():
             if enabled and self.chat_manager:
                 try:
-                    from core.config import ConfigManager
-                    fresh_config = ConfigManager()
+                    from core.config import get_config_manager
+                    fresh_config = get_config_manager()
                     platform_config = fresh_config.get_platform_config(platform)
 
                     if send_as_streamer:
@@ -1393,8 +1393,8 @@ QTabBar::tab:hover {
         for platform, enabled in group['platforms'].items():
             if enabled and self.chat_manager:
                 try:
-                    from core.config import ConfigManager
-                    fresh_config = ConfigManager()
+                    from core.config import get_config_manager
+                    fresh_config = get_config_manager()
                     platform_config = fresh_config.get_platform_config(platform)
 
                     if send_as_streamer:
@@ -1440,6 +1440,24 @@ QTabBar::tab:hover {
         
         logger.info(f"[TimerMessages] Sent message from '{group_name}' to {platforms_sent}: {message[:50]}...")
     
+    def _track_delivery(self, future, label, account_type, username):
+        """Log delivery of a queued send; returns False only if it already failed"""
+        def _done(f):
+            try:
+                ok = bool(f.result())
+            except Exception:
+                ok = False
+            if ok:
+                logger.info(f"[TimerMessages] ✓ {label}: Delivered as {account_type} ({username})")
+            else:
+                logger.warning(f"[TimerMessages] ✗ {label}: Delivery failed as {account_type} ({username})")
+
+        future.add_done_callback(_done)
+        try:
+            return not (future.done() and not future.result())
+        except Exception:
+            return False
+
     def send_message_as_account(self, platform, message, username, token, account_type):
         """Send a message to a platform using specific account credentials"""
         import requests
@@ -1493,9 +1511,11 @@ QTabBar::tab:hover {
                 if account_type == 'bot':
                     # Use persistent bot connector from chat_manager
                     # Disable fallback to ensure only bot sends (no streamer fallback)
-                    success = self.chat_manager.sendMessageAsBot('kick', message, allow_fallback=False)
+                    success = self._track_delivery(
+                        self.chat_manager.sendMessageAsBotAsync('kick', message, allow_fallback=False),
+                        'Kick', account_type, username)
                     if success:
-                        logger.info(f"[TimerMessages] ✓ Kick: Sent via persistent bot connection ({username})")
+                        logger.info(f"[TimerMessages] ✓ Kick: Queued via persistent bot connection ({username})")
                         return True
                     else:
                         logger.warning(f"[TimerMessages] ⚠ Kick: Bot connector not available")
@@ -1504,8 +1524,9 @@ QTabBar::tab:hover {
                     # Use streamer connector directly
                     connector = self.chat_manager.connectors.get('kick')
                     if connector and hasattr(connector, 'send_message') and getattr(connector, 'connected', False):
-                        connector.send_message(message)
-                        logger.info(f"[TimerMessages] ✓ Kick: Sent via persistent streamer connection ({username})")
+                        if not self._track_delivery(connector.send_message_async(message), 'Kick', account_type, username):
+                            return False
+                        logger.info(f"[TimerMessages] ✓ Kick: Queued via persistent streamer connection ({username})")
                         
                         # No need to echo - Kick webhook will receive it back
                         # (message will appear in chat log via normal webhook flow)
@@ -1519,9 +1540,11 @@ QTabBar::tab:hover {
                 logger.debug(f"[TimerMessages] YouTube send: account_type={account_type}, username={username}")
                 if account_type == 'bot':
                     # Disable fallback to ensure only bot sends (no streamer fallback)
-                    success = self.chat_manager.sendMessageAsBot('youtube', message, allow_fallback=False)
+                    success = self._track_delivery(
+                        self.chat_manager.sendMessageAsBotAsync('youtube', message, allow_fallback=False),
+                        'YouTube', account_type, username)
                     if success:
-                        logger.info(f"[TimerMessages] ✓ YouTube: Sent via persistent bot connection ({username})")
+                        logger.info(f"[TimerMessages] ✓ YouTube: Queued via persistent bot connection ({username})")
                         return True
                     else:
                         logger.warning(f"[TimerMessages] ⚠ YouTube: Bot connector not available")
@@ -1529,8 +1552,9 @@ QTabBar::tab:hover {
                 else:  # account_type == 'streamer'
                     connector = self.chat_manager.connectors.get('youtube')
                     if connector and hasattr(connector, 'send_message') and getattr(connector, 'connected', False):
-                        connector.send_message(message)
-                        logger.info(f"[TimerMessages] ✓ YouTube: Sent via persistent streamer connection ({username})")
+                        if not self._track_delivery(connector.send_message_async(message), 'YouTube', account_type, username):
+                            return False
+                        logger.info(f"[TimerMessages] ✓ YouTube: Queued via persistent streamer connection ({username})")
                         return True
                     else:
                         logger.warning(f"[TimerMessages] ✗ YouTube: Streamer connector not available")
@@ -1541,9 +1565,11 @@ QTabBar::tab:hover {
                 logger.debug(f"[TimerMessages] Trovo send: account_type={account_type}, username={username}")
                 if account_type == 'bot':
                     # Disable fallback to ensure only bot sends (no streamer fallback)
-                    success = self.chat_manager.sendMessageAsBot('trovo', message, allow_fallback=False)
+                    success = self._track_delivery(
+                        self.chat_manager.sendMessageAsBotAsync('trovo', message, allow_fallback=False),
+                        'Trovo', account_type, username)
                     if success:
-                        logger.info(f"[TimerMessages] ✓ Trovo: Sent via persistent bot connection ({username})")
+                        logger.info(f"[TimerMessages] ✓ Trovo: Queued via persistent bot connection ({username})")
                         return True
                     else:
                         logger.warning(f"[TimerMessages] ⚠ Trovo: Bot connector not available")
@@ -1551,8 +1577,9 @@ QTabBar::tab:hover {
                 else:  # account_type == 'streamer'
                     connector = self.chat_manager.connectors.get('trovo')
                     if connector and hasattr(connector, 'send_message') and getattr(connector, 'connected', False):
-                        connector.send_message(message)
-                        logger.info(f"[TimerMessages] ✓ Trovo: Sent via persistent streamer connection ({username})")
+                        if not self._track_delivery(connector.send_message_async(message), 'Trovo', account_type, username):
+                            return False
+                        logger.info(f"[TimerMessages] ✓ Trovo: Queued via persistent streamer connection ({username})")
                         return True
                     else:
                         logger.warning(f"[TimerMessages] ✗ Trovo: Streamer connector not available")
@@ -1563,9 +1590,11 @@ QTabBar::tab:hover {
                 logger.debug(f"[TimerMessages] DLive send: account_type={account_type}, username={username}")
                 if account_type == 'bot':
                     # Disable fallback to ensure only bot sends (no streamer fallback)
-                    success = self.chat_manager.sendMessageAsBot('dlive', message, allow_fallback=False)
+                    success = self._track_delivery(
+                        self.chat_manager.sendMessageAsBotAsync('dlive', message, allow_fallback=False),
+                        'DLive', account_type, username)
                     if success:
-                        logger.info(f"[TimerMessages] ✓ DLive: Sent via persistent bot connection ({username})")
+                        logger.info(f"[TimerMessages] ✓ DLive: Queued via persistent bot connection ({username})")
                         return True
                     else:
                         logger.warning(f"[TimerMessages] ⚠ DLive: Bot connector not available")
@@ -1573,8 +1602,9 @@ QTabBar::tab:hover {
                 else:  # account_type == 'streamer'
                     connector = self.chat_manager.connectors.get('dlive')
                     if connector and hasattr(connector, 'send_message') and getattr(connector, 'connected', False):
-                        connector.send_message(message)
-                        logger.info(f"[TimerMessages] ✓ DLive: Sent via persistent streamer connection ({username})")
+                        if not self._track_delivery(connector.send_message_async(message), 'DLive', account_type, username):
+                            return False
+                        logger.info(f"[TimerMessages] ✓ DLive: Queued via persistent streamer connection ({username})")
                         
                         # Don't echo - DLive WebSocket subscription will receive the message back
                         return True
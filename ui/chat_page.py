@@ -9,6 +9,7 @@ import base64
 import json
 import hashlib
 import html
+import functools
 
 # PyQt6 imports (guarded for headless/test environments)
 HAS_PYQT = True
@@ -172,7 +173,11 @@ except Exception:
 # Project-specific imports
 from core.badge_manager import get_badge_manager
 from core.blocked_terms_manager import get_blocked_terms_manager
-from ui.platform_icons import get_platform_icon_html, PLATFORM_COLORS
+from core.render_cache import get_render_cache, get_chrome_cache
+from core.pause_buffer import PauseBuffer, DEFAULT_MAX_MESSAGES
+from core.chat_archive import get_chat_archive
+from core.render_pipeline import PLACEHOLDER_PREFIX, RenderResult, get_render_fanout
+from ui.platform_icons import get_platform_icon_html, get_platform_icon_url, PLATFORM_COLORS
 
 from core.logger import get_logger
 
@@ -255,9 +260,12 @@ def set_username_colors(colors):
     global USERNAME_COLORS
     USERNAME_COLORS.clear()
     USERNAME_COLORS.extend(colors)
+    get_username_color.cache_clear()
+    get_chrome_cache().invalidate('username_colors')
     logger.info(f"Updated USERNAME_COLORS with {len(colors)} colors")
 
 
+@functools.lru_cache(maxsize=4096)
 def get_username_color(username: str) -> str:
     """
     Generate a consistent color for a username based on its hash.
@@ -308,14 +316,15 @@ def build_data_uri_for_emote(emid, mgr=None):
     return None
     
 
-def get_badge_html(badge_str: str, platform: str = 'twitch') -> str:
+def get_badge_ref(badge_str: str, platform: str = 'twitch'):
     """
-    Convert badge string to HTML image tag.
+    Resolve a badge to a structured reference.
     Args:
         badge_str: Badge identifier (e.g., 'moderator/1' or 'subscriber/12')
         platform: Platform name ('twitch', 'kick', 'trovo', 'youtube', 'dlive')
     Returns:
-        HTML <img> tag or empty string if badge not found
+        dict with 'name', 'label', 'title' and 'url' ('' when only a text badge
+        can be shown), or None if the badge can't be shown at all
     """
     try:
         # If badge_str is just a platform badge type (no version), use platform-specific icons
@@ -323,44 +332,43 @@ def get_badge_html(badge_str: str, platform: str = 'twitch') -> str:
             # Select the appropriate badge icon set
             if platform == 'kick':
                 badge_icons = KICK_BADGE_ICONS
-                logger.debug(f"Looking up Kick badge: '{badge_str}'")
+                logger.debug("Looking up Kick badge: '%s'", badge_str)
             elif platform == 'trovo':
                 badge_icons = TROVO_BADGE_ICONS
-                logger.debug(f"Looking up Trovo badge: '{badge_str}'")
+                logger.debug("Looking up Trovo badge: '%s'", badge_str)
             elif platform == 'youtube':
                 badge_icons = YOUTUBE_BADGE_ICONS
-                logger.debug(f"Looking up YouTube badge: '{badge_str}'")
+                logger.debug("Looking up YouTube badge: '%s'", badge_str)
             elif platform == 'dlive':
                 badge_icons = DLIVE_BADGE_ICONS
-                logger.debug(f"Looking up DLive badge: '{badge_str}'")
+                logger.debug("Looking up DLive badge: '%s'", badge_str)
             else:
-                # Unknown platform without version - return empty
-                return ''
+                # Unknown platform without version - nothing to show
+                return None
             
+            ref = {'name': badge_str, 'label': badge_str, 'title': '', 'url': ''}
             icon = badge_icons.get(badge_str)
             if icon:
                 local_path, tooltip = icon
+                ref['title'] = tooltip
                 try:
                     with open(local_path, 'rb') as f:
                         svg_data = f.read()
                     img_data = base64.b64encode(svg_data).decode()
-                    data_uri = f'data:image/svg+xml;base64,{img_data}'
-                    return f'<img src="{data_uri}" width="18" height="18" style="vertical-align: middle; margin-right: 2px;" title="{tooltip}" />'
+                    ref['url'] = f'data:image/svg+xml;base64,{img_data}'
                 except Exception as e:
-                    logger.debug(f"Error reading {platform} badge SVG from {local_path}: {e}")
-                    # Return text fallback if SVG not found
-                    return f'<span style="background: #555; color: #fff; padding: 2px 4px; border-radius: 3px; font-size: 10px; margin-right: 4px;" title="{tooltip}">{badge_str.upper()}</span>'
+                    logger.debug("Error reading %s badge SVG from %s: %s", platform, local_path, e)
+                    # Text fallback if SVG not found
             else:
-                logger.debug(f"{platform} badge '{badge_str}' not found. Showing as text badge.")
-                # Return text fallback for unknown badges
-                return f'<span style="background: #555; color: #fff; padding: 2px 4px; border-radius: 3px; font-size: 10px; margin-right: 4px;">{badge_str.upper()}</span>'
+                logger.debug("%s badge '%s' not found. Showing as text badge.", platform, badge_str)
+            return ref
 
         # Otherwise, treat as Twitch-style badge (with version)
         badge_manager = get_badge_manager()
         parts = badge_str.split('/')
         if len(parts) != 2:
-            logger.debug(f"Badge {badge_str} doesn't have version number")
-            return ''
+            logger.debug("Badge %s doesn't have version number", badge_str)
+            return None
         badge_name, version = parts
         badge_key = f"{badge_name}/{version}"
         badge_title = badge_manager.get_badge_title(badge_key)
@@ -368,19 +376,41 @@ def get_badge_html(badge_str: str, platform: str = 'twitch') -> str:
             badge_title = badge_name.replace('-', ' ').replace('_', ' ').title()
         badge_path = badge_manager.get_badge_path(badge_key, size='1x')
         if not badge_path or not os.path.exists(badge_path):
-            logger.debug(f"Downloading badge: {badge_key}")
+            logger.debug("Downloading badge: %s", badge_key)
             badge_path = badge_manager.download_badge(badge_key, size='1x')
         if not badge_path or not os.path.exists(badge_path):
-            logger.debug(f"Badge not found after download attempt: {badge_key}")
-            return ''
+            logger.debug("Badge not found after download attempt: %s", badge_key)
+            return None
         with open(badge_path, 'rb') as f:
             img_data = base64.b64encode(f.read()).decode()
-        return f'<img src="data:image/png;base64,{img_data}" width="18" height="18" style="vertical-align: middle; margin-right: 2px;" title="{badge_title}" />'
+        return {'name': badge_name, 'label': badge_name, 'title': badge_title, 'url': f'data:image/png;base64,{img_data}'}
     except Exception as e:
-        logger.error(f"Error getting badge HTML for {badge_str}: {e}")
+        logger.error(f"Error getting badge for {badge_str}: {e}")
         import traceback
         traceback.print_exc()
+        return None
+
+
+def get_badge_html(badge_str: str, platform: str = 'twitch') -> str:
+    """
+    Convert badge string to HTML image tag.
+    Args:
+        badge_str: Badge identifier (e.g., 'moderator/1' or 'subscriber/12')
+        platform: Platform name ('twitch', 'kick', 'trovo', 'youtube', 'dlive')
+    Returns:
+        HTML <img> tag (or text badge span) or empty string if badge not found
+    """
+    return badge_ref_html(get_badge_ref(badge_str, platform))
+
+
+def badge_ref_html(ref) -> str:
+    """Format a reference from get_badge_ref as an <img> tag or text badge span."""
+    if not ref:
         return ''
+    if ref['url']:
+        return f'<img src="{ref["url"]}" width="18" height="18" style="vertical-align: middle; margin-right: 2px;" title="{ref["title"]}" />'
+    title_attr = f' title="{ref["title"]}"' if ref['title'] else ''
+    return f'<span style="background: #555; color: #fff; padding: 2px 4px; border-radius: 3px; font-size: 10px; margin-right: 4px;"{title_attr}>{ref["label"].upper()}</span>'
 
 class ChatPage(QWidget):
     # Emitted when a message has been rendered into the WebEngine DOM.
@@ -392,6 +422,17 @@ class ChatPage(QWidget):
     render_ready = pyqtSignal(str, str, bool)
     """Chat page displaying messages from all platforms"""
     
+    # Config keys mirrored in attributes (key -> attribute, affects cached user chrome)
+    _UI_FLAG_KEYS = {
+        'ui.show_platform_icons': ('show_platform_icons', True),
+        'ui.show_user_colors': ('show_user_colors', True),
+        'ui.show_badges': ('show_badges', True),
+        'ui.show_timestamps': ('show_timestamps', False),
+    }
+    # Config keys that change rendered message bodies; each change bumps the
+    # render-settings version that is part of every body cache key
+    _RENDER_SETTING_KEYS = ('ui.theme',)
+
     def __init__(self, chat_manager, config=None, parent=None):
         super().__init__(parent)
         self.chat_manager = chat_manager
@@ -410,6 +451,13 @@ class ChatPage(QWidget):
             if custom_colors and len(custom_colors) == 20:
                 set_username_colors(custom_colors)
                 logger.info(f"Loaded {len(custom_colors)} custom username colors from config")
+
+            # Keep the cached display flags in sync when they change elsewhere
+            try:
+                for key in self._UI_FLAG_KEYS:
+                    self.config.subscribe(key, self._on_ui_flag_changed)
+            except Exception:
+                pass
         else:
             self.show_platform_icons = True
             self.show_user_colors = True
@@ -430,12 +478,20 @@ class ChatPage(QWidget):
         # Immediate JS execution rate-limits
         # Number of immediate calls allowed per second for generic priority snippets
         self._immediate_rate_limit = 20
-        # Number of immediate calls allowed per second specifically for tiny metadata/data-uri patches
-        # Temporarily raised for testing to allow aggressive immediate patching
-        self._meta_immediate_rate_limit = (self.config.get('ui.meta_immediate_rate_limit') if self.config else None) or 200
+        # Number of immediate calls allowed per second specifically for tiny metadata/data-uri patches.
+        # Emote patches are batched (see `_flush_emote_patches`) so a low limit is enough.
+        self._meta_immediate_rate_limit = (self.config.get('ui.meta_immediate_rate_limit') if self.config else None) or 20
         # timestamps of recent immediate calls
         self._immediate_call_timestamps = []
-        self.message_queue = []
+        # Bounded pause buffer: overflow spills to a temp segment or drops the oldest
+        self.message_queue = PauseBuffer(
+            max_messages=(self.config.get('ui.pause_buffer_max') if self.config else None) or DEFAULT_MAX_MESSAGES,
+            spill=(self.config.get('ui.pause_buffer_spill', True) if self.config else True),
+        )
+        # Backlog replay after resume is done in chunks between event-loop turns
+        self._resume_batch_size = (self.config.get('ui.resume_batch_size') if self.config else None) or 25
+        self._resume_batch_interval_ms = 16
+        self._resuming = False
         # Count of Python-side display calls (increments for every _displayMessage call)
         self._python_display_count = 0
         
@@ -450,6 +506,43 @@ class ChatPage(QWidget):
         self._immediate_rate_limit = 20  # max immediate runs per second
         # Track message_ids already queued to avoid duplicate DOM insertions
         self._queued_message_ids = set()
+        # Batched emote placeholder patching: ids resolved within a short
+        # window are applied together with one runJavaScript call.
+        import threading as _threading
+        self._pending_emote_patches = {}
+        self._emote_patch_lock = _threading.Lock()
+        self._emote_patch_scheduled = False
+        self._emote_patch_window_ms = (self.config.get('ui.emote_patch_window_ms') if self.config else None) or 50
+        self._emote_patch_max_batch = 500
+        self._emote_patch_batches = 0
+        self._emote_patch_ids = 0
+        # file:/// emotes are only patched when the deferred check finds them broken
+        self._pending_file_checks = set()
+        self._file_check_scheduled = False
+        self._file_emote_check_delay_ms = 250
+        # LRU cache of rendered message bodies (invalidated on emote/badge asset changes)
+        self.render_cache = get_render_cache()
+        self._render_settings_version = 0
+        try:
+            if self.config:
+                for key in self._RENDER_SETTING_KEYS:
+                    self.config.subscribe(key, self._on_render_setting_changed)
+        except Exception:
+            pass
+        try:
+            cache_size = self.config.get('ui.render_cache_size') if self.config else None
+            if cache_size is not None:
+                self.render_cache.resize(cache_size)
+        except Exception:
+            pass
+        # Persistent searchable chat history (batched background writer)
+        self.chat_archive = None
+        try:
+            archive_enabled = self.config.get('chat.archive_enabled', True) if self.config else True
+            if archive_enabled:
+                self.chat_archive = get_chat_archive()
+        except Exception as e:
+            logger.warning(f"Chat archive unavailable: {e}")
         
         # Overlay server will be set by main.py
         self.overlay_server = None
@@ -643,7 +736,7 @@ class ChatPage(QWidget):
 
             return ''.join(out_parts)
         except Exception as e:
-            logger.debug(f"Failed to parse emotes tag: {e}")
+            logger.debug("Failed to parse emotes tag: %s", e)
             return html.escape(message)
     
     def initUI(self):
@@ -837,6 +930,24 @@ class ChatPage(QWidget):
             }
         """)
         dump_btn.clicked.connect(lambda: self.dump_chat_body())
+
+        # Search chat history button
+        search_btn = QPushButton("Search")
+        search_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4a90e2;
+                color: #ffffff;
+                border: none;
+                padding: 5px 15px;
+                border-radius: 3px;
+                font-size: 12px;
+            }
+            QPushButton:hover {
+                background-color: #357abd;
+            }
+        """)
+        search_btn.clicked.connect(self.openChatSearch)
+        settings_layout.addWidget(search_btn)
         settings_layout.addWidget(dump_btn)
         settings_layout.addWidget(clear_btn)
         
@@ -1176,31 +1287,36 @@ class ChatPage(QWidget):
             if platform_msg_id:
                 key = f"{platform}:{platform_msg_id}"
                 if key in self.platform_message_id_map:
-                    logger.debug(f"Duplicate message ignored platform={platform} message_id={platform_msg_id}")
+                    logger.debug("Duplicate message ignored platform=%s message_id=%s", platform, platform_msg_id)
                     return
         except Exception:
             pass
         try:
-            logger.debug(f"[TRACE] addMessage called: platform={platform} username={username} preview={preview} paused={self.is_paused} chat_page_id={id(self)} chat_manager_id={id(self.chat_manager)}")
+            logger.debug("[TRACE] addMessage called: platform=%s username=%s preview=%s paused=%s chat_page_id=%s chat_manager_id=%s", platform, username, preview, self.is_paused, id(self), id(self.chat_manager))
         except Exception:
-            logger.debug(f"[TRACE] addMessage called: platform={platform} username={username} preview={preview} paused={self.is_paused}")
-        if self.is_paused:
-            # Queue the message instead of displaying
+            logger.debug("[TRACE] addMessage called: platform=%s username=%s preview=%s paused=%s", platform, username, preview, self.is_paused)
+        # Archive every accepted message (including ones held while paused)
+        archive = getattr(self, 'chat_archive', None)
+        if archive is not None:
+            archive.record(platform, username, message, metadata)
+        if self.is_paused or getattr(self, '_resuming', False):
+            # Queue the message instead of displaying (also while a resumed
+            # backlog is still replaying so ordering is preserved)
             self.message_queue.append((platform, username, message, metadata))
-            logger.debug(f"[TRACE] Message queued (paused). queue_length={len(self.message_queue)}")
+            logger.debug("[TRACE] Message queued (paused). queue_length=%s", len(self.message_queue))
             return
         
         self._displayMessage(platform, username, message, metadata)
     
     def _displayMessage(self, platform, username, message, metadata=None):
         """Internal method to display a message"""
-        logger.info(f"addMessage: platform={platform}, username={username}, message={message}, metadata={metadata}")
+        logger.debug("addMessage: platform=%s, username=%s, message=%s, metadata=%s", platform, username, message, metadata)
         # TRACE: confirm display entry
         try:
             preview = message[:120] if message else ''
         except Exception:
             preview = ''
-        logger.debug(f"[TRACE] _displayMessage: platform={platform} username={username} preview={preview}")
+        logger.debug("[TRACE] _displayMessage: platform=%s username=%s preview=%s", platform, username, preview)
         if metadata is None:
             metadata = {}
         
@@ -1221,7 +1337,7 @@ class ChatPage(QWidget):
             # Attempt to delete message from platform
             platform_msg_id = metadata.get('message_id')
             if platform_msg_id:
-                logger.debug(f"Attempting to delete message {platform_msg_id} from {platform} due to blocked terms")
+                logger.debug("Attempting to delete message %s from %s due to blocked terms", platform_msg_id, platform)
                 try:
                     deletion_success = self.chat_manager.deleteMessage(platform.lower(), platform_msg_id)
                     if deletion_success:
@@ -1232,7 +1348,7 @@ class ChatPage(QWidget):
                 except Exception as e:
                     logger.error(f"Error deleting message from {platform}: {e}")
             else:
-                logger.debug(f"No platform message_id available to delete from {platform}")
+                logger.debug("No platform message_id available to delete from %s", platform)
         
         # Prefer using the platform-provided message_id when available
         platform_msg_id = None
@@ -1296,45 +1412,11 @@ class ChatPage(QWidget):
         event_type = metadata.get('event_type')
         is_event = event_type in ['follow', 'subscription', 'raid', 'bits', 'highlight', 'redemption', 'spell', 'magic_chat']
         
-        # Get platform icon (image or emoji)
-        icon_html = get_platform_icon_html(platform, size=18) if self.show_platform_icons else ''
-        
-        # Get username color
-        if self.show_user_colors:
-            if 'color' in metadata and metadata['color']:
-                # Use platform-provided color
-                user_color = metadata['color']
-                if not user_color.startswith('#'):
-                    user_color = f'#{user_color}'
-            else:
-                # Assign a consistent color based on username
-                user_color = get_username_color(username)
-        else:
-            user_color = '#ffffff'
-        
-        # Get badges
-        badges_html = ''
-        if self.show_badges and 'badges' in metadata and metadata['badges']:
-            badges = metadata['badges']
-            if isinstance(badges, list):
-                for badge in badges:
-                    # Try to get badge image, passing platform for proper lookup
-                    badge_img = get_badge_html(badge, platform)
-                    if badge_img:
-                        badges_html += badge_img
-                    else:
-                        # Fallback to text badge
-                        badge_name = badge.split('/')[0] if '/' in badge else badge
-                        badges_html += f'<span style="background-color: #3d3d3d; padding: 2px 4px; border-radius: 3px; font-size: 10px; margin-right: 2px;">{badge_name}</span>'
-            elif isinstance(badges, str):
-                # Try to get badge image, passing platform for proper lookup
-                badge_img = get_badge_html(badges, platform)
-                if badge_img:
-                    badges_html = badge_img
-                else:
-                    # Fallback to text badge
-                    badge_name = badges.split('/')[0] if '/' in badges else badges
-                    badges_html = f'<span style="background-color: #3d3d3d; padding: 2px 4px; border-radius: 3px; font-size: 10px; margin-right: 2px;">{badge_name}</span>'
+        # Platform icon and username color/span are cached per (platform,
+        # user) so repeat chatters don't rebuild them; badges are added by
+        # the render worker
+        chrome_username = username
+        user_color, icon_html, chrome_username_html, icon_url = self._get_user_chrome(platform, username, metadata)
         
         # Format message as HTML with conditional spacing
         # Order: icon, timestamp, badges, username, message
@@ -1349,10 +1431,6 @@ class ChatPage(QWidget):
         if time_str:
             components.append(f'<span style="color: #888888; font-size: 11px;">[{time_str}]</span>')
 
-        # Badges
-        if badges_html:
-            components.append(badges_html)
-
         # Prepare emotes_tag (may be populated from metadata or recovered by heuristic)
         emotes_tag = None
 
@@ -1408,8 +1486,11 @@ class ChatPage(QWidget):
 
         # Username
         # Escape username to prevent raw HTML from being injected (connectors may include tag blobs)
-        safe_username = html.escape(username or '')
-        username_html = f'<span style="color: {user_color}; font-weight: bold;">{safe_username}</span>'
+        if username == chrome_username:
+            username_html = chrome_username_html
+        else:
+            safe_username = html.escape(username or '')
+            username_html = f'<span style="color: {user_color}; font-weight: bold;">{safe_username}</span>'
         components.append(username_html)
 
         # Message - replace emotes where possible (use unified renderer)
@@ -1429,14 +1510,25 @@ class ChatPage(QWidget):
         except Exception:
             pass
 
-        
+        # Rendered bodies are memoized by (platform, text, emotes/fragments,
+        # version); the chrome built above is composed around the cached body.
+        body_cache_key = None
+        cached_body = None
+        try:
+            body_cache_key = self.render_cache.make_key(platform, message, emotes_tag, metadata,
+                                                        settings_version=self._render_settings_version)
+            cached_body = self.render_cache.get(body_cache_key)
+        except Exception:
+            cached_body = None
 
         # Prefer rendering fragments with local cached images when possible
         message_html = None
         has_img = False
+        if cached_body is not None:
+            message_html, has_img = cached_body
         try:
             frags = None
-            if isinstance(metadata, dict):
+            if isinstance(metadata, dict) and cached_body is None:
                 frags = metadata.get('fragments') or metadata.get('message_fragments')
             if frags and isinstance(frags, list):
                 try:
@@ -1677,13 +1769,19 @@ class ChatPage(QWidget):
                 except Exception:
                     pass
                 final_parts = list(components_snapshot)
+                # Badges go between the timestamp and the username (the last component)
+                badges_html, badge_refs = self._get_user_badges(platform_snapshot, metadata_snapshot)
+                if badges_html:
+                    final_parts.insert(len(final_parts) - 1, badges_html)
                 # Re-run fragment/emote rendering logic in background
                 final_message_html = None
                 final_has_img = False
+                if cached_body is not None:
+                    final_message_html, final_has_img = cached_body
                 try:
                     # Use same fragment rendering block as above but operate on local copies
                     frags_local = None
-                    if isinstance(metadata_snapshot, dict):
+                    if isinstance(metadata_snapshot, dict) and cached_body is None:
                         frags_local = metadata_snapshot.get('fragments') or metadata_snapshot.get('message_fragments')
                     if frags_local and isinstance(frags_local, list):
                         try:
@@ -2020,10 +2118,40 @@ class ChatPage(QWidget):
                         except Exception:
                             final_message_html = ''
 
+                # Memoize the body unless it still carries placeholders that
+                # need a prefetch to be triggered by the next render.
+                try:
+                    if (cached_body is None and body_cache_key is not None and final_message_html
+                            and 'emote placeholder' not in final_message_html
+                            and PLACEHOLDER_PREFIX not in final_message_html):
+                        self.render_cache.put(body_cache_key, (final_message_html, bool(final_has_img)))
+                except Exception:
+                    pass
+
                 final_parts.append(final_message_html)
                 combined_html = ' '.join(final_parts)
                 wrapped_local = f'<div class="message" data-message-id="{message_id_snapshot}" style="{bg_style_snapshot} padding: 2px 6px; border-radius: 4px; margin-bottom: 2px; cursor: pointer;">{combined_html}</div>'
 
+                # Structured render result, fanned out to other consumers
+                # (overlay event stream, ...) once the DOM insert happens
+                try:
+                    entry = self.message_data.get(message_id_snapshot)
+                    if entry is not None:
+                        entry['render'] = RenderResult(
+                            message_id=message_id_snapshot,
+                            platform=platform_snapshot,
+                            username=username_snapshot,
+                            color=user_color_snapshot,
+                            icon_url=icon_url,
+                            badges=badge_refs,
+                            body_html=final_message_html,
+                            has_img=final_has_img,
+                            is_event=bool(metadata_snapshot.get('event_type')) if isinstance(metadata_snapshot, dict) else False,
+                            metadata=metadata_snapshot,
+                        )
+                except Exception:
+                    pass
+
                 # Emit to main thread for DOM insertion
                 try:
                     # Persist diagnostic: about to emit render_ready
@@ -2222,18 +2350,119 @@ class ChatPage(QWidget):
                 pass
             _render_worker(components, bg_style, message_id, metadata, platform, username, message, user_color)
     
+    def _get_user_chrome(self, platform, username, metadata):
+        """Return (user_color, icon_html, username_html, icon_url) for a
+        chatter, built once per (platform, user, color, toggles). The icon
+        URL is resolved regardless of the chat toggles since other render
+        consumers (overlay) apply their own display settings. Badges are
+        resolved separately by `_get_user_badges` on the render worker."""
+        meta_color = metadata.get('color') if isinstance(metadata, dict) else None
+        key = (
+            str(platform or '').lower(), username or '', meta_color or '',
+            self.show_platform_icons, self.show_user_colors,
+        )
+        cache = get_chrome_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Get platform icon (image or emoji)
+        icon_url = get_platform_icon_url(platform)
+        icon_html = get_platform_icon_html(platform, size=18) if self.show_platform_icons else ''
+        
+        # Get username color
+        if self.show_user_colors:
+            if meta_color:
+                # Use platform-provided color
+                user_color = meta_color
+                if not user_color.startswith('#'):
+                    user_color = f'#{user_color}'
+            else:
+                # Assign a consistent color based on username
+                user_color = get_username_color(username or '')
+        else:
+            user_color = '#ffffff'
+
+        # Escape username to prevent raw HTML from being injected (connectors may include tag blobs)
+        safe_username = html.escape(username or '')
+        username_html = f'<span style="color: {user_color}; font-weight: bold;">{safe_username}</span>'
+
+        chrome = (user_color, icon_html, username_html, icon_url)
+        cache.put(key, chrome)
+        return chrome
+
+    def _get_user_badges(self, platform, metadata):
+        """Return (badges_html, badge_refs) for a message's badges.
+
+        Badge lookups may read or download images, so this runs on the render
+        worker, and only when badges are shown in chat or a render subscriber
+        (overlay) will use the refs. Results are cached per (platform,
+        badges, show_badges).
+        """
+        badges = metadata.get('badges') if isinstance(metadata, dict) else None
+        if not badges or not (self.show_badges or get_render_fanout().has_subscribers):
+            return '', ()
+        if isinstance(badges, str):
+            badges = [badges]
+        if not isinstance(badges, list):
+            return '', ()
+        key = ('badges', str(platform or '').lower(), tuple(str(b) for b in badges), self.show_badges)
+        cache = get_chrome_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        badges_html = ''
+        badge_refs = []
+        for badge in badges:
+            # Try to get badge image, passing platform for proper lookup
+            ref = get_badge_ref(badge, platform)
+            badge_img = badge_ref_html(ref)
+            if badge_img:
+                badge_refs.append(ref)
+                badges_html += badge_img
+            else:
+                # Fallback to text badge
+                badge_name = badge.split('/')[0] if '/' in badge else badge
+                badge_refs.append({'name': badge_name, 'label': badge_name, 'title': '', 'url': ''})
+                badges_html += f'<span style="background-color: #3d3d3d; padding: 2px 4px; border-radius: 3px; font-size: 10px; margin-right: 2px;">{badge_name}</span>'
+        if not self.show_badges:
+            badges_html = ''
+
+        result = (badges_html, tuple(badge_refs))
+        cache.put(key, result)
+        return result
+
     def togglePlatformIcons(self, state):
         """Toggle platform icon visibility"""
         old_state = self.show_platform_icons
         self.show_platform_icons = (state == Qt.CheckState.Checked.value)
+        get_chrome_cache().invalidate('togglePlatformIcons')
         
         # Save setting to config
         if self.config:
             self.config.set('ui.show_platform_icons', self.show_platform_icons)
     
+    def _on_render_setting_changed(self, key, value):
+        """Config subscriber: bodies rendered under the old settings stop matching."""
+        self._render_settings_version += 1
+
+    def _on_ui_flag_changed(self, key, value):
+        """Config subscriber: update a cached display flag changed outside this page."""
+        attr, affects_chrome = self._UI_FLAG_KEYS.get(key, (None, False))
+        if attr is None:
+            return
+        value = bool(value) if value is not None else True
+        if getattr(self, attr, None) == value:
+            return
+        setattr(self, attr, value)
+        if affects_chrome:
+            get_chrome_cache().invalidate(f'config:{key}')
+
     def toggleUserColors(self, state):
         """Toggle username color display"""
         self.show_user_colors = (state == Qt.CheckState.Checked.value)
+        get_chrome_cache().invalidate('toggleUserColors')
         
         # Save setting to config
         if self.config:
@@ -2250,6 +2479,7 @@ class ChatPage(QWidget):
     def toggleBadges(self, state):
         """Toggle badge display"""
         self.show_badges = (state == Qt.CheckState.Checked.value)
+        get_chrome_cache().invalidate('toggleBadges')
         
         # Save setting to config
         if self.config:
@@ -3039,12 +3269,36 @@ class ChatPage(QWidget):
             logger.info(f"Message display paused. Queuing new messages...")
         else:
             self.pause_btn.setText("⏸ Pause")
-            logger.info(f"Message display resumed. Displaying {len(self.message_queue)} queued messages...")
+            try:
+                stats = self.message_queue.stats()
+            except Exception:
+                stats = {}
+            logger.info(f"Message display resumed. Displaying {len(self.message_queue)} queued messages... buffer={stats}")
             
-            # Display all queued messages
-            while self.message_queue:
-                platform, username, message, metadata = self.message_queue.pop(0)
+            # Replay the backlog in chunks so the UI thread stays responsive
+            if not self._resuming:
+                self._resuming = True
+                self._resume_next_batch()
+
+    def _resume_next_batch(self):
+        """Display one chunk of the paused backlog and schedule the next."""
+        if self.is_paused:
+            # Paused again mid-replay; remaining items stay buffered
+            self._resuming = False
+            return
+        batch = self.message_queue.pop_batch(self._resume_batch_size)
+        for platform, username, message, metadata in batch:
+            try:
                 self._displayMessage(platform, username, message, metadata)
+            except Exception as e:
+                logger.error(f"Error displaying queued message: {e}")
+        if not self.message_queue:
+            self._resuming = False
+            return
+        try:
+            QTimer.singleShot(self._resume_batch_interval_ms, self._resume_next_batch)
+        except Exception:
+            self._resume_next_batch()
     
     def _on_render_ready(self, message_id, wrapped_html, final_has_img):
         """Handle insertion of rendered HTML into the DOM on the main thread."""
@@ -3052,194 +3306,20 @@ class ChatPage(QWidget):
             js_code_local = f"var chatBody = document.getElementById('chat-body'); if (chatBody) {{ chatBody.insertAdjacentHTML('beforeend', `{wrapped_html}`); var messages = chatBody.querySelectorAll('.message'); var newMessage = messages[messages.length - 1]; newMessage.classList.add('message-slide-in'); setTimeout(function() {{ newMessage.classList.remove('message-slide-in'); newMessage.classList.add('message-wiggle'); setTimeout(function() {{ newMessage.classList.remove('message-wiggle'); }}, 2000); }}, 800); window.scrollTo(0, document.body.scrollHeight); }} true;"
             self._invoke_queue_js(js_code_local, message_id)
 
-            # After insertion, probe the inserted message's <img> elements
+            # Placeholders (and file:// fallbacks) in the inserted HTML are
+            # known on the Python side, so resolve them without a per-message
+            # JS probe and fold them into the next batched patch.
             try:
-                page = self.chat_display.page() if self.chat_display else None
-                if page:
-                    js_probe = f'''(function() {{ var node = document.querySelector('.message[data-message-id="{message_id}"]'); if(!node) return []; var imgs = node.querySelectorAll('img'); return Array.from(imgs).map(i=>({{src:i.src, currentSrc:i.currentSrc, complete:i.complete, naturalWidth:i.naturalWidth, naturalHeight:i.naturalHeight, dataEmoteId:i.getAttribute('data-emote-id')}})); }})()'''
-
-                    def _probe_cb(results):
-                        try:
-                            import time, os, json
-                            dlog = os.path.join(os.getcwd(), 'logs', 'chat_page_dom.log')
-                            os.makedirs(os.path.dirname(dlog), exist_ok=True)
-                            with open(dlog, 'a', encoding='utf-8', errors='replace') as df:
-                                df.write(f"{time.time():.3f} RENDER_PROBE message_id={message_id} probe={json.dumps(results)}\n")
-                                try:
-                                    df.flush(); os.fsync(df.fileno())
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-
-                        # If any probed images are file:// and have naturalWidth==0, try immediate replacement
-                        try:
-                            if results and isinstance(results, (list, tuple)):
-                                try:
-                                    from core.twitch_emotes import get_manager as _get_twitch_manager
-                                    mgr = _get_twitch_manager() if _get_twitch_manager is not None else None
-                                except Exception:
-                                    mgr = None
-                                if mgr:
-                                    import time, os
-                                    dlog = os.path.join(os.getcwd(), 'logs', 'chat_page_dom.log')
-                                    os.makedirs(os.path.dirname(dlog), exist_ok=True)
-                                    for ent in results:
-                                        try:
-                                            if not ent:
-                                                continue
-                                            cur = ent.get('currentSrc') or ''
-                                            nw = int(ent.get('naturalWidth') or 0)
-                                            emid = ent.get('dataEmoteId') or ent.get('dataEmoteID') or ent.get('dataEmote')
-                                            if not emid:
-                                                continue
-                                            if cur.startswith('file:///') and nw == 0:
-                                                data_uri = build_data_uri_for_emote(emid, mgr)
-                                                if not data_uri:
-                                                    continue
-                                                safe_uri = data_uri.replace('\\', '\\\\').replace('"', '\\"')
-                                                js_set = f'''(function() {{ try {{ var imgs = document.querySelectorAll('.message[data-message-id="{message_id}"] img[data-emote-id="{emid}"]'); for(var i=0;i<imgs.length;i++){{ (function(img){{ try{{ var newImg = new Image(); newImg.onload = function(){{ try{{ img.src="{safe_uri}"; img.classList.remove('placeholder'); }}catch(e){{}} }}; newImg.onerror = function(){{}}; newImg.src="{safe_uri}"; }}catch(e){{}} }})(imgs[i]); }} }}catch(e){{}} }})()'''
-                                                try:
-                                                    with open(dlog, 'a', encoding='utf-8', errors='replace') as df:
-                                                        df.write(f"{time.time():.3f} RETRY_EMOTE_REPLACE message_id={message_id} emote_id={emid} via_probe\n")
-                                                        try:
-                                                            df.flush(); os.fsync(df.fileno())
-                                                        except Exception:
-                                                            pass
-                                                except Exception:
-                                                    pass
-                                                try:
-                                                    self._invoke_queue_js(js_set, None)
-                                                except Exception:
-                                                    pass
-                                        except Exception:
-                                            pass
-                        except Exception:
-                            pass
-                        except Exception:
-                            pass
-
-                    try:
-                        # Use runJavaScript directly with a short delayed callback to allow resources to start loading
-                        QTimer.singleShot(80, lambda: page.runJavaScript(js_probe, _probe_cb))
-
-                        # Schedule a follow-up check to catch images that failed to decode from file:///
-                        try:
-                            js_check_missing = f'''(function() {{ var node = document.querySelector('.message[data-message-id="{message_id}"]'); if(!node) return []; var imgs = node.querySelectorAll('img[data-emote-id]'); return Array.from(imgs).filter(i => (!i.complete) || (i.naturalWidth===0)).map(i=>i.getAttribute('data-emote-id')); }})()'''
-
-                            def _missing_cb(bad_ids):
-                                try:
-                                    if not bad_ids:
-                                        return
-                                    try:
-                                        from core.twitch_emotes import get_manager as _get_twitch_manager
-                                        mgr = _get_twitch_manager() if _get_twitch_manager is not None else None
-                                    except Exception:
-                                        mgr = None
-                                    if not mgr:
-                                        return
-                                    import time, os
-                                    dlog = os.path.join(os.getcwd(), 'logs', 'chat_page_dom.log')
-                                    os.makedirs(os.path.dirname(dlog), exist_ok=True)
-                                    for emid in bad_ids:
-                                        try:
-                                            if not emid:
-                                                continue
-                                            data_uri = build_data_uri_for_emote(emid, mgr)
-                                            if not data_uri:
-                                                continue
-                                            safe_uri = data_uri.replace('\\', '\\\\').replace('"', '\\"')
-                                            js_set = f'''(function() {{ try {{ var imgs = document.querySelectorAll('.message[data-message-id="{message_id}"] img[data-emote-id="{emid}"]'); for(var i=0;i<imgs.length;i++){{ (function(img){{ try{{ var newImg = new Image(); newImg.onload = function(){{ try{{ img.src="{safe_uri}"; img.classList.remove('placeholder'); }}catch(e){{}} }}; newImg.onerror = function(){{}}; newImg.src="{safe_uri}"; }}catch(e){{}} }})(imgs[i]); }} }}catch(e){{}} }})()'''
-                                            try:
-                                                # Instrumentation
-                                                with open(dlog, 'a', encoding='utf-8', errors='replace') as df:
-                                                    df.write(f"{time.time():.3f} RETRY_EMOTE_REPLACE message_id={message_id} emote_id={emid}\n")
-                                                    try:
-                                                        df.flush(); os.fsync(df.fileno())
-                                                    except Exception:
-                                                        pass
-                                            except Exception:
-                                                pass
-                                            try:
-                                                self._invoke_queue_js(js_set, None)
-                                            except Exception:
-                                                pass
-                                        except Exception:
-                                            pass
-                                except Exception:
-                                    pass
-
-                            # Run after a slightly longer delay to allow system to attempt file-based loads
-                            QTimer.singleShot(360, lambda: page.runJavaScript(js_check_missing, _missing_cb))
-                        except Exception:
-                            pass
-                    except Exception:
-                        try:
-                            page.runJavaScript(js_probe, _probe_cb)
-                        except Exception:
-                            pass
+                self._schedule_placeholder_patches(wrapped_html, message_id)
             except Exception:
                 pass
-
-            # After inserting the message, proactively check for any placeholders
-            # that might already be cached (race: emote cached before DOM insert).
-            try:
-                page = self.chat_display.page() if self.chat_display else None
-                if page:
-                    js_find = f'''(function() {{ var node = document.querySelector('.message[data-message-id="{message_id}"]'); if(!node) return []; var imgs = node.querySelectorAll('img[data-emote-id]'); return Array.from(imgs).map(i => i.getAttribute('data-emote-id')); }})()'''
-
-                    def _cb(ids):
-                        try:
-                            if not ids:
-                                return
-                            try:
-                                from core.twitch_emotes import get_manager as _get_twitch_manager
-                                mgr = _get_twitch_manager() if _get_twitch_manager is not None else None
-                            except Exception:
-                                mgr = None
-                            if not mgr:
-                                return
-                            for emid in ids:
-                                try:
-                                    if not emid:
-                                        continue
-                                    data_uri = mgr.get_emote_data_uri(str(emid))
-                                    if not data_uri:
-                                        continue
-                                    safe_uri = data_uri.replace('\\', '\\\\').replace('"', '\\"')
-                                    js_set = f'''(function() {{ try {{ var imgs = document.querySelectorAll('.message[data-message-id="{message_id}"] img[data-emote-id="{emid}"]'); for(var i=0;i<imgs.length;i++){{ try{{ imgs[i].src="{safe_uri}"; imgs[i].classList.remove('placeholder'); }}catch(e){{}} }} }}catch(e){{}} }})()'''
-                                    try:
-                                        self._invoke_queue_js(js_set, None)
-                                    except Exception:
-                                        pass
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-
-                    try:
-                        try:
-                            self._run_js_with_diagnostics(page, js_find, _cb, message_id=message_id, tag='FIND_PLACEHOLDERS', timeout_ms=2000)
-                        except Exception:
-                            page.runJavaScript(js_find, _cb)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
             # (Direct run bypass removed — rely on queued execution and worker queue)
 
-            # Notify overlay_server if available (best-effort)
+            # Fan the render result out to other consumers (overlay, ...)
             try:
-                meta = self.message_data.get(message_id, {}).get('metadata', {})
-                platform = self.message_data.get(message_id, {}).get('platform')
-                username = self.message_data.get(message_id, {}).get('username')
-                message_text = self.message_data.get(message_id, {}).get('message')
-                is_event_local = meta.get('event_type') is not None
-                if self.overlay_server and not is_event_local and final_has_img:
-                    badges = meta.get('badges', [])
-                    color = meta.get('color') if self.show_user_colors else None
-                    self.overlay_server.add_message(platform, username, message_text, message_id, badges, color)
+                result = self.message_data.get(message_id, {}).get('render')
+                if result is not None:
+                    get_render_fanout().publish(result)
             except Exception:
                 pass
 
@@ -3251,7 +3331,7 @@ class ChatPage(QWidget):
             pass
 
     def _on_emote_image_cached(self, payload):
-        """Handle emote cache events and replace placeholder images in-place.
+        """Handle emote cache events by scheduling a batched placeholder patch.
 
         Payload is expected to be a dict with at least 'emote_id'.
         """
@@ -3261,63 +3341,12 @@ class ChatPage(QWidget):
             emote_id = str(payload.get('emote_id') or payload.get('id') or '')
             if not emote_id:
                 return
-            # Get manager to convert cached file to data URI (cache-first)
-            try:
-                from core.twitch_emotes import get_manager as _get_twitch_manager
-                mgr = _get_twitch_manager() if _get_twitch_manager is not None else None
-            except Exception:
-                mgr = None
-
-            if not mgr:
-                return
-
-            try:
-                data_uri = mgr.get_emote_data_uri(emote_id)
-            except Exception:
-                data_uri = None
-
-            if not data_uri:
-                return
-
-            # Instrumentation: log update
-            try:
-                import time, os
-                dlog = os.path.join(os.getcwd(), 'logs', 'chat_page_dom.log')
-                os.makedirs(os.path.dirname(dlog), exist_ok=True)
-                with open(dlog, 'a', encoding='utf-8', errors='replace') as df:
-                    df.write(f"{time.time():.3f} QUEUE_EMOTE_URI update emote_id={emote_id}\n")
-                    try:
-                        df.flush(); os.fsync(df.fileno())
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
-            # Escape double-quotes and backslashes in the URI for safe JS embedding
-            try:
-                safe_uri = data_uri.replace('\\', '\\\\').replace('"', '\\"')
-            except Exception:
-                safe_uri = data_uri
-
-            js = f'''(function() {{
-                try {{
-                    var imgs = document.querySelectorAll('img[data-emote-id="{emote_id}"]');
-                    for (var i=0;i<imgs.length;i++) {{
-                        try {{ imgs[i].src = "{safe_uri}"; imgs[i].classList.remove('placeholder'); }} catch(e){{}}
-                    }}
-                }} catch(e) {{}}
-            }})();'''
-
-            # Queue JS execution on main thread
-            try:
-                self._invoke_queue_js(js, None)
-            except Exception:
-                pass
+            self._schedule_emote_patches([emote_id], source='cached')
         except Exception:
             pass
 
     def _on_emote_set_metadata_ready(self, payload):
-        """Handle early metadata-ready emits: attempt lightweight patching for emote_ids.
+        """Handle early metadata-ready emits: schedule batched patching for emote_ids.
 
         Payload expected to include an 'emote_ids' iterable or 'emote_ids' key.
         """
@@ -3333,10 +3362,6 @@ class ChatPage(QWidget):
                     except Exception:
                         short = str(payload)
                     df.write(f"{time.time():.3f} META_HANDLER_CALLED payload={short}\n")
-                    try:
-                        df.flush(); os.fsync(df.fileno())
-                    except Exception:
-                        pass
             except Exception:
                 pass
             if not payload:
@@ -3348,65 +3373,177 @@ class ChatPage(QWidget):
                     emote_ids = payload
                 else:
                     return
+            self._schedule_emote_patches([str(eid) for eid in emote_ids if eid], source='meta')
+        except Exception:
+            pass
+
+    def _schedule_placeholder_patches(self, wrapped_html, message_id=None):
+        """Queue patches for placeholder emote images in freshly inserted HTML.
 
+        Covers the race where an emote was cached before the DOM insert.
+        `file:///` emotes normally load on their own, so they are only
+        queued for a deferred check that patches the ones that failed to
+        decode (naturalWidth == 0).
+        """
+        if not wrapped_html or 'data-emote-id' not in wrapped_html:
+            return
+        import re
+        ids = []
+        has_file = False
+        for m in re.finditer(r'<img data-emote-id="([^"]+)" src="([^"]*)"', wrapped_html):
+            emid, src = m.group(1), m.group(2)
+            if src.startswith(PLACEHOLDER_PREFIX):
+                ids.append(html.unescape(emid))
+            elif src.startswith('file:///'):
+                has_file = True
+        if ids:
+            self._schedule_emote_patches(ids, source='insert')
+        if has_file and message_id:
+            self._schedule_file_emote_check(message_id)
+
+    def _schedule_file_emote_check(self, message_id):
+        """Check `message_id`'s file:/// emotes for decode failures after a short delay.
+
+        Messages inserted within `_file_emote_check_delay_ms` share one probe.
+        """
+        with self._emote_patch_lock:
+            self._pending_file_checks.add(str(message_id))
+            already_scheduled = self._file_check_scheduled
+            self._file_check_scheduled = True
+        if already_scheduled:
+            return
+        try:
+            QTimer.singleShot(self._file_emote_check_delay_ms, self._run_file_emote_check)
+        except Exception:
+            self._run_file_emote_check()
+
+    def _run_file_emote_check(self):
+        """Probe the pending messages once and patch only file:/// emotes that failed to load."""
+        with self._emote_patch_lock:
+            message_ids = list(self._pending_file_checks)
+            self._pending_file_checks.clear()
+            self._file_check_scheduled = False
+        if not message_ids:
+            return
+        try:
+            page = self.chat_display.page() if getattr(self, 'chat_display', None) else None
+        except Exception:
+            page = None
+        if page is None:
+            return
+        js = self._build_file_emote_check_js(message_ids)
+
+        def _failed_cb(bad_ids):
             try:
-                from core.twitch_emotes import get_manager as _get_twitch_manager
-                mgr = _get_twitch_manager() if _get_twitch_manager is not None else None
+                if bad_ids:
+                    self._schedule_emote_patches([str(eid) for eid in bad_ids if eid], source='file-failed')
             except Exception:
-                mgr = None
-
-            if not mgr:
-                return
+                pass
+        try:
+            page.runJavaScript(js, _failed_cb)
+        except Exception:
+            pass
 
-            import time, os
-            dlog = os.path.join(os.getcwd(), 'logs', 'chat_page_dom.log')
-            os.makedirs(os.path.dirname(dlog), exist_ok=True)
+    @staticmethod
+    def _build_file_emote_check_js(message_ids):
+        """Build a JS snippet returning the emote ids of decoded-but-empty file:/// images."""
+        payload = json.dumps(message_ids).replace('</', '<\\/')
+        return (
+            "(function(ids){ var bad = {};"
+            " ids.forEach(function(mid){ var node = document.querySelector('.message[data-message-id=\"' + CSS.escape(mid) + '\"]');"
+            " if (!node) return; var imgs = node.querySelectorAll('img[data-emote-id]');"
+            " for (var i=0;i<imgs.length;i++) { var img = imgs[i];"
+            " if (img.src.indexOf('file:///') === 0 && img.complete && img.naturalWidth === 0) bad[img.getAttribute('data-emote-id')] = 1; } });"
+            " return Object.keys(bad); })(" + payload + ");"
+        )
 
-            for eid in list(emote_ids)[:200]:
-                try:
-                    emote_id = str(eid)
-                    data_uri = None
-                    try:
-                        data_uri = mgr.get_emote_data_uri(emote_id)
-                    except Exception:
-                        data_uri = None
+    def _schedule_emote_patches(self, emote_ids, source=''):
+        """Resolve data URIs for `emote_ids` and add them to the pending batch.
 
-                    if not data_uri:
-                        continue
+        All ids resolved within `_emote_patch_window_ms` are applied by a
+        single `_flush_emote_patches` JS call.
+        """
+        if not emote_ids:
+            return
+        try:
+            from core.twitch_emotes import get_manager as _get_twitch_manager
+            mgr = _get_twitch_manager() if _get_twitch_manager is not None else None
+        except Exception:
+            mgr = None
+        if not mgr:
+            return
 
-                    # instrumentation
-                    try:
-                        with open(dlog, 'a', encoding='utf-8', errors='replace') as df:
-                            df.write(f"{time.time():.3f} QUEUE_EMOTE_URI meta emote_id={emote_id}\n")
-                            try:
-                                df.flush(); os.fsync(df.fileno())
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
+        resolved = {}
+        for emote_id in list(emote_ids)[:self._emote_patch_max_batch]:
+            try:
+                if emote_id in resolved:
+                    continue
+                data_uri = build_data_uri_for_emote(emote_id, mgr)
+                if data_uri:
+                    resolved[emote_id] = data_uri
+            except Exception:
+                continue
+        if not resolved:
+            return
 
-                    safe_uri = data_uri.replace('\\', '\\\\').replace('"', '\\"')
-                    # Mark this JS as metadata-priority so it can bypass queue delays
-                    js_body = f'''(function() {{
-                        try {{
-                            var imgs = document.querySelectorAll('img[data-emote-id="{emote_id}"]');
-                            for (var i=0;i<imgs.length;i++) {{
-                                try {{ imgs[i].src = "{safe_uri}"; imgs[i].classList.remove('placeholder'); }} catch(e){{}}
-                            }}
-                        }} catch(e) {{}}
-                    }})();'''
+        with self._emote_patch_lock:
+            self._pending_emote_patches.update(resolved)
+            already_scheduled = self._emote_patch_scheduled
+            self._emote_patch_scheduled = True
 
-                    js = '/*META_PRIORITY*/' + js_body
+        try:
+            import time, os
+            dlog = os.path.join(os.getcwd(), 'logs', 'chat_page_dom.log')
+            os.makedirs(os.path.dirname(dlog), exist_ok=True)
+            with open(dlog, 'a', encoding='utf-8', errors='replace') as df:
+                df.write(f"{time.time():.3f} QUEUE_EMOTE_URI batch source={source} emote_ids={','.join(resolved.keys())}\n")
+        except Exception:
+            pass
 
-                    try:
-                        self._invoke_queue_js(js, None)
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
+        if already_scheduled:
+            return
+        try:
+            QTimer.singleShot(self._emote_patch_window_ms, self._flush_emote_patches)
+        except Exception:
+            self._flush_emote_patches()
+
+    def _flush_emote_patches(self):
+        """Swap every pending `img[data-emote-id]` in one JavaScript call."""
+        with self._emote_patch_lock:
+            patches = dict(self._pending_emote_patches)
+            self._pending_emote_patches.clear()
+            self._emote_patch_scheduled = False
+        if not patches:
+            return
+        js = self._build_emote_patch_js(patches)
+        try:
+            self._emote_patch_batches += 1
+            self._emote_patch_ids += len(patches)
+        except Exception:
+            pass
+        try:
+            # Metadata-priority so the batch bypasses queued message inserts
+            self._invoke_queue_js('/*META_PRIORITY*/' + js, None)
+        except Exception:
+            pass
+        try:
+            # Messages already fanned out with these placeholders need the images too
+            get_render_fanout().publish_emotes(patches)
         except Exception:
             pass
 
+    @staticmethod
+    def _build_emote_patch_js(patches):
+        """Build a single JS snippet applying {emote_id: data_uri} to the DOM."""
+        payload = json.dumps(patches).replace('</', '<\\/')
+        return (
+            "(function(m){ var ids = Object.keys(m); if (!ids.length) return 0;"
+            " var sel = ids.map(function(id){ return 'img[data-emote-id=\"' + CSS.escape(id) + '\"]'; }).join(',');"
+            " var imgs = document.querySelectorAll(sel); for (var i=0;i<imgs.length;i++) {"
+            " try { var u = m[imgs[i].getAttribute('data-emote-id')]; if (u) { imgs[i].src = u; imgs[i].classList.remove('placeholder'); } } catch(e){} }"
+            " return imgs.length; })(" + payload + ");"
+        )
+
     def emote_prefetch_sync(self, emote_set_ids=None, broadcaster_id=None, timeout_s=10):
         """Synchronous, blocking emote set prefetch helper.
 
@@ -3827,3 +3964,111 @@ class ChatPage(QWidget):
             self.blocked_terms_manager.clear()
             dialog.accept()
             QMessageBox.information(self, "Cleared", "All blocked terms cleared.")
+
+    def openChatSearch(self):
+        """Search archived chat history by text, user and platform"""
+        archive = getattr(self, 'chat_archive', None)
+        if archive is None:
+            QMessageBox.information(self, "Chat Search", "Chat history archiving is disabled.")
+            return
+
+        from PyQt6.QtWidgets import QDialog, QVBoxLayout, QListWidget, QHBoxLayout, QLineEdit, QComboBox
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Search Chat History")
+        dialog.setMinimumWidth(600)
+        dialog.setMinimumHeight(400)
+
+        layout = QVBoxLayout()
+        input_style = """
+            QLineEdit, QComboBox {
+                background-color: #2d2d2d;
+                color: #ffffff;
+                border: 1px solid #3d3d3d;
+                padding: 4px;
+            }
+        """
+
+        filter_layout = QHBoxLayout()
+        text_input = QLineEdit()
+        text_input.setPlaceholderText("Message text")
+        text_input.setStyleSheet(input_style)
+        filter_layout.addWidget(text_input, 3)
+
+        user_input = QLineEdit()
+        user_input.setPlaceholderText("Username")
+        user_input.setStyleSheet(input_style)
+        filter_layout.addWidget(user_input, 2)
+
+        platform_combo = QComboBox()
+        platform_combo.addItems(['All', 'twitch', 'youtube', 'trovo', 'kick', 'dlive', 'twitter'])
+        platform_combo.setStyleSheet(input_style)
+        filter_layout.addWidget(platform_combo, 1)
+
+        search_btn = QPushButton("Search")
+        search_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4a90e2;
+                color: #ffffff;
+                border: none;
+                padding: 5px 15px;
+                border-radius: 3px;
+            }
+            QPushButton:hover {
+                background-color: #357abd;
+            }
+        """)
+        filter_layout.addWidget(search_btn)
+        layout.addLayout(filter_layout)
+
+        results = QListWidget()
+        results.setStyleSheet("""
+            QListWidget {
+                background-color: #2d2d2d;
+                color: #ffffff;
+                border: 1px solid #3d3d3d;
+            }
+            QListWidget::item:selected {
+                background-color: #4a90e2;
+            }
+        """)
+        layout.addWidget(results)
+
+        def run_search():
+            import datetime
+            platform = platform_combo.currentText()
+            rows = archive.query(
+                text=text_input.text().strip() or None,
+                username=user_input.text().strip() or None,
+                platform=None if platform == 'All' else platform,
+                limit=500,
+            )
+            results.clear()
+            for row in rows:
+                when = datetime.datetime.fromtimestamp(row['ts']).strftime('%Y-%m-%d %H:%M:%S')
+                results.addItem(f"[{when}] [{row['platform']}] {row['username']}: {row['message']}")
+            if not rows:
+                results.addItem("No matching messages.")
+
+        search_btn.clicked.connect(run_search)
+        text_input.returnPressed.connect(run_search)
+        user_input.returnPressed.connect(run_search)
+
+        close_btn = QPushButton("Close")
+        close_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #5cb85c;
+                color: #ffffff;
+                border: none;
+                padding: 5px 15px;
+                border-radius: 3px;
+            }
+            QPushButton:hover {
+                background-color: #449d44;
+            }
+        """)
+        close_btn.clicked.connect(dialog.accept)
+        layout.addWidget(close_btn)
+
+        dialog.setLayout(layout)
+        dialog.exec()
@@ -171,6 +171,7 @@ class OverlayPage(QWidget):
         
         # Connect to overlay server signals
         self.overlay_server.server_started.connect(self.onOverlayServerStarted)
+        self.overlay_server.server_error.connect(self.onOverlayServerError)
         self.overlay_server.devices_updated.connect(self.onDevicesUpdated)
         
         # Start overlay server
@@ -775,6 +776,13 @@ class OverlayPage(QWidget):
         self.open_btn.setEnabled(True)
         logger.info(f"Overlay server started: {url}")
     
+    def onOverlayServerError(self, message):
+        """Handle an overlay server that failed to start"""
+        self.overlay_url = None
+        self.url_label.setText(f"<b>Overlay server not running:</b><br>{message}")
+        self.copy_btn.setEnabled(False)
+        self.open_btn.setEnabled(False)
+    
     def onRefreshDevices(self):
         """Refresh the list of video devices"""
         # NOTE: Video device feature disabled - interferes with Snap Cam and other virtual camera device settings
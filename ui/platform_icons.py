@@ -1,5 +1,7 @@
 # Platform icon utilities for chat UI
 
+import functools
+
 from core.logger import get_logger
 
 # Placeholder for get_platform_icon_html and PLATFORM_COLORS
@@ -9,6 +11,15 @@ logger = get_logger('PlatformIcons')
 
 def get_platform_icon_html(platform: str, size: int = 18) -> str:
     """Return HTML for platform icon image."""
+    icon_url = get_platform_icon_url(platform)
+    if not icon_url:
+        return ''
+    return f'<img src="{icon_url}" width="{size}" height="{size}" style="vertical-align: middle; margin-right: 2px;" />'
+
+
+@functools.lru_cache(maxsize=None)
+def get_platform_icon_url(platform: str) -> str:
+    """Return the icon URL (local data URI or external favicon) for a platform."""
     import os, base64, sys
     
     # Get base directory (works for both script and PyInstaller)
@@ -47,16 +58,12 @@ def get_platform_icon_html(platform: str, size: int = 18) -> str:
             else:
                 mime_type = 'image/png'  # default
             
-            data_uri = f'data:{mime_type};base64,{b64}'
-            return f'<img src="{data_uri}" width="{size}" height="{size}" style="vertical-align: middle; margin-right: 2px;" />'
+            return f'data:{mime_type};base64,{b64}'
         except Exception as e:
             logger.exception(f"Error loading icon for {platform}: {e}")
     
     # Fallback to external URL
-    icon_url = PLATFORM_COLORS.get(platform, '')
-    if not icon_url:
-        return ''
-    return f'<img src="{icon_url}" width="{size}" height="{size}" style="vertical-align: middle; margin-right: 2px;" />'
+    return PLATFORM_COLORS.get(platform, '')
 
 # Example color/icon mapping for platforms
 PLATFORM_COLORS = {
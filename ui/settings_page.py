@@ -83,6 +83,17 @@ class SettingsPage(QWidget):
     # Signal to notify when username colors are updated
     colors_updated = pyqtSignal(list)
     
+    # (column title, row key) for the connector health table
+    HEALTH_COLUMNS = [
+        ('Connection', 'name'),
+        ('Status', 'status'),
+        ('Last message', 'last_message_age'),
+        ('Ping', 'rtt_ms'),
+        ('Subscription', 'subscription'),
+        ('Detail', 'detail'),
+    ]
+    HEALTH_COLORS = {'ok': '#5cb85c', 'warn': '#f0ad4e', 'dead': '#d9534f', 'pending': '#aaaaaa'}
+    
     def __init__(self, ngrok_manager, config, log_manager=None):
         super().__init__()
         self.ngrok_manager = ngrok_manager
@@ -145,6 +156,10 @@ class SettingsPage(QWidget):
         status_group = self.create_status_section()
         scroll_layout.addWidget(status_group)
         
+        # === Connector Health Section ===
+        health_group = self.create_health_section()
+        scroll_layout.addWidget(health_group)
+        
         # === About Section ===
         about_group = self.create_about_section()
         scroll_layout.addWidget(about_group)
@@ -861,6 +876,88 @@ class SettingsPage(QWidget):
         group.setLayout(layout)
         return group
 
+    def create_health_section(self):
+        """Create the live connector health table (fed by the HealthSupervisor)"""
+        from PyQt6.QtWidgets import QTableWidget, QHeaderView
+        from PyQt6.QtCore import QTimer
+
+        group = QGroupBox("🩺 Connector Health")
+        group.setStyleSheet("""
+            QGroupBox {
+                font-size: 14px;
+                font-weight: bold;
+                color: #ffffff;
+                border: 2px solid #3d3d3d;
+                border-radius: 8px;
+                margin-top: 10px;
+                padding-top: 15px;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 5px;
+            }
+        """)
+        
+        layout = QVBoxLayout()
+        layout.setSpacing(10)
+        
+        self.health_table = QTableWidget(0, len(self.HEALTH_COLUMNS))
+        self.health_table.setHorizontalHeaderLabels([title for title, _ in self.HEALTH_COLUMNS])
+        self.health_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.health_table.verticalHeader().setVisible(False)
+        self.health_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.health_table.setMinimumHeight(160)
+        self.health_table.setStyleSheet("""
+            QTableWidget {
+                background-color: #1e1e1e;
+                color: #ffffff;
+                border: 1px solid #3d3d3d;
+                border-radius: 4px;
+                font-size: 11px;
+            }
+        """)
+        layout.addWidget(self.health_table)
+        
+        group.setLayout(layout)
+        
+        # Probes run on the supervisor's own schedule; this only repaints their latest results
+        self.health_timer = QTimer(self)
+        self.health_timer.timeout.connect(self.refresh_health_table)
+        self.health_timer.start(2000)
+        self.refresh_health_table()
+        return group
+    
+    @staticmethod
+    def format_health_cell(key, row):
+        """Text shown for one health table cell"""
+        value = row.get(key)
+        if value is None:
+            return '—'
+        if key == 'last_message_age':
+            return f"{value:.0f}s ago"
+        if key == 'rtt_ms':
+            return f"{value:.0f} ms"
+        if key == 'status':
+            return str(value).upper()
+        return str(value)
+    
+    def refresh_health_table(self):
+        """Repaint the health table from the supervisor's latest probe results"""
+        try:
+            from PyQt6.QtWidgets import QTableWidgetItem
+            from core.health_supervisor import get_health_supervisor
+            rows = sorted(get_health_supervisor().table(), key=lambda r: (r['platform'], r['name']))
+            self.health_table.setRowCount(len(rows))
+            for r, row in enumerate(rows):
+                for c, (_, key) in enumerate(self.HEALTH_COLUMNS):
+                    item = QTableWidgetItem(self.format_health_cell(key, row))
+                    if key == 'status':
+                        item.setForeground(QColor(self.HEALTH_COLORS.get(row['status'], '#ffffff')))
+                    self.health_table.setItem(r, c, item)
+        except Exception as e:
+            logger.debug(f"Error refreshing health table: {e}")
+
     def create_credentials_section(self):
         """Create a small credentials editor for platform client_id/client_secret"""
         group = QGroupBox("🔐 Platform Client Credentials")